@@ -0,0 +1,102 @@
+"""
+Aggregator Adapter Module
+Agent'lardan toplanan veriyi platform adaptörleriyle aynı arayüzle sunar.
+"""
+
+import json
+import sys
+import os
+from typing import List, Optional, Tuple
+from datetime import datetime
+
+# Core modülleri import edebilmek için path ekle
+src_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from core.service_monitor import ServiceInfo
+from core.log_collector import LogEntry, LogLevel
+from agent.aggregator import HostRegistry
+
+
+class AggregatorAdapter:
+    """
+    HostRegistry üzerinde servis ve log adaptörü.
+
+    ServiceMonitor ve LogCollector'a verildiğinde dashboard, anlık
+    görüntüler ve /metrics tüm host'lar için değişmeden çalışır.
+    Servis adları 'host/servis' biçimindedir. Hiçbir komut çalıştırmaz.
+
+    Artımlı okuma imleci host başına sıra numaralarını taşır; böylece
+    birçok host aynı anda yoğun log gönderdiğinde `limit` ötesindeki
+    kayıtlar kaybolmaz, sonraki çağrıda okunur.
+    """
+
+    def __init__(self, registry: HostRegistry):
+        self.registry = registry
+
+    def get_services(self) -> List[ServiceInfo]:
+        return self.registry.get_services()
+
+    async def get_services_async(self) -> List[ServiceInfo]:
+        return self.get_services()
+
+    def get_service_status(self, service_name: str) -> Optional[ServiceInfo]:
+        return next((s for s in self.get_services() if s.name == service_name), None)
+
+    async def get_service_status_async(self, service_name: str) -> Optional[ServiceInfo]:
+        return self.get_service_status(service_name)
+
+    def get_logs(self,
+                 limit: int = 100,
+                 level: Optional[LogLevel] = None,
+                 service: Optional[str] = None,
+                 since: Optional[datetime] = None,
+                 until: Optional[datetime] = None) -> List[LogEntry]:
+        """Tüm host'ların son logları (eskiden yeniye)"""
+        logs = self.registry.get_logs()
+        if level is not None:
+            logs = [entry for entry in logs if entry.level.value <= level.value]
+        if service:
+            # 'host/servis' tam eşleşme veya yalnızca servis adı (tüm host'larda)
+            logs = [entry for entry in logs
+                    if entry.service == service or entry.service.endswith(f"/{service}")]
+        # Epoch saniyeleri: agent kayıtları saat dilimli, sorgu zamanları yerel olabilir
+        if since:
+            since_ts = since.timestamp()
+            logs = [entry for entry in logs if entry.timestamp.timestamp() >= since_ts]
+        if until:
+            until_ts = until.timestamp()
+            logs = [entry for entry in logs if entry.timestamp.timestamp() <= until_ts]
+        return logs[-limit:] if limit else logs
+
+    async def get_logs_async(self, **kwargs) -> List[LogEntry]:
+        return self.get_logs(**kwargs)
+
+    def read_new_logs(self, after_cursor: Optional[str] = None,
+                      limit: int = 1000) -> Tuple[List[LogEntry], Optional[str]]:
+        """
+        İmleçten sonraki logları oku (artımlı toplama).
+
+        Returns:
+            (LogEntry listesi eskiden yeniye, son okunan kayıtların imleci)
+        """
+        logs, positions = self.registry.read_logs(self._decode_cursor(after_cursor), limit)
+        return logs, json.dumps({"epoch": self.registry.epoch, "hosts": positions},
+                                separators=(",", ":"))
+
+    async def read_new_logs_async(self, after_cursor: Optional[str] = None,
+                                  limit: int = 1000) -> Tuple[List[LogEntry], Optional[str]]:
+        return self.read_new_logs(after_cursor=after_cursor, limit=limit)
+
+    def _decode_cursor(self, cursor: Optional[str]):
+        """İmleçteki host sıra numaraları (başka bir aggregator ömrüne aitse None)"""
+        if not cursor:
+            return None
+        try:
+            data = json.loads(cursor)
+        except ValueError:
+            return None
+        if not isinstance(data, dict) or data.get("epoch") != self.registry.epoch:
+            return None
+        return data.get("hosts") or {}
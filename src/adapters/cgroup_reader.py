@@ -0,0 +1,307 @@
+"""
+Cgroup Reader Module
+systemd cgroup ağacı ve /proc üzerinden alt süreç açmadan servis kaynak kullanımı okuyucu.
+"""
+
+import os
+import sys
+import threading
+from typing import Dict, List, Optional
+
+# Core modülleri import edebilmek için path ekle
+src_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from core.service_monitor import ServiceResources
+
+
+class CgroupReader:
+    """
+    cgroup v2 dosyalarını ve /proc/<pid>/stat'ı doğrudan okur.
+
+    Dosya tanımlayıcıları açık tutulur ve her örneklemede os.pread ile
+    baştan okunur; böylece her turda open/close maliyeti ödenmez.
+    Birim durup yeniden başladığında eski tanımlayıcı hata verir,
+    bu durumda dosya bir kez yeniden açılır.
+
+    Okuyucu anlık görüntü thread'i ile istek thread'leri arasında
+    paylaşılır; tanımlayıcı önbelleği ve sayaç tek kilitle korunur.
+    """
+
+    CGROUP_FILES = ("cpu.stat", "memory.current", "pids.current", "cgroup.procs")
+    READ_SIZE = 4096
+
+    def __init__(self,
+                 cgroup_root: str = "/sys/fs/cgroup",
+                 proc_root: str = "/proc",
+                 slice_name: str = "system.slice",
+                 max_descriptors: Optional[int] = None):
+        """
+        CgroupReader başlatıcı.
+
+        Args:
+            cgroup_root: cgroup2 bağlama noktası
+            proc_root: procfs bağlama noktası
+            slice_name: Servislerin bulunduğu slice
+            max_descriptors: Açık tutulacak en fazla tanımlayıcı
+                (None ise RLIMIT_NOFILE yumuşak sınırının yarısı)
+        """
+        self.cgroup_root = cgroup_root
+        self.proc_root = proc_root
+        self.slice_name = slice_name
+        self.max_descriptors = max_descriptors or self._default_max_descriptors()
+        self._unit_fds: Dict[str, Dict[str, int]] = {}
+        self._proc_fds: Dict[int, int] = {}
+        self._fd_count = 0
+        # Açma/okuma/kapatma birbirinin tanımlayıcısını kapatmasın
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _default_max_descriptors() -> int:
+        """Sürecin dosya tanımlayıcı sınırının yarısını kullan"""
+        try:
+            import resource
+            soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+            if soft != resource.RLIM_INFINITY:
+                return max(soft // 2, 64)
+        except (ImportError, ValueError, OSError):
+            pass
+        return 4096
+
+    def is_available(self) -> bool:
+        """Birleşik (v2) cgroup hiyerarşisi okunabilir mi"""
+        return os.path.isdir(os.path.join(self.cgroup_root, self.slice_name))
+
+    def unit_path(self, service_name: str) -> str:
+        """
+        Servisin cgroup dizinini döndür.
+
+        Şablon örnekleri (getty@tty1) systemd tarafından
+        system-<şablon>.slice altına yerleştirilir.
+        """
+        unit = service_name if '.' in service_name else f"{service_name}.service"
+        base = os.path.join(self.cgroup_root, self.slice_name)
+        if '@' in unit:
+            template = unit.split('@', 1)[0]
+            return os.path.join(base, f"system-{template}.slice", unit)
+        return os.path.join(base, unit)
+
+    def _open(self, path: str) -> Optional[int]:
+        """Dosyayı salt okunur aç, yoksa None"""
+        try:
+            fd = os.open(path, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+        except OSError:
+            return None
+        self._fd_count += 1
+        return fd
+
+    def _close(self, fd: int):
+        self._fd_count -= 1
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+    def _read_once(self, path: str) -> Optional[bytes]:
+        """Tanımlayıcı bütçesi dolduğunda aç-oku-kapat"""
+        fd = self._open(path)
+        if fd is None:
+            return None
+        try:
+            return os.pread(fd, self.READ_SIZE, 0)
+        except OSError:
+            return None
+        finally:
+            self._close(fd)
+
+    def _read_unit_file(self, service_name: str, filename: str) -> Optional[bytes]:
+        """
+        Birime ait cgroup dosyasını önbellekteki tanımlayıcıdan oku.
+
+        Tanımlayıcı bayatlamışsa (birim yeniden başlatılmış) bir kez yeniden açar.
+        """
+        fds = self._unit_fds.setdefault(service_name, {})
+        for attempt in range(2):
+            fd = fds.get(filename)
+            if fd is None:
+                path = os.path.join(self.unit_path(service_name), filename)
+                if self._fd_count >= self.max_descriptors:
+                    return self._read_once(path)
+                fd = self._open(path)
+                if fd is None:
+                    return None
+                fds[filename] = fd
+            try:
+                return os.pread(fd, self.READ_SIZE, 0)
+            except OSError:
+                self._close(fds.pop(filename))
+        return None
+
+    def _read_proc_stat(self, pid: int) -> Optional[bytes]:
+        """/proc/<pid>/stat içeriğini oku; süreç ölmüşse tanımlayıcıyı bırak"""
+        fd = self._proc_fds.get(pid)
+        if fd is None:
+            path = os.path.join(self.proc_root, str(pid), "stat")
+            if self._fd_count >= self.max_descriptors:
+                return self._read_once(path)
+            fd = self._open(path)
+            if fd is None:
+                return None
+            self._proc_fds[pid] = fd
+        try:
+            data = os.pread(fd, self.READ_SIZE, 0)
+        except OSError:
+            data = b""
+        if not data:
+            # Ölü süreç: tanımlayıcı artık aynı PID'e yeniden bağlanmaz
+            self._close(self._proc_fds.pop(pid))
+            return None
+        return data
+
+    @staticmethod
+    def _parse_int(data: Optional[bytes]) -> int:
+        if not data:
+            return 0
+        try:
+            return int(data.split(None, 1)[0])
+        except (ValueError, IndexError):
+            # memory.max gibi "max" değerleri
+            return 0
+
+    @staticmethod
+    def _parse_cpu_stat(data: Optional[bytes]) -> Dict[str, int]:
+        """cpu.stat 'anahtar değer' satırlarını sözlüğe çevir"""
+        result = {}
+        if not data:
+            return result
+        for line in data.split(b"\n"):
+            parts = line.split()
+            if len(parts) == 2:
+                try:
+                    result[parts[0].decode()] = int(parts[1])
+                except ValueError:
+                    continue
+        return result
+
+    @staticmethod
+    def parse_proc_stat(data: bytes) -> Optional[Dict]:
+        """
+        /proc/<pid>/stat satırını ayrıştır.
+
+        comm alanı boşluk ve parantez içerebildiği için son ')' karakterinden bölünür.
+
+        Returns:
+            state, utime, stime, num_threads, starttime, rss_pages alanları
+        """
+        try:
+            end = data.rindex(b")")
+            fields = data[end + 2:].split()
+            # fields[0] = 3. alan (state)
+            return {
+                "state": fields[0].decode(),
+                "utime": int(fields[11]),
+                "stime": int(fields[12]),
+                "num_threads": int(fields[17]),
+                "starttime": int(fields[19]),
+                "rss_pages": int(fields[21]),
+            }
+        except (ValueError, IndexError):
+            return None
+
+    def read_unit(self, service_name: str, pid: Optional[int] = None) -> Optional[ServiceResources]:
+        """
+        Tek bir birimin kaynak kullanımını oku.
+
+        Args:
+            service_name: Servis adı (.service eki opsiyonel)
+            pid: Ana süreç PID'i; verilmezse cgroup.procs içindeki ilk PID
+
+        Returns:
+            ServiceResources veya cgroup yoksa None
+        """
+        with self._lock:
+            return self._read_unit(service_name, pid)
+
+    def _read_unit(self, service_name: str, pid: Optional[int]) -> Optional[ServiceResources]:
+        """read_unit gövdesi (kilit tutulurken çağrılır)"""
+        memory = self._read_unit_file(service_name, "memory.current")
+        if memory is None:
+            # Birim çalışmıyor: açık tanımlayıcıları serbest bırak
+            self._forget(service_name)
+            return None
+
+        cpu = self._parse_cpu_stat(self._read_unit_file(service_name, "cpu.stat"))
+        resources = ServiceResources(
+            name=service_name,
+            cpu_usage_usec=cpu.get("usage_usec", 0),
+            cpu_user_usec=cpu.get("user_usec", 0),
+            cpu_system_usec=cpu.get("system_usec", 0),
+            memory_bytes=self._parse_int(memory),
+            tasks=self._parse_int(self._read_unit_file(service_name, "pids.current"))
+        )
+
+        if pid is None:
+            procs = self._read_unit_file(service_name, "cgroup.procs")
+            pid = self._parse_int(procs) or None
+
+        if pid:
+            data = self._read_proc_stat(pid)
+            stat = self.parse_proc_stat(data) if data else None
+            if stat:
+                resources.main_pid = pid
+                resources.process_state = stat["state"]
+                resources.process_utime = stat["utime"]
+                resources.process_stime = stat["stime"]
+                resources.process_threads = stat["num_threads"]
+
+        return resources
+
+    def read_units(self, service_names: List[str]) -> Dict[str, ServiceResources]:
+        """
+        Birden fazla birimi tek geçişte oku.
+
+        Returns:
+            Servis adı -> ServiceResources sözlüğü (cgroup'u olmayanlar hariç)
+        """
+        results = {}
+        with self._lock:
+            for name in service_names:
+                resources = self._read_unit(name, None)
+                if resources is not None:
+                    results[name] = resources
+
+            # Artık ana süreç olmayan PID'lerin tanımlayıcılarını bırak
+            live_pids = {r.main_pid for r in results.values() if r.main_pid}
+            for pid in [p for p in self._proc_fds if p not in live_pids]:
+                self._close(self._proc_fds.pop(pid))
+
+        return results
+
+    def forget(self, service_name: str):
+        """Birime ait önbellekteki tanımlayıcıları kapat"""
+        with self._lock:
+            self._forget(service_name)
+
+    def _forget(self, service_name: str):
+        for fd in self._unit_fds.pop(service_name, {}).values():
+            self._close(fd)
+
+    def open_descriptor_count(self) -> int:
+        """Açık tutulan tanımlayıcı sayısı"""
+        return self._fd_count
+
+    def close(self):
+        """Tüm tanımlayıcıları kapat"""
+        with self._lock:
+            for name in list(self._unit_fds):
+                self._forget(name)
+            for fd in self._proc_fds.values():
+                self._close(fd)
+            self._proc_fds.clear()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -3,20 +3,180 @@ Linux Adapter Module
 Linux sistemleri için systemd/journalctl adaptörü.
 """
 
-import subprocess
+import json
 import re
+import subprocess
 import sys
 import os
-from typing import List, Optional
-from datetime import datetime
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime, timezone
 
 # Core modülleri import edebilmek için path ekle
 src_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if src_path not in sys.path:
     sys.path.insert(0, src_path)
 
-from core.service_monitor import ServiceInfo, ServiceStatus
+from core.service_monitor import ServiceInfo, ServiceStatus, ServiceResources
 from core.log_collector import LogEntry, LogLevel
+from core.async_utils import (
+    run_command, stream_command, run_command_sync, stream_command_sync, COMMAND_TIMEOUT
+)
+from core.instrumentation import instruments
+from adapters.cgroup_reader import CgroupReader
+
+# journalctl -o short-iso satırı: 2024-01-15T10:30:45+0300 hostname service[pid]: message
+LOG_LINE_RE = re.compile(r'^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[+-]\d{4})\s+(\S+)\s+(\S+?)(?:\[\d+\])?:\s*(.*)$')
+
+# journalctl priority mapping
+PRIORITY_MAP = {
+    0: LogLevel.EMERGENCY,
+    1: LogLevel.ALERT,
+    2: LogLevel.CRITICAL,
+    3: LogLevel.ERROR,
+    4: LogLevel.WARNING,
+    5: LogLevel.NOTICE,
+    6: LogLevel.INFO,
+    7: LogLevel.DEBUG
+}
+
+# systemctl ActiveState / is-active çıktısı
+ACTIVE_STATE_MAP = {
+    'active': ServiceStatus.RUNNING,
+    'failed': ServiceStatus.FAILED,
+    'inactive': ServiceStatus.STOPPED
+}
+
+
+def _unit_names(service_names: List[str]) -> List[str]:
+    """Servis adlarını systemd birim adlarına çevir ('nginx' -> 'nginx.service')"""
+    return [n if '.' in n else f"{n}.service" for n in service_names]
+
+
+def _service_name(unit: str) -> str:
+    """Birim adından servis adı ('nginx.service' -> 'nginx')"""
+    return unit[:-len('.service')] if unit.endswith('.service') else unit
+
+
+def parse_iso_timestamp(value: str) -> datetime:
+    """
+    short-iso zaman damgasını çöz ('2024-01-15T10:30:45+0300').
+    
+    Python 3.10 fromisoformat '+HHMM' biçimini kabul etmediğinden
+    ofsete iki nokta eklenir.
+    """
+    return datetime.fromisoformat(f"{value[:-2]}:{value[-2:]}")
+
+
+def guess_level(message: str) -> LogLevel:
+    """Mesaj içeriğinden log seviyesi tahmin et"""
+    message_lower = message.lower()
+    
+    if 'error' in message_lower or 'failed' in message_lower or 'failure' in message_lower:
+        return LogLevel.ERROR
+    elif 'warning' in message_lower or 'warn' in message_lower:
+        return LogLevel.WARNING
+    elif 'critical' in message_lower or 'crit' in message_lower:
+        return LogLevel.CRITICAL
+    elif 'debug' in message_lower:
+        return LogLevel.DEBUG
+    else:
+        return LogLevel.INFO
+
+
+def journal_match_args(groups: List[Dict[str, List[str]]]) -> List[str]:
+    """
+    Alan eşleşme gruplarını journalctl argümanlarına çevir.
+    
+    journalctl semantiği: bir grup içinde aynı alana ait eşleşmeler VEYA,
+    farklı alanlar VE ile birleşir; '+' ile ayrılan gruplar VEYA'lanır.
+    [{'SYSLOG_IDENTIFIER': ['nginx'], '_HOSTNAME': ['web-1']}, {'_PID': ['42']}]
+    -> SYSLOG_IDENTIFIER=nginx _HOSTNAME=web-1 + _PID=42
+    """
+    args: List[str] = []
+    for group in groups:
+        if args:
+            args.append('+')
+        for name, values in group.items():
+            args.extend(f'{name}={value}' for value in values)
+    return args
+
+
+def journal_record_fields(record: Dict) -> Optional[Tuple[float, LogLevel, str, str, str]]:
+    """
+    journalctl -o json kaydının alanları.
+    
+    Returns:
+        (epoch saniye, seviye, servis, host, mesaj) veya zaman damgası yoksa None
+    """
+    try:
+        ts = int(record["__REALTIME_TIMESTAMP"]) / 1e6
+    except (KeyError, ValueError, TypeError):
+        return None
+    
+    message = record.get("MESSAGE")
+    if isinstance(message, list):
+        # İkili mesajlar bayt dizisi olarak gelir
+        message = bytes(message).decode("utf-8", errors="replace")
+    message = message or ""
+    
+    try:
+        level = PRIORITY_MAP[int(record["PRIORITY"])]
+    except (KeyError, ValueError, TypeError):
+        level = guess_level(message)
+    
+    service = record.get("SYSLOG_IDENTIFIER") or record.get("_SYSTEMD_UNIT") or ""
+    return ts, level, service, record.get("_HOSTNAME") or "", message
+
+
+class JournalUnitFollower:
+    """
+    Servislerin journal mesajlarını `journalctl -f` ile canlı izler.
+    
+    Yalnızca birim durum değişiklikleri izlenir: bunları systemd (PID 1)
+    UNIT= alanıyla yazar. Servisin kendi log satırları (_SYSTEMD_UNIT=)
+    olay sayılmaz; aksi halde gürültülü bir servisin her satırı bir
+    durum sorgusuna dönüşürdü. Yineleme (servis adı, journal zaman
+    damgası) verir ve close() çağrılana veya journalctl çıkana kadar sürer.
+    """
+
+    def __init__(self, service_names: List[str]):
+        self.units = _unit_names(service_names)
+        self._process: Optional[subprocess.Popen] = None
+        self._closed = False
+
+    def command(self) -> List[str]:
+        # Farklı alanlar VE, aynı alandaki eşleşmeler VEYA ile birleşir: _PID=1 VE (UNIT=a VEYA UNIT=b)
+        return (['journalctl', '--no-pager', '-f', '-n', '0', '-o', 'json',
+                 '--output-fields=UNIT', '_PID=1']
+                + [f'UNIT={unit}' for unit in self.units])
+
+    def __iter__(self) -> Iterator[Tuple[str, float]]:
+        if self._closed:
+            return
+        self._process = subprocess.Popen(self.command(), stdout=subprocess.PIPE,
+                                         stderr=subprocess.DEVNULL)
+        for line in self._process.stdout:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            unit = record.get('UNIT')
+            if not isinstance(unit, str):
+                continue
+            try:
+                ts = int(record['__REALTIME_TIMESTAMP']) / 1e6
+            except (KeyError, ValueError, TypeError):
+                ts = time.time()
+            yield _service_name(unit), ts
+
+    def close(self):
+        """journalctl sürecini durdur (başka bir thread'den çağrılabilir)"""
+        self._closed = True
+        process = self._process
+        if process is not None and process.poll() is None:
+            process.kill()
+            process.wait()
 
 
 class LinuxAdapter:
@@ -25,41 +185,46 @@ class LinuxAdapter:
     systemctl ve journalctl komutlarını kullanır.
     """
 
-    # journalctl priority mapping
-    PRIORITY_MAP = {
-        0: LogLevel.EMERGENCY,
-        1: LogLevel.ALERT,
-        2: LogLevel.CRITICAL,
-        3: LogLevel.ERROR,
-        4: LogLevel.WARNING,
-        5: LogLevel.NOTICE,
-        6: LogLevel.INFO,
-        7: LogLevel.DEBUG
-    }
-
-    def __init__(self):
-        """LinuxAdapter başlatıcı."""
-        pass
-
-    def _run_command(self, cmd: List[str]) -> tuple:
+    PRIORITY_MAP = PRIORITY_MAP
+
+    # Artımlı okumada istenen journal alanları (__CURSOR her zaman gelir)
+    JOURNAL_FIELDS = ("MESSAGE", "PRIORITY", "SYSLOG_IDENTIFIER", "_SYSTEMD_UNIT",
+                      "_HOSTNAME", "__REALTIME_TIMESTAMP")
+
+    LIST_UNITS_CMD = ['systemctl', 'list-units', '--type=service', '--all', '--no-pager', '--no-legend']
+
+    # iter_logs journal alan eşleşmelerini (matches) ve --grep'i kabul eder
+    SUPPORTS_FIELD_MATCHES = True
+
+    # journalctl --grep PCRE2 ile derlenmiş sürümlerde vardır (None: henüz bakılmadı)
+    _grep_supported: Optional[bool] = None
+
+    def __init__(self, resource_reader: Optional[CgroupReader] = None):
+        """
+        LinuxAdapter başlatıcı.
+        
+        Args:
+            resource_reader: Kaynak kullanımı okuyucu (None ise varsayılan cgroup ağacı)
+        """
+        self.resource_reader = resource_reader or CgroupReader()
+
+    def _run_command(self, cmd: List[str], timeout: float = COMMAND_TIMEOUT) -> tuple:
         """
-        Shell komutu çalıştır.
+        Shell komutu çalıştır (senkron; event loop kurulmaz).
         
         Returns:
             (stdout, stderr, return_code) tuple
         """
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            return result.stdout, result.stderr, result.returncode
-        except subprocess.TimeoutExpired:
-            return "", "Command timed out", 1
-        except Exception as e:
-            return "", str(e), 1
+        return run_command_sync(cmd, timeout=timeout)
+
+    async def _run_command_async(self, cmd: List[str], timeout: float = COMMAND_TIMEOUT) -> tuple:
+        """
+        Shell komutunu asyncio alt süreci olarak çalıştır.
+        
+        Returns:
+            (stdout, stderr, return_code) tuple
+        """
+        return await run_command(cmd, timeout=timeout)
 
     def get_services(self) -> List[ServiceInfo]:
         """
@@ -68,21 +233,30 @@ class LinuxAdapter:
         Returns:
             ServiceInfo listesi
         """
-        services = []
-        
-        # Tüm servisleri listele
-        stdout, stderr, code = self._run_command([
-            'systemctl', 'list-units', '--type=service', '--all', '--no-pager', '--no-legend'
-        ])
+        stdout, stderr, code = self._run_command(self.LIST_UNITS_CMD)
+        return self._parse_services(stdout) if code == 0 else []
+
+    async def get_services_async(self) -> List[ServiceInfo]:
+        """Tüm systemd servislerini listele (async)"""
+        stdout, stderr, code = await self._run_command_async(self.LIST_UNITS_CMD)
         
         if code != 0:
-            return services
+            return []
+        
+        return self._parse_services(stdout)
+
+    def _parse_services(self, stdout: str) -> List[ServiceInfo]:
+        """systemctl list-units çıktısını ServiceInfo listesine çevir"""
+        services = []
         
         for line in stdout.strip().split('\n'):
             if not line.strip():
                 continue
             
             parts = line.split()
+            # Hatalı birimler satır başında '●' işaretiyle gelir
+            if parts and parts[0] == '●':
+                parts = parts[1:]
             if len(parts) >= 4:
                 name = parts[0].replace('.service', '')
                 load_state = parts[1]
@@ -102,7 +276,8 @@ class LinuxAdapter:
                     name=name,
                     display_name=description or name,
                     status=status,
-                    description=description
+                    description=description,
+                    sub_state=sub_state
                 ))
         
         return services
@@ -117,41 +292,147 @@ class LinuxAdapter:
         Returns:
             ServiceInfo veya None
         """
-        stdout, stderr, code = self._run_command([
-            'systemctl', 'is-active', service_name
-        ])
-        
-        state = stdout.strip()
-        
-        if state == 'active':
-            status = ServiceStatus.RUNNING
-        elif state == 'failed':
-            status = ServiceStatus.FAILED
-        elif state == 'inactive':
-            status = ServiceStatus.STOPPED
-        else:
-            status = ServiceStatus.UNKNOWN
+        state_out, _, _ = self._run_command(['systemctl', 'is-active', service_name])
+        pid_out, _, pid_code = self._run_command(['systemctl', 'show', service_name, '--property=MainPID'])
+        return self._build_service_status(service_name, state_out, pid_out, pid_code)
+
+    async def get_service_status_async(self, service_name: str) -> Optional[ServiceInfo]:
+        """Belirli bir servisin durumunu al (async)"""
+        import asyncio
+        # Durum ve PID sorguları birbirinden bağımsız, eşzamanlı çalıştır
+        (state_out, _, _), (pid_out, _, pid_code) = await asyncio.gather(
+            self._run_command_async(['systemctl', 'is-active', service_name]),
+            self._run_command_async(['systemctl', 'show', service_name, '--property=MainPID'])
+        )
+        return self._build_service_status(service_name, state_out, pid_out, pid_code)
+
+    def _build_service_status(self, service_name: str, state_out: str,
+                              pid_out: str, pid_code: int) -> ServiceInfo:
+        """is-active ve MainPID çıktılarından ServiceInfo oluştur"""
+        status = ACTIVE_STATE_MAP.get(state_out.strip(), ServiceStatus.UNKNOWN)
         
         # PID almaya çalış
         pid = None
-        stdout, stderr, code = self._run_command([
-            'systemctl', 'show', service_name, '--property=MainPID'
-        ])
-        if code == 0 and 'MainPID=' in stdout:
+        if pid_code == 0 and 'MainPID=' in pid_out:
             try:
-                pid = int(stdout.split('=')[1].strip())
+                pid = int(pid_out.split('=')[1].strip())
                 if pid == 0:
                     pid = None
             except ValueError:
                 pass
         
+        resources = None
+        if status == ServiceStatus.RUNNING and self.resource_reader.is_available():
+            resources = self.resource_reader.read_unit(service_name, pid=pid)
+        
         return ServiceInfo(
             name=service_name,
             display_name=service_name,
             status=status,
-            pid=pid
+            pid=pid,
+            resources=resources
         )
 
+    def get_units_state(self, service_names: List[str]) -> Dict[str, ServiceStatus]:
+        """
+        Servislerin durumunu tek `systemctl show` çağrısıyla al.
+        
+        Yüklü olmayan (LoadState=not-found) birimler sonuçta yer almaz;
+        böylece kurulu olmayan bir kritik servis durmuş sayılmaz.
+        
+        Returns:
+            Servis adı -> ServiceStatus sözlüğü
+        """
+        if not service_names:
+            return {}
+        stdout, _, code = self._run_command(
+            ['systemctl', 'show', '--property=Id,LoadState,ActiveState'] + _unit_names(service_names)
+        )
+        if code != 0:
+            return {}
+        states = {}
+        for block in stdout.strip().split('\n\n'):
+            props = dict(line.split('=', 1) for line in block.strip().split('\n') if '=' in line)
+            name = _service_name(props.get('Id', ''))
+            if not name or props.get('LoadState') == 'not-found':
+                continue
+            states[name] = ACTIVE_STATE_MAP.get(props.get('ActiveState', ''), ServiceStatus.UNKNOWN)
+        return states
+
+    def follow_unit_events(self, service_names: List[str]) -> "JournalUnitFollower":
+        """Servislerin journal mesajlarını canlı izleyen nesne (bkz. JournalUnitFollower)"""
+        return JournalUnitFollower(service_names)
+
+    def get_service_resources(self, service_names: List[str]) -> Dict[str, ServiceResources]:
+        """
+        Servislerin kaynak kullanımını al.
+        
+        cgroup v2 varsa dosyalar doğrudan okunur (alt süreç yok);
+        yoksa tüm birimler için tek bir `systemctl show` çağrısı yapılır.
+        
+        Args:
+            service_names: Servis adları
+            
+        Returns:
+            Servis adı -> ServiceResources sözlüğü
+        """
+        if self.resource_reader.is_available():
+            return self.resource_reader.read_units(service_names)
+        if not service_names:
+            return {}
+        stdout, stderr, code = self._run_command(self._build_show_command(service_names))
+        return self._parse_resources(stdout) if code == 0 else {}
+
+    async def get_service_resources_async(self, service_names: List[str]) -> Dict[str, ServiceResources]:
+        """Servislerin kaynak kullanımını al (async)"""
+        if self.resource_reader.is_available():
+            # Dosya okumaları pread ile mikro saniyeler sürer, doğrudan çağrılır
+            return self.resource_reader.read_units(service_names)
+        return await self._get_service_resources_systemctl(service_names)
+
+    async def _get_service_resources_systemctl(self, service_names: List[str]) -> Dict[str, ServiceResources]:
+        """systemctl show ile toplu kaynak sorgusu (cgroup okunamadığında)"""
+        if not service_names:
+            return {}
+        stdout, stderr, code = await self._run_command_async(self._build_show_command(service_names))
+        return self._parse_resources(stdout) if code == 0 else {}
+
+    def _build_show_command(self, service_names: List[str]) -> List[str]:
+        return (['systemctl', 'show', '--property=Id,MainPID,CPUUsageNSec,MemoryCurrent,TasksCurrent']
+                + _unit_names(service_names))
+
+    def _parse_resources(self, stdout: str) -> Dict[str, ServiceResources]:
+        """systemctl show çıktısını servis adı -> ServiceResources sözlüğüne çevir"""
+        results = {}
+        # Her birimin özellik bloğu boş satırla ayrılır
+        for block in stdout.strip().split('\n\n'):
+            props = dict(
+                line.split('=', 1) for line in block.strip().split('\n') if '=' in line
+            )
+            name = _service_name(props.get('Id', ''))
+            if not name:
+                continue
+            
+            def _int(key):
+                try:
+                    value = int(props.get(key, 0))
+                except ValueError:
+                    # [not set] gibi değerler
+                    return 0
+                # Eski systemd sürümleri "ayarlı değil" için UINT64_MAX döner
+                return 0 if value >= 2 ** 64 - 1 else value
+            
+            main_pid = _int('MainPID')
+            results[name] = ServiceResources(
+                name=name,
+                cpu_usage_usec=_int('CPUUsageNSec') // 1000,
+                memory_bytes=_int('MemoryCurrent'),
+                tasks=_int('TasksCurrent'),
+                main_pid=main_pid or None
+            )
+        
+        return results
+
     def get_logs(self,
                  limit: int = 100,
                  level: Optional[LogLevel] = None,
@@ -171,9 +452,115 @@ class LinuxAdapter:
         Returns:
             LogEntry listesi
         """
+        return list(self.iter_logs(limit, level, service, since, until))
+
+    def iter_logs(self,
+                  limit: int = 100,
+                  level: Optional[LogLevel] = None,
+                  service: Optional[str] = None,
+                  since: Optional[datetime] = None,
+                  until: Optional[datetime] = None,
+                  matches: Optional[List[Dict[str, List[str]]]] = None,
+                  grep: Optional[str] = None,
+                  predicate: Optional[Callable[[LogEntry], bool]] = None,
+                  max_scan: int = 0) -> Iterator[LogEntry]:
+        """
+        journalctl çıktısını satır satır ayrıştırarak kayıt üret (eskiden yeniye).
+        
+        Args:
+            matches: journal alan eşleşme grupları (bkz. journal_match_args)
+            grep: MESSAGE için --grep deseni (desteklenmiyorsa yok sayılır;
+                kesin filtre predicate ile uygulanmalıdır)
+            predicate: Python'da uygulanan son filtre. Verilirse journal
+                yeniden eskiye (-r) okunur ve `limit` eşleşme bulunana
+                (veya max_scan kayıt okunana) kadar devam edilir; böylece
+                -n limit filtreden önce uygulanıp sonuç kaçırılmaz.
+            max_scan: predicate ile okunacak en fazla kayıt (0 ise sınırsız)
+        
+        Üreteç erken kapatılırsa (ör. sorgu `head` ile bittiğinde)
+        journalctl süreci de durdurulur.
+        """
+        if grep and not self._supports_grep():
+            grep = None
+        if predicate is None:
+            cmd = self._build_log_command(limit, level, service, since, until, matches, grep)
+            yield from self._stream_logs(cmd)
+            return
+        
+        cmd = self._build_log_command(max_scan, level, service, since, until, matches, grep, reverse=True)
+        found: List[LogEntry] = []
+        logs = self._stream_logs(cmd)
+        try:
+            for entry in logs:
+                if predicate(entry):
+                    found.append(entry)
+                    if limit and len(found) >= limit:
+                        break
+        finally:
+            logs.close()
+        yield from reversed(found)
+
+    def _stream_logs(self, cmd: List[str]) -> Iterator[LogEntry]:
+        parse = instruments.wrap("parse.journal_short", self._parse_log_line)
+        try:
+            with stream_command_sync(cmd) as lines:
+                for line in lines:
+                    entry = parse(line) if line.strip() else None
+                    if entry:
+                        yield entry
+        except OSError:
+            # journalctl yok veya zaman aşımı (TimeoutError): görüntüleme
+            # okumasında imleç yoktur, okunan kısım döner
+            pass
+
+    @classmethod
+    def _supports_grep(cls) -> bool:
+        """journalctl --grep destekliyor mu (sürüm çıktısında +PCRE2)"""
+        if cls._grep_supported is None:
+            stdout, _, rc = run_command_sync(['journalctl', '--version'], timeout=5)
+            cls._grep_supported = rc == 0 and '+PCRE2' in stdout
+        return cls._grep_supported
+
+    async def get_logs_async(self,
+                             limit: int = 100,
+                             level: Optional[LogLevel] = None,
+                             service: Optional[str] = None,
+                             since: Optional[datetime] = None,
+                             until: Optional[datetime] = None) -> List[LogEntry]:
+        """
+        journalctl ile log oku (async).
+        
+        Çıktı satır satır okunur ve geldikçe ayrıştırılır; zaman aşımı veya
+        iptal durumunda journalctl süreci öldürülür.
+        """
         logs = []
+        cmd = self._build_log_command(limit, level, service, since, until)
+        parse = instruments.wrap("parse.journal_short", self._parse_log_line)
         
-        cmd = ['journalctl', '--no-pager', '-n', str(limit), '-o', 'short-iso']
+        try:
+            async with stream_command(cmd) as lines:
+                async for line in lines:
+                    if not line.strip():
+                        continue
+                    
+                    entry = parse(line)
+                    if entry:
+                        logs.append(entry)
+        except OSError:
+            # journalctl bulunamadı, çalıştırılamadı veya zaman aşımı
+            # (TimeoutError); görüntüleme okumasında okunan kısım döner
+            return logs
+        
+        return logs
+
+    def _build_log_command(self, limit, level, service, since, until,
+                           matches=None, grep=None, reverse=False) -> List[str]:
+        """journalctl komut satırını oluştur"""
+        cmd = ['journalctl', '--no-pager', '-o', 'short-iso']
+        if limit:
+            cmd.extend(['-n', str(limit)])
+        if reverse:
+            cmd.append('-r')
         
         # Seviye filtresi
         if level:
@@ -190,21 +577,13 @@ class LinuxAdapter:
         if until:
             cmd.extend(['--until', until.strftime('%Y-%m-%d %H:%M:%S')])
         
-        stdout, stderr, code = self._run_command(cmd)
-        
-        if code != 0:
-            return logs
-        
-        # Log satırlarını parse et
-        for line in stdout.strip().split('\n'):
-            if not line.strip():
-                continue
-            
-            entry = self._parse_log_line(line)
-            if entry:
-                logs.append(entry)
+        # Mesaj araması ve alan eşleşmeleri (eşleşmeler en sonda)
+        if grep:
+            cmd.extend(['--grep', grep, '--case-sensitive=false'])
+        if matches:
+            cmd.extend(journal_match_args(matches))
         
-        return logs
+        return cmd
 
     def _parse_log_line(self, line: str) -> Optional[LogEntry]:
         """
@@ -213,21 +592,19 @@ class LinuxAdapter:
         Format: 2024-01-15T10:30:45+0300 hostname service[pid]: message
         """
         try:
-            # ISO timestamp pattern
-            pattern = r'^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[+-]\d{4})\s+(\S+)\s+(\S+?)(?:\[\d+\])?:\s*(.*)$'
-            match = re.match(pattern, line)
+            match = LOG_LINE_RE.match(line)
             
             if match:
                 timestamp_str, hostname, service, message = match.groups()
                 
                 # Timestamp parse
                 try:
-                    timestamp = datetime.fromisoformat(timestamp_str.replace('+0000', '+00:00'))
+                    timestamp = parse_iso_timestamp(timestamp_str)
                 except Exception:
                     timestamp = datetime.now()
                 
                 # Seviye tahmini (mesaj içeriğinden)
-                level = self._guess_level(message)
+                level = guess_level(message)
                 
                 return LogEntry(
                     timestamp=timestamp,
@@ -241,20 +618,107 @@ class LinuxAdapter:
         
         return None
 
+    def read_new_logs(self, after_cursor: Optional[str] = None,
+                      limit: int = 1000) -> Tuple[List[LogEntry], Optional[str]]:
+        """
+        İmleçten sonraki logları sırayla oku (artımlı toplama).
+        
+        Returns:
+            (LogEntry listesi eskiden yeniye, son okunan kaydın imleci)
+        """
+        logs = []
+        cursor = after_cursor
+        parse = instruments.wrap("parse.journal_json", self._parse_json_entry)
+        try:
+            with stream_command_sync(self._build_cursor_command(after_cursor, limit)) as lines:
+                for line in lines:
+                    parsed = parse(line)
+                    if parsed is None:
+                        continue
+                    entry, cursor = parsed
+                    logs.append(entry)
+                    if len(logs) >= limit:
+                        break
+        except TimeoutError:
+            # Yarım okuma: imleç ilerletilmez, sonraki turda aynı yerden okunur
+            return [], after_cursor
+        except OSError:
+            pass
+        return logs, cursor
+
+    async def read_new_logs_async(self, after_cursor: Optional[str] = None,
+                                  limit: int = 1000) -> Tuple[List[LogEntry], Optional[str]]:
+        """
+        İmleçten sonraki logları sırayla oku (async).
+        
+        İmleç yoksa son `limit` kayıttan başlanır. İmleç varsa
+        --after-cursor ile yalnızca yeni kayıtlar okunur; `limit` kayda
+        ulaşılınca journalctl durdurulur ve dönen imleç tam olarak son
+        okunan kayıttır, böylece sonraki çağrı kaldığı yerden devam eder.
+        
+        Args:
+            after_cursor: Önceki çağrının döndürdüğü journal imleci (__CURSOR)
+            limit: Tek çağrıda okunacak en fazla kayıt
+            
+        Returns:
+            (LogEntry listesi eskiden yeniye, son okunan kaydın imleci)
+        """
+        logs = []
+        cursor = after_cursor
+        parse = instruments.wrap("parse.journal_json", self._parse_json_entry)
+        try:
+            async with stream_command(self._build_cursor_command(after_cursor, limit)) as lines:
+                async for line in lines:
+                    parsed = parse(line)
+                    if parsed is None:
+                        continue
+                    entry, cursor = parsed
+                    logs.append(entry)
+                    if len(logs) >= limit:
+                        break
+        except TimeoutError:
+            # Yarım okuma: imleç ilerletilmez, sonraki turda aynı yerden okunur
+            return [], after_cursor
+        except OSError:
+            pass
+        
+        return logs, cursor
+
+    def _build_cursor_command(self, after_cursor: Optional[str], limit: int) -> List[str]:
+        """İmleçli okuma için journalctl komut satırı"""
+        cmd = ['journalctl', '--no-pager', '-o', 'json',
+               '--output-fields=' + ','.join(self.JOURNAL_FIELDS)]
+        if after_cursor:
+            cmd.append(f'--after-cursor={after_cursor}')
+        else:
+            cmd.extend(['-n', str(limit)])
+        return cmd
+
+    def _parse_json_entry(self, line: str) -> Optional[Tuple[LogEntry, str]]:
+        """journalctl -o json satırını (LogEntry, imleç) olarak parse et"""
+        try:
+            record = json.loads(line)
+            cursor = record["__CURSOR"]
+        except (ValueError, KeyError, TypeError):
+            return None
+        
+        fields = journal_record_fields(record)
+        if fields is None:
+            return None
+        ts, level, service, hostname, message = fields
+        
+        entry = LogEntry(
+            timestamp=datetime.fromtimestamp(ts, tz=timezone.utc).astimezone(),
+            level=level,
+            message=message,
+            source=hostname,
+            service=service
+        )
+        return entry, cursor
+
     def _guess_level(self, message: str) -> LogLevel:
         """Mesaj içeriğinden log seviyesi tahmin et"""
-        message_lower = message.lower()
-        
-        if 'error' in message_lower or 'failed' in message_lower or 'failure' in message_lower:
-            return LogLevel.ERROR
-        elif 'warning' in message_lower or 'warn' in message_lower:
-            return LogLevel.WARNING
-        elif 'critical' in message_lower or 'crit' in message_lower:
-            return LogLevel.CRITICAL
-        elif 'debug' in message_lower:
-            return LogLevel.DEBUG
-        else:
-            return LogLevel.INFO
+        return guess_level(message)
 
 
 # Test için
@@ -7,7 +7,7 @@ import subprocess
 import re
 import sys
 import os
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 
 try:
@@ -47,6 +47,16 @@ class WindowsAdapter:
         16: LogLevel.WARNING    # EVENTLOG_AUDIT_FAILURE
     }
 
+    # Get-WinEvent Level alanı
+    WINEVENT_LEVEL_MAP = {
+        0: LogLevel.INFO,       # LogAlways
+        1: LogLevel.CRITICAL,
+        2: LogLevel.ERROR,
+        3: LogLevel.WARNING,
+        4: LogLevel.INFO,
+        5: LogLevel.DEBUG       # Verbose
+    }
+
     def __init__(self):
         """WindowsAdapter başlatıcı."""
         if not PSUTIL_AVAILABLE:
@@ -95,6 +105,15 @@ class WindowsAdapter:
         
         return services
 
+    async def get_services_async(self) -> List[ServiceInfo]:
+        """
+        Windows servislerini listele (async).
+        
+        psutil ve win32 API'leri bloklayıcı olduğundan thread havuzunda çalışır.
+        """
+        import asyncio
+        return await asyncio.to_thread(self.get_services)
+
     def _get_services_powershell(self) -> List[ServiceInfo]:
         """PowerShell ile servis listesi al"""
         services = []
@@ -200,6 +219,11 @@ class WindowsAdapter:
         
         return None
 
+    async def get_service_status_async(self, service_name: str) -> Optional[ServiceInfo]:
+        """Belirli bir servisin durumunu al (async)"""
+        import asyncio
+        return await asyncio.to_thread(self.get_service_status, service_name)
+
     def get_logs(self,
                  limit: int = 100,
                  level: Optional[LogLevel] = None,
@@ -228,6 +252,155 @@ class WindowsAdapter:
         
         return logs
 
+    async def get_logs_async(self,
+                             limit: int = 100,
+                             level: Optional[LogLevel] = None,
+                             service: Optional[str] = None,
+                             since: Optional[datetime] = None,
+                             until: Optional[datetime] = None) -> List[LogEntry]:
+        """Windows Event Log oku (async)"""
+        import asyncio
+        return await asyncio.to_thread(
+            self.get_logs, limit=limit, level=level, service=service, since=since, until=until
+        )
+
+    def read_new_logs(self, after_cursor: Optional[str] = None,
+                      limit: int = 1000) -> Tuple[List[LogEntry], Optional[str]]:
+        """
+        RecordId imlecinden sonraki System loglarını sırayla oku (artımlı toplama).
+        
+        İmleç, son okunan kaydın RecordId değeridir (metin olarak). İmleç
+        yoksa son `limit` kayıttan başlanır.
+        
+        Returns:
+            (LogEntry listesi eskiden yeniye, son okunan kaydın RecordId'si)
+        """
+        try:
+            after = int(after_cursor) if after_cursor else None
+        except ValueError:
+            after = None
+        
+        if WIN32_AVAILABLE:
+            records = self._read_records_win32(after, limit)
+        else:
+            records = self._read_records_powershell(after, limit)
+        
+        if not records:
+            return [], after_cursor
+        return [entry for _, entry in records], str(records[-1][0])
+
+    async def read_new_logs_async(self, after_cursor: Optional[str] = None,
+                                  limit: int = 1000) -> Tuple[List[LogEntry], Optional[str]]:
+        """RecordId imlecinden sonraki logları oku (async)"""
+        import asyncio
+        return await asyncio.to_thread(self.read_new_logs, after_cursor=after_cursor, limit=limit)
+
+    def _read_records_win32(self, after: Optional[int], limit: int) -> List[Tuple[int, LogEntry]]:
+        """win32evtlog ile (RecordId, LogEntry) çiftleri, eskiden yeniye"""
+        records = []
+        
+        try:
+            hand = win32evtlog.OpenEventLog(None, "System")
+            try:
+                oldest = win32evtlog.GetOldestEventLogRecord(hand)
+                total = win32evtlog.GetNumberOfEventLogRecords(hand)
+                newest = oldest + total - 1
+                if after is None:
+                    start = max(oldest, newest - limit + 1)
+                else:
+                    # Log temizlendiyse/döndüyse en eski kayıttan devam edilir
+                    start = max(oldest, after + 1)
+                if start > newest:
+                    return records
+                
+                flags = win32evtlog.EVENTLOG_FORWARDS_READ | win32evtlog.EVENTLOG_SEEK_READ
+                offset = start
+                while len(records) < limit:
+                    events = win32evtlog.ReadEventLog(hand, flags, offset)
+                    if not events:
+                        break
+                    flags = win32evtlog.EVENTLOG_FORWARDS_READ | win32evtlog.EVENTLOG_SEQUENTIAL_READ
+                    for event in events:
+                        if event.RecordNumber < start:
+                            continue
+                        records.append((event.RecordNumber, self._event_to_entry(event)))
+                        if len(records) >= limit:
+                            break
+            finally:
+                win32evtlog.CloseEventLog(hand)
+        except Exception as e:
+            print(f"Win32 event log error: {e}")
+        
+        return records
+
+    def _event_to_entry(self, event) -> LogEntry:
+        """win32evtlog kaydını LogEntry'ye dönüştür"""
+        message = ""
+        try:
+            message = win32evtlogutil.SafeFormatMessage(event, "System")
+        except Exception:
+            if event.StringInserts:
+                message = ", ".join([s for s in event.StringInserts if s])
+        
+        return LogEntry(
+            timestamp=event.TimeGenerated,
+            level=self.LEVEL_MAP.get(event.EventType, LogLevel.INFO),
+            message=message[:500] if message else "No message",
+            source="System",
+            service=event.SourceName
+        )
+
+    def _read_records_powershell(self, after: Optional[int], limit: int) -> List[Tuple[int, LogEntry]]:
+        """Get-WinEvent ile (RecordId, LogEntry) çiftleri, eskiden yeniye"""
+        records = []
+        
+        try:
+            ps_cmd = '[Console]::OutputEncoding = [System.Text.Encoding]::UTF8; '
+            if after is None:
+                ps_cmd += f'Get-WinEvent -LogName System -MaxEvents {limit}'
+            else:
+                # -Oldest ile ileri okunur; MaxEvents imleçten sonraki ilk kayıtları sınırlar
+                ps_cmd += (f'Get-WinEvent -LogName System -Oldest -MaxEvents {limit} '
+                           f'-FilterXPath "*[System[EventRecordID > {after}]]"')
+            ps_cmd += (' | Select-Object RecordId, @{n="TimeCreated";e={$_.TimeCreated.ToString("o")}},'
+                       ' Level, ProviderName, Message | ConvertTo-Json')
+            
+            result = subprocess.run(
+                ['powershell', '-Command', ps_cmd],
+                capture_output=True,
+                timeout=30,
+                encoding='utf-8',
+                errors='replace'
+            )
+            
+            if result.returncode == 0 and result.stdout.strip():
+                import json
+                data = json.loads(result.stdout)
+                
+                if isinstance(data, dict):
+                    data = [data]
+                
+                for item in data:
+                    try:
+                        timestamp = datetime.fromisoformat(item.get('TimeCreated', '')[:26])
+                    except (TypeError, ValueError):
+                        timestamp = datetime.now()
+                    
+                    message = str(item.get('Message') or '')[:500]
+                    records.append((int(item['RecordId']), LogEntry(
+                        timestamp=timestamp,
+                        level=self.WINEVENT_LEVEL_MAP.get(item.get('Level'), LogLevel.INFO),
+                        message=message or "No message",
+                        source="System",
+                        service=item.get('ProviderName', '')
+                    )))
+        except Exception as e:
+            print(f"PowerShell event log error: {e}")
+        
+        # İmleçsiz okuma en yeniden başlar
+        records.sort(key=lambda record: record[0])
+        return records
+
     def _get_logs_win32(self, limit, level, service, since, until) -> List[LogEntry]:
         """win32evtlog API ile log oku"""
         logs = []
@@ -0,0 +1 @@
+# Agent package
@@ -0,0 +1,366 @@
+"""
+Aggregator
+Agent'lardan gelen servis durumu ve log yığınlarını toplayan merkezi sunucu.
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+from core.service_monitor import ServiceInfo
+from core.log_collector import LogEntry
+from agent.protocol import (
+    Frame, FrameType, ProtocolError, encode_frame, read_frame,
+    parse_address, rows_to_services, columns_to_logs
+)
+
+# Aggregator'da servis ve log adları "host/servis" biçimindedir
+HOST_SEPARATOR = "/"
+
+
+@dataclass
+class HostState:
+    """Tek bir agent'ın son bilinen durumu"""
+    agent_id: str
+    session: str = ""
+    hostname: str = ""
+    platform: str = ""
+    last_seq: int = 0
+    spool_id: str = ""
+    spool_offset: int = -1
+    connections: int = 0
+    last_seen: float = 0.0
+    services: Dict[str, ServiceInfo] = field(default_factory=dict)
+    logs: Deque[LogEntry] = field(default_factory=deque)
+    log_seq: int = 0  # eklenen toplam log (son kaydın sıra numarası)
+    metrics: Optional[Dict] = None
+    frames: int = 0
+    duplicates: int = 0
+    bytes_received: int = 0
+
+    @property
+    def connected(self) -> bool:
+        return self.connections > 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "agent_id": self.agent_id,
+            "hostname": self.hostname,
+            "platform": self.platform,
+            "connected": self.connected,
+            "last_seen": self.last_seen,
+            "services": len(self.services),
+            "logs": len(self.logs),
+            "metrics": self.metrics,
+            "frames": self.frames,
+            "duplicates": self.duplicates,
+            "spool_offset": self.spool_offset,
+            "bytes_received": self.bytes_received
+        }
+
+
+class HostRegistry:
+    """
+    Tüm host'ların durumunu tutan thread-safe kayıt.
+
+    Aggregator event loop'u yazar, Flask view'ları (başka thread'ler) okur.
+    Tekrarlanan sıra numaraları (yeniden gönderim) atlanır; böylece
+    işlem en az bir kez teslimde bile tam olarak bir kez uygulanır.
+    Spool'dan gelen log yığınları ayrıca spool ofsetiyle ayıklanır:
+    agent yeniden başlayıp yeni oturumda eski yığınları tekrar
+    gönderdiğinde de her yığın bir kez uygulanır.
+    """
+
+    def __init__(self, max_logs_per_host: int = 1000):
+        self.max_logs_per_host = max_logs_per_host
+        self.hosts: Dict[str, HostState] = {}
+        # Sıra imleçleri yalnızca bu kayıt nesnesinin ömrü boyunca geçerlidir
+        self.epoch = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+
+    def hello(self, payload: Dict) -> Dict:
+        """
+        HELLO işle.
+
+        Returns:
+            WELCOME yükü: işlenmiş son sıra no, tam durum gerekip gerekmediği
+            ve agent spool'undan işlenmiş son ofset
+        """
+        agent_id = payload["agent_id"]
+        session = payload.get("session", "")
+        with self._lock:
+            host = self.hosts.get(agent_id)
+            if host is None:
+                host = HostState(agent_id=agent_id, logs=deque(maxlen=self.max_logs_per_host))
+                self.hosts[agent_id] = host
+            full = host.session != session
+            if full:
+                # Yeni agent oturumu: sıra numaraları baştan başlar
+                host.session = session
+                host.last_seq = 0
+            spool_id = payload.get("spool_id") or ""
+            if host.spool_id != spool_id:
+                # Farklı (veya silinmiş) spool: ofsetler yeniden başlar
+                host.spool_id = spool_id
+                host.spool_offset = -1
+            host.hostname = payload.get("hostname", agent_id)
+            host.platform = payload.get("platform", "")
+            host.connections += 1
+            host.last_seen = time.time()
+            return {"last_seq": host.last_seq, "full": full, "spool_offset": host.spool_offset}
+
+    def disconnected(self, agent_id: str):
+        with self._lock:
+            host = self.hosts.get(agent_id)
+            if host is not None:
+                host.connections = max(host.connections - 1, 0)
+
+    def apply(self, agent_id: str, frame: Frame) -> bool:
+        """
+        Bir veri çerçevesini uygula.
+
+        Returns:
+            Çerçeve uygulandıysa True, tekrar ise False
+        """
+        with self._lock:
+            host = self.hosts[agent_id]
+            host.last_seen = time.time()
+            host.bytes_received += frame.size
+            if frame.seq <= host.last_seq:
+                host.duplicates += 1
+                return False
+            host.last_seq = frame.seq
+            host.frames += 1
+
+            if frame.type == FrameType.SERVICES:
+                if frame.payload.get("full"):
+                    host.services = {}
+                for name in frame.payload.get("removed", []):
+                    host.services.pop(name, None)
+                for service in rows_to_services(frame.payload.get("services", [])):
+                    host.services[service.name] = service
+            elif frame.type == FrameType.LOGS:
+                offset = frame.payload.get("offset")
+                if offset is not None:
+                    if offset <= host.spool_offset:
+                        host.duplicates += 1
+                        return False
+                    host.spool_offset = offset
+                logs = columns_to_logs(frame.payload)
+                host.logs.extend(logs)
+                host.log_seq += len(logs)
+            elif frame.type == FrameType.METRICS:
+                host.metrics = frame.payload
+            return True
+
+    def get_hosts(self) -> List[HostState]:
+        with self._lock:
+            return list(self.hosts.values())
+
+    def get_services(self) -> List[ServiceInfo]:
+        """Tüm host'ların servisleri ('host/servis' adlarıyla)"""
+        with self._lock:
+            return [
+                ServiceInfo(
+                    name=f"{host.agent_id}{HOST_SEPARATOR}{s.name}",
+                    display_name=s.display_name,
+                    status=s.status,
+                    is_critical=s.is_critical,
+                    description=s.description,
+                    pid=s.pid
+                )
+                for host in self.hosts.values()
+                for s in host.services.values()
+            ]
+
+    def get_logs(self) -> List[LogEntry]:
+        """Tüm host'ların logları (zamana göre sıralı, servis 'host/servis')"""
+        with self._lock:
+            logs = [_tagged(host, entry) for host in self.hosts.values() for entry in host.logs]
+        logs.sort(key=lambda entry: entry.timestamp)
+        return logs
+
+    def read_logs(self, after: Optional[Dict[str, int]] = None,
+                  limit: int = 1000) -> Tuple[List[LogEntry], Dict[str, int]]:
+        """
+        Sıra imlecinden sonraki loglar (artımlı okuma).
+
+        Her host'un kayıtları geliş sırasıyla numaralanır; imleç host
+        başına okunan son sıra numarasıdır. Host'lar zamana göre
+        birleştirilir ve her host'tan yalnızca okunmamış kayıtların başı
+        alınır, böylece `limit` aşıldığında kalanlar sonraki çağrıya
+        kalır. after None ise son `limit` kayıt döner ve mevcut tüm
+        kayıtlar okunmuş sayılır.
+
+        Returns:
+            (LogEntry listesi, yeni imleç)
+        """
+        cursor = dict(after or {})
+        with self._lock:
+            streams = []
+            for host in self.hosts.values():
+                first = host.log_seq - len(host.logs) + 1
+                # Kuyruktan taşıp atılan kayıtlar atlanır
+                start = first if after is None else max(cursor.get(host.agent_id, 0) + 1, first)
+                streams.append([
+                    (entry.timestamp.timestamp(), seq, host.agent_id, _tagged(host, entry))
+                    for seq, entry in enumerate(itertools.islice(host.logs, start - first, None), start)
+                ])
+                if after is None:
+                    cursor[host.agent_id] = host.log_seq
+        merged = heapq.merge(*streams, key=lambda item: item[0])
+        if after is None:
+            selected = list(merged)
+            selected = selected[-limit:] if limit else selected
+        else:
+            selected = list(itertools.islice(merged, limit)) if limit else list(merged)
+            for _, seq, agent_id, _ in selected:
+                cursor[agent_id] = seq
+        return [item[3] for item in selected], cursor
+
+
+def _tagged(host: HostState, entry: LogEntry) -> LogEntry:
+    """Kaydı host adıyla ('host/servis') kopyala"""
+    return LogEntry(
+        timestamp=entry.timestamp,
+        level=entry.level,
+        message=entry.message,
+        source=host.agent_id,
+        service=f"{host.agent_id}{HOST_SEPARATOR}{entry.service}" if entry.service else host.agent_id
+    )
+
+
+class AggregatorServer:
+    """
+    Agent bağlantılarını kabul eden asyncio sunucusu.
+
+    Her bağlantı için çerçeveler sırayla okunur, uygulanır ve onaylanır.
+    İşleme senkron olduğundan aggregator yavaşlarsa okuma da yavaşlar;
+    TCP penceresi dolar ve geri basınç agent'a kadar yayılır.
+    """
+
+    def __init__(self, address: str, registry: HostRegistry = None):
+        """
+        Args:
+            address: Dinlenecek adres ('host:port' veya 'unix:/yol')
+        """
+        self.address = parse_address(address)
+        self.registry = registry or HostRegistry()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._connections = set()
+
+    @property
+    def bound_address(self) -> str:
+        """Gerçek dinleme adresi (port 0 verildiyse atanan port ile)"""
+        kind, host, port = self.address
+        if kind == "unix":
+            return f"unix:{host}"
+        if self._server and self._server.sockets:
+            port = self._server.sockets[0].getsockname()[1]
+        return f"{host}:{port}"
+
+    async def start_async(self):
+        """Sunucuyu mevcut event loop üzerinde başlat"""
+        kind, host, port = self.address
+        if kind == "unix":
+            if os.path.exists(host):
+                os.unlink(host)
+            self._server = await asyncio.start_unix_server(self._handle, path=host)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+
+    async def stop_async(self):
+        """Dinlemeyi bırak ve açık agent bağlantılarını kapat"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Tek bir agent bağlantısı"""
+        agent_id = None
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            frame = await asyncio.wait_for(read_frame(reader), timeout=10)
+            if frame.type != FrameType.HELLO or "agent_id" not in frame.payload:
+                raise ProtocolError("Expected HELLO")
+            agent_id = frame.payload["agent_id"]
+            writer.write(encode_frame(FrameType.WELCOME, 0, self.registry.hello(frame.payload)))
+            await writer.drain()
+
+            while True:
+                frame = await read_frame(reader)
+                if frame.type in (FrameType.HELLO, FrameType.WELCOME, FrameType.ACK):
+                    raise ProtocolError(f"Unexpected {frame.type.name}")
+                self.registry.apply(agent_id, frame)
+                writer.write(encode_frame(FrameType.ACK, frame.seq, {}))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.TimeoutError):
+            pass
+        except ProtocolError as e:
+            print(f"Aggregator protocol error ({agent_id or 'unknown'}): {e}")
+        finally:
+            self._connections.discard(task)
+            if agent_id is not None:
+                self.registry.disconnected(agent_id)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    # ===== Arka plan thread'i =====
+
+    def start(self):
+        """Sunucuyu kendi event loop'u ile arka plan thread'inde başlat"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._ready.clear()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="aggregator", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=10)
+        if self._error is not None:
+            raise self._error
+
+    def stop(self):
+        """Arka plan sunucusunu durdur"""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.stop_async(), self._loop).result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=10)
+        self._thread = None
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self.start_async())
+        except Exception as e:
+            self._error = e
+            self._loop.close()
+            self._loop = None
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+            self._loop = None
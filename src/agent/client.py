@@ -0,0 +1,433 @@
+"""
+Agent Client
+Servis durumu değişikliklerini ve log yığınlarını merkezi aggregator'a gönderir.
+"""
+
+import asyncio
+import platform
+import socket
+import time
+import uuid
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from core.service_monitor import ServiceMonitor, ServiceInfo
+from core.log_collector import LogCollector, LogEntry
+from core.system_metrics import SystemMetricsCollector
+from agent.spool import Spool
+from agent.protocol import (
+    FrameType, ProtocolError, encode_body, encode_frame, pack_frame,
+    read_frame, parse_address, services_to_rows, logs_to_columns,
+    PROTOCOL_VERSION
+)
+
+
+def _service_key(service: ServiceInfo) -> Tuple:
+    return (service.display_name, service.status, service.is_critical, service.description, service.pid)
+
+
+class AgentClient:
+    """
+    Tek bir host'un verisini aggregator'a taşıyan agent.
+
+    Toplama ve gönderme birbirinden ayrıdır: toplayıcı her turda
+    servis deltası ve yeni log kayıtlarını bekleyen kuyruğuna ekler,
+    gönderici kuyruğu kalıcı bağlantı üzerinden akıtır.
+
+    Geri basınç iki katmanlıdır:
+      * En fazla max_inflight onaylanmamış çerçeve gönderilir; pencere
+        dolduğunda gönderici ACK bekler (yavaş aggregator agent'ı
+        sınırsız bellek kullanmaya zorlamaz).
+      * Bekleyen kuyruk max_pending çerçeveyle sınırlıdır; dolduğunda en
+        eski log yığınları düşürülür ve sayılır. Servis çerçeveleri
+        düşürülmez; bağlantı koptuysa tam durum yeniden gönderilir.
+
+    Bağlantı koptuğunda onaylanmamış çerçeveler aynı sıra numaralarıyla
+    yeniden gönderilir; aggregator tekrar eden sıra numaralarını atlar.
+
+    spool verilirse log yığınları bellekteki kuyruk yerine diskteki
+    önden yazma kuyruğuna yazılır ve gönderici onu sırayla okur. ACK
+    gelen ofset journal imleciyle birlikte checkpoint'e yazılır; agent
+    yeniden başladığında journal'ı baştan okumadan onaylanmamış
+    kayıtlardan devam eder. Aggregator her agent için işlediği son spool
+    ofsetini tutar, böylece checkpoint'ten sonra onaylanmış ama
+    kaydedilmemiş yığınlar ikinci kez uygulanmaz.
+    """
+
+    def __init__(self,
+                 address: str,
+                 service_monitor: ServiceMonitor = None,
+                 log_collector: LogCollector = None,
+                 system_metrics: SystemMetricsCollector = None,
+                 agent_id: str = None,
+                 interval: float = 5.0,
+                 log_limit: int = 200,
+                 max_inflight: int = 32,
+                 max_pending: int = 1024,
+                 heartbeat_interval: float = 15.0,
+                 spool: Spool = None,
+                 max_log_batches: int = 10):
+        """
+        AgentClient başlatıcı.
+
+        Args:
+            address: Aggregator adresi ('host:port' veya 'unix:/yol')
+            agent_id: Host kimliği (None ise hostname)
+            interval: Toplama aralığı (saniye)
+            log_limit: Her turda okunacak son log sayısı
+            max_inflight: Onay beklenen en fazla çerçeve
+            max_pending: Gönderilmeyi bekleyen en fazla çerçeve
+            heartbeat_interval: Boşta kalınırsa heartbeat aralığı
+            spool: Log yığınları için disk kuyruğu (None ise bellekte tutulur)
+            max_log_batches: İmleçle okumada tur başına en fazla log yığını
+        """
+        self.address = parse_address(address)
+        self.service_monitor = service_monitor or ServiceMonitor()
+        self.log_collector = log_collector or LogCollector()
+        self.system_metrics = system_metrics
+        self.agent_id = agent_id or socket.gethostname()
+        self.session = uuid.uuid4().hex
+        self.interval = interval
+        self.log_limit = log_limit
+        self.max_inflight = max_inflight
+        self.max_pending = max_pending
+        self.heartbeat_interval = heartbeat_interval
+        self.spool = spool
+        self.max_log_batches = max_log_batches
+
+        self._seq = 0
+        # (tip, flags, gövde, kayıt sayısı) - sıra numarası gönderimde atanır
+        self._pending: Deque[Tuple[FrameType, int, bytes, int]] = deque()
+        # sıra no -> (çerçeve baytları, spool bitiş ofseti veya None) (onay bekleyen)
+        self._inflight: Dict[int, Tuple[bytes, Optional[int]]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._window: Optional[asyncio.Condition] = None
+
+        self._sent_services: Dict[str, Tuple] = {}
+        self._full_services = True
+        self._last_services: Optional[List[ServiceInfo]] = None
+        # Journal imleci: spool varsa diskteki son yığınla birlikte kalıcıdır
+        self._cursor: Optional[str] = spool.cursor if spool is not None else None
+        # Aggregator'ın bu spool'dan işlediği son kayıt ofseti
+        self._remote_offset = -1
+
+        # İstatistikler
+        self.connected = False
+        self.frames_sent = 0
+        self.frames_acked = 0
+        self.bytes_sent = 0
+        self.reconnects = 0
+        self.dropped_frames = 0
+        self.dropped_logs = 0
+        self._last_send = 0.0
+
+    # ===== Toplama =====
+
+    async def collect_once(self):
+        """Tek bir toplama turu: servis deltası, yeni loglar ve metrikler"""
+        services, _ = await asyncio.gather(
+            self.service_monitor.get_all_services_async(),
+            self._collect_new_logs()
+        )
+        self._last_services = services
+        self._queue_services(services)
+
+        if self.system_metrics is not None:
+            metrics = self.system_metrics.sample()
+            if metrics is not None:
+                self._enqueue(FrameType.METRICS, metrics.to_dict())
+
+        if not self._pending and time.monotonic() - self._last_send >= self.heartbeat_interval:
+            self._enqueue(FrameType.HEARTBEAT, {})
+
+    def _queue_services(self, services: List[ServiceInfo]):
+        """Önceki gönderime göre değişen servisleri kuyruğa ekle"""
+        current = {s.name: _service_key(s) for s in services}
+        if self._full_services:
+            changed = services
+            removed = []
+        else:
+            changed = [s for s in services if self._sent_services.get(s.name) != current[s.name]]
+            removed = [name for name in self._sent_services if name not in current]
+
+        if self._full_services or changed or removed:
+            self._enqueue(FrameType.SERVICES, {
+                "full": self._full_services,
+                "services": services_to_rows(changed),
+                "removed": removed
+            })
+        self._sent_services = current
+        self._full_services = False
+
+    async def _collect_new_logs(self):
+        """İmleçten sonraki logları yığınlar halinde oku (birikmiş loglar tur başına sınırlı)"""
+        if not self.log_collector.supports_cursor:
+            self._queue_logs(await self.log_collector.collect_new_async(limit=self.log_limit))
+            return
+        for _ in range(self.max_log_batches):
+            logs, cursor = await self.log_collector.read_new_logs_async(
+                after_cursor=self._cursor, limit=self.log_limit
+            )
+            self._queue_logs(logs, cursor)
+            self._cursor = cursor
+            if len(logs) < self.log_limit:
+                return
+
+    def _queue_logs(self, logs: List[LogEntry], cursor: Optional[str] = None):
+        """Log yığınını spool'a veya bekleyen kuyruğa ekle"""
+        if not logs:
+            return
+        payload = logs_to_columns(logs)
+        if self.spool is None:
+            self._enqueue(FrameType.LOGS, payload, len(logs))
+            return
+        # Ofset gövdeye yazılır: aggregator yeniden oynatılan yığınları bununla ayıklar
+        payload["offset"] = self.spool.end_offset
+        flags, body = encode_body(payload)
+        self.spool.append(FrameType.LOGS, flags, body, len(logs), cursor)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _enqueue(self, frame_type: FrameType, payload: Dict, items: int = 0):
+        """Yükü bir kez serileştirip bekleyen kuyruğa ekle"""
+        flags, body = encode_body(payload)
+        if len(self._pending) >= self.max_pending:
+            self._drop_oldest()
+        self._pending.append((frame_type, flags, body, items))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _drop_oldest(self):
+        """
+        Kuyruk doluyken en eski servis dışı çerçeveyi düşür.
+
+        Servis deltaları birbirine bağlı olduğundan düşürülmez; kuyrukta
+        yalnızca servis çerçeveleri kaldıysa sınır aşılır (bunlar tur
+        başına en fazla bir tanedir).
+        """
+        for index, (frame_type, _, _, items) in enumerate(self._pending):
+            if frame_type != FrameType.SERVICES:
+                del self._pending[index]
+                self.dropped_frames += 1
+                if frame_type == FrameType.LOGS:
+                    self.dropped_logs += items
+                return
+
+    # ===== Bağlantı =====
+
+    async def _open(self):
+        kind, host, port = self.address
+        if kind == "unix":
+            return await asyncio.open_unix_connection(host)
+        return await asyncio.open_connection(host, port)
+
+    async def _handshake(self, reader, writer) -> int:
+        """HELLO gönder, WELCOME bekle; aggregator'ın işlediği son sıra no'yu döndür"""
+        writer.write(encode_frame(FrameType.HELLO, 0, {
+            "agent_id": self.agent_id,
+            "session": self.session,
+            "hostname": socket.gethostname(),
+            "platform": platform.system().lower(),
+            "protocol": PROTOCOL_VERSION,
+            "spool_id": self.spool.spool_id if self.spool is not None else None
+        }))
+        await writer.drain()
+        frame = await asyncio.wait_for(read_frame(reader), timeout=10)
+        if frame.type != FrameType.WELCOME:
+            raise ProtocolError(f"Expected WELCOME, got {frame.type.name}")
+        self._remote_offset = frame.payload.get("spool_offset", -1)
+        if frame.payload.get("full"):
+            # Aggregator bu oturumun durumunu bilmiyor: bekleyen servis
+            # deltaları yerine tam durum gönderilir (data[4] başlıktaki tip baytı)
+            self._pending = deque(item for item in self._pending if item[0] != FrameType.SERVICES)
+            self._inflight = {seq: item for seq, item in self._inflight.items()
+                              if item[0][4] != FrameType.SERVICES}
+            self._full_services = True
+            if self._last_services is not None:
+                self._queue_services(self._last_services)
+        return frame.payload.get("last_seq", 0)
+
+    async def _read_acks(self, reader):
+        """ACK çerçevelerini okuyup onaylanan çerçeveleri pencereden çıkar"""
+        while True:
+            frame = await read_frame(reader)
+            if frame.type != FrameType.ACK:
+                continue
+            async with self._window:
+                for seq in [s for s in self._inflight if s <= frame.seq]:
+                    self._acked(seq)
+                self._window.notify_all()
+
+    def _acked(self, seq: int):
+        """Onaylanan çerçeveyi pencereden çıkar; spool kaydıysa ofseti ilerlet"""
+        _, spool_end = self._inflight.pop(seq)
+        self.frames_acked += 1
+        if spool_end is not None:
+            self.spool.ack(spool_end)
+
+    def _has_unsent(self) -> bool:
+        return bool(self._pending) or (self.spool is not None and self.spool.has_unread())
+
+    def _next_frame(self) -> Optional[Tuple[FrameType, int, bytes, Optional[int]]]:
+        """
+        Gönderilecek sıradaki çerçeve: önce bellekteki kuyruk (servis,
+        metrik, heartbeat), sonra spool'daki log yığınları.
+
+        Returns:
+            (tip, flags, gövde, spool bitiş ofseti) veya gönderilecek yoksa None
+        """
+        if self._pending:
+            frame_type, flags, body, _ = self._pending.popleft()
+            return frame_type, flags, body, None
+        while self.spool is not None:
+            record = self.spool.read_next()
+            if record is None:
+                return None
+            if record.offset <= self._remote_offset:
+                # Aggregator bu yığını önceki bir oturumda işledi
+                self.spool.ack(record.next_offset)
+                continue
+            return FrameType(record.type), record.flags, record.body, record.next_offset
+        return None
+
+    async def _send_loop(self, writer):
+        """Bekleyen çerçeveleri pencere izin verdikçe gönder"""
+        while True:
+            if not self._has_unsent():
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            async with self._window:
+                await self._window.wait_for(lambda: len(self._inflight) < self.max_inflight)
+            item = self._next_frame()
+            if item is None:
+                continue
+
+            frame_type, flags, body, spool_end = item
+            self._seq += 1
+            data = pack_frame(frame_type, self._seq, flags, body)
+            self._inflight[self._seq] = (data, spool_end)
+            writer.write(data)
+            # TCP geri basıncı: alıcı yavaşsa burada beklenir
+            await writer.drain()
+            self.frames_sent += 1
+            self.bytes_sent += len(data)
+            self._last_send = time.monotonic()
+
+    async def _session(self):
+        """Tek bir bağlantı ömrü; bağlantı koptuğunda istisna ile döner"""
+        reader, writer = await self._open()
+        try:
+            last_seq = await self._handshake(reader, writer)
+            # Önceki bağlantıdan kalan onaysız çerçeveleri aynı sıra ile yeniden gönder
+            for seq in sorted(self._inflight):
+                if seq <= last_seq:
+                    self._acked(seq)
+                    continue
+                writer.write(self._inflight[seq][0])
+            await writer.drain()
+            self.connected = True
+
+            ack_task = asyncio.ensure_future(self._read_acks(reader))
+            send_task = asyncio.ensure_future(self._send_loop(writer))
+            try:
+                done, _ = await asyncio.wait({ack_task, send_task}, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+            finally:
+                ack_task.cancel()
+                send_task.cancel()
+                await asyncio.gather(ack_task, send_task, return_exceptions=True)
+        finally:
+            self.connected = False
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def _connection_loop(self, stop: asyncio.Event):
+        """Bağlantıyı üstel geri çekilme ile sürdür"""
+        backoff = 0.5
+        while not stop.is_set():
+            acked = self.frames_acked
+            try:
+                await self._session()
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ProtocolError) as e:
+                if backoff == 0.5:
+                    print(f"Agent connection error: {e}")
+            if self.frames_acked != acked:
+                # Bağlantı veri taşıdıysa geri çekilmeyi sıfırla
+                backoff = 0.5
+            self.reconnects += 1
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=backoff)
+            except asyncio.TimeoutError:
+                pass
+            backoff = min(backoff * 2, 30.0)
+
+    async def _collect_loop(self, stop: asyncio.Event):
+        while not stop.is_set():
+            try:
+                await self.collect_once()
+                if self.spool is not None:
+                    # Onaylanan ofset ve imleç tur başına bir kez kalıcı olur
+                    self.spool.commit()
+            except Exception as e:
+                print(f"Agent collect error: {e}")
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self, stop: asyncio.Event = None):
+        """
+        Agent'ı stop olayı set edilene kadar çalıştır.
+
+        Args:
+            stop: Durdurma olayı (None ise sonsuza kadar çalışır)
+        """
+        stop = stop or asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self._window = asyncio.Condition()
+        tasks = [
+            asyncio.ensure_future(self._collect_loop(stop)),
+            asyncio.ensure_future(self._connection_loop(stop)),
+        ]
+        try:
+            await stop.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self.spool is not None:
+                self.spool.commit()
+
+    async def flush(self, timeout: float = 10.0) -> bool:
+        """Bekleyen ve onaysız çerçeveler bitene kadar bekle"""
+        deadline = time.monotonic() + timeout
+        while self._has_unsent() or self._inflight:
+            if time.monotonic() > deadline:
+                return False
+            await asyncio.sleep(0.01)
+        return True
+
+    def get_stats(self) -> Dict:
+        """Agent istatistikleri"""
+        stats = {
+            "agent_id": self.agent_id,
+            "connected": self.connected,
+            "pending": len(self._pending),
+            "inflight": len(self._inflight),
+            "frames_sent": self.frames_sent,
+            "frames_acked": self.frames_acked,
+            "bytes_sent": self.bytes_sent,
+            "reconnects": self.reconnects,
+            "dropped_frames": self.dropped_frames,
+            "dropped_logs": self.dropped_logs
+        }
+        if self.spool is not None:
+            stats["spool"] = self.spool.get_stats()
+            stats["dropped_logs"] += self.spool.dropped_items
+        return stats
@@ -0,0 +1,199 @@
+"""
+Agent Wire Protocol
+Agent ile aggregator arasındaki uzunluk önekli ikili çerçeveler.
+
+Çerçeve düzeni (ağ bayt sırası):
+
+    +----------+------+-------+----------+------------------+
+    | uzunluk  | tip  | flags | sıra no  | gövde            |
+    | uint32   | u8   | u8    | uint64   | uzunluk bayt     |
+    +----------+------+-------+----------+------------------+
+
+Gövde kompakt JSON'dur; COMPRESS_MIN bayttan büyükse zlib ile
+sıkıştırılır ve FLAG_ZLIB bayrağı konur. Log kayıtları sütun
+düzeninde (her alan için bir liste) taşınır; bu hem JSON anahtar
+tekrarını kaldırır hem de sıkıştırma oranını artırır.
+"""
+
+import asyncio
+import json
+import struct
+import zlib
+from datetime import datetime, timezone
+from enum import IntEnum
+from typing import Dict, List, NamedTuple, Tuple
+
+from core.service_monitor import ServiceInfo, ServiceStatus
+from core.log_collector import LogEntry, LogLevel
+
+HEADER = struct.Struct("!IBBQ")
+
+# Tek çerçevenin en büyük gövde boyutu
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+# Bu boyutun altındaki gövdeler sıkıştırılmaz
+COMPRESS_MIN = 512
+COMPRESS_LEVEL = 6
+
+FLAG_ZLIB = 0x01
+
+PROTOCOL_VERSION = 1
+
+
+class FrameType(IntEnum):
+    """Çerçeve tipleri"""
+    HELLO = 1       # agent -> aggregator: kimlik ve oturum
+    WELCOME = 2     # aggregator -> agent: işlenmiş son sıra no
+    SERVICES = 3    # servis durumu (tam veya delta)
+    LOGS = 4        # log yığını (sütun düzeni)
+    METRICS = 5     # host metrikleri
+    HEARTBEAT = 6   # boşta bağlantı canlılığı
+    ACK = 7         # aggregator -> agent: bu sıra no'ya kadar işlendi
+
+
+class ProtocolError(Exception):
+    """Geçersiz veya bozuk çerçeve"""
+
+
+class Frame(NamedTuple):
+    type: FrameType
+    seq: int
+    payload: Dict
+    size: int = 0  # başlık dahil kablodaki bayt sayısı
+
+
+def encode_body(payload: Dict) -> Tuple[int, bytes]:
+    """
+    Gövdeyi serileştir (gerekirse sıkıştır).
+
+    Returns:
+        (flags, gövde baytları)
+    """
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    if len(body) >= COMPRESS_MIN:
+        compressed = zlib.compress(body, COMPRESS_LEVEL)
+        if len(compressed) < len(body):
+            return FLAG_ZLIB, compressed
+    return 0, body
+
+
+def pack_frame(type: FrameType, seq: int, flags: int, body: bytes) -> bytes:
+    """Başlık ve gövdeyi tek çerçevede birleştir"""
+    if len(body) > MAX_FRAME_SIZE:
+        raise ProtocolError(f"Frame too large: {len(body)} bytes")
+    return HEADER.pack(len(body), int(type), flags, seq) + body
+
+
+def encode_frame(type: FrameType, seq: int, payload: Dict) -> bytes:
+    """Yükü çerçeveye dönüştür"""
+    flags, body = encode_body(payload)
+    return pack_frame(type, seq, flags, body)
+
+
+def decode_body(flags: int, body: bytes) -> Dict:
+    """Gövdeyi çöz (açılmış gövde de MAX_FRAME_SIZE ile sınırlıdır)"""
+    try:
+        if flags & FLAG_ZLIB:
+            decompressor = zlib.decompressobj()
+            body = decompressor.decompress(body, MAX_FRAME_SIZE)
+            if decompressor.unconsumed_tail:
+                raise ProtocolError(f"Decompressed frame exceeds {MAX_FRAME_SIZE} bytes")
+        return json.loads(body)
+    except (zlib.error, ValueError) as e:
+        raise ProtocolError(f"Invalid frame body: {e}") from e
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Frame:
+    """
+    Akıştan tek bir çerçeve oku.
+
+    Raises:
+        asyncio.IncompleteReadError: Bağlantı kapandı
+        ProtocolError: Geçersiz çerçeve
+    """
+    header = await reader.readexactly(HEADER.size)
+    length, type_value, flags, seq = HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ProtocolError(f"Frame too large: {length} bytes")
+    try:
+        frame_type = FrameType(type_value)
+    except ValueError:
+        raise ProtocolError(f"Unknown frame type: {type_value}")
+    body = await reader.readexactly(length) if length else b""
+    return Frame(frame_type, seq, decode_body(flags, body) if body else {}, HEADER.size + length)
+
+
+def parse_address(address: str):
+    """
+    Adres metnini çöz.
+
+    Args:
+        address: 'host:port' veya 'unix:/yol/soket'
+
+    Returns:
+        ('tcp', host, port) veya ('unix', yol, None)
+    """
+    if address.startswith("unix:"):
+        return "unix", address[5:], None
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"Invalid address: {address!r} (expected host:port or unix:/path)")
+    return "tcp", host.strip("[]"), int(port)
+
+
+# ===== Yük dönüşümleri =====
+
+def services_to_rows(services: List[ServiceInfo]) -> List[List]:
+    """Servisleri kompakt satırlara dönüştür"""
+    return [[s.name, s.display_name, s.status.value, s.is_critical, s.description, s.pid]
+            for s in services]
+
+
+def rows_to_services(rows: List[List]) -> List[ServiceInfo]:
+    """Kompakt satırlardan servisleri oluştur"""
+    services = []
+    for name, display_name, status, is_critical, description, pid in rows:
+        try:
+            status = ServiceStatus(status)
+        except ValueError:
+            status = ServiceStatus.UNKNOWN
+        services.append(ServiceInfo(
+            name=name,
+            display_name=display_name,
+            status=status,
+            is_critical=bool(is_critical),
+            description=description,
+            pid=pid
+        ))
+    return services
+
+
+def logs_to_columns(logs: List[LogEntry]) -> Dict[str, List]:
+    """Log kayıtlarını sütun düzenine dönüştür"""
+    return {
+        "ts": [entry.timestamp.timestamp() for entry in logs],
+        "level": [entry.level.value for entry in logs],
+        "service": [entry.service for entry in logs],
+        "source": [entry.source for entry in logs],
+        "message": [entry.message for entry in logs],
+    }
+
+
+def columns_to_logs(columns: Dict[str, List]) -> List[LogEntry]:
+    """Sütun düzeninden log kayıtlarını oluştur"""
+    logs = []
+    for ts, level, service, source, message in zip(
+            columns["ts"], columns["level"], columns["service"],
+            columns["source"], columns["message"]):
+        try:
+            level = LogLevel(level)
+        except ValueError:
+            level = LogLevel.INFO
+        logs.append(LogEntry(
+            timestamp=datetime.fromtimestamp(ts, timezone.utc).astimezone(),
+            level=level,
+            message=message,
+            source=source,
+            service=service
+        ))
+    return logs
@@ -0,0 +1,432 @@
+"""
+Agent Spool
+Aggregator'a gönderilecek log yığınları için diskte önden yazma kuyruğu.
+
+Kuyruk, adları taban ofsetleri olan segment dosyalarından oluşur
+(00000000000000000000.seg, 00000000000008388608.seg, ...). Ofsetler
+segmentler arasında süreklidir ve hiç geri gitmez; bir kaydın ofseti
+onun kalıcı kimliğidir.
+
+Kayıt düzeni (ağ bayt sırası):
+
+    +----------+--------+------+-------+---------+-----------+--------+------+
+    | uzunluk  | crc32  | tip  | flags | kayıt   | imleç uz. | imleç  | gövde|
+    | uint32   | uint32 | u8   | u8    | uint32  | uint16    |        |      |
+    +----------+--------+------+-------+---------+-----------+--------+------+
+
+Uzunluk crc'den sonraki tüm baytları kapsar; crc32 tip alanından
+gövdenin sonuna kadar hesaplanır. Yarım yazılmış kayıtlar açılışta
+son segmentten kesilir.
+
+checkpoint.json onaylanan son ofseti ve diske alınmış son journal
+imlecini birlikte tutar; geçici dosya + os.replace ile atomik yazılır.
+"""
+
+import bisect
+import json
+import os
+import struct
+import time
+import uuid
+import zlib
+from typing import Dict, List, NamedTuple, Optional
+
+from core.log_cursor import fsync_dir, write_atomic
+
+RECORD_HEAD = struct.Struct("!II")
+RECORD_META = struct.Struct("!BBIH")
+
+SEGMENT_SUFFIX = ".seg"
+CHECKPOINT_FILE = "checkpoint.json"
+
+DEFAULT_SEGMENT_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class SpoolRecord(NamedTuple):
+    offset: int
+    next_offset: int
+    type: int
+    flags: int
+    items: int
+    cursor: Optional[str]
+    body: bytes
+
+
+class Spool:
+    """
+    Segmentli, boyut sınırlı önden yazma kuyruğu.
+
+    * append: kaydı etkin segmentin sonuna ekler; fsync en fazla
+      fsync_interval saniyede bir yapılır (toplu fsync). Segment
+      segment_size'ı aşarsa yeni segmente geçilir.
+    * read_next: okuyucu ofsetinden sıradaki kaydı verir; gönderici
+      kuyruğu baştan sona sırayla okur.
+    * ack / commit: onaylanan ofset bellekte ilerletilir, commit ile
+      imleçle birlikte checkpoint'e yazılır ve tamamen onaylanmış
+      segmentler silinir.
+
+    Toplam boyut max_bytes'ı aşarsa en eski segment (onaylanmamış olsa
+    bile) silinir ve düşürülen kayıtlar sayılır; bağlantı uzun süre
+    kopuk kaldığında disk dolmaz, en yeni loglar korunur.
+
+    Tek thread'den (agent event loop'u) kullanılmak üzere tasarlanmıştır.
+    """
+
+    def __init__(self,
+                 directory: str,
+                 segment_size: int = DEFAULT_SEGMENT_SIZE,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 fsync_interval: float = 1.0):
+        """
+        Spool başlatıcı.
+
+        Args:
+            directory: Segment ve checkpoint dizini (yoksa oluşturulur)
+            segment_size: Segment başına hedef boyut (bayt)
+            max_bytes: Diskteki en fazla toplam boyut (bayt)
+            fsync_interval: Toplu fsync aralığı (saniye, 0 ise her eklemede)
+        """
+        self.directory = directory
+        self.segment_size = segment_size
+        self.max_bytes = max(max_bytes, segment_size)
+        self.fsync_interval = fsync_interval
+        os.makedirs(directory, exist_ok=True)
+
+        self.spool_id = ""
+        self.acked_offset = 0
+        self.cursor: Optional[str] = None
+        self._segments: List[int] = []
+        self._sizes: Dict[int, int] = {}
+        self._writer = None
+        self._reader = None
+        self._reader_base: Optional[int] = None
+        self._read_offset = 0
+        self._unsynced = False
+        self._last_sync = time.monotonic()
+        self._committed = None
+
+        # İstatistikler
+        self.records_written = 0
+        self.bytes_written = 0
+        self.syncs = 0
+        self.commits = 0
+        self.dropped_segments = 0
+        self.dropped_bytes = 0
+        self.dropped_items = 0
+        self.truncated_bytes = 0
+
+        self._open()
+
+    # ===== Açılış / kurtarma =====
+
+    def _segment_path(self, base: int) -> str:
+        return os.path.join(self.directory, f"{base:020d}{SEGMENT_SUFFIX}")
+
+    def _checkpoint_path(self) -> str:
+        return os.path.join(self.directory, CHECKPOINT_FILE)
+
+    def _open(self):
+        checkpoint = self._load_checkpoint()
+        self.spool_id = checkpoint.get("spool_id") or uuid.uuid4().hex
+        self.acked_offset = int(checkpoint.get("acked_offset", 0))
+        self.cursor = checkpoint.get("cursor")
+
+        for name in os.listdir(self.directory):
+            if name.endswith(SEGMENT_SUFFIX) and name[:-len(SEGMENT_SUFFIX)].isdigit():
+                self._segments.append(int(name[:-len(SEGMENT_SUFFIX)]))
+        self._segments.sort()
+        for base in self._segments:
+            self._sizes[base] = os.path.getsize(self._segment_path(base))
+
+        if self._segments:
+            self._recover_tail()
+        else:
+            # Boş dizin: ofsetler onaylanan yerden sürer (asla geri gitmez)
+            self._create_segment(self.acked_offset)
+
+        # Onaylanan ofset mevcut veri aralığına sıkıştırılır
+        self.acked_offset = min(max(self.acked_offset, self._segments[0]), self.end_offset)
+        self._read_offset = self.acked_offset
+        self._writer = open(self._segment_path(self._segments[-1]), "ab")
+        self.commit()
+
+    def _load_checkpoint(self) -> Dict:
+        try:
+            with open(self._checkpoint_path(), "rb") as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+
+    def _recover_tail(self):
+        """Son segmenti tara: yarım kayıtları kes, son imleci bul"""
+        base = self._segments[-1]
+        path = self._segment_path(base)
+        valid = 0
+        cursor = None
+        with open(path, "rb") as f:
+            while True:
+                record = self._read_record(f, base, valid)
+                if record is None:
+                    break
+                valid = record.next_offset - base
+                if record.cursor:
+                    cursor = record.cursor
+        if valid < self._sizes[base]:
+            self.truncated_bytes += self._sizes[base] - valid
+            with open(path, "r+b") as f:
+                f.truncate(valid)
+                os.fsync(f.fileno())
+            self._sizes[base] = valid
+        # Segmentteki imleç diske alınmış veriyle tutarlıdır; checkpoint daha eski olabilir
+        if cursor:
+            self.cursor = cursor
+
+    def _create_segment(self, base: int):
+        open(self._segment_path(base), "ab").close()
+        fsync_dir(self.directory)
+        self._segments.append(base)
+        self._sizes[base] = 0
+
+    @staticmethod
+    def _read_record(f, base: int, position: int) -> Optional[SpoolRecord]:
+        """Dosyadaki konumdan tek kayıt oku; eksik veya bozuksa None"""
+        f.seek(position)
+        head = f.read(RECORD_HEAD.size)
+        if len(head) < RECORD_HEAD.size:
+            return None
+        length, crc = RECORD_HEAD.unpack(head)
+        if length < RECORD_META.size:
+            return None
+        data = f.read(length)
+        if len(data) < length or zlib.crc32(data) != crc:
+            return None
+        frame_type, flags, items, cursor_length = RECORD_META.unpack_from(data)
+        cursor_end = RECORD_META.size + cursor_length
+        cursor = data[RECORD_META.size:cursor_end].decode("utf-8") if cursor_length else None
+        offset = base + position
+        return SpoolRecord(
+            offset=offset,
+            next_offset=offset + RECORD_HEAD.size + length,
+            type=frame_type,
+            flags=flags,
+            items=items,
+            cursor=cursor,
+            body=data[cursor_end:]
+        )
+
+    # ===== Durum =====
+
+    @property
+    def end_offset(self) -> int:
+        """Sonraki kaydın yazılacağı ofset"""
+        base = self._segments[-1]
+        return base + self._sizes[base]
+
+    @property
+    def read_offset(self) -> int:
+        """Okuyucunun sıradaki ofseti"""
+        return self._read_offset
+
+    @property
+    def size_bytes(self) -> int:
+        """Diskteki toplam segment boyutu"""
+        return self.end_offset - self._segments[0]
+
+    @property
+    def pending_bytes(self) -> int:
+        """Onaylanmamış bayt sayısı"""
+        return self.end_offset - self.acked_offset
+
+    def has_unread(self) -> bool:
+        return self._read_offset < self.end_offset
+
+    # ===== Yazma =====
+
+    def append(self, frame_type: int, flags: int, body: bytes,
+               items: int = 0, cursor: Optional[str] = None) -> int:
+        """
+        Kaydı kuyruğa ekle.
+
+        Args:
+            frame_type: Çerçeve tipi
+            flags: Gövde bayrakları (ör. FLAG_ZLIB)
+            body: Serileştirilmiş gövde
+            items: Gövdedeki kayıt sayısı (düşürme istatistiği için)
+            cursor: Bu kayıtla birlikte kalıcı olacak journal imleci
+
+        Returns:
+            Kaydın ofseti
+        """
+        cursor_bytes = cursor.encode("utf-8") if cursor else b""
+        data = RECORD_META.pack(int(frame_type), flags, items, len(cursor_bytes)) + cursor_bytes + body
+        record = RECORD_HEAD.pack(len(data), zlib.crc32(data)) + data
+
+        base = self._segments[-1]
+        if self._sizes[base] and self._sizes[base] + len(record) > self.segment_size:
+            self._roll()
+            base = self._segments[-1]
+
+        offset = base + self._sizes[base]
+        self._writer.write(record)
+        # Okuyucu aynı süreçte hemen görebilsin diye kullanıcı tamponu boşaltılır
+        self._writer.flush()
+        self._sizes[base] += len(record)
+        self._unsynced = True
+        if cursor:
+            self.cursor = cursor
+        self.records_written += 1
+        self.bytes_written += len(record)
+
+        if time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+        self._enforce_cap()
+        return offset
+
+    def sync(self):
+        """Etkin segmenti diske al"""
+        if not self._unsynced:
+            return
+        self._writer.flush()
+        os.fsync(self._writer.fileno())
+        self._unsynced = False
+        self._last_sync = time.monotonic()
+        self.syncs += 1
+
+    def _roll(self):
+        """Etkin segmenti kapatıp yenisine geç"""
+        self.sync()
+        self._writer.close()
+        self._create_segment(self.end_offset)
+        self._writer = open(self._segment_path(self._segments[-1]), "ab")
+        # Yeni segment boşken çökülürse imleç checkpoint'ten okunur
+        self.commit()
+
+    def _enforce_cap(self):
+        """Boyut sınırı aşıldıysa en eski segmentleri düşür"""
+        while self.size_bytes > self.max_bytes and len(self._segments) > 1:
+            base = self._segments[0]
+            next_base = self._segments[1]
+            if self.acked_offset < next_base:
+                self.dropped_items += self._count_items(base, max(self.acked_offset, base))
+                self.dropped_bytes += next_base - max(self.acked_offset, base)
+                self.acked_offset = next_base
+            self._remove_segment(base)
+            self.dropped_segments += 1
+        self._read_offset = max(self._read_offset, self._segments[0])
+
+    def _count_items(self, base: int, offset: int) -> int:
+        """Segmentte ofsetten itibaren kalan kayıt sayısını topla"""
+        items = 0
+        with open(self._segment_path(base), "rb") as f:
+            position = offset - base
+            while True:
+                record = self._read_record(f, base, position)
+                if record is None:
+                    return items
+                items += record.items
+                position = record.next_offset - base
+
+    def _remove_segment(self, base: int):
+        if self._reader_base == base:
+            self._reader.close()
+            self._reader = None
+            self._reader_base = None
+        try:
+            os.unlink(self._segment_path(base))
+        except FileNotFoundError:
+            pass
+        self._segments.remove(base)
+        del self._sizes[base]
+
+    # ===== Okuma =====
+
+    def read_next(self) -> Optional[SpoolRecord]:
+        """
+        Okuyucu ofsetindeki kaydı döndür ve ofseti ilerlet.
+
+        Returns:
+            Sıradaki kayıt veya okunacak kayıt yoksa None
+        """
+        while self._read_offset < self.end_offset:
+            index = bisect.bisect_right(self._segments, self._read_offset) - 1
+            base = self._segments[index]
+            position = self._read_offset - base
+            if position >= self._sizes[base]:
+                self._read_offset = self._segments[index + 1]
+                continue
+            if self._reader_base != base:
+                if self._reader is not None:
+                    self._reader.close()
+                self._reader = open(self._segment_path(base), "rb")
+                self._reader_base = base
+            record = self._read_record(self._reader, base, position)
+            if record is None:
+                # Kapalı segmentte bozulma: segmentin geri kalanı atlanır
+                skipped = self._sizes[base] - position
+                self.truncated_bytes += skipped
+                self._read_offset = base + self._sizes[base]
+                continue
+            self._read_offset = record.next_offset
+            return record
+        return None
+
+    def rewind(self):
+        """Okuyucuyu onaylanan son ofsete geri al"""
+        self._read_offset = max(self.acked_offset, self._segments[0])
+
+    def ack(self, offset: int):
+        """Bu ofsetten önceki tüm kayıtları onaylanmış say"""
+        if offset > self.acked_offset:
+            self.acked_offset = min(offset, self.end_offset)
+
+    def commit(self):
+        """
+        Veriyi diske al, onaylanan ofseti ve imleci checkpoint'e yaz,
+        tamamen onaylanmış segmentleri sil.
+        """
+        self.sync()
+        state = (self.spool_id, self.acked_offset, self.cursor)
+        if state != self._committed:
+            write_atomic(self._checkpoint_path(), json.dumps({
+                "spool_id": self.spool_id,
+                "acked_offset": self.acked_offset,
+                "cursor": self.cursor
+            }).encode("utf-8"))
+            self._committed = state
+            self.commits += 1
+        removed = False
+        while len(self._segments) > 1 and self._segments[1] <= self.acked_offset:
+            self._remove_segment(self._segments[0])
+            removed = True
+        if removed:
+            fsync_dir(self.directory)
+
+    def close(self):
+        """Checkpoint yaz ve dosyaları kapat"""
+        if self._writer is None:
+            return
+        self.commit()
+        self._writer.close()
+        self._writer = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+            self._reader_base = None
+
+    def get_stats(self) -> Dict:
+        """Spool istatistikleri"""
+        return {
+            "segments": len(self._segments),
+            "size_bytes": self.size_bytes,
+            "pending_bytes": self.pending_bytes,
+            "acked_offset": self.acked_offset,
+            "end_offset": self.end_offset,
+            "records_written": self.records_written,
+            "syncs": self.syncs,
+            "commits": self.commits,
+            "dropped_segments": self.dropped_segments,
+            "dropped_bytes": self.dropped_bytes,
+            "dropped_logs": self.dropped_items,
+            "truncated_bytes": self.truncated_bytes
+        }
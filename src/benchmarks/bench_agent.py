@@ -0,0 +1,128 @@
+"""
+Agent/Aggregator Benchmark
+Localhost üzerinde çok sayıda sahte agent ile kablo protokolü verimi.
+
+Her agent belirtilen sayıda servis ve tur başına log yığını üretir;
+aggregator'ın saniyede işlediği log kaydı, kayıt başına kablo baytı
+ve JSON'a göre sıkıştırma oranı raporlanır.
+
+Kullanım:
+    python src/benchmarks/bench_agent.py [--agents 50] [--services 200] [--logs 500] [--duration 10]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.service_monitor import ServiceMonitor, ServiceInfo, ServiceStatus
+from core.log_collector import LogCollector, LogEntry, LogLevel
+from agent.client import AgentClient
+from agent.aggregator import AggregatorServer
+
+MESSAGES = [
+    "Started Session {n} of user root.",
+    "connection from 10.0.{n}.1 port 52{n} closed",
+    "upstream timed out (110: Connection timed out) while reading response header",
+    "GET /api/v1/items/{n} HTTP/1.1 200",
+    "Failed password for invalid user admin from 192.168.1.{n}",
+]
+
+
+class SyntheticAdapter:
+    """Her turda yeni loglar ve ara sıra servis değişikliği üreten adaptör"""
+
+    def __init__(self, services: int, logs_per_round: int, seed: int):
+        self.random = random.Random(seed)
+        self.services = [ServiceInfo(f"svc-{i}.service", f"svc-{i}", ServiceStatus.RUNNING)
+                         for i in range(services)]
+        self.logs_per_round = logs_per_round
+        self.counter = 0
+
+    async def get_services_async(self):
+        # Tur başına bir servisin durumu değişir
+        service = self.random.choice(self.services)
+        service.status = ServiceStatus.FAILED if service.status == ServiceStatus.RUNNING else ServiceStatus.RUNNING
+        return [ServiceInfo(s.name, s.display_name, s.status) for s in self.services]
+
+    async def get_logs_async(self, limit=100, **kwargs):
+        logs = []
+        for _ in range(self.logs_per_round):
+            self.counter += 1
+            logs.append(LogEntry(
+                timestamp=datetime.fromtimestamp(time.time() + self.counter * 1e-6),
+                level=self.random.choice((LogLevel.INFO, LogLevel.INFO, LogLevel.WARNING, LogLevel.ERROR)),
+                message=self.random.choice(MESSAGES).format(n=self.counter % 250),
+                source="journalctl",
+                service=f"svc-{self.counter % len(self.services)}.service"
+            ))
+        return logs
+
+
+async def run_agents(address: str, args) -> list:
+    stop = asyncio.Event()
+    agents = []
+    for i in range(args.agents):
+        adapter = SyntheticAdapter(args.services, args.logs, seed=i)
+        agents.append(AgentClient(
+            address,
+            service_monitor=ServiceMonitor(adapter=adapter),
+            log_collector=LogCollector(adapter=adapter),
+            agent_id=f"bench-{i}",
+            interval=args.interval,
+            log_limit=args.logs
+        ))
+    tasks = [asyncio.ensure_future(agent.run(stop)) for agent in agents]
+    await asyncio.sleep(args.duration)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return agents
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent/aggregator kablo protokolü verimi")
+    parser.add_argument("--agents", type=int, default=50)
+    parser.add_argument("--services", type=int, default=200)
+    parser.add_argument("--logs", type=int, default=500, help="Agent başına tur başına log")
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    server = AggregatorServer("127.0.0.1:0")
+    server.start()
+    try:
+        agents = asyncio.run(run_agents(server.bound_address, args))
+    finally:
+        server.stop()
+
+    hosts = server.registry.get_hosts()
+    wire_bytes = sum(h.bytes_received for h in hosts)
+    frames = sum(h.frames for h in hosts)
+    total_logs = args.agents * args.logs * int(args.duration / args.interval)
+    received_logs = sum(len(h.logs) for h in hosts)
+
+    # Aynı logların satır başına JSON nesnesi olarak boyutu (karşılaştırma için)
+    sample = asyncio.run(SyntheticAdapter(args.services, args.logs, seed=0).get_logs_async())
+    json_per_log = len(json.dumps([e.to_dict() for e in sample]).encode()) / len(sample)
+    acked = sum(a.frames_acked for a in agents)
+
+    print(f"Agent: {args.agents}, servis/agent: {args.services}, log/tur: {args.logs}")
+    print(f"Çerçeve: {frames} ({acked} onaylandı), kablo: {wire_bytes / 1024:.0f} KiB")
+    print(f"Log: ~{total_logs} üretildi, {received_logs} aggregator'da "
+          f"(host başına son {server.registry.max_logs_per_host} tutulur)")
+    print(f"Verim: {frames / args.duration:.0f} çerçeve/s")
+    if wire_bytes and total_logs:
+        per_log = wire_bytes / total_logs
+        print(f"Log başına kablo: {per_log:.1f} bayt (JSON nesne: {json_per_log:.1f} bayt, "
+              f"oran {json_per_log / per_log:.1f}x)")
+    print(f"Düşürülen log: {sum(a.dropped_logs for a in agents)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Bulk Parse Benchmark
+Sentetik short-iso journal dosyasında toplu ayrıştırmanın çekirdek sayısıyla ölçeklenmesi.
+
+Önce LinuxAdapter._parse_log_line ile tek thread'li temel ölçülür,
+sonra BulkIngestor 1, 2, 4, ... CPU sayısına kadar worker ile çalıştırılır.
+
+Kullanım:
+    python src/benchmarks/bench_bulk_parse.py [--lines 1000000] [--chunk-mb 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adapters.linux_adapter import LinuxAdapter
+from core.bulk_ingest import BulkIngestor
+
+SERVICES = ["sshd", "nginx", "systemd", "kernel", "dockerd", "postgres", "cron"]
+MESSAGES = [
+    "Accepted publickey for deploy from 10.0.{n}.4 port 5{n} ssh2",
+    "upstream timed out (110: Connection timed out) while reading response header",
+    "Started Session {n} of user root.",
+    "Failed password for invalid user admin from 192.168.1.{n}",
+    "warning: checkpoint request took {n} ms",
+    "GET /api/v1/items/{n} HTTP/1.1 200",
+]
+
+
+def write_journal(path: str, lines: int, seed: int = 1):
+    """Sentetik journalctl -o short-iso çıktısı yaz"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    with open(path, "w") as f:
+        for i in range(lines):
+            stamp = (start + timedelta(seconds=i // 20)).strftime("%Y-%m-%dT%H:%M:%S+0300")
+            service = rng.choice(SERVICES)
+            message = rng.choice(MESSAGES).format(n=i % 250)
+            f.write(f"{stamp} web-01 {service}[{1000 + i % 50}]: {message}\n")
+
+
+def baseline(path: str) -> float:
+    """Tek thread, satır başına LogEntry üreten mevcut ayrıştırıcı"""
+    adapter = LinuxAdapter()
+    start = time.perf_counter()
+    with open(path) as f:
+        entries = [adapter._parse_log_line(line.rstrip("\n")) for line in f]
+    elapsed = time.perf_counter() - start
+    assert all(entries)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Toplu log ayrıştırma ölçeklenmesi")
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--chunk-mb", type=float, default=4.0)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "journal.log")
+        write_journal(path, args.lines)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        print(f"Dosya: {args.lines} satır, {size_mb:.0f} MiB, CPU: {os.cpu_count()}")
+
+        base = baseline(path)
+        print(f"{'temel (_parse_log_line)':<24} {base:7.2f} sn {args.lines / base:12,.0f} satır/sn")
+
+        workers = 1
+        while workers <= args.max_workers:
+            ingestor = BulkIngestor(workers=workers, chunk_size=int(args.chunk_mb * 1024 * 1024))
+            result = ingestor.ingest([path], fmt="text")
+            assert result.entries == args.lines, result
+            print(f"{f'bulk, {workers} worker':<24} {result.duration:7.2f} sn "
+                  f"{result.entries_per_second:12,.0f} satır/sn  x{base / result.duration:.1f}")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
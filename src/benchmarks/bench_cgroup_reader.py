@@ -0,0 +1,76 @@
+"""
+Cgroup Reader Benchmark
+500 birimlik sahte cgroup ağacında örnekleme maliyeti ölçümü.
+
+Kullanım:
+    python src/benchmarks/bench_cgroup_reader.py [--units 500] [--interval 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adapters.cgroup_reader import CgroupReader
+
+
+def build_tree(root: str, units: int):
+    """Sahte system.slice ağacı ve /proc/<pid>/stat dosyaları oluştur"""
+    stat_tail = " ".join(["S"] + ["0"] * 48)
+    for i in range(units):
+        base = os.path.join(root, "cgroup", "system.slice", f"unit{i}.service")
+        os.makedirs(base)
+        pid = 1000 + i
+        files = {
+            "cpu.stat": f"usage_usec {i * 100}\nuser_usec {i * 60}\nsystem_usec {i * 40}\n",
+            "memory.current": f"{i * 4096}\n",
+            "pids.current": "2\n",
+            "cgroup.procs": f"{pid}\n",
+        }
+        for name, content in files.items():
+            with open(os.path.join(base, name), "w") as f:
+                f.write(content)
+        os.makedirs(os.path.join(root, "proc", str(pid)))
+        with open(os.path.join(root, "proc", str(pid), "stat"), "w") as f:
+            f.write(f"{pid} (unit{i}) {stat_tail}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CgroupReader örnekleme maliyeti")
+    parser.add_argument("--units", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=5.0,
+                        help="Gerçek örnekleme aralığı (CPU yüzdesi hesabı için)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        build_tree(root, args.units)
+        names = [f"unit{i}" for i in range(args.units)]
+        reader = CgroupReader(cgroup_root=os.path.join(root, "cgroup"),
+                              proc_root=os.path.join(root, "proc"))
+
+        # İlk tur: tanımlayıcıları aç
+        start = time.process_time()
+        reader.read_units(names)
+        cold = time.process_time() - start
+
+        start = time.process_time()
+        for _ in range(args.rounds):
+            reader.read_units(names)
+        warm = (time.process_time() - start) / args.rounds
+        descriptors = reader.open_descriptor_count()
+        reader.close()
+
+    print(f"Birim sayısı          : {args.units}")
+    print(f"Açık tanımlayıcı      : {descriptors}")
+    print(f"İlk tur (open dahil)  : {cold * 1000:.2f} ms")
+    print(f"Sıcak tur (pread)     : {warm * 1000:.2f} ms")
+    print(f"{args.interval:>4.0f}s aralıkta CPU   : %{warm / args.interval * 100:.3f}")
+
+
+if __name__ == "__main__":
+    main()
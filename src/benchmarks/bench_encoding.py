@@ -0,0 +1,96 @@
+"""
+Encoding Benchmark
+Büyük /api/logs yanıtı: to_dict + json.dumps ile önbellekli parça birleştirme.
+
+Üç yol ölçülür:
+- dict: her istekte to_dict() ve standart json (eski jsonify yolu)
+- soğuk: kayıt başına ilk kodlama (orjson varsa onunla)
+- sıcak: önbellekteki parçaların birleştirilmesi
+
+Kullanım:
+    python src/benchmarks/bench_encoding.py [--logs 10000] [--rounds 20]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.encoding import MSGPACK_AVAILABLE, MSGPACK, ORJSON_AVAILABLE, JSON, encode_document
+from core.log_collector import LogEntry, LogLevel
+from core.log_parser import LogParser
+
+MESSAGES = [
+    "Started Session {n} of user root.",
+    "connection from 10.0.{n}.1 port 52{n} closed",
+    "upstream timed out (110: Connection timed out) while reading response header",
+    "Failed password for invalid user admin from 192.168.1.{n}",
+]
+
+
+def make_logs(count: int):
+    rng = random.Random(1)
+    start = datetime(2024, 1, 15, 10, 0)
+    return [LogEntry(
+        timestamp=start + timedelta(milliseconds=i),
+        level=rng.choice((LogLevel.INFO, LogLevel.WARNING, LogLevel.ERROR)),
+        message=rng.choice(MESSAGES).format(n=i % 250),
+        source="web-1",
+        service=rng.choice(("nginx", "sshd", "cron"))
+    ) for i in range(count)]
+
+
+def best_of(rounds: int, func) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/api/logs serileştirme maliyeti")
+    parser.add_argument("--logs", type=int, default=10000, help="Yanıttaki kayıt sayısı")
+    parser.add_argument("--rounds", type=int, default=20, help="Tekrar sayısı (en iyisi raporlanır)")
+    args = parser.parse_args()
+
+    log_parser = LogParser()
+    logs = make_logs(args.logs)
+
+    def dict_path():
+        return json.dumps({"logs": log_parser.to_json(logs), "count": len(logs)}).encode()
+
+    def cold_path(fmt=JSON):
+        for log in logs:
+            log._encoded = None
+        return encode_document({"logs": log_parser.encode(logs, fmt), "count": len(logs)}, fmt)
+
+    def warm_path(fmt=JSON):
+        return encode_document({"logs": log_parser.encode(logs, fmt), "count": len(logs)}, fmt)
+
+    size = len(dict_path())
+    dict_time = best_of(args.rounds, dict_path)
+    cold_time = best_of(args.rounds, cold_path)
+    warm_time = best_of(args.rounds, warm_path)
+
+    print(f"Kayıt sayısı          : {args.logs}")
+    print(f"Yanıt boyutu          : {size / 1024:.0f} KiB")
+    print(f"JSON arka ucu         : {'orjson' if ORJSON_AVAILABLE else 'json'}")
+    print(f"to_dict + json.dumps  : {dict_time * 1000:8.2f} ms")
+    print(f"Soğuk (ilk kodlama)   : {cold_time * 1000:8.2f} ms")
+    print(f"Sıcak (parça birleşim): {warm_time * 1000:8.2f} ms  (x{dict_time / warm_time:.1f})")
+    if MSGPACK_AVAILABLE:
+        cold_path(MSGPACK)
+        msgpack_time = best_of(args.rounds, lambda: warm_path(MSGPACK))
+        print(f"Sıcak MessagePack     : {msgpack_time * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Log Blocks Benchmark
+Sıkıştırılmış blok deposu: sıkıştırma oranı, bellek ve çözme hızı.
+
+Ölçülenler:
+- oran: ham metin (zaman + seviye + servis/kaynak/mesaj) / sıkıştırılmış bayt,
+  servis sözlüğüyle ve sözlüksüz
+- bellek: LogEntry listesi, LogStore ve BlockLogStore (tracemalloc)
+- çözme hızı: önbellek soğukken tüm kayıtların iter_logs ile okunması
+- saklama: ölçülen kayıt başı boyutla retention_days günlük tahmin
+
+Kullanım:
+    python src/benchmarks/bench_log_blocks.py [--logs 200000] [--rate 20] [--rounds 3]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from core.log_blocks import BlockLogStore
+from core.log_collector import LogEntry, LogLevel
+from core.log_store import LogBatch, LogStore
+
+SERVICES = {
+    "sshd": [
+        "Accepted publickey for deploy from 10.0.{a}.{b} port {p} ssh2: RSA SHA256:{h}",
+        "Failed password for invalid user admin from 192.168.{a}.{b} port {p} ssh2",
+        "pam_unix(sshd:session): session opened for user deploy(uid=1000) by (uid=0)",
+        "Received disconnect from 10.0.{a}.{b} port {p}:11: disconnected by user",
+    ],
+    "nginx": [
+        "{a}.{b}.1.9 - - \"GET /api/v1/items/{p} HTTP/1.1\" 200 {h} \"-\" \"curl/8.4.0\"",
+        "upstream timed out (110: Connection timed out) while reading response header from upstream, "
+        "client: 10.0.{a}.{b}, server: shop.local, request: \"GET /cart HTTP/1.1\"",
+        "{a}.{b}.7.3 - - \"POST /api/v1/orders HTTP/1.1\" 201 {p} \"-\" \"Mozilla/5.0\"",
+    ],
+    "systemd": [
+        "Started Session {p} of User deploy.",
+        "session-{p}.scope: Deactivated successfully.",
+        "Starting Cleanup of Temporary Directories...",
+        "logrotate.service: Consumed {a}.{b}s CPU time.",
+    ],
+    "kernel": [
+        "[UFW BLOCK] IN=eth0 OUT= MAC=52:54:00:{a}:{b}:01 SRC=203.0.113.{b} DST=10.0.0.5 LEN=60 "
+        "PROTO=TCP SPT={p} DPT=22 WINDOW=64240",
+        "EXT4-fs (sda{a}): mounted filesystem with ordered data mode. Quota mode: none.",
+    ],
+    "cron": [
+        "(root) CMD (/usr/local/bin/backup.sh --incremental --target s3://backups/{a})",
+        "pam_unix(cron:session): session closed for user root",
+    ],
+}
+LEVELS = (LogLevel.INFO,) * 12 + (LogLevel.NOTICE, LogLevel.WARNING, LogLevel.ERROR, LogLevel.DEBUG)
+
+
+def make_logs(count: int, rate: float):
+    """rate kayıt/saniye hızında, servis dağılımı dengesiz kayıtlar"""
+    rng = random.Random(1)
+    start = datetime(2024, 1, 15, 0, 0)
+    services = list(SERVICES)
+    weights = [5, 8, 3, 1, 1]
+    logs = []
+    for i in range(count):
+        service = rng.choices(services, weights)[0]
+        template = rng.choice(SERVICES[service])
+        logs.append(LogEntry(
+            timestamp=start + timedelta(seconds=i / rate),
+            level=rng.choice(LEVELS),
+            message=template.format(a=rng.randrange(256), b=rng.randrange(256),
+                                    p=rng.randrange(1024, 65535), h=f"{rng.getrandbits(64):016x}"),
+            source="web-1",
+            service=service
+        ))
+    return logs
+
+
+def measure_memory(build):
+    """build() sonucunun kapladığı bellek (bayt) ve sonucu"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def best_of(rounds: int, func) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sıkıştırılmış log bloklarının oranı ve çözme hızı")
+    parser.add_argument("--logs", type=int, default=200000, help="Kayıt sayısı")
+    parser.add_argument("--rate", type=float, default=20.0, help="Kayıt/saniye (saklama tahmini için)")
+    parser.add_argument("--block-size", type=int, default=1024, help="Blok başına kayıt")
+    parser.add_argument("--rounds", type=int, default=3, help="Tekrar sayısı (en iyisi raporlanır)")
+    args = parser.parse_args()
+
+    logs = make_logs(args.logs, args.rate)
+
+    def build_blocks(dictionary_size=16384):
+        store = BlockLogStore(block_size=args.block_size, dictionary_size=dictionary_size)
+        store.add_entries(logs)
+        store.flush()
+        return store
+
+    def build_store():
+        store = LogStore()
+        store.merge([LogBatch.from_entries(logs)])
+        return store
+
+    entries_memory, _ = measure_memory(lambda: make_logs(args.logs, args.rate))
+    # LogStore dizeleri logs ile paylaşır; ölçülen yalnızca sütun listeleridir
+    store_memory, _ = measure_memory(build_store)
+    blocks_memory, store = measure_memory(build_blocks)
+    plain = build_blocks(dictionary_size=0).get_statistics()["compression"]
+    compression = store.get_statistics()["compression"]
+
+    def decode_all():
+        store._cache.clear()
+        for _ in store.iter_logs(limit=0):
+            pass
+
+    decode_time = best_of(args.rounds, decode_all)
+    query_time = best_of(args.rounds * 10, lambda: store.query(limit=100, level=LogLevel.ERROR, service="sshd"))
+    per_entry = blocks_memory / args.logs
+    retained = args.rate * 86400 * config.log_retention_days
+
+    print(f"Kayıt sayısı          : {args.logs} ({len(SERVICES)} servis, blok {args.block_size})")
+    print(f"Kodlayıcı             : {compression['codec']}")
+    print(f"Ham metin             : {compression['text_bytes'] / 1024 / 1024:8.2f} MiB")
+    print(f"Sıkıştırılmış         : {compression['compressed_bytes'] / 1024 / 1024:8.2f} MiB  "
+          f"(oran x{compression['ratio']}, sözlüksüz x{plain['ratio']})")
+    print(f"Sözlükler             : {compression['dictionaries']} ({compression['dictionary_bytes'] / 1024:.1f} KiB)")
+    print(f"Bellek LogEntry listesi: {entries_memory / 1024 / 1024:8.2f} MiB")
+    print(f"Bellek LogStore       : {store_memory / 1024 / 1024:8.2f} MiB  (dizeler hariç)")
+    print(f"Bellek BlockLogStore  : {blocks_memory / 1024 / 1024:8.2f} MiB  "
+          f"(LogEntry listesinin %{blocks_memory / entries_memory * 100:.1f}'i)")
+    print(f"Çözme (soğuk, tümü)   : {decode_time * 1000:8.2f} ms  "
+          f"({args.logs / decode_time:,.0f} kayıt/sn, "
+          f"{compression['text_bytes'] / decode_time / 1024 / 1024:.0f} MiB/sn ham metin)")
+    print(f"Sorgu (son 100 ERROR) : {query_time * 1000:8.2f} ms")
+    print(f"{config.log_retention_days} gün @ {args.rate:g} kayıt/sn: {retained:,.0f} kayıt, "
+          f"~{retained * per_entry / 1024 / 1024:,.0f} MiB "
+          f"(LogEntry listesi ~{retained * entries_memory / args.logs / 1024 / 1024:,.0f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Server Benchmark
+Geliştirme sunucusu ile production (gunicorn gthread) modunun
+istek/saniye ve SocketIO yayın kapasitesi karşılaştırması.
+
+Kullanım:
+    python src/benchmarks/bench_server.py [--clients 50] [--ws-clients 100] [--duration 10]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+SRC_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(mode: str, port: int, workers: int, threads: int) -> subprocess.Popen:
+    """Sunucuyu alt süreç olarak başlat ve hazır olana kadar bekle"""
+    env = dict(os.environ, MONITOR_METRICS_INTERVAL="0.25")
+    cmd = [sys.executable, os.path.join(SRC_PATH, "main.py"),
+           "--host", "127.0.0.1", "--port", str(port), "--server-mode", mode,
+           "--workers", str(workers), "--threads", str(threads)]
+    process = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/api/status")
+            if conn.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{mode} sunucusu başlatılamadı")
+
+
+def http_load(port: int, path: str, clients: int, duration: float) -> dict:
+    """Keep-alive bağlantılarla eşzamanlı istek yükü uygula"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.time() + duration
+
+    def worker():
+        local = []
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        while time.time() < deadline:
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    raise OSError(response.status)
+                local.append(time.perf_counter() - start)
+            except (OSError, http.client.HTTPException):
+                with lock:
+                    errors[0] += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker) for _ in range(clients)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    latencies.sort()
+    count = len(latencies)
+    return {
+        "requests": count,
+        "rps": count / duration,
+        "p50_ms": latencies[count // 2] * 1000 if count else 0,
+        "p99_ms": latencies[int(count * 0.99)] * 1000 if count else 0,
+        "errors": errors[0],
+    }
+
+
+def socketio_fanout(port: int, clients: int, duration: float) -> dict:
+    """
+    Ham Engine.IO v4 WebSocket istemcileri bağla ve 'system_update'
+    yayınlarının kaç istemciye ulaştığını say.
+    """
+    import simple_websocket
+
+    url = f"ws://127.0.0.1:{port}/socket.io/?EIO=4&transport=websocket"
+    received = []
+    connected = [0]
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(clients + 1, timeout=60)
+
+    def client():
+        count = 0
+        ws = None
+        try:
+            ws = simple_websocket.Client.connect(url)
+            ws.receive(timeout=5)      # '0{...}' açılış paketi
+            ws.send("40")              # varsayılan namespace'e bağlan
+            with lock:
+                connected[0] += 1
+        except Exception:
+            ws = None
+        try:
+            start_barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+        window_start = time.time()
+        deadline = window_start + duration
+        while ws is not None and time.time() < deadline:
+            try:
+                message = ws.receive(timeout=0.5)
+            except Exception:
+                break
+            if message is None:
+                continue
+            if message == "2":
+                ws.send("3")           # ping -> pong
+            elif message.startswith('42["system_update"'):
+                # Bağlantı aşamasında tamponda biriken eski yayınları sayma
+                payload = json.loads(message[2:])[1]
+                if payload["timestamp"] >= window_start:
+                    count += 1
+        if ws is not None:
+            ws.close()
+        with lock:
+            received.append(count)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    try:
+        start_barrier.wait()
+    except threading.BrokenBarrierError:
+        pass
+    for t in threads:
+        t.join()
+
+    expected = duration / 0.25
+    total = sum(received)
+    return {
+        "connected": connected[0],
+        "messages": total,
+        "messages_per_sec": total / duration,
+        "delivery_ratio": total / (expected * clients) if clients else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sunucu modu karşılaştırması")
+    parser.add_argument("--clients", type=int, default=50, help="Eşzamanlı HTTP istemcisi")
+    parser.add_argument("--ws-clients", type=int, default=100, help="WebSocket istemcisi")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--path", default="/api/status")
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--modes", default="dev,production")
+    args = parser.parse_args()
+
+    results = {}
+    for mode in args.modes.split(","):
+        port = free_port()
+        process = start_server(mode, port, 1, args.threads)
+        try:
+            http_result = http_load(port, args.path, args.clients, args.duration)
+        finally:
+            process.terminate()
+            process.wait()
+
+        port = free_port()
+        process = start_server(mode, port, 1, max(args.threads, args.ws_clients + 8))
+        try:
+            ws_result = socketio_fanout(port, args.ws_clients, args.duration)
+        finally:
+            process.terminate()
+            process.wait()
+
+        results[mode] = {"http": http_result, "socketio": ws_result}
+        print(f"[{mode}] HTTP {args.path}: {http_result['rps']:.0f} req/s "
+              f"(p50 {http_result['p50_ms']:.1f} ms, p99 {http_result['p99_ms']:.1f} ms, "
+              f"{http_result['errors']} hata)")
+        print(f"[{mode}] SocketIO: {ws_result['connected']}/{args.ws_clients} bağlı, "
+              f"{ws_result['messages_per_sec']:.0f} mesaj/s, "
+              f"teslim oranı %{ws_result['delivery_ratio'] * 100:.0f}")
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,11 @@ Configuration Module
 Uygulama yapılandırması.
 """
 
+import dataclasses
+import json
 import os
 from dataclasses import dataclass, field
-from typing import List
+from typing import Any, Dict, List
 
 
 @dataclass
@@ -17,14 +19,60 @@ class Config:
     port: int = 5000
     debug: bool = False
     
+    # Production server settings
+    server_mode: str = "dev"  # dev | production
+    workers: int = 1
+    threads: int = 64  # per worker
+    message_queue: str = ""  # e.g. redis://localhost:6379/0 (external Socket.IO emitters)
+    
+    # Hot-reloadable config file (JSON or TOML), applied over env/CLI settings
+    config_file: str = ""  # empty = disabled
+    config_poll_interval: float = 2.0  # seconds, stat polling when inotify is unavailable
+    
     # Monitoring settings
     refresh_interval: int = 30  # seconds
+    snapshot_interval: float = 5.0  # seconds (servis/log anlık görüntüsü)
+    
+    # Agent / aggregator settings
+    agent_interval: float = 5.0  # seconds
+    agent_max_inflight: int = 32  # unacknowledged frames
+    agent_spool_dir: str = ""  # log spool directory (empty = in memory)
+    agent_spool_max_mb: int = 256  # spool size cap (oldest segments dropped)
+    
+    # Host metrics settings
+    metrics_interval: float = 1.0  # seconds
+    metrics_history_size: int = 300  # samples
     
     # Alert thresholds
     error_threshold: int = 10
     warning_threshold: int = 20
+    cpu_threshold: float = 90.0  # percent
+    memory_threshold: float = 90.0  # percent
+    disk_threshold: float = 90.0  # percent
+    
+    # Log rate anomaly detection (replaces error_threshold when enabled)
+    anomaly_detection: bool = True
+    anomaly_interval: float = 60.0  # bucket length in seconds
+    anomaly_alpha: float = 0.1  # EWMA weight
+    anomaly_threshold: float = 4.0  # z-score
+    anomaly_max_series: int = 10000  # (service, level) series cap
+    
+    # Service state transitions (edge-triggered service alerts, uptime, flap detection)
+    flap_window: float = 600.0  # seconds
+    flap_threshold: int = 5  # up/down transitions within flap_window that count as flapping
+    transition_history: int = 1000  # recent transitions kept for /api/services/transitions
     
-    # Critical services
+    # --watch-critical (event driven, polling is the safety net)
+    watch_min_interval: float = 1.0  # seconds, poll interval right after a change
+    watch_max_interval: float = 60.0  # seconds, idle poll interval while journal events flow
+    watch_poll_max_interval: float = 5.0  # seconds, idle poll interval without events
+    
+    # Self-instrumentation (/api/internal/profile)
+    instrumentation: bool = False  # hot-path timing histograms and counters
+    profiler: bool = False  # continuous sampling profiler (collapsed stacks)
+    profiler_interval: float = 0.01  # seconds between stack samples
+    
+    # Critical services (exact names, globs like "postgresql@*" or "re:" regexes)
     critical_services: List[str] = field(default_factory=lambda: [
         # Linux
         "sshd", "nginx", "apache2", "mysql", "postgresql", "docker",
@@ -35,11 +83,118 @@ class Config:
     # Log settings
     max_log_entries: int = 1000
     log_retention_days: int = 7
+    log_archive: bool = True  # keep collected logs in compressed per-service blocks for log_retention_days
+    log_archive_block_size: int = 1024  # entries per compressed block
+    log_cursor_file: str = ""  # journal cursor / RecordId checkpoint (empty = in memory)
+    log_cursor_interval: float = 10.0  # seconds between checkpoint writes
+    template_depth: int = 4  # template miner parse tree depth
+    template_similarity: float = 0.4  # min token similarity to join a template
+    template_max_clusters: int = 5000
+    sketch_window: float = 60.0  # seconds per top-K / distinct-count window
+    sketch_windows: int = 60  # windows kept (default: last hour)
+    sketch_top_k: int = 50  # Space-Saving counters per window
+    log_query_scan_limit: int = 10000  # max entries read for ?q= queries with residual filters
+    ingest_governor: bool = True  # sample INFO/DEBUG per service during log storms
+    ingest_rate: float = 50.0  # entries/second per service before sampling
+    ingest_burst: float = 500.0  # token bucket capacity per service
+    ingest_reservoir: int = 100  # sampled entries kept per service/level per round
 
 
 # Default configuration
 config = Config()
 
+# Sıfırdan büyük olması gereken aralıklar (saniye)
+_POSITIVE_FIELDS = (
+    "refresh_interval", "snapshot_interval", "agent_interval", "metrics_interval",
+    "anomaly_interval", "watch_min_interval", "watch_max_interval", "watch_poll_max_interval",
+    "profiler_interval", "log_cursor_interval", "config_poll_interval", "sketch_window",
+    "ingest_rate", "ingest_burst", "flap_window"
+)
+_PERCENT_FIELDS = ("cpu_threshold", "memory_threshold", "disk_threshold")
+
+
+def _coerce(name: str, value: Any, current: Any) -> Any:
+    """Dosyadaki değeri alanın tipine çevir (uyumsuzsa ValueError)"""
+    if isinstance(current, bool):
+        if isinstance(value, bool):
+            return value
+    elif isinstance(current, int):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    elif isinstance(current, float):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+    elif isinstance(current, str):
+        if isinstance(value, str):
+            return value
+    elif isinstance(current, list):
+        if isinstance(value, list) and all(isinstance(item, str) for item in value):
+            return list(value)
+    raise ValueError(f"Invalid type for {name}: {value!r}")
+
+
+def validate_config(cfg: Config):
+    """Değer aralıklarını kontrol et (geçersizse ValueError)"""
+    for name in _POSITIVE_FIELDS:
+        if getattr(cfg, name) <= 0:
+            raise ValueError(f"{name} must be positive")
+    for name in _PERCENT_FIELDS:
+        if not 0 < getattr(cfg, name) <= 100:
+            raise ValueError(f"{name} must be between 0 and 100")
+    if cfg.error_threshold < 1 or cfg.warning_threshold < 1:
+        raise ValueError("error_threshold and warning_threshold must be at least 1")
+    if cfg.flap_threshold < 2:
+        raise ValueError("flap_threshold must be at least 2")
+    if not 0 < cfg.anomaly_alpha <= 1:
+        raise ValueError("anomaly_alpha must be between 0 and 1")
+    if cfg.server_mode not in ("dev", "production"):
+        raise ValueError(f"Unknown server_mode: {cfg.server_mode}")
+    if not 0 < cfg.port < 65536:
+        raise ValueError(f"Invalid port: {cfg.port}")
+
+
+def read_config_file(path: str) -> Dict[str, Any]:
+    """JSON veya (.toml uzantılı) TOML yapılandırma dosyasını oku"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            raise ValueError("TOML config files require Python 3.11+")
+        try:
+            values = tomllib.loads(data.decode("utf-8"))
+        except tomllib.TOMLDecodeError as e:
+            raise ValueError(f"Invalid TOML: {e}")
+    else:
+        try:
+            values = json.loads(data)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+    if not isinstance(values, dict):
+        raise ValueError("Config file must contain an object")
+    return values
+
+
+def load_config_file(path: str, base: Config = None) -> Config:
+    """
+    Dosyadaki alanları base üzerine uygulayıp yeni, doğrulanmış Config döndür.
+
+    base değişmez; dosyadan kaldırılan bir alan base'deki değerine döner.
+    Bilinmeyen alan, uyumsuz tip veya geçersiz değer ValueError fırlatır.
+    """
+    base = base or Config()
+    known = {item.name for item in dataclasses.fields(Config)}
+    updates = {}
+    for name, value in read_config_file(path).items():
+        if name not in known:
+            raise ValueError(f"Unknown config key: {name}")
+        updates[name] = _coerce(name, value, getattr(base, name))
+    cfg = dataclasses.replace(base, **updates)
+    cfg.critical_services = list(cfg.critical_services)
+    validate_config(cfg)
+    return cfg
+
 
 def load_config_from_env():
     """Environment variable'lardan yapılandırma yükle"""
@@ -49,8 +204,37 @@ def load_config_from_env():
     config.port = int(os.environ.get("MONITOR_PORT", config.port))
     config.debug = os.environ.get("MONITOR_DEBUG", "false").lower() == "true"
     
+    config.server_mode = os.environ.get("MONITOR_SERVER_MODE", config.server_mode)
+    config.workers = int(os.environ.get("MONITOR_WORKERS", config.workers))
+    config.threads = int(os.environ.get("MONITOR_THREADS", config.threads))
+    config.message_queue = os.environ.get("MONITOR_MESSAGE_QUEUE", config.message_queue)
+    
     config.error_threshold = int(os.environ.get("MONITOR_ERROR_THRESHOLD", config.error_threshold))
     config.warning_threshold = int(os.environ.get("MONITOR_WARNING_THRESHOLD", config.warning_threshold))
+    config.cpu_threshold = float(os.environ.get("MONITOR_CPU_THRESHOLD", config.cpu_threshold))
+    config.memory_threshold = float(os.environ.get("MONITOR_MEMORY_THRESHOLD", config.memory_threshold))
+    config.disk_threshold = float(os.environ.get("MONITOR_DISK_THRESHOLD", config.disk_threshold))
+    
+    config.metrics_interval = float(os.environ.get("MONITOR_METRICS_INTERVAL", config.metrics_interval))
+    config.agent_interval = float(os.environ.get("MONITOR_AGENT_INTERVAL", config.agent_interval))
+    config.agent_spool_dir = os.environ.get("MONITOR_AGENT_SPOOL_DIR", config.agent_spool_dir)
+    config.agent_spool_max_mb = int(os.environ.get("MONITOR_AGENT_SPOOL_MAX_MB", config.agent_spool_max_mb))
+    config.snapshot_interval = float(os.environ.get("MONITOR_SNAPSHOT_INTERVAL", config.snapshot_interval))
+    
+    config.config_file = os.environ.get("MONITOR_CONFIG_FILE", config.config_file)
+    config.log_archive = os.environ.get("MONITOR_LOG_ARCHIVE", "true").lower() == "true"
+    config.log_retention_days = int(os.environ.get("MONITOR_LOG_RETENTION_DAYS", config.log_retention_days))
+    config.log_cursor_file = os.environ.get("MONITOR_LOG_CURSOR_FILE", config.log_cursor_file)
+    config.log_cursor_interval = float(os.environ.get("MONITOR_LOG_CURSOR_INTERVAL", config.log_cursor_interval))
+    config.anomaly_detection = os.environ.get("MONITOR_ANOMALY_DETECTION", "true").lower() == "true"
+    config.anomaly_threshold = float(os.environ.get("MONITOR_ANOMALY_THRESHOLD", config.anomaly_threshold))
+    config.flap_window = float(os.environ.get("MONITOR_FLAP_WINDOW", config.flap_window))
+    config.flap_threshold = int(os.environ.get("MONITOR_FLAP_THRESHOLD", config.flap_threshold))
+    config.ingest_governor = os.environ.get("MONITOR_INGEST_GOVERNOR", "true").lower() == "true"
+    config.ingest_rate = float(os.environ.get("MONITOR_INGEST_RATE", config.ingest_rate))
+    config.template_similarity = float(os.environ.get("MONITOR_TEMPLATE_SIMILARITY", config.template_similarity))
+    config.instrumentation = os.environ.get("MONITOR_INSTRUMENTATION", "false").lower() == "true"
+    config.profiler = os.environ.get("MONITOR_PROFILER", "false").lower() == "true"
 
 
 # Load on import
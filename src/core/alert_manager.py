@@ -5,11 +5,13 @@ Uyarı sistemi modülü.
 
 from typing import List, Dict, Optional, Callable
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 import threading
 import time
 
+from .instrumentation import instruments
+
 
 class AlertSeverity(Enum):
     """Uyarı önem derecesi"""
@@ -23,9 +25,14 @@ class AlertType(Enum):
     """Uyarı tipi"""
     SERVICE_DOWN = "service_down"
     SERVICE_FAILED = "service_failed"
+    SERVICE_FLAPPING = "service_flapping"
     HIGH_ERROR_RATE = "high_error_rate"
     HIGH_WARNING_RATE = "high_warning_rate"
+    LOG_RATE_ANOMALY = "log_rate_anomaly"
     CRITICAL_SERVICE_DOWN = "critical_service_down"
+    HIGH_CPU_USAGE = "high_cpu_usage"
+    HIGH_MEMORY_USAGE = "high_memory_usage"
+    HIGH_DISK_USAGE = "high_disk_usage"
     CUSTOM = "custom"
 
 
@@ -41,6 +48,9 @@ class Alert:
     timestamp: datetime = field(default_factory=datetime.now)
     acknowledged: bool = False
     resolved: bool = False
+    version: int = 0  # AlertManager sürümü (son değişiklik)
+    # Kodlanmış to_dict() önbelleği (core.encoding, sürüme göre geçersizleşir)
+    _encoded: Optional[Dict] = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self) -> Dict:
         return {
@@ -52,7 +62,8 @@ class Alert:
             "source": self.source,
             "timestamp": self.timestamp.isoformat(),
             "acknowledged": self.acknowledged,
-            "resolved": self.resolved
+            "resolved": self.resolved,
+            "version": self.version
         }
 
 
@@ -62,19 +73,41 @@ class AlertManager:
     Kritik durumları tespit eder ve uyarı oluşturur.
     """
 
-    def __init__(self, error_threshold: int = 10, warning_threshold: int = 20):
+    # Metrik eşiği aşıldıktan sonra uyarının yeniden kurulması için
+    # değerin eşiğin bu kadar altına inmesi gerekir (salınımı önler)
+    METRIC_HYSTERESIS = 5.0
+
+    # Silinen uyarı kayıtlarının tutulacağı sürüm aralığı (delta istekleri için)
+    REMOVED_HISTORY = 1000
+
+    def __init__(self,
+                 error_threshold: int = 10,
+                 warning_threshold: int = 20,
+                 cpu_threshold: float = 90.0,
+                 memory_threshold: float = 90.0,
+                 disk_threshold: float = 90.0):
         """
         AlertManager başlatıcı.
         
         Args:
             error_threshold: Hata eşiği (bu kadar error log'da uyarı)
             warning_threshold: Uyarı eşiği
+            cpu_threshold: CPU kullanım eşiği (%)
+            memory_threshold: Bellek kullanım eşiği (%)
+            disk_threshold: Disk doluluk eşiği (%)
         """
         self.error_threshold = error_threshold
         self.warning_threshold = warning_threshold
+        self.cpu_threshold = cpu_threshold
+        self.memory_threshold = memory_threshold
+        self.disk_threshold = disk_threshold
+        self._metric_breaches = set()
         self.alerts: List[Alert] = []
         self._alert_counter = 0
-        self._lock = threading.Lock()
+        self.version = 0
+        self.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+        self._removed: Dict[str, int] = {}
+        self._lock = instruments.lock("alert_manager")
         self._callbacks: List[Callable[[Alert], None]] = []
 
     def _generate_id(self) -> str:
@@ -83,6 +116,24 @@ class AlertManager:
             self._alert_counter += 1
             return f"ALT-{self._alert_counter:06d}"
 
+    @property
+    def created_count(self) -> int:
+        """Süreç başından beri oluşturulan uyarı sayısı (temizlenenler dahil)"""
+        return self._alert_counter
+
+    def _touch(self, alert: Alert = None) -> int:
+        """
+        Uyarı listesi sürümünü artır (kilit tutulurken çağrılır).
+
+        Returns:
+            Yeni sürüm
+        """
+        self.version += 1
+        self.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+        if alert is not None:
+            alert.version = self.version
+        return self.version
+
     def add_callback(self, callback: Callable[[Alert], None]):
         """Yeni uyarı callback'i ekle"""
         self._callbacks.append(callback)
@@ -91,7 +142,7 @@ class AlertManager:
         """Callback'leri bilgilendir"""
         for callback in self._callbacks:
             try:
-                callback(alert)
+                instruments.call("callback.alert", callback, alert)
             except Exception as e:
                 print(f"Callback error: {e}")
 
@@ -118,6 +169,7 @@ class AlertManager:
         
         with self._lock:
             self.alerts.append(alert)
+            self._touch(alert)
         
         self._notify_callbacks(alert)
         return alert
@@ -149,6 +201,26 @@ class AlertManager:
                     source=service_name
                 )
 
+    def check_service_flapping(self, service_name: str, transitions: int, window: float,
+                               is_critical: bool = False):
+        """
+        Sık çalışma/durma geçişi yapan servis için uyarı oluştur (TransitionTracker).
+        
+        Args:
+            service_name: Servis adı
+            transitions: Pencere içindeki geçiş sayısı
+            window: Pencere uzunluğu (saniye)
+            is_critical: Kritik servis mi
+        """
+        self.create_alert(
+            type=AlertType.SERVICE_FLAPPING,
+            severity=AlertSeverity.HIGH if is_critical else AlertSeverity.MEDIUM,
+            title=f"Servis Dalgalanıyor: {service_name}",
+            message=(f"Servis '{service_name}' son {int(window)} sn içinde {transitions} kez "
+                     f"durdu/başladı."),
+            source=service_name
+        )
+
     def check_error_rate(self, error_count: int, total_count: int, source: str = "logs"):
         """
         Hata oranını kontrol et.
@@ -182,6 +254,70 @@ class AlertManager:
                 source=source
             )
 
+    def check_log_anomaly(self, service: str, level: str, count: int, expected: float,
+                          std: float, score: float, interval: float = 60.0):
+        """
+        Servis/seviye log hızı anomalisi için uyarı oluştur (RateAnomalyDetector).
+        
+        Args:
+            service: Servis adı
+            level: Log seviyesi adı
+            count: Açık kovadaki kayıt sayısı
+            expected: Serinin beklenen (EWMA) kova sayısı
+            std: Serinin standart sapması
+            score: z-skoru
+            interval: Kova uzunluğu (saniye)
+        """
+        severity = AlertSeverity.MEDIUM if level in ("WARNING", "NOTICE", "INFO", "DEBUG") else AlertSeverity.HIGH
+        self.create_alert(
+            type=AlertType.LOG_RATE_ANOMALY,
+            severity=severity,
+            title=f"Olağandışı Log Hızı: {service}",
+            message=(f"'{service}' servisinde {int(interval)} sn içinde {count} adet {level} "
+                     f"(beklenen {expected:.1f} ± {std:.1f}, z={score:.1f})."),
+            source=service
+        )
+
+    def check_system_metrics(self, metrics: Dict, source: str = "host"):
+        """
+        Host metriklerini eşiklerle karşılaştır.
+        
+        Her metrik için yalnızca eşik aşıldığı anda bir uyarı oluşturulur;
+        değer eşiğin METRIC_HYSTERESIS altına inene kadar tekrar uyarı verilmez.
+        
+        Args:
+            metrics: cpu_percent, memory_percent, disk_percent içeren sözlük
+            source: Kaynak
+        """
+        checks = [
+            ("cpu_percent", self.cpu_threshold, AlertType.HIGH_CPU_USAGE,
+             AlertSeverity.HIGH, "Yüksek CPU Kullanımı", "CPU kullanımı"),
+            ("memory_percent", self.memory_threshold, AlertType.HIGH_MEMORY_USAGE,
+             AlertSeverity.HIGH, "Yüksek Bellek Kullanımı", "Bellek kullanımı"),
+            ("disk_percent", self.disk_threshold, AlertType.HIGH_DISK_USAGE,
+             AlertSeverity.CRITICAL, "Disk Dolmak Üzere", "Disk doluluğu"),
+        ]
+        
+        for key, threshold, alert_type, severity, title, label in checks:
+            value = metrics.get(key)
+            if value is None:
+                continue
+            breach_key = (source, key)
+            
+            if value >= threshold:
+                if breach_key in self._metric_breaches:
+                    continue
+                self._metric_breaches.add(breach_key)
+                self.create_alert(
+                    type=alert_type,
+                    severity=severity,
+                    title=title,
+                    message=f"{label} %{value} (eşik %{threshold}).",
+                    source=source
+                )
+            elif value < threshold - self.METRIC_HYSTERESIS:
+                self._metric_breaches.discard(breach_key)
+
     def get_active_alerts(self) -> List[Alert]:
         """Çözülmemiş uyarıları döndür"""
         return [a for a in self.alerts if not a.resolved]
@@ -195,22 +331,63 @@ class AlertManager:
         return [a for a in self.alerts 
                 if a.severity == AlertSeverity.CRITICAL and not a.resolved]
 
+    def get_alerts_since(self, version: int, active_only: bool = False):
+        """
+        Verilen sürümden sonra değişen ve silinen uyarılar.
+
+        Returns:
+            (değişen uyarılar, silinen uyarı ID'leri); sürüm geçmişin
+            dışında kalıyorsa silinenler None döner (tam liste gerekir)
+        """
+        with self._lock:
+            alerts = [a for a in self.alerts if a.version > version]
+            if active_only:
+                # Çözülen uyarılar istemcinin aktif listesinden çıkmalı
+                removed = [a.id for a in alerts if a.resolved]
+                alerts = [a for a in alerts if not a.resolved]
+            else:
+                removed = []
+            if version < self.version - self.REMOVED_HISTORY:
+                return alerts, None
+            removed.extend(alert_id for alert_id, v in self._removed.items() if v > version)
+        return alerts, removed
+
     def acknowledge_alert(self, alert_id: str) -> bool:
         """Uyarıyı onayla"""
-        for alert in self.alerts:
-            if alert.id == alert_id:
-                alert.acknowledged = True
-                return True
+        with self._lock:
+            for alert in self.alerts:
+                if alert.id == alert_id:
+                    alert.acknowledged = True
+                    self._touch(alert)
+                    return True
         return False
 
     def resolve_alert(self, alert_id: str) -> bool:
         """Uyarıyı çözülmüş olarak işaretle"""
-        for alert in self.alerts:
-            if alert.id == alert_id:
-                alert.resolved = True
-                return True
+        with self._lock:
+            for alert in self.alerts:
+                if alert.id == alert_id:
+                    alert.resolved = True
+                    self._touch(alert)
+                    return True
         return False
 
+    def resolve_alerts(self, source: str, types) -> int:
+        """
+        Kaynağın verilen tiplerdeki aktif uyarılarını çöz (servis geri geldiğinde).
+        
+        Returns:
+            Çözülen uyarı sayısı
+        """
+        resolved = 0
+        with self._lock:
+            for alert in self.alerts:
+                if not alert.resolved and alert.source == source and alert.type in types:
+                    alert.resolved = True
+                    self._touch(alert)
+                    resolved += 1
+        return resolved
+
     def get_alert_summary(self) -> Dict:
         """Uyarı özeti döndür"""
         active = self.get_active_alerts()
@@ -227,7 +404,15 @@ class AlertManager:
     def clear_resolved(self):
         """Çözülmüş uyarıları temizle"""
         with self._lock:
+            removed = [a.id for a in self.alerts if a.resolved]
+            if not removed:
+                return
             self.alerts = [a for a in self.alerts if not a.resolved]
+            version = self._touch()
+            for alert_id in removed:
+                self._removed[alert_id] = version
+            floor = version - self.REMOVED_HISTORY
+            self._removed = {k: v for k, v in self._removed.items() if v > floor}
 
     def get_alerts_json(self) -> List[Dict]:
         """Tüm uyarıları JSON formatında döndür"""
@@ -0,0 +1,205 @@
+"""
+Anomaly Detector Module
+Servis/seviye bazında log hızı için akış tabanlı anomali tespiti.
+
+Her (servis, seviye) serisi sabit aralıklı kovalarda sayılır. Kapanan
+her kova üstel ağırlıklı ortalama (EWMA) ve varyansı O(1) adımda
+günceller; açık kovadaki sayı beklenenin threshold standart sapma
+üstüne çıktığı anda uyarı üretilir. Seri başına durum birkaç sayıdır
+ve seri sayısı max_series ile sınırlıdır (en uzun süre güncellenmeyen
+seri atılır).
+
+Tespitçi başlamadan önceki kayıtlar (açılışta okunan journal birikimi)
+yalnızca taban çizgisine katılır; geçmişteki patlamalar uyarı üretmez.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .alert_manager import AlertManager
+from .log_collector import LogEntry, LogLevel
+
+SeriesKey = Tuple[str, str]
+
+
+class _Series:
+    """Tek bir serinin sabit boyutlu durumu"""
+    __slots__ = ("bucket", "count", "mean", "var", "samples", "alerted")
+
+    def __init__(self, bucket: int, samples: int):
+        self.bucket = bucket
+        self.count = 0
+        self.mean = 0.0
+        self.var = 0.0
+        # Seri ilk kez görülmeden önceki kovalar sıfır sayılır
+        self.samples = samples
+        self.alerted = False
+
+
+class RateAnomalyDetector:
+    """
+    (servis, seviye) serileri için EWMA/varyans tabanlı hız anomalisi.
+
+    Sabit error_threshold yerine her serinin kendi taban çizgisi
+    öğrenilir; gürültülü bir servisin olağan hata hızı uyarı üretmezken
+    sessiz bir servisteki ani artış yakalanır. Bir anomali dönemi için
+    tek uyarı üretilir; kova beklenen aralığa dönünce yeniden kurulur.
+    """
+
+    # Boş kovaları uygularken en fazla adım; (1 - alpha)^adım ihmal edilebilir olunca durulur
+    MAX_GAP_STEPS = 200
+
+    def __init__(self,
+                 alert_manager: Optional[AlertManager] = None,
+                 interval: float = 60.0,
+                 alpha: float = 0.1,
+                 threshold: float = 4.0,
+                 warmup: int = 10,
+                 min_count: int = 5,
+                 max_level: LogLevel = LogLevel.WARNING,
+                 max_series: int = 10000,
+                 start: Optional[float] = None):
+        """
+        Args:
+            alert_manager: Uyarıların gönderileceği yönetici (None ise yalnızca sayılır)
+            interval: Kova uzunluğu (saniye)
+            alpha: EWMA ağırlığı (büyükse taban çizgisi daha hızlı uyum sağlar)
+            threshold: Uyarı için en az z-skoru
+            warmup: Uyarıdan önce gereken kapanmış kova sayısı
+            min_count: Uyarı için kovadaki en az kayıt
+            max_level: İzlenecek en düşük önemdeki seviye (varsayılan WARNING ve üstü)
+            max_series: En fazla seri
+            start: Bu andan eski kovalar puanlanmaz (None ise oluşturulma anı)
+        """
+        self.alert_manager = alert_manager
+        self.interval = interval
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.min_count = min_count
+        self.max_level = max_level
+        self.max_series = max_series
+
+        self._series: "OrderedDict[SeriesKey, _Series]" = OrderedDict()
+        self._origin: Optional[int] = None
+        self._start_bucket = int((time.time() if start is None else start) // interval)
+        self._gap_steps = min(self.MAX_GAP_STEPS, math.ceil(math.log(1e-4) / math.log(1 - alpha)))
+        self._lock = threading.Lock()
+
+        self.samples = 0
+        self.anomalies = 0
+        self.evicted = 0
+
+    # ===== Güncelleme =====
+
+    def _update(self, series: _Series, value: float):
+        """EWMA ortalama ve varyansı tek örnekle güncelle"""
+        diff = value - series.mean
+        increment = self.alpha * diff
+        series.mean += increment
+        series.var = (1 - self.alpha) * (series.var + diff * increment)
+        series.samples += 1
+
+    def _advance(self, series: _Series, bucket: int):
+        """Açık kovayı kapatıp bucket'a kadar boş kovaları uygula"""
+        if bucket <= series.bucket:
+            return
+        self._update(series, series.count)
+        gap = bucket - series.bucket - 1
+        for _ in range(min(gap, self._gap_steps)):
+            self._update(series, 0)
+        series.samples += max(gap - self._gap_steps, 0)
+        series.bucket = bucket
+        series.count = 0
+        series.alerted = False
+
+    def _get_series(self, key: SeriesKey, bucket: int) -> _Series:
+        series = self._series.get(key)
+        if series is None:
+            if self._origin is None:
+                self._origin = bucket
+            series = _Series(bucket, max(bucket - self._origin, 0))
+            self._series[key] = series
+            if len(self._series) > self.max_series:
+                self._series.popitem(last=False)
+                self.evicted += 1
+        else:
+            self._series.move_to_end(key)
+        return series
+
+    def _std(self, series: _Series) -> float:
+        # Poisson varsayımıyla alt sınır: taban çizgisi sıfıra yakın seriler
+        # tek kayıtla anomali sayılmasın
+        return math.sqrt(max(series.var, series.mean, 1.0))
+
+    def score(self, series: _Series) -> float:
+        """Açık kovanın z-skoru"""
+        return (series.count - series.mean) / self._std(series)
+
+    def observe(self, service: str, level: LogLevel, timestamp: float, count: int = 1) -> Optional[float]:
+        """
+        Tek kaydı seriye ekle.
+
+        Args:
+            count: Kaydın temsil ettiği kayıt sayısı (örneklenmiş kayıtlar için)
+
+        Returns:
+            Bu kayıtla anomali eşiği aşıldıysa z-skoru, aksi halde None
+        """
+        if level.value > self.max_level.value:
+            return None
+        bucket = int(timestamp // self.interval)
+        key = (service or "unknown", level.name)
+        with self._lock:
+            self.samples += 1
+            series = self._get_series(key, bucket)
+            self._advance(series, bucket)
+            series.count += count
+            if bucket < self._start_bucket or series.alerted or \
+                    series.samples < self.warmup or series.count < self.min_count:
+                return None
+            z = self.score(series)
+            if z < self.threshold:
+                return None
+            series.alerted = True
+            self.anomalies += 1
+            expected, std = series.mean, self._std(series)
+            count = series.count
+        if self.alert_manager is not None:
+            self.alert_manager.check_log_anomaly(key[0], key[1], count, expected, std, z, self.interval)
+        return z
+
+    def add_entries(self, entries: Iterable[LogEntry]):
+        """Log kayıtlarını serilere ekle (SnapshotManager log callback'i)"""
+        for entry in entries:
+            self.observe(entry.service, entry.level, entry.timestamp.timestamp(), entry.sample_weight)
+
+    # ===== Sorgu =====
+
+    def get_series(self, limit: int = 20) -> List[Dict]:
+        """Açık kovası beklenenin en çok üstünde olan seriler"""
+        with self._lock:
+            rows = [(self.score(series), key, series) for key, series in self._series.items()]
+        rows.sort(key=lambda row: row[0], reverse=True)
+        return [{
+            "service": key[0],
+            "level": key[1],
+            "count": series.count,
+            "expected": round(series.mean, 3),
+            "std": round(math.sqrt(series.var), 3),
+            "score": round(score, 2),
+            "samples": series.samples,
+            "anomalous": series.alerted
+        } for score, key, series in rows[:limit]]
+
+    def get_stats(self) -> Dict:
+        return {
+            "series": len(self._series),
+            "samples": self.samples,
+            "anomalies": self.anomalies,
+            "evicted": self.evicted,
+            "interval": self.interval
+        }
@@ -0,0 +1,198 @@
+"""
+Async Utilities Module
+asyncio alt süreç yardımcıları ve senkron sarmalayıcılar.
+
+asyncio yalnızca async yardımcılar ilk kez çağrıldığında import edilir;
+CLI komutları (--logs, --list-services, --self-check) senkron
+karşılıkları (run_command_sync, stream_command_sync) kullanır ve
+event loop kurma maliyetini ödemez.
+"""
+
+import subprocess
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Coroutine, Iterator, List, Tuple
+
+from .instrumentation import instruments
+
+# Varsayılan komut zaman aşımı (saniye)
+COMMAND_TIMEOUT = 30
+
+
+def run_sync(coro: Coroutine):
+    """
+    Bir coroutine'i senkron koddan çalıştır (CLI ve Flask view'ları için).
+
+    Çalışan bir event loop içinden çağrılırsa kilitlenmek yerine hata verir;
+    bu durumda async API doğrudan await edilmelidir.
+    """
+    import asyncio
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    coro.close()
+    raise RuntimeError("run_sync cannot be called from a running event loop; await the async API instead")
+
+
+async def _terminate(process):
+    """
+    Süreç hâlâ çalışıyorsa öldür ve zombi bırakmamak için bekle.
+
+    wait() yerine communicate() kullanılır: tampon dolduğu için okuması
+    duraklatılmış bir stdout borusu boşaltılmazsa wait() hiç dönmeyebilir.
+    """
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+        await process.communicate()
+
+
+async def run_command(cmd: List[str], timeout: float = COMMAND_TIMEOUT) -> Tuple[str, str, int]:
+    """
+    Komutu asyncio alt süreci olarak çalıştır.
+
+    Zaman aşımında veya çağıran görev iptal edildiğinde süreç öldürülür.
+
+    Returns:
+        (stdout, stderr, return_code) tuple
+    """
+    import asyncio
+    start = time.perf_counter()
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+    except Exception as e:
+        return "", str(e), 1
+
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        await _terminate(process)
+        instruments.command(cmd, time.perf_counter() - start, "timeout")
+        return "", "Command timed out", 1
+    except asyncio.CancelledError:
+        await _terminate(process)
+        raise
+
+    instruments.command(cmd, time.perf_counter() - start, process.returncode)
+    return (stdout.decode("utf-8", errors="replace"),
+            stderr.decode("utf-8", errors="replace"),
+            process.returncode)
+
+
+@asynccontextmanager
+async def stream_command(cmd: List[str], timeout: float = COMMAND_TIMEOUT) -> AsyncIterator[AsyncIterator[str]]:
+    """
+    Komutun stdout satırlarını geldikçe veren bağlam yöneticisi.
+
+    Bağlamdan çıkıldığında (erken break, zaman aşımı, iptal) süreç öldürülür;
+    böylece okuyucu yeterli satırı aldığında kalan çıktı üretilmez.
+
+    Kullanım:
+        async with stream_command(cmd) as lines:
+            async for line in lines:
+                ...
+
+    Raises:
+        TimeoutError: Çıktı timeout içinde bitmedi; okunan satırlar eksiktir
+            ve çağıran imleç ilerletmemelidir
+    """
+    import asyncio
+    start = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    timed_out = False
+
+    async def lines():
+        nonlocal timed_out
+        while True:
+            remaining = deadline - loop.time()
+            try:
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                line = await asyncio.wait_for(process.stdout.readline(), remaining)
+            except asyncio.TimeoutError:
+                timed_out = True
+                raise TimeoutError(f"Command timed out after {timeout}s: {cmd[0]}") from None
+            if not line:
+                return
+            yield line.decode("utf-8", errors="replace").rstrip("\n")
+
+    try:
+        yield lines()
+    finally:
+        await _terminate(process)
+        instruments.command(cmd, time.perf_counter() - start, "timeout" if timed_out else process.returncode)
+
+
+def run_command_sync(cmd: List[str], timeout: float = COMMAND_TIMEOUT) -> Tuple[str, str, int]:
+    """
+    run_command'ın senkron karşılığı (event loop kurulmaz).
+
+    Returns:
+        (stdout, stderr, return_code) tuple
+    """
+    start = time.perf_counter()
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        instruments.command(cmd, time.perf_counter() - start, "timeout")
+        return "", "Command timed out", 1
+    except Exception as e:
+        return "", str(e), 1
+    instruments.command(cmd, time.perf_counter() - start, result.returncode)
+    return (result.stdout.decode("utf-8", errors="replace"),
+            result.stderr.decode("utf-8", errors="replace"),
+            result.returncode)
+
+
+@contextmanager
+def stream_command_sync(cmd: List[str], timeout: float = COMMAND_TIMEOUT) -> Iterator[Iterator[str]]:
+    """
+    stream_command'ın senkron karşılığı.
+
+    Zaman aşımında süreç bir zamanlayıcı ile öldürülür ve satır akışı
+    TimeoutError ile biter; bağlamdan çıkıldığında süreç hâlâ çalışıyorsa
+    öldürülür.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    expired = threading.Event()
+
+    def expire():
+        if process.poll() is None:
+            expired.set()
+            process.kill()
+
+    timer = threading.Timer(timeout, expire)
+    timer.daemon = True
+    timer.start()
+
+    def lines():
+        for line in process.stdout:
+            yield line.decode("utf-8", errors="replace").rstrip("\n")
+        if expired.is_set():
+            raise TimeoutError(f"Command timed out after {timeout}s: {cmd[0]}")
+
+    try:
+        yield lines()
+    finally:
+        timer.cancel()
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        process.wait()
+        instruments.command(cmd, time.perf_counter() - start,
+                            "timeout" if expired.is_set() else process.returncode)
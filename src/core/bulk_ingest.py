@@ -0,0 +1,260 @@
+"""
+Bulk Ingest Module
+Geçmiş journal ve arşiv dosyalarını süreç havuzunda paralel ayrıştırma.
+
+Metin dosyaları (journalctl -o short-iso veya -o json çıktısı) satır
+sınırına hizalanmış bayt aralıklarına bölünür; her worker kendi
+aralığını dosyadan okur, ayrıştırır ve sütun düzeninde LogBatch döndürür.
+İkili .journal dosyaları `journalctl --file` ile okunur ve satır
+yığınları worker'lara gönderilir. Aynı anda en fazla 2×worker görev
+bekler; tamamlanan yığınlar gönderim sırasıyla hemen LogStore'a
+birleştirilir, böylece bellekte tüm dosya yerine birkaç yığın tutulur.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+from dataclasses import dataclass
+from typing import Deque, Iterator, List, Optional, Sequence, Tuple
+
+# Adapters modülünü import edebilmek için path ekle
+src_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from adapters.linux_adapter import (
+    LinuxAdapter, LOG_LINE_RE, parse_iso_timestamp, guess_level, journal_record_fields
+)
+from .log_store import LogBatch, LogStore
+
+FORMATS = ("text", "json", "journal")
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024  # bayt
+DEFAULT_CHUNK_LINES = 20000  # .journal okurken worker başına satır
+
+
+@dataclass
+class IngestResult:
+    """Toplu içe aktarma özeti"""
+    files: int = 0
+    chunks: int = 0
+    entries: int = 0
+    skipped: int = 0
+    bytes: int = 0
+    workers: int = 1
+    duration: float = 0.0
+
+    @property
+    def entries_per_second(self) -> float:
+        return self.entries / self.duration if self.duration else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "files": self.files,
+            "chunks": self.chunks,
+            "entries": self.entries,
+            "skipped": self.skipped,
+            "bytes": self.bytes,
+            "workers": self.workers,
+            "duration": round(self.duration, 3),
+            "entries_per_second": round(self.entries_per_second, 1)
+        }
+
+
+# ===== Worker fonksiyonları (modül seviyesinde: süreçler arası pickle edilebilir) =====
+
+def parse_lines(lines: Sequence[str], fmt: str) -> LogBatch:
+    """
+    Satırları sütun düzeninde yığına ayrıştır (zamana göre sıralı).
+
+    Args:
+        lines: Log satırları
+        fmt: 'text' (short-iso) veya 'json' (journalctl -o json)
+    """
+    batch = LogBatch()
+    append = batch.append
+    if fmt == "json":
+        loads = json.loads
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                fields = journal_record_fields(loads(line))
+            except ValueError:
+                fields = None
+            if fields is None:
+                batch.skipped += 1
+                continue
+            ts, level, service, hostname, message = fields
+            append(ts, level.value, service, hostname, message)
+    else:
+        match = LOG_LINE_RE.match
+        last_stamp = None
+        last_ts = 0.0
+        for line in lines:
+            m = match(line)
+            if m is None:
+                if line.strip():
+                    batch.skipped += 1
+                continue
+            stamp, hostname, service, message = m.groups()
+            # Aynı saniyedeki satırlar zaman damgasını paylaşır
+            if stamp != last_stamp:
+                try:
+                    last_ts = parse_iso_timestamp(stamp).timestamp()
+                except ValueError:
+                    batch.skipped += 1
+                    continue
+                last_stamp = stamp
+            append(last_ts, guess_level(message).value, service, hostname, message)
+    batch.sort()
+    return batch
+
+
+def parse_file_chunk(path: str, start: int, end: int, fmt: str) -> LogBatch:
+    """Dosyanın [start, end) bayt aralığını oku ve ayrıştır"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return parse_lines(data.decode("utf-8", errors="replace").splitlines(), fmt)
+
+
+# ===== Ana süreç =====
+
+def detect_format(path: str) -> str:
+    """Dosya biçimini uzantı ve ilk satırdan tahmin et"""
+    if path.endswith(".journal") or path.endswith(".journal~"):
+        return "journal"
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                return "json" if line.startswith(b"{") else "text"
+    return "text"
+
+
+def chunk_ranges(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Tuple[int, int]]:
+    """
+    Dosyayı satır sınırına hizalı bayt aralıklarına böl.
+
+    Her aralığın sonu bir sonraki satır başına kaydırılır; böylece
+    hiçbir satır iki worker arasında bölünmez.
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    start = 0
+    with open(path, "rb") as f:
+        while start < size:
+            end = start + chunk_size
+            if end >= size:
+                end = size
+            else:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _journal_line_chunks(path: str, chunk_lines: int) -> Iterator[List[str]]:
+    """İkili .journal dosyasını journalctl ile JSON satır yığınları olarak oku"""
+    cmd = ["journalctl", "--no-pager", f"--file={path}", "-o", "json",
+           "--output-fields=" + ",".join(LinuxAdapter.JOURNAL_FIELDS)]
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                               encoding="utf-8", errors="replace")
+    try:
+        chunk = []
+        for line in process.stdout:
+            chunk.append(line)
+            if len(chunk) >= chunk_lines:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        process.stdout.close()
+        process.wait()
+
+
+class BulkIngestor:
+    """
+    Dosyaları süreç havuzunda paralel ayrıştırıp LogStore'a ekler.
+
+    Worker'lar LogEntry nesneleri yerine sütun listeleri döndürür;
+    süreçler arası aktarım ve ana süreçteki birleştirme maliyeti düşük
+    kalır. workers=1 ise havuz kurulmaz, aynı süreçte çalışılır.
+    """
+
+    def __init__(self,
+                 store: LogStore = None,
+                 workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 chunk_lines: int = DEFAULT_CHUNK_LINES):
+        """
+        Args:
+            store: Hedef depo (None ise yeni LogStore)
+            workers: Süreç sayısı (None ise CPU sayısı)
+            chunk_size: Metin dosyalarında yığın boyutu (bayt)
+            chunk_lines: .journal dosyalarında yığın başına satır
+        """
+        self.store = store if store is not None else LogStore()
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+        self.chunk_lines = chunk_lines
+
+    def ingest(self, paths: Sequence[str], fmt: Optional[str] = None) -> IngestResult:
+        """
+        Dosyaları ayrıştırıp depoya ekle.
+
+        Args:
+            paths: Dosya yolları
+            fmt: 'text', 'json' veya 'journal' (None ise dosya başına tahmin)
+
+        Returns:
+            IngestResult özeti
+        """
+        result = IngestResult(files=len(paths), workers=self.workers)
+        start = time.perf_counter()
+
+        if self.workers == 1:
+            for func, args in self._tasks(paths, fmt, result):
+                self._merge(func(*args), result)
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                pending: Deque[Future] = deque()
+                for func, args in self._tasks(paths, fmt, result):
+                    if len(pending) >= 2 * self.workers:
+                        self._merge(pending.popleft().result(), result)
+                    pending.append(executor.submit(func, *args))
+                while pending:
+                    self._merge(pending.popleft().result(), result)
+
+        result.duration = time.perf_counter() - start
+        return result
+
+    def _merge(self, batch: LogBatch, result: IngestResult):
+        """Tamamlanan yığını depoya ekle ve özeti güncelle"""
+        result.skipped += batch.skipped
+        result.entries += self.store.merge([batch])
+
+    def _tasks(self, paths: Sequence[str], fmt: Optional[str], result: IngestResult):
+        """(fonksiyon, argümanlar) görevleri; .journal yığınları okundukça üretilir"""
+        for path in paths:
+            file_format = fmt or detect_format(path)
+            if file_format not in FORMATS:
+                raise ValueError(f"Unknown format: {file_format}")
+            if file_format == "journal":
+                for chunk in _journal_line_chunks(path, self.chunk_lines):
+                    result.chunks += 1
+                    result.bytes += sum(len(line) for line in chunk)
+                    yield parse_lines, (chunk, "json")
+            else:
+                result.bytes += os.path.getsize(path)
+                for chunk_start, chunk_end in chunk_ranges(path, self.chunk_size):
+                    result.chunks += 1
+                    yield parse_file_chunk, (path, chunk_start, chunk_end, file_format)
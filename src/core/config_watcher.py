@@ -0,0 +1,226 @@
+"""
+Config Watcher Module
+Yapılandırma dosyasının değişikliklerini izleyip süreç yeniden
+başlatılmadan uygulanması.
+
+Linux'ta dosyanın bulunduğu dizin inotify ile izlenir (editörlerin ve
+Kubernetes ConfigMap'lerinin yeni dosyayı rename ile koyması da
+yakalanır); olay gelince kısa bir bekleme sonrası dosya okunur.
+inotify yoksa (Windows, macOS, ctypes yok) dosyanın stat imzası
+poll_interval aralıkla karşılaştırılır. inotify çalışırken de seyrek
+bir stat kontrolü güvenlik ağı olarak sürer.
+
+Dosya load ile okunup doğrulanır; yalnızca geçerli yapılandırma
+apply'a verilir. Geçersiz dosya mevcut yapılandırmayı değiştirmez.
+"""
+
+import os
+import select
+import struct
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# inotify_add_watch maskesi: yazma bitti, taşındı, oluşturuldu/silindi, öznitelik
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+
+class Inotify:
+    """libc inotify çağrılarının ctypes sarmalayıcısı (tek dizin)"""
+
+    def __init__(self, directory: str):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed: {directory}")
+
+    def wait(self, timeout: float, wakeup_fd: int) -> bool:
+        """Olay gelene, wakeup_fd okunabilir olana veya timeout dolana kadar bekle"""
+        ready, _, _ = select.select([self.fd, wakeup_fd], [], [], timeout)
+        return self.fd in ready
+
+    def drain(self) -> List[str]:
+        """Bekleyen olayları oku; olaydaki dosya adlarını döndür"""
+        names = []
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return names
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = struct.unpack_from("iIII", data, offset)
+                offset += 16
+                names.append(os.fsdecode(data[offset:offset + length].rstrip(b"\0")))
+                offset += length
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _signature(path: str) -> Optional[Tuple[int, int, int]]:
+    """Dosyanın (mtime_ns, boyut, inode) imzası (yoksa None)"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class ConfigWatcher:
+    """
+    Yapılandırma dosyası izleyicisi.
+
+    load(path) yeni yapılandırmayı üretir (geçersizse ValueError/OSError),
+    apply(config) onu uygular ve değişen alan adlarını döndürür.
+    """
+
+    # inotify çalışırken güvenlik amaçlı stat kontrolü aralığı (saniye)
+    SAFETY_INTERVAL = 60.0
+
+    def __init__(self,
+                 path: str,
+                 load: Callable[[str], Any],
+                 apply: Callable[[Any], List[str]],
+                 poll_interval: float = 2.0,
+                 debounce: float = 0.1,
+                 use_inotify: bool = True):
+        """
+        Args:
+            path: İzlenen yapılandırma dosyası
+            load: Dosyayı okuyup doğrulayan fonksiyon
+            apply: Geçerli yapılandırmayı uygulayan fonksiyon
+            poll_interval: inotify yokken stat kontrolü aralığı (saniye)
+            debounce: Olaydan sonra yazmanın bitmesi için bekleme (saniye)
+            use_inotify: Destekleniyorsa inotify kullan
+        """
+        self.path = os.path.abspath(path)
+        self.load = load
+        self.apply = apply
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.use_inotify = use_inotify
+
+        self.backend = "poll"
+        self.reloads = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.last_changed: List[str] = []
+        self.last_reload: Optional[float] = None
+
+        self._signature = _signature(self.path)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify: Optional[Inotify] = None
+        self._wakeup: Optional[Tuple[int, int]] = None
+
+    def reload(self) -> Optional[List[str]]:
+        """
+        Dosyayı okuyup doğrula ve uygula.
+
+        Returns:
+            Değişen alan adları (dosya geçersizse None; mevcut yapılandırma korunur)
+        """
+        with self._lock:
+            self._signature = _signature(self.path)
+            try:
+                new_config = self.load(self.path)
+            except (OSError, ValueError) as e:
+                self.errors += 1
+                self.last_error = str(e)
+                print(f"Config reload error: {e}")
+                return None
+            changed = self.apply(new_config)
+            self.reloads += 1
+            self.last_error = None
+            self.last_changed = changed
+            self.last_reload = time.time()
+            return changed
+
+    def check(self) -> Optional[List[str]]:
+        """Dosya imzası değiştiyse yeniden yükle (değişmediyse None)"""
+        signature = _signature(self.path)
+        if signature == self._signature:
+            return None
+        if signature is None:
+            # Dosya silindi (veya rename arası): mevcut yapılandırma kalır
+            self._signature = None
+            return None
+        return self.reload()
+
+    def start(self):
+        """İzleme thread'ini başlat"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._inotify = None
+        if self.use_inotify:
+            try:
+                self._inotify = Inotify(os.path.dirname(self.path))
+                self._wakeup = os.pipe()
+                self.backend = "inotify"
+            except (OSError, AttributeError, ImportError) as e:
+                print(f"inotify unavailable, polling config file: {e}")
+                self.backend = "poll"
+        self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """İzlemeyi durdur"""
+        self._stop_event.set()
+        if self._wakeup:
+            os.write(self._wakeup[1], b"\0")
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+        if self._wakeup:
+            for fd in self._wakeup:
+                os.close(fd)
+            self._wakeup = None
+
+    def _run(self):
+        name = os.path.basename(self.path)
+        while not self._stop_event.is_set():
+            if self._inotify is None:
+                self._stop_event.wait(self.poll_interval)
+            elif self._inotify.wait(self.SAFETY_INTERVAL, self._wakeup[0]):
+                names = self._inotify.drain()
+                # Dizindeki başka dosyalar (ConfigMap'te ..data bağlantısı hariç) yok sayılır
+                if name not in names and not any(item.startswith("..") for item in names):
+                    continue
+                self._stop_event.wait(self.debounce)
+                self._inotify.drain()
+            if self._stop_event.is_set():
+                break
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Config watcher error: {e}")
+
+    def get_stats(self) -> Dict:
+        """İzleyici durumu"""
+        return {
+            "path": self.path,
+            "backend": self.backend,
+            "reloads": self.reloads,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "last_changed": self.last_changed,
+            "last_reload": self.last_reload
+        }
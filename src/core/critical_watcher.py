@@ -0,0 +1,268 @@
+"""
+Critical Watcher Module
+Kritik servislerin olay tabanlı izlenmesi (--watch-critical).
+
+Adaptör destekliyorsa (Linux: journalctl -f) kritik birimler için
+systemd'nin durum mesajları canlı izlenir; her uyanışta kuyruktaki
+olaylar birim başına tekilleştirilir ve yalnızca o birimlerin durumu
+tek sorguda alınır, değişiklik milisaniyeler içinde bildirilir. Olay kaynağı
+yoksa veya sessizse durum, boşta kaldıkça aralığı uzayan (backoff)
+periyodik sorgularla kontrol edilir.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional
+
+from .alert_manager import AlertManager
+from .service_monitor import ServiceMonitor, ServiceStatus
+
+DOWN_STATES = (ServiceStatus.STOPPED, ServiceStatus.FAILED)
+
+
+@dataclass
+class ServiceTransition:
+    """Kritik servis durum değişikliği"""
+    name: str
+    previous: Optional[ServiceStatus]
+    current: ServiceStatus
+    source: str  # 'event' veya 'poll'
+    changed_at: float  # olay zamanı (poll için önceki sorgu: üst sınır)
+    detected_at: float
+
+    @property
+    def latency(self) -> float:
+        return max(self.detected_at - self.changed_at, 0.0)
+
+    @property
+    def is_down(self) -> bool:
+        return self.current in DOWN_STATES
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    index = min(int(fraction * len(values)), len(values) - 1)
+    return values[index]
+
+
+class CriticalWatcher:
+    """
+    Kritik servis izleyici.
+
+    Journal olayları ayrı bir thread'de okunup kuyruğa yazılır; ana
+    döngü kuyruğu, bir sonraki güvenlik sorgusuna kadar bekler. Olay
+    geldiğinde veya durum değiştiğinde sorgu aralığı min_interval'a
+    döner, sessiz geçen her sorguda backoff ile çarpılır.
+    """
+
+    # Gecikme örneklerinin tutulacağı en fazla sayı (kaynak başına)
+    LATENCY_HISTORY = 10000
+
+    def __init__(self,
+                 monitor: ServiceMonitor,
+                 alert_manager: AlertManager = None,
+                 min_interval: float = 1.0,
+                 max_interval: float = 60.0,
+                 poll_max_interval: float = 5.0,
+                 backoff: float = 2.0,
+                 use_events: bool = True):
+        """
+        Args:
+            monitor: Servis izleyici (kritik servis listesi buradan alınır)
+            alert_manager: Durma uyarılarının gönderileceği yönetici
+            min_interval: Değişiklik sonrası sorgu aralığı (saniye)
+            max_interval: Olay kaynağı çalışırken en uzun sorgu aralığı
+            poll_max_interval: Olay kaynağı yokken en uzun sorgu aralığı
+            backoff: Sessiz geçen her sorguda aralık çarpanı
+            use_events: Adaptörün olay kaynağını kullan
+        """
+        self.monitor = monitor
+        self.alert_manager = alert_manager
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.poll_max_interval = poll_max_interval
+        self.backoff = backoff
+        self.use_events = use_events
+
+        self.states: Dict[str, ServiceStatus] = {}
+        self.interval = min_interval
+        self.events_active = False
+        self.polls = 0
+        self.events = 0
+        self.latencies: Dict[str, Deque[float]] = {
+            "event": deque(maxlen=self.LATENCY_HISTORY),
+            "poll": deque(maxlen=self.LATENCY_HISTORY)
+        }
+
+        self._last_poll: Optional[float] = None
+        self._events: "queue.Queue" = queue.Queue()
+        self._follower = None
+        self._follower_thread: Optional[threading.Thread] = None
+        self._callbacks: List[Callable[[ServiceTransition], None]] = []
+        self._stop_event = threading.Event()
+
+    def add_callback(self, callback: Callable[[ServiceTransition], None]):
+        """Durum değişikliği callback'i ekle"""
+        self._callbacks.append(callback)
+
+    def _notify(self, transition: ServiceTransition):
+        if transition.is_down and self.alert_manager is not None:
+            self.alert_manager.check_service_status(transition.name, is_running=False, is_critical=True)
+        for callback in self._callbacks:
+            try:
+                callback(transition)
+            except Exception as e:
+                print(f"Watcher callback error: {e}")
+
+    # ===== Durum karşılaştırma =====
+
+    def _apply(self, states: Dict[str, ServiceStatus], source: str,
+               changed_at: float, detected_at: float) -> List[ServiceTransition]:
+        transitions = []
+        for name, status in states.items():
+            previous = self.states.get(name)
+            if status == previous:
+                continue
+            if status == ServiceStatus.UNKNOWN and previous is not None:
+                # activating/deactivating gibi ara durumlar; son durum sonraki mesaj/sorguda gelir
+                continue
+            self.states[name] = status
+            if previous is None and status not in DOWN_STATES:
+                continue
+            transition = ServiceTransition(name, previous, status, source, changed_at, detected_at)
+            if previous is not None:
+                self.latencies[source].append(transition.latency)
+            transitions.append(transition)
+        for transition in transitions:
+            self._notify(transition)
+        return transitions
+
+    def poll(self) -> List[ServiceTransition]:
+        """Tüm kritik servisleri tek sorguda kontrol et (güvenlik sorgusu)"""
+        states = self.monitor.get_critical_states()
+        detected_at = time.time()
+        changed_at = self._last_poll if self._last_poll is not None else detected_at
+        self._last_poll = detected_at
+        self.polls += 1
+        return self._apply(states, "poll", changed_at, detected_at)
+
+    def handle_event(self, name: str, event_at: float) -> List[ServiceTransition]:
+        """Journal mesajı gelen servisin durumunu kontrol et"""
+        self.events += 1
+        return self.handle_events({name: event_at})
+
+    def handle_events(self, events: Dict[str, float]) -> List[ServiceTransition]:
+        """
+        Olay gelen servislerin durumunu tek sorguda kontrol et.
+
+        Args:
+            events: Servis adı -> ilk olay zamanı
+        """
+        names = [name for name in events if self.monitor.is_critical(name)]
+        if not names:
+            return []
+        states = self.monitor.get_critical_states(names)
+        detected_at = time.time()
+        transitions = []
+        for name, status in states.items():
+            changed_at = min(events.get(name, detected_at), detected_at)
+            transitions.extend(self._apply({name: status}, "event", changed_at, detected_at))
+        return transitions
+
+    def _drain(self, item) -> Dict[str, float]:
+        """Kuyruktaki tüm olayları al; aynı birim için en erken zaman tutulur"""
+        batch: Dict[str, float] = {}
+        while True:
+            if item is not None:
+                self.events += 1
+                name, event_at = item
+                if event_at < batch.get(name, event_at + 1):
+                    batch[name] = event_at
+            try:
+                item = self._events.get_nowait()
+            except queue.Empty:
+                return batch
+
+    def _adapt(self, changed: bool):
+        """Sorgu aralığını güncelle"""
+        if changed:
+            self.interval = self.min_interval
+            return
+        limit = self.max_interval if self.events_active else self.poll_max_interval
+        self.interval = min(self.interval * self.backoff, limit)
+
+    # ===== Olay kaynağı =====
+
+    def _start_follower(self):
+        follow = getattr(self.monitor.adapter, "follow_unit_events", None)
+        if not self.use_events or follow is None:
+            return
+        # Desenler şu an var olan birimlere açılır; sonradan oluşanları güvenlik sorgusu yakalar
+        self._follower = follow(self.monitor.get_critical_names())
+        self.events_active = True
+        self._follower_thread = threading.Thread(target=self._follow, name="critical-events", daemon=True)
+        self._follower_thread.start()
+
+    def _follow(self):
+        try:
+            for name, event_at in self._follower:
+                self._events.put((name, event_at))
+        except Exception as e:
+            print(f"Journal follow error: {e}")
+        finally:
+            # journalctl çıktıysa yalnızca sorgu ile devam edilir
+            self.events_active = False
+            self._events.put(None)
+
+    # ===== Döngü =====
+
+    def run(self):
+        """stop() çağrılana kadar izle (çağıran thread'i bloklar)"""
+        self._stop_event.clear()
+        self._start_follower()
+        self._adapt(bool(self.poll()))
+        while not self._stop_event.is_set():
+            try:
+                item = self._events.get(timeout=self.interval)
+            except queue.Empty:
+                self._adapt(bool(self.poll()))
+                continue
+            batch = self._drain(item)
+            if not batch:
+                continue
+            self.handle_events(batch)
+            # Olay sonrası son durum kısa süre içinde güvenlik sorgusuyla da doğrulanır
+            self.interval = self.min_interval
+
+    def stop(self):
+        """İzlemeyi durdur"""
+        self._stop_event.set()
+        if self._follower is not None:
+            self._follower.close()
+        self._events.put(None)
+        if self._follower_thread is not None:
+            self._follower_thread.join(timeout=5)
+            self._follower_thread = None
+
+    def get_latency_report(self) -> Dict:
+        """Kaynak başına algılama gecikmesi dağılımı (milisaniye)"""
+        report = {
+            "polls": self.polls,
+            "events": self.events,
+            "events_active": self.events_active,
+            "interval": self.interval
+        }
+        for source, samples in self.latencies.items():
+            values = sorted(samples)
+            report[source] = {
+                "count": len(values),
+                "p50_ms": round(_percentile(values, 0.50) * 1000, 1),
+                "p90_ms": round(_percentile(values, 0.90) * 1000, 1),
+                "p99_ms": round(_percentile(values, 0.99) * 1000, 1),
+                "max_ms": round(values[-1] * 1000, 1) if values else 0.0
+            }
+        return report
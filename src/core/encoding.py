@@ -0,0 +1,170 @@
+"""
+Encoding Module
+API yükleri için hızlı serileştirme katmanı.
+
+Log kayıtları, servisler ve uyarılar bir kez to_dict() ile sözlüğe
+çevrilip kodlanır; kodlanmış baytlar nesnenin üzerinde saklanır
+(`_encoded`). Yanıtlar bu parçaların uç uca eklenmesiyle kurulur,
+böylece büyük bir /api/logs yanıtının maliyeti nesne başına sözlük
+kurmak yerine bayt kopyalamaya iner.
+
+Arka uçlar: orjson kuruluysa JSON onunla, değilse standart json ile
+kodlanır; msgpack kuruluysa MessagePack de sunulur (web katmanında
+Accept başlığıyla seçilir).
+"""
+
+import json
+from typing import Any, Dict, Iterable, Iterator, List
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+JSON = "json"
+MSGPACK = "msgpack"
+
+CONTENT_TYPES = {
+    JSON: "application/json",
+    MSGPACK: "application/msgpack"
+}
+
+# Accept başlığında MessagePack için kullanılan medya tipleri
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+# Akış yanıtlarında tek seferde birleştirilen parça sayısı
+CHUNK_ITEMS = 512
+
+
+def available_formats() -> List[str]:
+    """Sunulabilen kodlamalar (JSON her zaman)"""
+    return [JSON, MSGPACK] if MSGPACK_AVAILABLE else [JSON]
+
+
+def _dumps_json(value: Any) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(value: Any, fmt: str = JSON) -> bytes:
+    """Değeri seçilen biçimde kodla"""
+    if fmt == MSGPACK:
+        return msgpack.packb(value, use_bin_type=True)
+    return _dumps_json(value)
+
+
+def loads(data: bytes, fmt: str = JSON) -> Any:
+    """dumps'ın tersi (testler ve istemciler için)"""
+    if fmt == MSGPACK:
+        return msgpack.unpackb(data, raw=False)
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def encode_item(item, fmt: str = JSON, version: Any = None) -> bytes:
+    """
+    item.to_dict() çıktısının kodlanmış hali (nesne üzerinde önbelleklenir).
+
+    Args:
+        item: to_dict() ve _encoded özniteliği olan nesne (LogEntry, ServiceInfo, Alert)
+        version: Nesne değiştikçe değişen değer (ör. Alert.version); önbellekteki
+            kopya farklı bir sürüme aitse yeniden kodlanır
+    """
+    cache = item._encoded
+    if cache is None:
+        cache = item._encoded = {}
+    cached = cache.get(fmt)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    data = dumps(item.to_dict(), fmt)
+    cache[fmt] = (version, data)
+    return data
+
+
+class Fragments:
+    """
+    Önceden kodlanmış dizi elemanları.
+
+    encode_document içinde bir alanın değeri olarak verildiğinde eleman
+    baytları yeniden kodlanmadan diziye eklenir.
+    """
+    __slots__ = ("items",)
+
+    def __init__(self, items: List[bytes]):
+        self.items = items
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+def _msgpack_header(size: int, fix: int, code16: int, code32: int) -> bytes:
+    if size < 16:
+        return bytes((fix | size,))
+    if size < 0x10000:
+        return bytes((code16,)) + size.to_bytes(2, "big")
+    return bytes((code32,)) + size.to_bytes(4, "big")
+
+
+def _iter_json_array(items: List[bytes]) -> Iterator[bytes]:
+    yield b"["
+    for start in range(0, len(items), CHUNK_ITEMS):
+        chunk = b",".join(items[start:start + CHUNK_ITEMS])
+        yield b"," + chunk if start else chunk
+    yield b"]"
+
+
+def iter_document(fields: Dict[str, Any], fmt: str = JSON) -> Iterator[bytes]:
+    """
+    Üst düzey nesneyi parça parça kodla (akış yanıtları için).
+
+    Fragments değerleri önceden kodlanmış elemanlardan dizi olarak
+    eklenir; diğer değerler dumps ile kodlanır. Büyük diziler
+    CHUNK_ITEMS elemanlık parçalar halinde verilir.
+    """
+    if fmt == MSGPACK:
+        yield _msgpack_header(len(fields), 0x80, 0xde, 0xdf)
+        for key, value in fields.items():
+            yield dumps(key, fmt)
+            if isinstance(value, Fragments):
+                yield _msgpack_header(len(value), 0x90, 0xdc, 0xdd)
+                for start in range(0, len(value), CHUNK_ITEMS):
+                    yield b"".join(value.items[start:start + CHUNK_ITEMS])
+            else:
+                yield dumps(value, fmt)
+        return
+
+    first = True
+    for key, value in fields.items():
+        prefix = b"{" if first else b","
+        first = False
+        yield prefix + _dumps_json(key) + b":"
+        if isinstance(value, Fragments):
+            yield from _iter_json_array(value.items)
+        else:
+            yield _dumps_json(value)
+    yield b"}" if not first else b"{}"
+
+
+def encode_document(fields: Dict[str, Any], fmt: str = JSON) -> bytes:
+    """iter_document çıktısını tek gövdede birleştir"""
+    return b"".join(iter_document(fields, fmt))
+
+
+def encode_items(items: Iterable, fmt: str = JSON, version=None) -> Fragments:
+    """
+    Nesne listesini önbellekli parçalara çevir.
+
+    Args:
+        version: Nesneden sürüm değeri üreten fonksiyon (None ise nesne değişmez kabul edilir)
+    """
+    if version is None:
+        return Fragments([encode_item(item, fmt) for item in items])
+    return Fragments([encode_item(item, fmt, version(item)) for item in items])
+
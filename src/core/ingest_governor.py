@@ -0,0 +1,194 @@
+"""
+Ingest Governor Module
+Log fırtınalarında yeni kayıtlar için hız sınırlama ve örnekleme.
+
+Her servisin bir token kovası vardır (kayıt zaman damgasıyla dolar).
+Kovası boşalan servisin yalnızca INFO ve DEBUG kayıtları, (servis,
+seviye) başına bir rezervuarda örneklenir. Rezervuarda kalan her kayda temsil
+ettiği kayıt sayısı `sample_weight` olarak yazılır. Ağırlıkların
+toplamı görülen kayıt sayısına tam eşittir; böylece istatistikler,
+sayaçlar ve anomali serileri ağırlıklarla sayıldığında sapmaz.
+NOTICE ve üstü kayıtlar (WARNING, ERROR...) hiçbir zaman atılmaz.
+
+Bellek servis sayısı (max_services) ve tur başına rezervuar boyutuyla,
+işlem süresi kayıt başına O(1) ile sınırlıdır.
+"""
+
+import random
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .log_collector import LogEntry, LogLevel
+
+
+class TokenBucket:
+    """rate/saniye dolan, en fazla burst token tutan kova"""
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated: Optional[float] = None
+
+    def take(self, now: float) -> bool:
+        """Bir token harca; kova boşsa False (zaman geri giderse dolum olmaz)"""
+        if self.updated is None:
+            self.updated = now
+        elif now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class Reservoir:
+    """Sabit boyutlu düzgün örneklem (Algorithm R)"""
+    __slots__ = ("size", "seen", "items")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.seen = 0
+        self.items: List[int] = []
+
+    def offer(self, item: int, rng: random.Random):
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+        else:
+            slot = rng.randrange(self.seen)
+            if slot < self.size:
+                self.items[slot] = item
+
+
+class IngestGovernor:
+    """
+    Yeni log yığınlarını servis bazında sınırlayan yönetici.
+
+    admit her toplama turunda bir kez çağrılır; rezervuarlar tur
+    başına kurulur, kovalar turlar arasında sürer.
+    """
+
+    def __init__(self,
+                 rate: float = 50.0,
+                 burst: float = 500.0,
+                 reservoir_size: int = 100,
+                 protect_level: LogLevel = LogLevel.NOTICE,
+                 max_services: int = 10000,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            rate: Servis başına saniyede örneklenmeden geçen kayıt
+            burst: Kova kapasitesi (kısa süreli patlamalar)
+            reservoir_size: Kovası boşalan (servis, seviye) başına turda tutulan kayıt
+            protect_level: Bu seviye ve üstü hiçbir zaman örneklenmez
+            max_services: Takip edilen en fazla servis kovası (en eski atılır)
+            seed: Örnekleme rastgeleliği (testler için)
+        """
+        self.rate = rate
+        self.burst = burst
+        self.reservoir_size = max(1, reservoir_size)
+        self.protect_level = protect_level
+        self.max_services = max_services
+        self._rng = random.Random(seed)
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.seen = 0
+        self.kept = 0
+        self.protected = 0
+        self.sampled = 0
+        self.dropped = 0
+        # Servis -> atılan kayıt sayısı (yalnızca örneklenen servisler)
+        self._dropped_by_service: Dict[str, int] = {}
+
+    def _bucket(self, service: str) -> TokenBucket:
+        bucket = self._buckets.get(service)
+        if bucket is None:
+            bucket = self._buckets[service] = TokenBucket(self.rate, self.burst)
+            if len(self._buckets) > self.max_services:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(service)
+        return bucket
+
+    def configure(self, rate: float, burst: float, reservoir_size: int):
+        """Sınırları değiştir; mevcut kovalar dolulukları korunarak güncellenir"""
+        with self._lock:
+            self.rate = rate
+            self.burst = burst
+            self.reservoir_size = max(1, reservoir_size)
+            for bucket in self._buckets.values():
+                bucket.rate = rate
+                bucket.burst = burst
+                bucket.tokens = min(bucket.tokens, burst)
+
+    def admit(self, entries: List[LogEntry]) -> List[LogEntry]:
+        """
+        Yığından tutulacak kayıtlar (sıra korunur).
+
+        Örneklenen kayıtların sample_weight alanı temsil ettikleri
+        kayıt sayısıdır; diğerlerininki 1 kalır.
+        """
+        if not entries:
+            return entries
+        protect = self.protect_level.value
+        keep: List[int] = []
+        reservoirs: Dict[Tuple[str, int], Reservoir] = {}
+
+        with self._lock:
+            for index, entry in enumerate(entries):
+                if entry.level.value <= protect:
+                    self.protected += 1
+                    keep.append(index)
+                    continue
+                service = entry.service or "unknown"
+                if self._bucket(service).take(entry.timestamp.timestamp()):
+                    keep.append(index)
+                    continue
+                key = (service, entry.level.value)
+                reservoir = reservoirs.get(key)
+                if reservoir is None:
+                    reservoir = reservoirs[key] = Reservoir(self.reservoir_size)
+                reservoir.offer(index, self._rng)
+
+            for (service, _), reservoir in reservoirs.items():
+                # Görülen sayı örneklere tam sayı ağırlıklarla dağıtılır
+                samples = sorted(reservoir.items)
+                base, extra = divmod(reservoir.seen, len(samples))
+                for position, index in enumerate(samples):
+                    entries[index].sample_weight = base + (1 if position < extra else 0)
+                keep.extend(samples)
+                dropped = reservoir.seen - len(samples)
+                self.sampled += len(samples)
+                self.dropped += dropped
+                self._dropped_by_service[service] = self._dropped_by_service.get(service, 0) + dropped
+
+            self.seen += len(entries)
+            self.kept += len(keep)
+
+        if not reservoirs:
+            return entries
+        keep.sort()
+        return [entries[index] for index in keep]
+
+    def get_stats(self, limit: int = 10) -> Dict:
+        """Sayaçlar ve en çok örneklenen servisler"""
+        with self._lock:
+            top = sorted(self._dropped_by_service.items(), key=lambda item: item[1], reverse=True)[:limit]
+            return {
+                "seen": self.seen,
+                "kept": self.kept,
+                "protected": self.protected,
+                "sampled": self.sampled,
+                "dropped": self.dropped,
+                "keep_ratio": round(self.kept / self.seen, 4) if self.seen else 1.0,
+                "rate": self.rate,
+                "burst": self.burst,
+                "reservoir_size": self.reservoir_size,
+                "services": len(self._buckets),
+                "top_sampled": [{"service": service, "dropped": count} for service, count in top]
+            }
@@ -0,0 +1,375 @@
+"""
+Instrumentation Module
+Panelin kendi sıcak yollarının ölçümü (süre histogramları, sayaçlar,
+önbellek isabet oranları) ve isteğe bağlı örnekleyici profiler.
+
+Ölçüm varsayılan olarak kapalıdır. Kapalıyken çağrı noktaları ya
+`instruments.enabled` kontrolüyle atlanır ya da ölçülmeyen nesneyi
+aynen geri alır (wrap, lock); böylece maliyet tek bir öznitelik
+okumasıdır. Modül seviyesindeki `instruments` süreç genelinde paylaşılır.
+"""
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+# Histogramlar mikro saniye kaydeder; 2 anlamlı basamak -> yarım kova başına 128 alt kova
+SUB_BUCKET_BITS = 8
+SUB_BUCKET_HALF = 1 << (SUB_BUCKET_BITS - 1)
+SUB_BUCKET_MASK = (1 << SUB_BUCKET_BITS) - 1
+
+
+class Histogram:
+    """
+    HDR tarzı log-doğrusal histogram.
+
+    Değerler 2'nin kuvvetleri aralıklarına, her aralık 128 eşit alt
+    kovaya bölünür; göreli hata %1'in altında kalır ve kayıt O(1)'dir.
+    Yalnızca dolu kovalar tutulur.
+    """
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _index(value: int) -> int:
+        bucket = (value | SUB_BUCKET_MASK).bit_length() - SUB_BUCKET_BITS
+        return (bucket << (SUB_BUCKET_BITS - 1)) + (value >> bucket)
+
+    @staticmethod
+    def _highest_equivalent(index: int) -> int:
+        """Kovadaki en büyük değer"""
+        bucket = max((index >> (SUB_BUCKET_BITS - 1)) - 1, 0)
+        sub = index - (bucket << (SUB_BUCKET_BITS - 1))
+        return ((sub + 1) << bucket) - 1
+
+    def record(self, value: int, count: int = 1):
+        """Mikro saniye cinsinden değer ekle"""
+        value = max(int(value), 0)
+        index = self._index(value)
+        with self._lock:
+            self.counts[index] = self.counts.get(index, 0) + count
+            self.count += count
+            self.total += value * count
+            if self.min is None or value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    def percentile(self, percent: float) -> int:
+        """Yüzdelik değeri (mikro saniye, kova üst sınırı)"""
+        with self._lock:
+            if not self.count:
+                return 0
+            target = max(int(percent / 100.0 * self.count + 0.5), 1)
+            seen = 0
+            for index in sorted(self.counts):
+                seen += self.counts[index]
+                if seen >= target:
+                    return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    def merge(self, other: "Histogram"):
+        """Başka bir histogramı bu histograma ekle"""
+        with other._lock:
+            counts = dict(other.counts)
+            count, total, low, high = other.count, other.total, other.min, other.max
+        with self._lock:
+            for index, n in counts.items():
+                self.counts[index] = self.counts.get(index, 0) + n
+            self.count += count
+            self.total += total
+            if low is not None and (self.min is None or low < self.min):
+                self.min = low
+            self.max = max(self.max, high)
+
+    def to_dict(self) -> Dict:
+        """Milisaniye cinsinden özet"""
+        return {
+            "count": self.count,
+            "min_ms": round((self.min or 0) / 1000, 3),
+            "mean_ms": round(self.total / self.count / 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) / 1000, 3),
+            "p90_ms": round(self.percentile(90) / 1000, 3),
+            "p99_ms": round(self.percentile(99) / 1000, 3),
+            "p999_ms": round(self.percentile(99.9) / 1000, 3),
+            "max_ms": round(self.max / 1000, 3)
+        }
+
+
+class _NullTimer:
+    """Ölçüm kapalıyken timer() yerine dönen boş bağlam yöneticisi"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class InstrumentedLock:
+    """
+    Bekleme ve tutma sürelerini ölçen threading.Lock sarmalayıcısı.
+
+    Kilit yeniden girişli değildir; tutma başlangıcı tek sahibi olan
+    thread tarafından yazılıp okunur.
+    """
+
+    def __init__(self, name: str, registry: "Instrumentation"):
+        self._lock = threading.Lock()
+        self._wait = registry.histogram(f"lock.{name}.wait")
+        self._hold = registry.histogram(f"lock.{name}.hold")
+        self._acquired_at = 0.0
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        start = time.perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        if acquired:
+            self._acquired_at = now = time.perf_counter()
+            self._wait.record((now - start) * 1e6)
+        return acquired
+
+    def release(self):
+        self._hold.record((time.perf_counter() - self._acquired_at) * 1e6)
+        self._lock.release()
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _callable_name(func: Callable) -> str:
+    name = getattr(func, "__qualname__", None) or type(func).__name__
+    return name.replace(".<locals>", "")
+
+
+class Instrumentation:
+    """
+    Adlandırılmış histogram ve sayaç kaydı.
+
+    Ad kuralı: "<alan>.<ayrıntı>" (ör. "subprocess.journalctl",
+    "route./api/services", "parse.journal_json", "lock.alert_manager.wait").
+    Önbellek isabetleri "cache.<ad>.hit" / "cache.<ad>.miss" sayaçlarıdır.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.started_at = time.time()
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def enable(self, enabled: bool = True):
+        """
+        Ölçümü aç/kapat.
+
+        Kilitler ve sarmalanan fonksiyonlar oluşturuldukları anda karar
+        verir; bunlar için ölçüm bileşenler kurulmadan önce açılmalıdır.
+        """
+        self.enabled = enabled
+
+    def reset(self):
+        """Tüm ölçümleri sıfırla"""
+        with self._lock:
+            self._histograms = {}
+            self._counters = {}
+            self.started_at = time.time()
+
+    # ===== Kayıt =====
+
+    def histogram(self, name: str) -> Histogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram())
+        return histogram
+
+    def record(self, name: str, seconds: float):
+        """Süre kaydet (saniye)"""
+        if self.enabled:
+            self.histogram(name).record(seconds * 1e6)
+
+    def increment(self, name: str, count: int = 1):
+        if self.enabled:
+            with self._lock:
+                self._counters[name] = self._counters.get(name, 0) + count
+
+    def cache(self, name: str, hit: bool):
+        """Önbellek isabeti/ıskası"""
+        if self.enabled:
+            self.increment(f"cache.{name}.{'hit' if hit else 'miss'}")
+
+    @contextmanager
+    def _timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram(name).record((time.perf_counter() - start) * 1e6)
+
+    def timer(self, name: str):
+        """Bloğun süresini ölçen bağlam yöneticisi (kapalıyken boş)"""
+        return self._timer(name) if self.enabled else _NULL_TIMER
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """
+        Her çağrısı ölçülen fonksiyon.
+
+        Ölçüm kapalıysa func aynen döner; sıcak döngülerde (satır başına
+        ayrıştırma) döngüden önce bir kez çağrılmalıdır.
+        """
+        if not self.enabled:
+            return func
+        histogram = self.histogram(name)
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.record((perf_counter() - start) * 1e6)
+        return timed
+
+    def call(self, prefix: str, callback: Callable, *args):
+        """Callback'i çağır; ölçüm açıksa süresini "<prefix>.<ad>" altında kaydet"""
+        if not self.enabled:
+            return callback(*args)
+        with self._timer(f"{prefix}.{_callable_name(callback)}"):
+            return callback(*args)
+
+    def lock(self, name: str):
+        """Ölçüm açıksa bekleme/tutma süresi ölçülen kilit, değilse threading.Lock"""
+        return InstrumentedLock(name, self) if self.enabled else threading.Lock()
+
+    def command(self, cmd, seconds: float, return_code: Optional[int]):
+        """Alt süreç süresi ve çıkış kodu"""
+        if not self.enabled or not cmd:
+            return
+        name = os.path.basename(cmd[0])
+        self.histogram(f"subprocess.{name}").record(seconds * 1e6)
+        self.increment(f"subprocess.{name}.exit.{return_code}")
+
+    # ===== Rapor =====
+
+    def get_report(self) -> Dict:
+        """Histogram özetleri, sayaçlar ve önbellek isabet oranları"""
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+        caches = {}
+        for name, value in counters.items():
+            if name.startswith("cache.") and name.endswith(".hit"):
+                key = name[len("cache."):-len(".hit")]
+                misses = counters.get(f"cache.{key}.miss", 0)
+                caches[key] = {"hits": value, "misses": misses,
+                               "hit_rate": round(value / (value + misses), 4)}
+        for name, value in counters.items():
+            if name.startswith("cache.") and name.endswith(".miss"):
+                key = name[len("cache."):-len(".miss")]
+                caches.setdefault(key, {"hits": 0, "misses": value, "hit_rate": 0.0})
+        return {
+            "enabled": self.enabled,
+            "since": self.started_at,
+            "histograms": {name: h.to_dict() for name, h in sorted(histograms.items())},
+            "counters": {name: value for name, value in sorted(counters.items())
+                         if not name.startswith("cache.")},
+            "caches": caches
+        }
+
+
+class SamplingProfiler:
+    """
+    Örnekleyici profiler.
+
+    Ayrı bir thread her interval saniyede tüm thread'lerin yığınını
+    (sys._current_frames) okur ve "thread;modül:fonksiyon;..." biçiminde
+    katlanmış yığınları sayar. Çıktı flamegraph.pl / speedscope ile
+    doğrudan kullanılabilir. Yalnızca çalışırken maliyeti vardır.
+    """
+
+    def __init__(self, interval: float = 0.01, max_depth: int = 64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples = 0
+        self._stacks: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _frame_name(self, frame) -> str:
+        code = frame.f_code
+        module = frame.f_globals.get("__name__") or os.path.basename(code.co_filename)
+        return f"{module}:{code.co_name}"
+
+    def sample(self):
+        """Tüm thread'lerden tek örnek al"""
+        names = {t.ident: t.name for t in threading.enumerate()}
+        own = threading.get_ident()
+        stacks = []
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            parts = []
+            while frame is not None and len(parts) < self.max_depth:
+                parts.append(self._frame_name(frame))
+                frame = frame.f_back
+            parts.append(names.get(ident, str(ident)))
+            stacks.append(";".join(reversed(parts)))
+        with self._lock:
+            for stack in stacks:
+                self._stacks[stack] = self._stacks.get(stack, 0) + 1
+            self.samples += 1
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        """Örneklemeyi başlat"""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Örneklemeyi durdur"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def reset(self):
+        with self._lock:
+            self._stacks = {}
+            self.samples = 0
+
+    def collapsed(self) -> str:
+        """Katlanmış yığınlar ("yığın sayı" satırları, en sık önce)"""
+        with self._lock:
+            items = sorted(self._stacks.items(), key=lambda item: -item[1])
+        return "".join(f"{stack} {count}\n" for stack, count in items)
+
+
+# Süreç genelinde paylaşılan kayıt
+instruments = Instrumentation()
@@ -0,0 +1,597 @@
+"""
+Log Blocks Module
+Saklanan loglar için servis bazında sıkıştırılmış blok deposu.
+
+Journal mesajları servis başına çok tekrarlıdır. Kayıtlar servis
+başına açık bir tamponda toplanır; tampon block_size kayda ulaşınca
+(veya block_age saniyeden eskiyse) sütun düzeninde kodlanıp
+sıkıştırılmış, değişmez bir bloğa dönüştürülür:
+
+- zaman damgaları ilk kayda göre mikrosaniye farkları,
+- kaynak ve mesaj sütunları dize tablosu + indeks (aynı mesaj bir kez),
+- örnekleme ağırlıkları (sample_weight) ayrı bir sütun,
+- tüm bölümler tek zlib (zstandard kuruluysa zstd) akışında.
+
+Servisin ilk bloğundan örneklenen mesajlar (rakamlar maskelenerek
+biçim başına bir örnek, en sık olan sona) o servisin ön tanımlı
+sözlüğü olur. Sonraki bloklar bu sözlükle sıkıştırılır; küçük bloklar
+da ilk baytlardan itibaren tekrarları bulabilir.
+
+Okuma şeffaftır: query/iter_logs LogStore ile aynı arayüzdedir, bloklar
+gerektiğinde çözülür ve son çözülenler küçük bir LRU önbellekte tutulur.
+retention_days verilirse en yeni kayıttan o kadar eski bloklar atılır.
+"""
+
+import heapq
+import re
+import struct
+import threading
+import zlib
+from array import array
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .log_collector import LogEntry, LogLevel
+from .log_store import LogBatch, _LEVELS
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:  # pragma: no cover - isteğe bağlı bağımlılık
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+# Blok başlığı: kayıt, kaynak tablosu ve mesaj tablosu boyutları, ilk zaman (µs)
+_HEADER = struct.Struct("<IIIq")
+_DIGITS = re.compile(r"\d+")
+
+
+def train_dictionary(messages: Iterable[str], size: int = 16384) -> bytes:
+    """
+    Örnek mesajlardan ön tanımlı sıkıştırma sözlüğü üret.
+
+    Rakamlar maskelenerek her mesaj biçiminden bir örnek alınır; en sık
+    biçimler sözlüğün sonuna yerleşir (sıkıştırıcı yakın eşleşmeleri
+    daha ucuza kodlar). Sözlük en fazla size bayttır.
+    """
+    shapes: Dict[str, str] = {}
+    counts: Counter = Counter()
+    for message in messages:
+        shape = _DIGITS.sub("0", message)
+        counts[shape] += 1
+        shapes.setdefault(shape, message)
+    parts: List[bytes] = []
+    total = 0
+    for shape, _ in counts.most_common():
+        data = shapes[shape].encode("utf-8", "replace")
+        if total + len(data) > size:
+            break
+        parts.append(data)
+        total += len(data)
+    return b"".join(reversed(parts))
+
+
+class ServiceDictionary:
+    """Bir servisin sözlüğü (zstd için hazırlanmış hali önbelleklenir)"""
+    __slots__ = ("data", "_zstd")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self._zstd = None
+
+    def zstd(self):
+        if self._zstd is None:
+            self._zstd = zstandard.ZstdCompressionDict(
+                self.data, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+        return self._zstd
+
+
+class ZlibCodec:
+    """zlib (deflate) ve ön tanımlı sözlük"""
+    name = "zlib"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def compress(self, raw: bytes, dictionary: Optional[ServiceDictionary]) -> bytes:
+        if dictionary is None:
+            return zlib.compress(raw, self.level)
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, zlib.MAX_WBITS,
+                                      zdict=dictionary.data)
+        return compressor.compress(raw) + compressor.flush()
+
+    def decompress(self, payload: bytes, dictionary: Optional[ServiceDictionary]) -> bytes:
+        if dictionary is None:
+            return zlib.decompress(payload)
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS, zdict=dictionary.data)
+        return decompressor.decompress(payload) + decompressor.flush()
+
+
+class ZstdCodec:
+    """zstandard ve ham içerik sözlüğü"""
+    name = "zstd"
+
+    def __init__(self, level: int = 3):
+        self.level = level
+
+    def compress(self, raw: bytes, dictionary: Optional[ServiceDictionary]) -> bytes:
+        if dictionary is None:
+            return zstandard.ZstdCompressor(level=self.level).compress(raw)
+        return zstandard.ZstdCompressor(level=self.level, dict_data=dictionary.zstd()).compress(raw)
+
+    def decompress(self, payload: bytes, dictionary: Optional[ServiceDictionary]) -> bytes:
+        if dictionary is None:
+            return zstandard.ZstdDecompressor().decompress(payload)
+        return zstandard.ZstdDecompressor(dict_data=dictionary.zstd()).decompress(payload)
+
+
+def get_codec(name: str = "auto"):
+    """'auto' (zstd varsa zstd), 'zstd' veya 'zlib' kodlayıcısı"""
+    if name == "auto":
+        name = "zstd" if ZSTD_AVAILABLE else "zlib"
+    if name == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise ValueError("zstd codec requires the zstandard package")
+        return ZstdCodec()
+    if name == "zlib":
+        return ZlibCodec()
+    raise ValueError(f"Unknown codec: {name}")
+
+
+def _string_table(values: List[str]) -> Tuple[array, List[bytes]]:
+    """Değerler -> (indeks dizisi, benzersiz değerlerin UTF-8 halleri)"""
+    index: Dict[str, int] = {}
+    table: List[bytes] = []
+    positions = array("I")
+    for value in values:
+        position = index.get(value)
+        if position is None:
+            position = index[value] = len(table)
+            table.append(value.encode("utf-8", "surrogatepass"))
+        positions.append(position)
+    return positions, table
+
+
+def encode_columns(batch: LogBatch) -> bytes:
+    """Sıralı tek servisli yığının sıkıştırılmamış blok gövdesi"""
+    micros = [round(ts * 1_000_000) for ts in batch.ts]
+    first = micros[0]
+    deltas = array("q", [value - first for value in micros])
+    levels = bytes(batch.level)
+    weights = array("I", batch.weight)
+    source_index, sources = _string_table(batch.source)
+    message_index, messages = _string_table(batch.message)
+    return b"".join((
+        _HEADER.pack(len(batch), len(sources), len(messages), first),
+        deltas.tobytes(), levels, weights.tobytes(), source_index.tobytes(), message_index.tobytes(),
+        array("I", map(len, sources)).tobytes(), array("I", map(len, messages)).tobytes(),
+        b"".join(sources), b"".join(messages)
+    ))
+
+
+def decode_columns(raw: bytes, service: str) -> LogBatch:
+    """encode_columns'ın tersi"""
+    count, source_count, message_count, first = _HEADER.unpack_from(raw)
+    view = memoryview(raw)
+    offset = _HEADER.size
+
+    def take(typecode: str, length: int) -> array:
+        nonlocal offset
+        values = array(typecode)
+        end = offset + length * values.itemsize
+        values.frombytes(view[offset:end])
+        offset = end
+        return values
+
+    deltas = take("q", count)
+    levels = list(view[offset:offset + count])
+    offset += count
+    weights = take("I", count)
+    source_index = take("I", count)
+    message_index = take("I", count)
+    source_lengths = take("I", source_count)
+    message_lengths = take("I", message_count)
+
+    def strings(lengths: array) -> List[str]:
+        nonlocal offset
+        values = []
+        for length in lengths:
+            values.append(str(view[offset:offset + length], "utf-8", "surrogatepass"))
+            offset += length
+        return values
+
+    sources = strings(source_lengths)
+    messages = strings(message_lengths)
+    return LogBatch(
+        ts=[(first + delta) / 1_000_000 for delta in deltas],
+        level=levels,
+        service=[service] * count,
+        source=[sources[i] for i in source_index],
+        message=[messages[i] for i in message_index],
+        weight=weights.tolist()
+    )
+
+
+@dataclass
+class LogBlock:
+    """Tek servisin zamana göre sıralı, sıkıştırılmış kayıtları (değişmez)"""
+    service: str
+    first_ts: float
+    last_ts: float
+    count: int
+    # LogLevel değeri -> kayıt sayısı
+    levels: Dict[int, int]
+    payload: bytes
+    # Ham metin boyutu (zaman + seviye + servis/kaynak/mesaj UTF-8)
+    text_bytes: int
+    dictionary: Optional[ServiceDictionary] = field(default=None, repr=False)
+    # Depo içinde benzersiz, önbellek anahtarı (id() serbest bırakılan bloktan sonra yeniden kullanılabilir)
+    seq: int = 0
+
+    @property
+    def min_level(self) -> int:
+        return min(self.levels)
+
+
+def _text_bytes(batch: LogBatch) -> int:
+    size = 9 * len(batch)
+    for column in (batch.service, batch.source, batch.message):
+        size += sum(len(value.encode("utf-8", "surrogatepass")) for value in column)
+    return size
+
+
+class BlockLogStore:
+    """
+    Servis bazında sıkıştırılmış bloklardan oluşan log deposu.
+
+    LogStore ile aynı okuma arayüzüne (query, iter_logs, time_range,
+    get_statistics) sahiptir; BulkIngestor'a ve sorgu dilinin kaynağı
+    olarak verilebilir. Ek olarak add_entries ile canlı kayıtları alır.
+    """
+
+    def __init__(self,
+                 block_size: int = 1024,
+                 block_age: float = 3600.0,
+                 retention_days: float = 0,
+                 codec: str = "auto",
+                 dictionary_size: int = 16384,
+                 max_dictionaries: int = 1000,
+                 cache_blocks: int = 16):
+        """
+        Args:
+            block_size: Blok başına kayıt
+            block_age: Açık tampondaki en eski kayıt bu kadar saniye eskiyse blok kapatılır
+            retention_days: Saklama süresi, en yeni kayda göre (0 ise sınırsız)
+            codec: 'auto', 'zstd' veya 'zlib'
+            dictionary_size: Servis sözlüğü üst sınırı (bayt, 0 ise sözlük yok)
+            max_dictionaries: En fazla servis sözlüğü (sonrakiler sözlüksüz sıkıştırılır)
+            cache_blocks: Çözülmüş halde tutulan son blok sayısı
+        """
+        self.block_size = max(1, block_size)
+        self.block_age = block_age
+        self.retention_days = retention_days
+        self.codec = get_codec(codec)
+        self.dictionary_size = dictionary_size
+        self.max_dictionaries = max_dictionaries
+        self.cache_blocks = cache_blocks
+
+        # Servis -> başlangıç zamanına göre sıralı bloklar
+        self._blocks: Dict[str, List[LogBlock]] = {}
+        # Servis -> henüz sıkıştırılmamış kayıtlar (ve en eski zamanı)
+        self._open: Dict[str, LogBatch] = {}
+        self._open_first: Dict[str, float] = {}
+        self._dictionaries: Dict[str, ServiceDictionary] = {}
+        # Blok sıra no -> çözülmüş yığın
+        self._cache: "OrderedDict[int, LogBatch]" = OrderedDict()
+        self._block_seq = 0
+        self._level_counts: Dict[int, int] = {}
+        self._newest: Optional[float] = None
+        self._lock = threading.Lock()
+
+        self.total = 0
+        self.text_bytes = 0
+        self.compressed_bytes = 0
+        self.expired = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __len__(self) -> int:
+        return self.total
+
+    # ---- yazma ----
+
+    def add_entries(self, entries: Iterable[LogEntry]):
+        """Canlı kayıtları ekle (SnapshotManager log callback'i)"""
+        self.merge([LogBatch.from_entries(entries)])
+
+    def merge(self, batches: Iterable[LogBatch]) -> int:
+        """
+        Yığınları servis tamponlarına ekle; dolan tamponları sıkıştır.
+
+        Returns:
+            Eklenen kayıt sayısı
+        """
+        added = 0
+        with self._lock:
+            for batch in batches:
+                for i in range(len(batch)):
+                    self._append(batch.ts[i], batch.level[i], batch.service[i],
+                                 batch.source[i], batch.message[i], batch.weight[i])
+                added += len(batch)
+            if not added:
+                return 0
+            self._seal_ready()
+            self._expire()
+        return added
+
+    def flush(self):
+        """Tüm açık tamponları bloklara dönüştür"""
+        with self._lock:
+            for service in list(self._open):
+                self._seal(service, everything=True)
+
+    def _append(self, ts: float, level: int, service: str, source: str, message: str, weight: int):
+        buffer = self._open.get(service)
+        if buffer is None:
+            buffer = self._open[service] = LogBatch()
+            self._open_first[service] = ts
+        elif ts < self._open_first[service]:
+            self._open_first[service] = ts
+        buffer.append(ts, level, service, source, message, weight)
+        self._level_counts[level] = self._level_counts.get(level, 0) + 1
+        self.total += 1
+        if self._newest is None or ts > self._newest:
+            self._newest = ts
+
+    def _seal_ready(self):
+        horizon = self._newest - self.block_age
+        for service in list(self._open):
+            if len(self._open[service]) >= self.block_size:
+                self._seal(service, everything=self._open_first[service] < horizon)
+            elif self._open_first[service] < horizon:
+                self._seal(service, everything=True)
+
+    def _seal(self, service: str, everything: bool):
+        """Tamponu block_size'lık bloklara böl; kalan kısım (everything değilse) açık kalır"""
+        buffer = self._open.pop(service)
+        del self._open_first[service]
+        buffer.sort()
+        size = self.block_size
+        end = len(buffer) if everything else len(buffer) - len(buffer) % size
+        for start in range(0, end, size):
+            chunk = LogBatch(**{name: getattr(buffer, name)[start:min(start + size, end)]
+                                for name in LogBatch.COLUMNS})
+            self._add_block(self._compress(service, chunk))
+        if end < len(buffer):
+            rest = LogBatch(**{name: getattr(buffer, name)[end:] for name in LogBatch.COLUMNS})
+            self._open[service] = rest
+            self._open_first[service] = rest.ts[0]
+
+    def _compress(self, service: str, chunk: LogBatch) -> LogBlock:
+        dictionary = self._dictionaries.get(service)
+        if dictionary is None and self.dictionary_size and len(self._dictionaries) < self.max_dictionaries:
+            # İlk blok servisin sözlüğünü eğitir
+            dictionary = self._dictionaries[service] = ServiceDictionary(
+                train_dictionary(chunk.message, self.dictionary_size))
+        levels: Dict[int, int] = {}
+        for value in chunk.level:
+            levels[value] = levels.get(value, 0) + 1
+        self._block_seq += 1
+        return LogBlock(
+            service=service,
+            first_ts=chunk.ts[0],
+            last_ts=chunk.ts[-1],
+            count=len(chunk),
+            levels=levels,
+            payload=self.codec.compress(encode_columns(chunk), dictionary),
+            text_bytes=_text_bytes(chunk),
+            dictionary=dictionary,
+            seq=self._block_seq
+        )
+
+    def _add_block(self, block: LogBlock):
+        blocks = self._blocks.setdefault(block.service, [])
+        if blocks and block.first_ts < blocks[-1].first_ts:
+            # Geç gelen kayıtlar: başlangıç sırası korunur
+            position = next(i for i, other in enumerate(blocks) if other.first_ts > block.first_ts)
+            blocks.insert(position, block)
+        else:
+            blocks.append(block)
+        self.text_bytes += block.text_bytes
+        self.compressed_bytes += len(block.payload)
+
+    def _expire(self):
+        """En yeni kayda göre saklama süresini aşan blokları at"""
+        if not self.retention_days or self._newest is None:
+            return
+        cutoff = self._newest - self.retention_days * 86400
+        for service in list(self._blocks):
+            blocks = self._blocks[service]
+            kept = [block for block in blocks if block.last_ts >= cutoff]
+            if len(kept) == len(blocks):
+                continue
+            for block in blocks:
+                if block.last_ts < cutoff:
+                    self._forget(block)
+            if kept:
+                self._blocks[service] = kept
+            else:
+                del self._blocks[service]
+
+    def _forget(self, block: LogBlock):
+        for value, count in block.levels.items():
+            self._level_counts[value] -= count
+        self.total -= block.count
+        self.expired += block.count
+        self.text_bytes -= block.text_bytes
+        self.compressed_bytes -= len(block.payload)
+        self._cache.pop(block.seq, None)
+
+    # ---- okuma ----
+
+    def _decode(self, block: LogBlock) -> LogBatch:
+        """Bloğu çöz (son çözülenler önbellekten, bloğun sıra no'suyla)"""
+        key = block.seq
+        with self._lock:
+            batch = self._cache.get(key)
+            if batch is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return batch
+            self.cache_misses += 1
+        batch = decode_columns(self.codec.decompress(block.payload, block.dictionary), block.service)
+        if self.cache_blocks:
+            with self._lock:
+                self._cache[key] = batch
+                while len(self._cache) > self.cache_blocks:
+                    self._cache.popitem(last=False)
+        return batch
+
+    def _sources(self, level: Optional[LogLevel], service: Optional[str],
+                 since: Optional[float], until: Optional[float]) -> List[Tuple[float, float, object]]:
+        """
+        Aralığa ve filtrelere uyabilecek (ilk, son, blok/yığın) kaynakları.
+
+        Açık tamponlar sıralı kopyalar olarak döner; bloklar değişmez
+        olduğundan kilit dışında çözülebilir.
+        """
+        services = [service] if service else None
+        sources = []
+        with self._lock:
+            for name in services or list(self._blocks):
+                for block in self._blocks.get(name, ()):
+                    if since is not None and block.last_ts < since:
+                        continue
+                    if until is not None and block.first_ts > until:
+                        continue
+                    if level is not None and block.min_level > level.value:
+                        continue
+                    sources.append((block.first_ts, block.last_ts, block))
+            for name in services or list(self._open):
+                buffer = self._open.get(name)
+                if buffer is None:
+                    continue
+                copy = LogBatch(**{column: list(getattr(buffer, column)) for column in LogBatch.COLUMNS})
+                copy.sort()
+                sources.append((copy.ts[0], copy.ts[-1], copy))
+        return sources
+
+    def _rows(self, source, level: Optional[LogLevel],
+              since: Optional[float], until: Optional[float]) -> Iterator[Tuple[float, LogBatch, int]]:
+        batch = self._decode(source) if isinstance(source, LogBlock) else source
+        ts = batch.ts
+        for i in range(len(batch)):
+            if since is not None and ts[i] < since:
+                continue
+            if until is not None and ts[i] > until:
+                break
+            if level is not None and batch.level[i] > level.value:
+                continue
+            yield ts[i], batch, i
+
+    def query(self,
+              limit: int = 100,
+              level: Optional[LogLevel] = None,
+              service: Optional[str] = None,
+              since: Optional[datetime] = None,
+              until: Optional[datetime] = None) -> List[LogEntry]:
+        """
+        Filtreye uyan son kayıtlar (eskiden yeniye).
+
+        Bloklar son zamanlarına göre yeniden eskiye çözülür; elde limit
+        kadar kayıt varken kalan bloklar daha eskiyse durulur.
+        """
+        since_ts = since.timestamp() if since else None
+        until_ts = until.timestamp() if until else None
+        sources = sorted(self._sources(level, service, since_ts, until_ts),
+                         key=lambda item: item[1], reverse=True)
+        rows: List[Tuple[float, LogBatch, int]] = []
+        for _, last, source in sources:
+            if limit and len(rows) >= limit:
+                rows.sort(key=lambda row: row[0])
+                del rows[:-limit]
+                if rows[0][0] >= last:
+                    break
+            rows.extend(self._rows(source, level, since_ts, until_ts))
+        rows.sort(key=lambda row: row[0])
+        if limit:
+            rows = rows[-limit:]
+        return [batch.entry(i) for _, batch, i in rows]
+
+    def iter_logs(self,
+                  limit: int = 100,
+                  level: Optional[LogLevel] = None,
+                  service: Optional[str] = None,
+                  since: Optional[datetime] = None,
+                  until: Optional[datetime] = None) -> Iterator[LogEntry]:
+        """
+        Filtreye uyan kayıtları eskiden yeniye üret (sorgu boru hattı için).
+
+        limit 0 ise bloklar başlangıç zamanına göre yalnızca akış onlara
+        ulaştığında çözülür; bellekte aynı anda çakışan bloklar kadar
+        çözülmüş blok bulunur.
+        """
+        if limit:
+            yield from self.query(limit=limit, level=level, service=service, since=since, until=until)
+            return
+        since_ts = since.timestamp() if since else None
+        until_ts = until.timestamp() if until else None
+        pending = sorted(self._sources(level, service, since_ts, until_ts),
+                         key=lambda item: item[0], reverse=True)
+        heap: List[Tuple[float, int, LogBatch, int, Iterator]] = []
+        sequence = 0
+        while pending or heap:
+            while pending and (not heap or pending[-1][0] <= heap[0][0]):
+                rows = self._rows(pending.pop()[2], level, since_ts, until_ts)
+                for ts, batch, i in rows:
+                    heapq.heappush(heap, (ts, sequence, batch, i, rows))
+                    sequence += 1
+                    break
+            if not heap:
+                continue
+            _, _, batch, i, rows = heapq.heappop(heap)
+            yield batch.entry(i)
+            for ts, next_batch, j in rows:
+                heapq.heappush(heap, (ts, sequence, next_batch, j, rows))
+                sequence += 1
+                break
+
+    def time_range(self) -> Optional[Tuple[datetime, datetime]]:
+        """İlk ve son kaydın zamanı (depo boşsa None)"""
+        with self._lock:
+            firsts = [blocks[0].first_ts for blocks in self._blocks.values()]
+            firsts.extend(self._open_first.values())
+            if not firsts:
+                return None
+            return datetime.fromtimestamp(min(firsts)), datetime.fromtimestamp(self._newest)
+
+    def get_statistics(self) -> Dict:
+        """Seviye ve servis bazında kayıt sayıları ve sıkıştırma özeti"""
+        with self._lock:
+            by_level = {_LEVELS.get(value, LogLevel.INFO).name: count
+                        for value, count in sorted(self._level_counts.items()) if count}
+            services = len(set(self._blocks) | set(self._open))
+            blocks = sum(len(items) for items in self._blocks.values())
+            open_entries = sum(len(buffer) for buffer in self._open.values())
+            return {
+                "total": self.total,
+                "by_level": by_level,
+                "services": services,
+                "compression": {
+                    "codec": self.codec.name,
+                    "blocks": blocks,
+                    "compressed_entries": self.total - open_entries,
+                    "open_entries": open_entries,
+                    "text_bytes": self.text_bytes,
+                    "compressed_bytes": self.compressed_bytes,
+                    "ratio": round(self.text_bytes / self.compressed_bytes, 2) if self.compressed_bytes else 0.0,
+                    "dictionaries": len(self._dictionaries),
+                    "dictionary_bytes": sum(len(item.data) for item in self._dictionaries.values()),
+                    "expired": self.expired,
+                    "retention_days": self.retention_days,
+                    "cache_hits": self.cache_hits,
+                    "cache_misses": self.cache_misses
+                }
+            }
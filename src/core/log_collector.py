@@ -3,12 +3,14 @@ Log Collector Module
 Cross-platform log toplama modülü.
 """
 
-import platform
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+from .log_cursor import CursorCheckpoint
+from .platform_adapter import get_default_adapter, platform_name
+
 
 class LogLevel(Enum):
     """Log seviyesi enum'u"""
@@ -30,9 +32,15 @@ class LogEntry:
     message: str
     source: str = ""
     service: str = ""
+    # TemplateMiner tarafından atanan şablon id'si
+    template_id: Optional[int] = None
+    # Örneklenen kaydın temsil ettiği kayıt sayısı (IngestGovernor)
+    sample_weight: int = 1
+    # Kodlanmış to_dict() önbelleği (core.encoding)
+    _encoded: Optional[Dict] = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self) -> Dict:
-        return {
+        data = {
             "timestamp": self.timestamp.isoformat(),
             "level": self.level.name,
             "level_value": self.level.value,
@@ -40,6 +48,11 @@ class LogEntry:
             "source": self.source,
             "service": self.service
         }
+        if self.template_id is not None:
+            data["template_id"] = self.template_id
+        if self.sample_weight != 1:
+            data["sample_weight"] = self.sample_weight
+        return data
 
 
 class LogCollector:
@@ -48,26 +61,24 @@ class LogCollector:
     Linux'ta journalctl, Windows'ta Event Log okur.
     """
 
-    def __init__(self):
-        """LogCollector başlatıcı."""
-        self.platform = platform.system().lower()
-        self.adapter = self._get_adapter()
+    def __init__(self, adapter=None, cursor_file: Optional[str] = None, cursor_interval: float = 10.0):
+        """
+        LogCollector başlatıcı.
+        
+        Args:
+            adapter: Log adaptörü (None ise platforma göre seçilir)
+            cursor_file: Artımlı okuma imlecinin kaydedileceği dosya (None ise bellekte)
+            cursor_interval: İmlecin diske yazılma aralığı (saniye)
+        """
+        self.platform = platform_name()
+        self.adapter = adapter or self._get_adapter()
+        self.checkpoint = CursorCheckpoint(cursor_file, cursor_interval) if cursor_file else None
+        self.cursor: Optional[str] = self.checkpoint.load() if self.checkpoint else None
+        self._seen_keys = set()
 
     def _get_adapter(self):
-        """Platform'a göre uygun adaptörü döndür"""
-        import sys
-        import os
-        # Adapters modülünü import edebilmek için path ekle
-        src_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        if src_path not in sys.path:
-            sys.path.insert(0, src_path)
-        
-        if self.platform == "linux":
-            from adapters.linux_adapter import LinuxAdapter
-            return LinuxAdapter()
-        else:
-            from adapters.windows_adapter import WindowsAdapter
-            return WindowsAdapter()
+        """Platform'a göre paylaşılan adaptörü döndür"""
+        return get_default_adapter()
 
     def get_logs(self, 
                  limit: int = 100,
@@ -96,6 +107,123 @@ class LogCollector:
             until=until
         )
 
+    def iter_logs(self,
+                  limit: int = 100,
+                  level: Optional[LogLevel] = None,
+                  service: Optional[str] = None,
+                  since: Optional[datetime] = None,
+                  until: Optional[datetime] = None,
+                  **journal) -> Iterator[LogEntry]:
+        """
+        Log girdilerini okundukça üret (sorgu boru hattı için).
+        
+        journal argümanları (matches, grep, predicate, max_scan) yalnızca
+        supports_field_matches olan adaptörlere iletilir. Adaptör akış
+        desteklemiyorsa get_logs sonucu üzerinde gezinir.
+        """
+        if hasattr(self.adapter, "iter_logs"):
+            if not self.supports_field_matches:
+                journal = {}
+            return self.adapter.iter_logs(limit=limit, level=level, service=service,
+                                          since=since, until=until, **journal)
+        return iter(self.get_logs(limit=limit, level=level, service=service,
+                                  since=since, until=until))
+
+    @property
+    def supports_field_matches(self) -> bool:
+        """Adaptör journal alan eşleşmeleri ve filtreye kadar okumayı destekliyor mu"""
+        return getattr(self.adapter, "SUPPORTS_FIELD_MATCHES", False)
+
+    async def get_logs_async(self,
+                             limit: int = 100,
+                             level: Optional[LogLevel] = None,
+                             service: Optional[str] = None,
+                             since: Optional[datetime] = None,
+                             until: Optional[datetime] = None) -> List[LogEntry]:
+        """Log girdilerini al (async)"""
+        return await self.adapter.get_logs_async(
+            limit=limit,
+            level=level,
+            service=service,
+            since=since,
+            until=until
+        )
+
+    @property
+    def supports_cursor(self) -> bool:
+        """Adaptör imleçle artımlı okumayı destekliyor mu"""
+        return hasattr(self.adapter, "read_new_logs_async")
+
+    def read_new_logs(self, after_cursor: Optional[str] = None,
+                      limit: int = 1000) -> Tuple[List[LogEntry], Optional[str]]:
+        """
+        İmleçten sonraki yeni logları oku.
+        
+        Args:
+            after_cursor: Önceki çağrının döndürdüğü imleç (None ise son loglar)
+            limit: Tek çağrıda okunacak en fazla kayıt
+            
+        Returns:
+            (LogEntry listesi eskiden yeniye, son okunan kaydın imleci)
+        """
+        return self.adapter.read_new_logs(after_cursor=after_cursor, limit=limit)
+
+    async def read_new_logs_async(self, after_cursor: Optional[str] = None,
+                                  limit: int = 1000) -> Tuple[List[LogEntry], Optional[str]]:
+        """İmleçten sonraki yeni logları oku (async)"""
+        return await self.adapter.read_new_logs_async(after_cursor=after_cursor, limit=limit)
+
+    def collect_new(self, limit: int = 1000) -> List[LogEntry]:
+        """
+        Önceki çağrıdan (veya kayıtlı imleçten) bu yana gelen yeni loglar.
+        
+        Adaptör imleç destekliyorsa yalnızca yeni satırlar okunur ve imleç
+        checkpoint'e yazılır; böylece yeniden başlatmada loglar ne kaçırılır
+        ne de iki kez sayılır. Desteklemiyorsa son `limit` log okunup bir
+        önceki pencerede görülenler ayıklanır.
+        
+        Args:
+            limit: Tek çağrıda okunacak en fazla kayıt
+            
+        Returns:
+            Yeni LogEntry listesi (eskiden yeniye)
+        """
+        if not self.supports_cursor:
+            return self._new_entries(self.get_logs(limit=limit))
+        logs, cursor = self.read_new_logs(after_cursor=self.cursor, limit=limit)
+        self._advance(cursor)
+        return logs
+
+    async def collect_new_async(self, limit: int = 1000) -> List[LogEntry]:
+        """Önceki çağrıdan bu yana gelen yeni loglar (async)"""
+        if not self.supports_cursor:
+            return self._new_entries(await self.get_logs_async(limit=limit))
+        logs, cursor = await self.read_new_logs_async(after_cursor=self.cursor, limit=limit)
+        self._advance(cursor)
+        return logs
+
+    def save_cursor(self):
+        """Son imleci hemen diske yaz (kapanışta çağrılır)"""
+        if self.checkpoint is not None:
+            self.checkpoint.flush()
+
+    def _advance(self, cursor: Optional[str]):
+        self.cursor = cursor
+        if self.checkpoint is not None and cursor is not None:
+            self.checkpoint.update(cursor)
+
+    def _new_entries(self, logs: List[LogEntry]) -> List[LogEntry]:
+        """Önceki pencerede görülmeyen kayıtlar (imleçsiz adaptörler için)"""
+        keys = set()
+        new_logs = []
+        for entry in logs:
+            key = (entry.timestamp, entry.service, entry.message)
+            keys.add(key)
+            if key not in self._seen_keys:
+                new_logs.append(entry)
+        self._seen_keys = keys
+        return new_logs
+
     def get_error_logs(self, limit: int = 50) -> List[LogEntry]:
         """Sadece ERROR seviyesi logları al"""
         return self.get_logs(limit=limit, level=LogLevel.ERROR)
@@ -127,6 +255,14 @@ class LogCollector:
         if logs is None:
             logs = self.get_logs(limit=100)
         
+        return self._compute_statistics(logs)
+
+    async def get_log_statistics_async(self) -> Dict:
+        """Son 100 log için istatistikleri hesapla (async)"""
+        return self._compute_statistics(await self.get_logs_async(limit=100))
+
+    def _compute_statistics(self, logs: List[LogEntry]) -> Dict:
+        """Seviye bazlı sayımları hesapla"""
         stats = {
             "total": len(logs),
             "by_level": {},
@@ -0,0 +1,101 @@
+"""
+Log Cursor Module
+Log okuma konumunun (journal __CURSOR, Windows RecordId) kalıcı kaydı.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+
+def fsync_dir(directory: str):
+    """Dizin girdisini diske al (dosya oluşturma/silme/yeniden adlandırma için)"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return  # Windows
+    try:
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_atomic(path: str, data: bytes):
+    """
+    Dosyayı atomik olarak yaz.
+
+    Önce geçici dosyaya yazılıp fsync edilir, sonra os.replace ile yerine
+    konur; çökme anında okuyucu ya eski ya yeni içeriği görür.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    fsync_dir(os.path.dirname(os.path.abspath(path)))
+
+
+class CursorCheckpoint:
+    """
+    Log imlecini belirli aralıklarla diske yazan checkpoint.
+
+    update her okumadan sonra çağrılır; dosya en fazla interval saniyede
+    bir yazılır. Süreç düzgün kapanırken flush son imleci yazar. Çökmede
+    en fazla interval saniyelik log yeniden okunur.
+    """
+
+    def __init__(self, path: str, interval: float = 10.0):
+        """
+        Args:
+            path: Checkpoint dosyası (dizini yoksa oluşturulur)
+            interval: En sık yazma aralığı (saniye, 0 ise her güncellemede)
+        """
+        self.path = path
+        self.interval = interval
+        self.cursor: Optional[str] = None
+        self.writes = 0
+        self._written: Optional[str] = None
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+
+    def load(self) -> Optional[str]:
+        """Kayıtlı imleci oku (dosya yoksa veya bozuksa None)"""
+        try:
+            with open(self.path, "rb") as f:
+                cursor = json.loads(f.read()).get("cursor")
+        except (OSError, ValueError, AttributeError):
+            cursor = None
+        self.cursor = self._written = cursor
+        return cursor
+
+    def update(self, cursor: Optional[str]):
+        """Yeni imleci kaydet; interval dolduysa diske yaz"""
+        with self._lock:
+            self.cursor = cursor
+            if time.monotonic() - self._last_write >= self.interval:
+                self._write()
+
+    def flush(self):
+        """Bekleyen imleci hemen diske yaz"""
+        with self._lock:
+            self._write()
+
+    def _write(self):
+        if self.cursor is None or self.cursor == self._written:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        write_atomic(self.path, json.dumps({
+            "cursor": self.cursor,
+            "updated_at": time.time()
+        }).encode("utf-8"))
+        self._written = self.cursor
+        self._last_write = time.monotonic()
+        self.writes += 1
@@ -5,6 +5,7 @@ Log ayrıştırma ve filtreleme modülü.
 
 import re
 from typing import List, Dict, Optional, Pattern
+from .encoding import JSON, Fragments, encode_items
 from .log_collector import LogEntry, LogLevel
 
 
@@ -121,6 +122,8 @@ class LogParser:
         """
         Detaylı log istatistikleri hesapla.
         
+        Örneklenmiş kayıtlar sample_weight kadar sayılır.
+        
         Returns:
             İstatistik sözlüğü
         """
@@ -133,18 +136,21 @@ class LogParser:
                 "warning_rate": 0
             }
 
-        total = len(logs)
+        total = 0
         by_level = {}
         by_service = {}
 
         for log in logs:
+            weight = log.sample_weight
+            total += weight
+
             # Level sayımı
             level_name = log.level.name
-            by_level[level_name] = by_level.get(level_name, 0) + 1
+            by_level[level_name] = by_level.get(level_name, 0) + weight
 
             # Servis sayımı
             service = log.service or "unknown"
-            by_service[service] = by_service.get(service, 0) + 1
+            by_service[service] = by_service.get(service, 0) + weight
 
         error_count = by_level.get("ERROR", 0)
         warning_count = by_level.get("WARNING", 0)
@@ -179,6 +185,15 @@ class LogParser:
         """Logları JSON formatına dönüştür"""
         return [log.to_dict() for log in logs]
 
+    def encode(self, logs: List[LogEntry], fmt: str = JSON) -> Fragments:
+        """
+        Logları önceden kodlanmış parçalara dönüştür (API yanıtları için).
+        
+        Kayıtlar toplandıktan sonra değişmez; kodlama kayıt üzerinde
+        saklanır ve yalnızca şablon id'si atanırsa yenilenir.
+        """
+        return encode_items(logs, fmt, version=lambda log: log.template_id)
+
 
 # Test için
 if __name__ == "__main__":
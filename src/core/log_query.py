@@ -0,0 +1,604 @@
+"""
+Log Query Module
+/api/logs için küçük sorgu dili: ayrıştırma, filtre planı ve akış halinde yürütme.
+
+Örnek:
+    level>=warning service:nginx AND msg~"timeout" since:-1h | count by service
+
+Sorgu bir kez ayrıştırılıp plana çevrilir (compile_query önbelleklidir).
+Üst düzey VE koşullarından kaynağın kendisi uygulayabilenler (seviye,
+tek servis, zaman aralığı) kaynağa itilir (journalctl -p/-u/--since,
+LogStore ikili arama); kalanlar Python'da akış üzerinde uygulanır.
+Aşamalar üreteç zinciridir; count/count by ara liste kurmadan sayar.
+"""
+
+import fnmatch
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .log_collector import LogEntry, LogLevel
+
+# Filtre dışı sorgularda taranacak en fazla kayıt (kalan filtre varsa)
+DEFAULT_SCAN_LIMIT = 10000
+
+# journal alan eşleşmelerinde en fazla VEYA grubu (VE çarpımı büyürse itilmez)
+MAX_JOURNAL_GROUPS = 32
+
+LEVEL_NAMES = {
+    "emerg": LogLevel.EMERGENCY, "emergency": LogLevel.EMERGENCY,
+    "alert": LogLevel.ALERT,
+    "crit": LogLevel.CRITICAL, "critical": LogLevel.CRITICAL,
+    "err": LogLevel.ERROR, "error": LogLevel.ERROR,
+    "warn": LogLevel.WARNING, "warning": LogLevel.WARNING,
+    "notice": LogLevel.NOTICE,
+    "info": LogLevel.INFO,
+    "debug": LogLevel.DEBUG,
+}
+
+FIELD_ALIASES = {
+    "level": "level", "severity": "level",
+    "service": "service", "unit": "service",
+    "source": "source", "host": "source",
+    "msg": "message", "message": "message",
+    "template": "template",
+    "since": "since", "until": "until",
+}
+
+GROUP_FIELDS = ("service", "level", "source", "template", "minute", "hour")
+
+_TOKEN_RE = re.compile(r'\s*(?:(\()|(\))|(\|)|"((?:[^"\\]|\\.)*)"|([^\s()|"]+))')
+_TERM_RE = re.compile(r'^([A-Za-z_]+)(>=|<=|!=|!~|=|:|~|>|<)(.*)$')
+_RELATIVE_RE = re.compile(r'^-(\d+(?:\.\d+)?)([smhd])$')
+_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+
+
+class QueryError(ValueError):
+    """Geçersiz sorgu"""
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """Tek karşılaştırma: alan, işleç, değer"""
+    field: str
+    op: str
+    value: str
+
+    def __str__(self) -> str:
+        return f'{self.field}{self.op}"{self.value}"'
+
+
+@dataclass(frozen=True)
+class Node:
+    """Mantıksal düğüm: and / or / not"""
+    kind: str
+    children: Tuple[Any, ...]
+
+    def __str__(self) -> str:
+        if self.kind == "not":
+            return f"NOT {self.children[0]}"
+        inner = f" {self.kind.upper()} ".join(str(child) for child in self.children)
+        return f"({inner})"
+
+
+@dataclass(frozen=True)
+class Stage:
+    """Boru hattı aşaması: count, head, tail"""
+    name: str
+    arg: Any = None
+
+    def __str__(self) -> str:
+        if self.name == "count":
+            return f"count by {self.arg}" if self.arg else "count"
+        return f"{self.name} {self.arg}"
+
+
+# ===== Ayrıştırma =====
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN_RE.match(text, position)
+        if not match or match.end() == position:
+            raise QueryError(f"Unexpected character at {position}")
+        position = match.end()
+        lparen, rparen, pipe, string, word = match.groups()
+        if lparen:
+            tokens.append(("(", lparen))
+        elif rparen:
+            tokens.append((")", rparen))
+        elif pipe:
+            tokens.append(("|", pipe))
+        elif string is not None:
+            tokens.append(("string", re.sub(r'\\(.)', r'\1', string)))
+        else:
+            tokens.append(("word", word))
+    return tokens
+
+
+class _Parser:
+    """Özyinelemeli iniş ayrıştırıcı (OR < AND < NOT < terim)"""
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self) -> Tuple[str, str]:
+        token = self.peek()
+        if token is None:
+            raise QueryError("Unexpected end of query")
+        self.position += 1
+        return token
+
+    def keyword(self, name: str) -> bool:
+        token = self.peek()
+        if token and token[0] == "word" and token[1].upper() == name:
+            self.position += 1
+            return True
+        return False
+
+    def parse(self):
+        expression = None
+        if self.peek() and self.peek()[0] != "|":
+            expression = self.parse_or()
+        stages = []
+        while self.peek():
+            if self.take()[0] != "|":
+                raise QueryError("Expected '|' before stage")
+            if stages and stages[-1].name == "count":
+                raise QueryError("'count' must be the last stage")
+            stages.append(self.parse_stage())
+        return expression, tuple(stages)
+
+    def parse_or(self):
+        children = [self.parse_and()]
+        while self.keyword("OR"):
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else Node("or", tuple(children))
+
+    def parse_and(self):
+        children = [self.parse_not()]
+        while True:
+            token = self.peek()
+            if token is None or token[0] in (")", "|") or \
+                    (token[0] == "word" and token[1].upper() == "OR"):
+                break
+            self.keyword("AND")
+            children.append(self.parse_not())
+        return children[0] if len(children) == 1 else Node("and", tuple(children))
+
+    def parse_not(self):
+        if self.keyword("NOT"):
+            return Node("not", (self.parse_not(),))
+        return self.parse_term()
+
+    def parse_term(self):
+        kind, value = self.take()
+        if kind == "(":
+            expression = self.parse_or()
+            if self.take()[0] != ")":
+                raise QueryError("Expected ')'")
+            return expression
+        if kind == "string":
+            return Predicate("message", ":", value)
+        if kind != "word":
+            raise QueryError(f"Unexpected '{value}'")
+
+        match = _TERM_RE.match(value)
+        if not match:
+            # Çıplak kelime: mesajda arama
+            return Predicate("message", ":", value)
+        name, op, operand = match.groups()
+        field_name = FIELD_ALIASES.get(name.lower())
+        if field_name is None:
+            raise QueryError(f"Unknown field '{name}'")
+        if not operand:
+            token = self.peek()
+            if token is None or token[0] not in ("string", "word"):
+                raise QueryError(f"Missing value for '{name}'")
+            operand = self.take()[1]
+        return _validate(Predicate(field_name, op, operand))
+
+    def parse_stage(self) -> Stage:
+        kind, name = self.take()
+        name = name.lower()
+        if kind != "word":
+            raise QueryError("Expected stage name")
+        if name == "count":
+            if self.keyword("BY"):
+                group = self.take()[1].lower()
+                if group not in GROUP_FIELDS:
+                    raise QueryError(f"Cannot group by '{group}'")
+                return Stage("count", group)
+            return Stage("count")
+        if name in ("head", "tail", "limit"):
+            try:
+                count = int(self.take()[1])
+            except ValueError:
+                raise QueryError(f"'{name}' expects a number")
+            return Stage("tail" if name == "tail" else "head", max(0, count))
+        raise QueryError(f"Unknown stage '{name}'")
+
+
+def _validate(predicate: Predicate) -> Predicate:
+    """Alan/işleç uyumunu ve değerleri ayrıştırma sırasında denetle"""
+    name, op, value = predicate.field, predicate.op, predicate.value
+    if name == "level":
+        if value.lower() not in LEVEL_NAMES:
+            raise QueryError(f"Unknown level '{value}'")
+        if op in ("~", "!~"):
+            raise QueryError("Level does not support regex")
+    elif name in ("since", "until"):
+        if op not in (":", "=", ">=" if name == "since" else "<="):
+            raise QueryError(f"Unsupported operator for '{name}'")
+        _parse_time(value, datetime.now())
+    elif name == "template":
+        if op not in (":", "=", "!=") or not value.isdigit():
+            raise QueryError("Template expects an id")
+    elif op in (">", "<", ">=", "<="):
+        raise QueryError(f"Unsupported operator for '{name}'")
+    if op in ("~", "!~"):
+        try:
+            re.compile(value)
+        except re.error as e:
+            raise QueryError(f"Invalid regex '{value}': {e}")
+    return predicate
+
+
+def _parse_time(value: str, now: datetime) -> datetime:
+    """-1h / -30m / -2d / now veya ISO 8601 zaman damgası"""
+    if value.lower() == "now":
+        return now
+    match = _RELATIVE_RE.match(value)
+    if match:
+        amount, unit = match.groups()
+        return now - timedelta(**{_UNITS[unit]: float(amount)})
+    try:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise QueryError(f"Invalid time '{value}'")
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment
+
+
+# ===== Derleme =====
+
+def _compile_predicate(predicate: Predicate, now: datetime) -> Callable[[LogEntry], bool]:
+    name, op, value = predicate.field, predicate.op, predicate.value
+    negate = op in ("!=", "!~")
+
+    if name == "level":
+        target = LEVEL_NAMES[value.lower()].value
+        # Küçük değer daha ciddi: level>=warning -> WARNING ve üstü
+        compare = {
+            ">=": lambda v: v <= target, ">": lambda v: v < target,
+            "<=": lambda v: v >= target, "<": lambda v: v > target,
+        }.get(op, lambda v: v == target)
+        test = lambda log: compare(log.level.value)
+    elif name in ("since", "until"):
+        # Epoch saniyeleri karşılaştırılır: journal kayıtları saat dilimli,
+        # dosyadan okunanlar yerel saattir
+        moment = _parse_time(value, now).timestamp()
+        if name == "since":
+            test = lambda log: log.timestamp.timestamp() >= moment
+        else:
+            test = lambda log: log.timestamp.timestamp() <= moment
+    elif name == "template":
+        template_id = int(value)
+        test = lambda log: log.template_id == template_id
+    else:
+        attribute = name
+        if op in ("~", "!~"):
+            pattern = re.compile(value, re.IGNORECASE)
+            test = lambda log: pattern.search(getattr(log, attribute) or "") is not None
+        elif name == "message":
+            needle = value.lower()
+            test = lambda log: needle in log.message.lower()
+        elif "*" in value or "?" in value:
+            pattern = re.compile(fnmatch.translate(value), re.IGNORECASE)
+            test = lambda log: pattern.match(getattr(log, attribute) or "") is not None
+        else:
+            expected = value.lower()
+            test = lambda log: (getattr(log, attribute) or "").lower() == expected
+
+    if negate:
+        return lambda log: not test(log)
+    return test
+
+
+def _compile_node(node, now: datetime) -> Callable[[LogEntry], bool]:
+    if isinstance(node, Predicate):
+        return _compile_predicate(node, now)
+    tests = [_compile_node(child, now) for child in node.children]
+    if node.kind == "not":
+        inner = tests[0]
+        return lambda log: not inner(log)
+    if node.kind == "and":
+        return lambda log: all(test(log) for test in tests)
+    return lambda log: any(test(log) for test in tests)
+
+
+def _pushable(predicate: Predicate) -> bool:
+    """Kaynağın kendi filtresiyle (tam olarak) uygulanabilen koşul mu"""
+    if predicate.field == "level":
+        return predicate.op == ">="
+    if predicate.field == "service":
+        return predicate.op in (":", "=") and "*" not in predicate.value and "?" not in predicate.value
+    return predicate.field in ("since", "until")
+
+
+@dataclass
+class QueryPlan:
+    """
+    Derlenmiş sorgu.
+
+    pushdown kaynağa itilen koşullardır (level, service, since, until);
+    residual kaynağın uygulayamadığı koşulların ağacıdır; stages boru
+    hattı aşamalarıdır. Göreli zamanlar (since:-1h) yürütme anında
+    çözülür, bu yüzden plan önbellekte güvenle paylaşılır.
+    """
+    text: str
+    pushdown: Dict[str, Predicate] = field(default_factory=dict)
+    residual: Any = None
+    stages: Tuple[Stage, ...] = ()
+    # Kalan koşullardan journal'a ön filtre olarak verilebilenler (matches, grep)
+    journal: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def aggregate(self) -> bool:
+        """Sonuç log listesi yerine sayım mı"""
+        return any(stage.name == "count" for stage in self.stages)
+
+    @property
+    def exact(self) -> bool:
+        """Kaynak tüm filtreyi kendisi uyguluyor mu (kalan filtre ve sayım yok)"""
+        return self.residual is None and not self.aggregate
+
+    def source_filters(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Kaynağın get_logs/query argümanları"""
+        now = now or datetime.now()
+        filters: Dict[str, Any] = {}
+        for key, predicate in self.pushdown.items():
+            if key == "level":
+                filters["level"] = LEVEL_NAMES[predicate.value.lower()]
+            elif key == "service":
+                filters["service"] = predicate.value
+            else:
+                filters[key] = _parse_time(predicate.value, now)
+        return filters
+
+    def predicate(self, now: Optional[datetime] = None) -> Optional[Callable[[LogEntry], bool]]:
+        """Kalan koşulların derlenmiş hali (kalan koşul yoksa None)"""
+        if self.residual is None:
+            return None
+        return _compile_node(self.residual, now or datetime.now())
+
+    def filter(self, logs: Iterable[LogEntry], now: Optional[datetime] = None) -> Iterator[LogEntry]:
+        """Kalan koşulları akış üzerinde uygula"""
+        test = self.predicate(now)
+        if test is None:
+            return iter(logs)
+        return (log for log in logs if test(log))
+
+    def explain(self) -> Dict[str, Any]:
+        return {
+            "query": self.text,
+            "pushdown": {key: str(predicate) for key, predicate in self.pushdown.items()},
+            "residual": str(self.residual) if self.residual is not None else None,
+            "stages": [str(stage) for stage in self.stages],
+            "journal": dict(self.journal),
+            "exact": self.exact
+        }
+
+
+@lru_cache(maxsize=256)
+def compile_query(text: str) -> QueryPlan:
+    """
+    Sorguyu ayrıştırıp plana çevir (aynı metin için önbellekten döner).
+
+    Raises:
+        QueryError: Sözdizimi veya alan/değer hatası
+    """
+    expression, stages = _Parser(_tokenize(text)).parse()
+    plan = QueryPlan(text=text, stages=stages)
+    if expression is None:
+        return plan
+
+    conjuncts = list(expression.children) if isinstance(expression, Node) and expression.kind == "and" \
+        else [expression]
+    residual = []
+    for conjunct in conjuncts:
+        key = conjunct.field if isinstance(conjunct, Predicate) else None
+        if key and _pushable(conjunct) and key not in plan.pushdown:
+            plan.pushdown[key] = conjunct
+        else:
+            residual.append(conjunct)
+    if residual:
+        plan.residual = residual[0] if len(residual) == 1 else Node("and", tuple(residual))
+        plan.journal = _journal_prefilter(residual)
+    return plan
+
+
+def _and_groups(left: List[Dict[str, List[str]]], right: List[Dict[str, List[str]]]):
+    """İki VEYA-grup listesinin VE'si (grupların çarpımı)"""
+    groups = []
+    for a in left:
+        for b in right:
+            merged = dict(a)
+            for name, values in b.items():
+                if name in merged:
+                    # Grup içinde aynı alan VEYA'lanır; VE için kesişim alınır
+                    values = [value for value in merged[name] if value in values]
+                    if not values:
+                        break
+                merged[name] = list(values)
+            else:
+                groups.append(merged)
+    return groups
+
+
+def _journal_groups(node) -> Optional[List[Dict[str, List[str]]]]:
+    """
+    Koşulu journal alan eşleşme gruplarına çevir (çevrilemiyorsa None).
+
+    Servis hem SYSLOG_IDENTIFIER hem _SYSTEMD_UNIT ile eşleşebilir (iki
+    grup); host _HOSTNAME'dir. OR grupları birleştirir, AND çarpar.
+    """
+    if isinstance(node, Predicate):
+        if node.op not in (":", "=") or "*" in node.value or "?" in node.value:
+            return None
+        if node.field == "service":
+            unit = node.value if "." in node.value else f"{node.value}.service"
+            return [{"SYSLOG_IDENTIFIER": [node.value]}, {"_SYSTEMD_UNIT": [unit]}]
+        if node.field == "source":
+            return [{"_HOSTNAME": [node.value]}]
+        return None
+    if node.kind == "not":
+        return None
+    parts = [_journal_groups(child) for child in node.children]
+    if any(part is None for part in parts):
+        return None
+    if node.kind == "or":
+        groups = [group for part in parts for group in part]
+    else:
+        groups = [{}]
+        for part in parts:
+            groups = _and_groups(groups, part)
+    return groups if 0 < len(groups) <= MAX_JOURNAL_GROUPS else None
+
+
+def _journal_prefilter(conjuncts: List[Any]) -> Dict[str, Any]:
+    """
+    Kalan VE koşullarından journal ön filtresi (alan eşleşmeleri ve --grep).
+
+    Ön filtre daraltır ama kesin değildir (journal eşleşmeleri büyük/küçük
+    harfe duyarlıdır); kalan koşullar okunan kayıtlara yine uygulanır.
+    """
+    matches = None
+    grep = None
+    for conjunct in conjuncts:
+        if grep is None and isinstance(conjunct, Predicate) and \
+                conjunct.field == "message" and conjunct.op == ":":
+            grep = re.escape(conjunct.value)
+            continue
+        groups = _journal_groups(conjunct)
+        if groups is None:
+            continue
+        combined = groups if matches is None else _and_groups(matches, groups)
+        if 0 < len(combined) <= MAX_JOURNAL_GROUPS:
+            matches = combined
+    prefilter: Dict[str, Any] = {}
+    if matches:
+        prefilter["matches"] = matches
+    if grep:
+        prefilter["grep"] = grep
+    return prefilter
+
+
+# ===== Yürütme =====
+
+def _group_key(log: LogEntry, group: str):
+    if group == "level":
+        return log.level.name
+    if group == "template":
+        return log.template_id
+    if group == "minute":
+        return log.timestamp.strftime("%Y-%m-%dT%H:%M")
+    if group == "hour":
+        return log.timestamp.strftime("%Y-%m-%dT%H:00")
+    return getattr(log, group) or "unknown"
+
+
+def run_stages(logs: Iterable[LogEntry], stages: Tuple[Stage, ...]):
+    """
+    Aşamaları üreteç zinciri olarak uygula.
+
+    Returns:
+        Son aşama count ise sayım sonucu (int veya satır listesi),
+        değilse LogEntry üreteci
+    """
+    stream: Iterable[LogEntry] = logs
+    for stage in stages:
+        if stage.name == "head":
+            stream = _head(stream, stage.arg)
+        elif stage.name == "tail":
+            stream = iter(deque(stream, maxlen=stage.arg))
+        elif stage.name == "count":
+            if stage.arg is None:
+                return sum(1 for _ in stream)
+            counts: Dict[Any, int] = {}
+            for log in stream:
+                key = _group_key(log, stage.arg)
+                counts[key] = counts.get(key, 0) + 1
+            rows = sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))
+            return [{stage.arg: key, "count": count} for key, count in rows]
+    return stream
+
+
+def _head(logs: Iterable[LogEntry], count: int) -> Iterator[LogEntry]:
+    if count <= 0:
+        return
+    for index, log in enumerate(logs, 1):
+        yield log
+        if index >= count:
+            return
+
+
+def execute(plan: QueryPlan,
+            fetch: Callable[..., Iterable[LogEntry]],
+            limit: int = 100,
+            scan_limit: int = DEFAULT_SCAN_LIMIT,
+            now: Optional[datetime] = None,
+            field_matches: bool = False) -> Dict[str, Any]:
+    """
+    Planı bir kaynak üzerinde yürüt.
+
+    Args:
+        fetch: get_logs(limit=, level=, service=, since=, until=) imzalı kaynak
+            (LogCollector.iter_logs, LogStore.iter_logs)
+        limit: Log döndüren sorgularda en fazla sonuç (son `limit` eşleşme)
+        scan_limit: Kalan filtre veya sayım varsa kaynaktan okunacak en fazla kayıt
+        field_matches: Kaynak journal ön filtresini (matches, grep) ve
+            predicate/max_scan argümanlarını kabul ediyor mu. Bu durumda
+            log döndüren sorgularda kaynak `limit` eşleşme bulunana kadar okur.
+
+    Returns:
+        {'logs': [...]} veya {'result': sayım}, ayrıca 'scanned'
+    """
+    now = now or datetime.now()
+    filters = plan.source_filters(now)
+    scanned = 0
+
+    def counted(logs):
+        nonlocal scanned
+        for log in logs:
+            scanned += 1
+            yield log
+
+    if field_matches:
+        filters.update(plan.journal)
+    test = plan.predicate(now)
+    if field_matches and test is not None and not plan.aggregate:
+        def counted_test(log):
+            nonlocal scanned
+            scanned += 1
+            return test(log)
+        stream = fetch(limit=limit, predicate=counted_test, max_scan=scan_limit, **filters)
+    else:
+        read = limit if plan.exact else scan_limit
+        stream = plan.filter(counted(fetch(limit=read, **filters)), now)
+
+    result = run_stages(stream, plan.stages)
+    if plan.aggregate:
+        return {"result": result, "scanned": scanned}
+    logs = list(deque(result, maxlen=limit)) if limit else list(result)
+    return {"logs": logs, "scanned": scanned}
@@ -0,0 +1,228 @@
+"""
+Log Store Module
+Zamana göre sıralı, sütun düzeninde log deposu.
+"""
+
+import bisect
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .log_collector import LogEntry, LogLevel
+
+_LEVELS = {level.value: level for level in LogLevel}
+
+
+@dataclass
+class LogBatch:
+    """
+    Sütun düzeninde log yığını.
+
+    Her alan ayrı bir listedir; süreçler arasında LogEntry nesne listesine
+    göre çok daha ucuz serileştirilir ve birleştirilir. ts epoch saniyesi,
+    level LogLevel değeri, weight kaydın sample_weight değeridir.
+    """
+    ts: List[float] = field(default_factory=list)
+    level: List[int] = field(default_factory=list)
+    service: List[str] = field(default_factory=list)
+    source: List[str] = field(default_factory=list)
+    message: List[str] = field(default_factory=list)
+    weight: List[int] = field(default_factory=list)
+    # Ayrıştırılamayan satır sayısı
+    skipped: int = 0
+
+    COLUMNS = ("ts", "level", "service", "source", "message", "weight")
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def append(self, ts: float, level: int, service: str, source: str, message: str, weight: int = 1):
+        self.ts.append(ts)
+        self.level.append(level)
+        self.service.append(service)
+        self.source.append(source)
+        self.message.append(message)
+        self.weight.append(weight)
+
+    def is_sorted(self) -> bool:
+        ts = self.ts
+        return all(ts[i] <= ts[i + 1] for i in range(len(ts) - 1))
+
+    def sort(self):
+        """Zaman damgasına göre (kararlı) sırala"""
+        if self.is_sorted():
+            return
+        order = sorted(range(len(self.ts)), key=self.ts.__getitem__)
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            setattr(self, name, [column[i] for i in order])
+
+    def entry(self, index: int) -> LogEntry:
+        return LogEntry(
+            timestamp=datetime.fromtimestamp(self.ts[index]),
+            level=_LEVELS.get(self.level[index], LogLevel.INFO),
+            message=self.message[index],
+            source=self.source[index],
+            service=self.service[index],
+            sample_weight=self.weight[index]
+        )
+
+    def entries(self) -> List[LogEntry]:
+        return [self.entry(i) for i in range(len(self))]
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[LogEntry]) -> "LogBatch":
+        batch = cls()
+        for entry in entries:
+            batch.append(entry.timestamp.timestamp(), entry.level.value,
+                         entry.service, entry.source, entry.message, entry.sample_weight)
+        return batch
+
+    @classmethod
+    def concat(cls, batches: List["LogBatch"]) -> "LogBatch":
+        result = cls()
+        for batch in batches:
+            for name in cls.COLUMNS:
+                getattr(result, name).extend(getattr(batch, name))
+            result.skipped += batch.skipped
+        return result
+
+
+class LogStore:
+    """
+    Zamana göre sıralı log deposu (bellek içi, sütun düzeni).
+
+    merge sıralı yığınları tek seferde birleştirir: yığınlar uç uca
+    eklenip kararlı sıralanır. Python'un sıralaması önceden sıralı
+    dizileri (run) tanıdığından bu k yollu birleştirme kadar ucuzdur.
+    Yeni yığınlar mevcut son kayıttan sonra başlıyorsa yalnızca eklenir.
+
+    templates verilirse mesaj sütununda ham metin yerine
+    (şablon sürümü, parametreler) saklanır ve sorguda geri kurulur.
+    """
+
+    def __init__(self, max_entries: int = 0, templates=None):
+        """
+        Args:
+            max_entries: En fazla kayıt (0 ise sınırsız); aşılırsa en eskiler atılır
+            templates: Mesajları kodlamak için TemplateMiner (None ise ham metin)
+        """
+        self.max_entries = max_entries
+        self.templates = templates
+        self._data = LogBatch()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def merge(self, batches: Iterable[LogBatch]) -> int:
+        """
+        Yığınları zaman sırasını koruyarak depoya ekle.
+
+        Returns:
+            Eklenen kayıt sayısı
+        """
+        incoming = LogBatch.concat([batch for batch in batches if len(batch)])
+        if not len(incoming):
+            return 0
+        incoming.sort()
+        if self.templates is not None:
+            encode = self.templates.encode
+            incoming.message = [encode(message) for message in incoming.message]
+        with self._lock:
+            data = self._data
+            if not len(data) or incoming.ts[0] >= data.ts[-1]:
+                for name in LogBatch.COLUMNS:
+                    getattr(data, name).extend(getattr(incoming, name))
+            else:
+                merged = LogBatch.concat([data, incoming])
+                merged.sort()
+                merged.skipped = data.skipped
+                self._data = data = merged
+            if self.max_entries and len(data) > self.max_entries:
+                excess = len(data) - self.max_entries
+                for name in LogBatch.COLUMNS:
+                    del getattr(data, name)[:excess]
+        return len(incoming)
+
+    def time_range(self) -> Optional[Tuple[datetime, datetime]]:
+        """İlk ve son kaydın zamanı (depo boşsa None)"""
+        with self._lock:
+            if not len(self._data):
+                return None
+            return datetime.fromtimestamp(self._data.ts[0]), datetime.fromtimestamp(self._data.ts[-1])
+
+    def query(self,
+              limit: int = 100,
+              level: Optional[LogLevel] = None,
+              service: Optional[str] = None,
+              since: Optional[datetime] = None,
+              until: Optional[datetime] = None) -> List[LogEntry]:
+        """
+        Filtreye uyan son kayıtlar (eskiden yeniye).
+
+        Zaman aralığı ikili arama ile daraltılır; kalan aralık sondan
+        başa taranır ve limit dolunca durulur.
+        """
+        with self._lock:
+            data = self._data
+            lo = bisect.bisect_left(data.ts, since.timestamp()) if since else 0
+            hi = bisect.bisect_right(data.ts, until.timestamp()) if until else len(data)
+            indexes = []
+            for i in range(hi - 1, lo - 1, -1):
+                if level is not None and data.level[i] > level.value:
+                    continue
+                if service and data.service[i] != service:
+                    continue
+                indexes.append(i)
+                if limit and len(indexes) >= limit:
+                    break
+            return [self._entry(data, i) for i in reversed(indexes)]
+
+    def iter_logs(self,
+                  limit: int = 100,
+                  level: Optional[LogLevel] = None,
+                  service: Optional[str] = None,
+                  since: Optional[datetime] = None,
+                  until: Optional[datetime] = None) -> Iterator[LogEntry]:
+        """
+        Filtreye uyan kayıtları eskiden yeniye üret (sorgu boru hattı için).
+
+        limit verilirse query ile son `limit` kayıt döner. limit 0 ise
+        zaman aralığı kilit altında sütun dilimleri olarak alınır ve
+        kayıtlar tüketildikçe kurulur.
+        """
+        if limit:
+            yield from self.query(limit=limit, level=level, service=service, since=since, until=until)
+            return
+        with self._lock:
+            data = self._data
+            lo = bisect.bisect_left(data.ts, since.timestamp()) if since else 0
+            hi = bisect.bisect_right(data.ts, until.timestamp()) if until else len(data)
+            window = LogBatch(**{name: getattr(data, name)[lo:hi] for name in LogBatch.COLUMNS})
+        for i in range(len(window)):
+            if level is not None and window.level[i] > level.value:
+                continue
+            if service and window.service[i] != service:
+                continue
+            yield self._entry(window, i)
+
+    def _entry(self, data: LogBatch, index: int) -> LogEntry:
+        entry = data.entry(index)
+        if self.templates is not None:
+            encoded = entry.message
+            entry.message = self.templates.decode(encoded)
+            entry.template_id = self.templates.template_of(encoded)
+        return entry
+
+    def get_statistics(self) -> Dict:
+        """Seviye ve servis bazında kayıt sayıları"""
+        with self._lock:
+            by_level: Dict[str, int] = {}
+            for value in self._data.level:
+                name = _LEVELS.get(value, LogLevel.INFO).name
+                by_level[name] = by_level.get(name, 0) + 1
+            services = len(set(self._data.service))
+            total = len(self._data)
+        return {"total": total, "by_level": by_level, "services": services}
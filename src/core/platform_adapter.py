@@ -0,0 +1,51 @@
+"""
+Platform Adapter Module
+Platforma uygun servis/log adaptörünün paylaşılan örneği.
+
+ServiceMonitor ve LogCollector adaptör verilmediğinde aynı örneği
+kullanır; adaptör modülü ilk ihtiyaçta bir kez import edilir.
+"""
+
+import os
+import sys
+import threading
+
+_adapter = None
+_lock = threading.Lock()
+
+
+def platform_name() -> str:
+    """
+    platform.system().lower() karşılığı ('linux', 'windows', 'darwin').
+
+    platform modülünü import etmeden sys.platform'dan türetilir.
+    """
+    if sys.platform.startswith("linux"):
+        return "linux"
+    if sys.platform in ("win32", "cygwin"):
+        return "windows"
+    return sys.platform
+
+
+def create_adapter():
+    """Platforma göre yeni bir adaptör oluştur"""
+    # Adapters modülünü import edebilmek için path ekle
+    src_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if src_path not in sys.path:
+        sys.path.insert(0, src_path)
+
+    if platform_name() == "linux":
+        from adapters.linux_adapter import LinuxAdapter
+        return LinuxAdapter()
+    from adapters.windows_adapter import WindowsAdapter
+    return WindowsAdapter()
+
+
+def get_default_adapter():
+    """Süreç genelinde paylaşılan adaptör (ilk çağrıda oluşturulur)"""
+    global _adapter
+    if _adapter is None:
+        with _lock:
+            if _adapter is None:
+                _adapter = create_adapter()
+    return _adapter
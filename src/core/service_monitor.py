@@ -3,11 +3,14 @@ Service Monitor Module
 Cross-platform sistem servisleri izleme modülü.
 """
 
-import platform
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+import fnmatch
+import re
+from typing import Iterable, List, Dict, Optional
+from dataclasses import dataclass, field
 from enum import Enum
 
+from .platform_adapter import get_default_adapter, platform_name
+
 
 class ServiceStatus(Enum):
     """Servis durumu enum'u"""
@@ -17,6 +20,37 @@ class ServiceStatus(Enum):
     UNKNOWN = "unknown"
 
 
+@dataclass
+class ServiceResources:
+    """Servis kaynak kullanımı veri sınıfı (cgroup ve /proc sayaçları)"""
+    name: str
+    cpu_usage_usec: int = 0
+    cpu_user_usec: int = 0
+    cpu_system_usec: int = 0
+    memory_bytes: int = 0
+    tasks: int = 0
+    main_pid: Optional[int] = None
+    process_state: str = ""
+    process_utime: int = 0
+    process_stime: int = 0
+    process_threads: int = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "cpu_usage_usec": self.cpu_usage_usec,
+            "cpu_user_usec": self.cpu_user_usec,
+            "cpu_system_usec": self.cpu_system_usec,
+            "memory_bytes": self.memory_bytes,
+            "tasks": self.tasks,
+            "main_pid": self.main_pid,
+            "process_state": self.process_state,
+            "process_utime": self.process_utime,
+            "process_stime": self.process_stime,
+            "process_threads": self.process_threads
+        }
+
+
 @dataclass
 class ServiceInfo:
     """Servis bilgisi veri sınıfı"""
@@ -26,6 +60,10 @@ class ServiceInfo:
     is_critical: bool = False
     description: str = ""
     pid: Optional[int] = None
+    resources: Optional[ServiceResources] = None
+    sub_state: str = ""  # systemd SUB durumu (running, exited, auto-restart...)
+    # Kodlanmış to_dict() önbelleği (core.encoding)
+    _encoded: Optional[Dict] = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self) -> Dict:
         return {
@@ -34,10 +72,62 @@ class ServiceInfo:
             "status": self.status.value,
             "is_critical": self.is_critical,
             "description": self.description,
-            "pid": self.pid
+            "pid": self.pid,
+            "sub_state": self.sub_state,
+            "resources": self.resources.to_dict() if self.resources else None
         }
 
 
+class CriticalMatcher:
+    """
+    Kritik servis listesinin derlenmiş hali.
+
+    Girdiler tam ad, glob deseni ('postgresql@*', 'docker-*') veya 're:'
+    önekli düzenli ifade ('re:kube-.*-[0-9]+') olabilir. Tam adlar bir
+    frozenset'te, desenler tek bir birleşik regex'te tutulur. Ad başına
+    sonuç önbelleklenir; binlerce şablon örneği (foo@1, foo@2...) her
+    turda yeniden eşleştirilmez. Nesne değişmezdir, liste değişince
+    yenisi kurulur.
+    """
+
+    # Önbelleklenen en fazla ad (dolunca sıfırlanır)
+    MAX_MEMO = 65536
+
+    def __init__(self, entries: Iterable[str] = ()):
+        self.entries = tuple(dict.fromkeys(entries))
+        self.exact = frozenset(entry for entry in self.entries if not self.is_pattern(entry))
+        self.patterns = tuple(entry for entry in self.entries if self.is_pattern(entry))
+        self.regex = re.compile("|".join(
+            f"(?:{entry[3:]})" if entry.startswith("re:") else fnmatch.translate(entry)
+            for entry in self.patterns
+        )) if self.patterns else None
+        self._memo: Dict[str, bool] = {}
+
+    @staticmethod
+    def is_pattern(entry: str) -> bool:
+        return entry.startswith("re:") or any(char in entry for char in "*?[")
+
+    @property
+    def has_regex(self) -> bool:
+        """systemctl/journalctl'e verilemeyen 're:' deseni var mı"""
+        return any(entry.startswith("re:") for entry in self.patterns)
+
+    def __contains__(self, name: str) -> bool:
+        if name in self.exact:
+            return True
+        if self.regex is None:
+            return False
+        matched = self._memo.get(name)
+        if matched is None:
+            if len(self._memo) >= self.MAX_MEMO:
+                self._memo.clear()
+            matched = self._memo[name] = self.regex.fullmatch(name) is not None
+        return matched
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
 class ServiceMonitor:
     """
     Cross-platform servis izleme sınıfı.
@@ -50,17 +140,41 @@ class ServiceMonitor:
         "windows": ["Spooler", "BITS", "wuauserv", "Dhcp", "Dnscache", "EventLog"]
     }
 
-    def __init__(self, custom_critical_services: List[str] = None):
+    def __init__(self, custom_critical_services: List[str] = None, adapter=None):
         """
         ServiceMonitor başlatıcı.
         
         Args:
             custom_critical_services: Özel kritik servis listesi
+            adapter: Servis adaptörü (None ise platforma göre seçilir)
         """
-        self.platform = platform.system().lower()
-        self.adapter = self._get_adapter()
+        self.platform = platform_name()
+        self.adapter = adapter or self._get_adapter()
         self.critical_services = custom_critical_services or self._get_default_critical()
 
+    @property
+    def critical_services(self) -> List[str]:
+        """Kritik servis adları ve desenleri (kopya)"""
+        return list(self._critical)
+
+    @critical_services.setter
+    def critical_services(self, service_names: List[str]):
+        # Sıralı küme: ekleme/çıkarma O(1), eşleyici ilk kullanımda yeniden kurulur
+        self._critical = dict.fromkeys(service_names)
+        self._matcher: Optional[CriticalMatcher] = None
+
+    @property
+    def critical_matcher(self) -> CriticalMatcher:
+        """Güncel derlenmiş eşleyici (liste değiştiyse yeniden kurulur)"""
+        matcher = self._matcher
+        if matcher is None:
+            matcher = self._matcher = CriticalMatcher(self._critical)
+        return matcher
+
+    def is_critical(self, service_name: str) -> bool:
+        """Servis kritik listede mi (tam ad veya desen)"""
+        return service_name in self.critical_matcher
+
     def _get_default_critical(self) -> List[str]:
         """Varsayılan kritik servisleri döndür"""
         if self.platform == "linux":
@@ -68,20 +182,8 @@ class ServiceMonitor:
         return self.DEFAULT_CRITICAL_SERVICES["windows"]
 
     def _get_adapter(self):
-        """Platform'a göre uygun adaptörü döndür"""
-        import sys
-        import os
-        # Adapters modülünü import edebilmek için path ekle
-        src_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        if src_path not in sys.path:
-            sys.path.insert(0, src_path)
-        
-        if self.platform == "linux":
-            from adapters.linux_adapter import LinuxAdapter
-            return LinuxAdapter()
-        else:
-            from adapters.windows_adapter import WindowsAdapter
-            return WindowsAdapter()
+        """Platform'a göre paylaşılan adaptörü döndür"""
+        return get_default_adapter()
 
     def get_all_services(self) -> List[ServiceInfo]:
         """
@@ -90,11 +192,17 @@ class ServiceMonitor:
         Returns:
             ServiceInfo listesi
         """
-        services = self.adapter.get_services()
-        
-        # Kritik servisleri işaretle
+        return self._mark_critical(self.adapter.get_services())
+
+    async def get_all_services_async(self) -> List[ServiceInfo]:
+        """Tüm servisleri listele (async)"""
+        return self._mark_critical(await self.adapter.get_services_async())
+
+    def _mark_critical(self, services: List[ServiceInfo]) -> List[ServiceInfo]:
+        """Kritik servisleri işaretle"""
+        matcher = self.critical_matcher
         for service in services:
-            if service.name in self.critical_services:
+            if service.name in matcher:
                 service.is_critical = True
         
         return services
@@ -110,10 +218,33 @@ class ServiceMonitor:
             ServiceInfo nesnesi
         """
         service = self.adapter.get_service_status(service_name)
-        if service and service.name in self.critical_services:
+        if service and self.is_critical(service.name):
+            service.is_critical = True
+        return service
+
+    async def get_service_status_async(self, service_name: str) -> ServiceInfo:
+        """Belirli bir servisin durumunu al (async)"""
+        service = await self.adapter.get_service_status_async(service_name)
+        if service and self.is_critical(service.name):
             service.is_critical = True
         return service
 
+    def get_service_resources(self, service_names: List[str] = None) -> Dict[str, ServiceResources]:
+        """
+        Servislerin CPU/bellek/görev kullanımını al.
+        
+        Args:
+            service_names: Servis adları (None ise çalışan tüm servisler)
+            
+        Returns:
+            Servis adı -> ServiceResources sözlüğü
+        """
+        if not hasattr(self.adapter, "get_service_resources"):
+            return {}
+        if service_names is None:
+            service_names = [s.name for s in self.get_running_services()]
+        return self.adapter.get_service_resources(service_names)
+
     def get_running_services(self) -> List[ServiceInfo]:
         """Çalışan servisleri döndür"""
         return [s for s in self.get_all_services() if s.status == ServiceStatus.RUNNING]
@@ -130,20 +261,67 @@ class ServiceMonitor:
         """Kritik servisleri döndür"""
         return [s for s in self.get_all_services() if s.is_critical]
 
-    def get_critical_down_services(self) -> List[ServiceInfo]:
-        """Durmuş kritik servisleri döndür"""
-        return [s for s in self.get_critical_services() 
-                if s.status in [ServiceStatus.STOPPED, ServiceStatus.FAILED]]
+    def get_critical_down_services(self, services: List[ServiceInfo] = None) -> List[ServiceInfo]:
+        """
+        Durmuş kritik servisleri döndür.
+        
+        Args:
+            services: Önceden alınmış servis listesi (None ise yeniden sorgulanır)
+        """
+        if services is None:
+            services = self.get_all_services()
+        return [s for s in services
+                if s.is_critical and s.status in [ServiceStatus.STOPPED, ServiceStatus.FAILED]]
+
+    def get_critical_states(self, names: List[str] = None) -> Dict[str, ServiceStatus]:
+        """
+        Kritik servislerin durumu (sistemde bulunmayanlar hariç).
+        
+        Adaptör toplu durum sorgusunu destekliyorsa (get_units_state)
+        yalnızca istenen servisler sorgulanır; aksi halde tüm servis
+        listesi alınıp süzülür.
+        
+        Args:
+            names: Sorgulanacak kritik servisler (None ise hepsi)
+        """
+        if names is None:
+            matcher = self.critical_matcher
+            names = list(matcher.entries)
+        else:
+            matcher = CriticalMatcher(names)
+        # Glob desenleri systemctl show'a aynen verilir; 're:' desenleri için tüm liste süzülür
+        if hasattr(self.adapter, "get_units_state") and not matcher.has_regex:
+            return self.adapter.get_units_state(names)
+        return {s.name: s.status for s in self.adapter.get_services() if s.name in matcher}
+
+    def get_critical_names(self) -> List[str]:
+        """
+        İzlenecek somut servis adları.
+
+        Tam adlar aynen döner; desenler şu an sistemde bulunan eşleşen
+        birimlere açılır (journal eşleşmeleri desen kabul etmez).
+        """
+        matcher = self.critical_matcher
+        names = [entry for entry in matcher.entries if entry in matcher.exact]
+        if matcher.patterns:
+            names.extend(sorted(name for name in self.get_critical_states() if name not in matcher.exact))
+        return names
 
     def add_critical_service(self, service_name: str):
-        """Kritik servis listesine ekle"""
-        if service_name not in self.critical_services:
-            self.critical_services.append(service_name)
+        """Kritik servis listesine ekle (ad veya desen)"""
+        if service_name not in self._critical:
+            self._critical[service_name] = None
+            self._matcher = None
 
     def remove_critical_service(self, service_name: str):
         """Kritik servis listesinden çıkar"""
-        if service_name in self.critical_services:
-            self.critical_services.remove(service_name)
+        if service_name in self._critical:
+            del self._critical[service_name]
+            self._matcher = None
+
+    def set_critical_services(self, service_names: List[str]):
+        """Kritik servis listesini değiştir (yapılandırma yeniden yüklemesi)"""
+        self.critical_services = service_names
 
     def get_service_summary(self) -> Dict:
         """
@@ -152,14 +330,26 @@ class ServiceMonitor:
         Returns:
             Özet istatistikleri içeren sözlük
         """
-        services = self.get_all_services()
+        return self.summarize(self.get_all_services())
+
+    async def get_service_summary_async(self) -> Dict:
+        """Servis özeti döndür (async)"""
+        return self.summarize(await self.get_all_services_async())
+
+    def summarize(self, services: List[ServiceInfo]) -> Dict:
+        """
+        Verilen servis listesinden özet hesapla (yeni sorgu yapmaz).
+        
+        Returns:
+            Özet istatistikleri içeren sözlük
+        """
         return {
             "total": len(services),
             "running": len([s for s in services if s.status == ServiceStatus.RUNNING]),
             "stopped": len([s for s in services if s.status == ServiceStatus.STOPPED]),
             "failed": len([s for s in services if s.status == ServiceStatus.FAILED]),
             "critical_total": len([s for s in services if s.is_critical]),
-            "critical_down": len(self.get_critical_down_services()),
+            "critical_down": len(self.get_critical_down_services(services)),
             "platform": self.platform
         }
 
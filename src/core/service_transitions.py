@@ -0,0 +1,378 @@
+"""
+Service Transitions Module
+Ardışık servis görüntüleri arasındaki durum geçişleri.
+
+SnapshotManager her turda yalnızca anahtarı değişen servisleri ve
+kaldırılan adları verir; burada önceki kayıtla (durum, PID, alt
+durum) karşılaştırılıp zaman damgalı geçiş olayları üretilir. Maliyet
+birim sayısıyla değil değişiklik sayısıyla orantılıdır: çalışma ve
+durma süreleri her geçişte biriktirilir, açık aralık okurken eklenir.
+
+Geçişler uyarıları besler (çalışırken duran kritik servis için uyarı,
+geri geldiğinde otomatik çözüm), birim başına çalışma oranı ve
+dalgalanma (flapping) istatistiği tutar ve callback'lerle (WebSocket)
+istemcilere iletilir.
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from .alert_manager import AlertManager, AlertType
+from .critical_watcher import DOWN_STATES
+from .instrumentation import instruments
+from .service_monitor import ServiceInfo, ServiceStatus
+
+# Servis geri geldiğinde çözülen uyarı tipleri
+DOWN_ALERT_TYPES = (AlertType.CRITICAL_SERVICE_DOWN, AlertType.SERVICE_DOWN, AlertType.SERVICE_FAILED)
+
+
+@dataclass
+class StateChange:
+    """
+    Tek bir servis geçişi.
+
+    kind: 'down' (çalışırken durdu/hata), 'up' (geri geldi), 'status'
+    (diğer durum değişiklikleri), 'added', 'removed', 'restart' (durum
+    aynı, PID değişti) veya 'substate' (yalnızca alt durum değişti)
+    """
+    id: int
+    name: str
+    kind: str
+    previous: Optional[ServiceStatus]
+    current: Optional[ServiceStatus]
+    previous_pid: Optional[int]
+    pid: Optional[int]
+    sub_state: str
+    is_critical: bool
+    timestamp: float
+    version: int = 0  # geçişin görüldüğü görüntü sürümü
+    flapping: bool = False  # birim geçiş anında dalgalanıyor mu
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "kind": self.kind,
+            "previous": self.previous.value if self.previous else None,
+            "current": self.current.value if self.current else None,
+            "previous_pid": self.previous_pid,
+            "pid": self.pid,
+            "sub_state": self.sub_state,
+            "is_critical": self.is_critical,
+            "timestamp": self.timestamp,
+            "version": self.version,
+            "flapping": self.flapping
+        }
+
+
+@dataclass
+class UnitHistory:
+    """Birim başına son durum ve biriken çalışma/durma süreleri"""
+    status: ServiceStatus
+    pid: Optional[int]
+    sub_state: str
+    is_critical: bool
+    first_seen: float
+    since: float  # mevcut durumun başladığı zaman
+    up_seconds: float = 0.0
+    down_seconds: float = 0.0
+    transitions: int = 0
+    restarts: int = 0
+    last_down: Optional[float] = None
+    last_up: Optional[float] = None
+    # flap_window içindeki çalışma/durma geçişlerinin zamanları
+    edges: Deque[float] = field(default_factory=deque)
+    flapping: bool = False
+
+    def close_interval(self, now: float):
+        """Mevcut durumun süresini toplamlara ekle"""
+        elapsed = max(now - self.since, 0.0)
+        if self.status == ServiceStatus.RUNNING:
+            self.up_seconds += elapsed
+        elif self.status in DOWN_STATES:
+            self.down_seconds += elapsed
+        self.since = now
+
+    def to_dict(self, name: str, now: float) -> Dict:
+        up, down = self.up_seconds, self.down_seconds
+        elapsed = max(now - self.since, 0.0)
+        if self.status == ServiceStatus.RUNNING:
+            up += elapsed
+        elif self.status in DOWN_STATES:
+            down += elapsed
+        return {
+            "name": name,
+            "status": self.status.value,
+            "sub_state": self.sub_state,
+            "is_critical": self.is_critical,
+            "since": self.since,
+            "uptime_ratio": round(up / (up + down), 6) if up + down else None,
+            "up_seconds": round(up, 3),
+            "down_seconds": round(down, 3),
+            "transitions": self.transitions,
+            "restarts": self.restarts,
+            "recent_transitions": len(self.edges),
+            "flapping": self.flapping,
+            "last_down": self.last_down,
+            "last_up": self.last_up
+        }
+
+
+class TransitionTracker:
+    """
+    Servis geçişi motoru.
+
+    observe() her görüntü turunda değişen servislerle çağrılır. Bir
+    birim flap_window saniye içinde flap_threshold kez çalışma/durma
+    arasında geçiş yaparsa dalgalanıyor sayılır: tek bir dalgalanma
+    uyarısı oluşturulur ve bu süre boyunca durma uyarıları bastırılır.
+    """
+
+    def __init__(self,
+                 alert_manager: AlertManager = None,
+                 flap_window: float = 600.0,
+                 flap_threshold: int = 5,
+                 history: int = 1000):
+        """
+        Args:
+            alert_manager: Durma/dalgalanma uyarılarının gönderileceği yönetici
+            flap_window: Dalgalanma penceresi (saniye)
+            flap_threshold: Pencerede dalgalanma sayılan geçiş sayısı
+            history: Tutulacak son geçiş sayısı
+        """
+        self.alert_manager = alert_manager
+        self.flap_window = flap_window
+        self.flap_threshold = flap_threshold
+
+        self._units: Dict[str, UnitHistory] = {}
+        self._events: Deque[StateChange] = deque(maxlen=history)
+        self._flapping: Dict[str, UnitHistory] = {}
+        self._counts: Dict[str, int] = {}
+        self._next_id = 0
+        self._primed = False
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[List[StateChange]], None]] = []
+
+    @property
+    def last_id(self) -> int:
+        return self._next_id
+
+    def add_callback(self, callback: Callable[[List[StateChange]], None]):
+        """Geçiş callback'i ekle (tur başına bir kez, olay listesiyle)"""
+        self._callbacks.append(callback)
+
+    def _notify_callbacks(self, events: List[StateChange]):
+        for callback in self._callbacks:
+            try:
+                instruments.call("callback.transition", callback, events)
+            except Exception as e:
+                print(f"Transition callback error: {e}")
+
+    def observe(self,
+                changed: List[ServiceInfo],
+                gone: List[str] = (),
+                now: float = None,
+                version: int = 0) -> List[StateChange]:
+        """
+        Değişen ve kaldırılan servisleri işle.
+
+        İlk çağrıda tüm servisler kaydedilir; yalnızca durmuş olanlar
+        için geçiş üretilir (önceki durum None).
+
+        Args:
+            changed: Son görüntüden bu yana anahtarı değişen servisler
+            gone: Kaldırılan servis adları
+            now: Görüntü zamanı (None ise şimdi)
+            version: Görüntü sürümü
+
+        Returns:
+            Üretilen geçişler
+        """
+        now = time.time() if now is None else now
+        events: List[StateChange] = []
+        started: List[StateChange] = []
+        with self._lock:
+            initial = not self._primed
+            self._primed = True
+            for service in changed:
+                event = self._observe_service(service, now, version, initial)
+                if event is not None:
+                    events.append(event)
+                    if event.flapping and event.name not in self._flapping:
+                        self._flapping[event.name] = self._units[event.name]
+                        started.append(event)
+            for name in gone:
+                record = self._units.pop(name, None)
+                if record is None:
+                    continue
+                self._flapping.pop(name, None)
+                events.append(self._event(name, "removed", record.status, None, record.pid, None,
+                                          record.sub_state, record.is_critical, now, version))
+            expired = self._expire_flapping(now)
+            self._events.extend(events)
+
+        self._raise_alerts(events, started, expired)
+        if events:
+            self._notify_callbacks(events)
+        return events
+
+    def _event(self, name, kind, previous, current, previous_pid, pid, sub_state,
+               is_critical, now, version) -> StateChange:
+        self._next_id += 1
+        self._counts[kind] = self._counts.get(kind, 0) + 1
+        return StateChange(self._next_id, name, kind, previous, current, previous_pid, pid,
+                           sub_state, is_critical, now, version)
+
+    def _observe_service(self, service: ServiceInfo, now: float, version: int,
+                         initial: bool) -> Optional[StateChange]:
+        """Tek servisi önceki kaydıyla karşılaştır (kilit tutulurken)"""
+        status = service.status
+        record = self._units.get(service.name)
+        if record is None:
+            self._units[service.name] = UnitHistory(
+                status=status, pid=service.pid, sub_state=service.sub_state,
+                is_critical=service.is_critical, first_seen=now, since=now
+            )
+            if initial and status not in DOWN_STATES:
+                return None
+            kind = "down" if status in DOWN_STATES else "added"
+            return self._event(service.name, kind, None, status, None, service.pid,
+                               service.sub_state, service.is_critical, now, version)
+
+        previous, previous_pid = record.status, record.pid
+        became_critical = service.is_critical and not record.is_critical
+        record.is_critical = service.is_critical
+        if status != previous:
+            record.close_interval(now)
+            record.status = status
+            record.transitions += 1
+            was_down, is_down = previous in DOWN_STATES, status in DOWN_STATES
+            if is_down and not was_down:
+                kind = "down"
+                record.last_down = now
+            elif was_down and status == ServiceStatus.RUNNING:
+                kind = "up"
+                record.last_up = now
+            else:
+                kind = "status"
+            if kind in ("down", "up"):
+                record.edges.append(now)
+                self._update_flapping(record, now)
+        elif service.pid != previous_pid and previous_pid is not None and service.pid is not None:
+            record.restarts += 1
+            kind = "restart"
+        elif service.sub_state != record.sub_state:
+            kind = "substate"
+        elif became_critical and status in DOWN_STATES:
+            # Kritik listeye durmuşken eklendi: uyarı için durma olayı sayılır
+            kind = "down"
+        else:
+            # Yalnızca açıklama/görünen ad değişti
+            record.pid = service.pid
+            return None
+        record.pid = service.pid
+        record.sub_state = service.sub_state
+        event = self._event(service.name, kind, previous, status, previous_pid, service.pid,
+                            service.sub_state, service.is_critical, now, version)
+        event.flapping = record.flapping
+        return event
+
+    def _update_flapping(self, record: UnitHistory, now: float):
+        """Pencere dışındaki geçişleri at, dalgalanma eşiğini kontrol et"""
+        floor = now - self.flap_window
+        while record.edges and record.edges[0] < floor:
+            record.edges.popleft()
+        if len(record.edges) >= self.flap_threshold:
+            record.flapping = True
+
+    def _expire_flapping(self, now: float) -> List[Tuple[str, bool]]:
+        """
+        Penceresi sakinleşen birimlerin dalgalanmasını bitir (yalnızca dalgalananlar gezilir).
+
+        Returns:
+            (servis adı, kritik ve durmuş mu) listesi
+        """
+        expired = []
+        floor = now - self.flap_window
+        for name, record in list(self._flapping.items()):
+            while record.edges and record.edges[0] < floor:
+                record.edges.popleft()
+            if len(record.edges) < self.flap_threshold:
+                record.flapping = False
+                del self._flapping[name]
+                expired.append((name, record.is_critical and record.status in DOWN_STATES))
+        return expired
+
+    def _raise_alerts(self, events: List[StateChange], started: List[StateChange],
+                      expired: List[Tuple[str, bool]]):
+        """Geçişlerden uyarı oluştur / çöz (kilit dışında)"""
+        manager = self.alert_manager
+        if manager is None:
+            return
+        for event in events:
+            if event.kind == "down" and event.is_critical and not event.flapping:
+                manager.check_service_status(event.name, is_running=False, is_critical=True)
+            elif event.kind == "up":
+                manager.resolve_alerts(event.name, DOWN_ALERT_TYPES)
+            elif event.kind == "removed":
+                manager.resolve_alerts(event.name, DOWN_ALERT_TYPES + (AlertType.SERVICE_FLAPPING,))
+        for event in started:
+            manager.check_service_flapping(event.name, self.flap_threshold, self.flap_window,
+                                           is_critical=event.is_critical)
+        for name, down in expired:
+            manager.resolve_alerts(name, (AlertType.SERVICE_FLAPPING,))
+            if down:
+                # Dalgalanırken bastırılan durma uyarısı: servis durmuş kaldıysa şimdi verilir
+                manager.check_service_status(name, is_running=False, is_critical=True)
+
+    def get_transitions(self, since: int = 0, service: str = None, limit: int = 100) -> List[Dict]:
+        """
+        Son geçişler (eskiden yeniye).
+
+        Args:
+            since: Yalnızca bu id'den sonraki geçişler
+            service: Yalnızca bu servisin geçişleri
+            limit: En fazla geçiş sayısı (en yeniler)
+        """
+        with self._lock:
+            events = [event for event in self._events
+                      if event.id > since and (service is None or event.name == service)]
+        if limit > 0:
+            events = events[-limit:]
+        return [event.to_dict() for event in events]
+
+    def get_uptime(self, service: str = None, limit: int = 0, sort: str = "transitions") -> List[Dict]:
+        """
+        Birim başına çalışma oranı ve dalgalanma istatistiği.
+
+        Args:
+            service: Yalnızca bu servis
+            limit: En fazla birim sayısı (0 ise hepsi)
+            sort: 'transitions' (en çok geçiş yapan önce) veya 'uptime' (en düşük oran önce)
+        """
+        now = time.time()
+        with self._lock:
+            if service is not None:
+                record = self._units.get(service)
+                return [record.to_dict(service, now)] if record else []
+            items = [record.to_dict(name, now) for name, record in self._units.items()]
+        if sort == "uptime":
+            items.sort(key=lambda item: (item["uptime_ratio"] is None, item["uptime_ratio"] or 0.0))
+        else:
+            items.sort(key=lambda item: (-item["transitions"], item["name"]))
+        return items[:limit] if limit > 0 else items
+
+    def get_stats(self) -> Dict:
+        """Genel sayaçlar"""
+        with self._lock:
+            return {
+                "units": len(self._units),
+                "transitions": self._next_id,
+                "by_kind": dict(self._counts),
+                "flapping": sorted(self._flapping),
+                "flap_window": self.flap_window,
+                "flap_threshold": self.flap_threshold
+            }
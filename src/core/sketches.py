@@ -0,0 +1,329 @@
+"""
+Sketches Module
+Log akışı için sabit bellekli, birleştirilebilir özet yapıları.
+
+- SpaceSaving: en sık k öğe (servis, şablon) ve sayım hata payı
+- CountMinSketch: herhangi bir öğenin sıklık tahmini (yalnızca üstten hatalı)
+- HyperLogLog: farklı öğe sayısı (kaynak, host)
+
+Hepsi aynı parametrelerle kurulmuş bir eşiyle merge edilebilir;
+WindowedSketches zaman pencereleri tutar ve sorgu anında istenen
+aralıktaki pencereleri birleştirir.
+"""
+
+import hashlib
+import math
+import operator
+import threading
+import time
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .instrumentation import instruments
+from .log_collector import LogEntry
+
+# Aggregator modunda servis adları "host/servis" biçimindedir
+HOST_SEPARATOR = "/"
+
+
+def _hash64(item: Hashable) -> int:
+    """
+    Süreçten bağımsız 64 bit özet.
+
+    Yerleşik hash() süreç başına rastgele tohumlanır; farklı süreçlerde
+    (agent'lar, gunicorn worker'ları) üretilen sketch'ler birleştirilebilsin
+    diye sabit bir özet kullanılır.
+    """
+    data = item.encode("utf-8", errors="replace") if isinstance(item, str) else repr(item).encode()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+class SpaceSaving:
+    """
+    Space-Saving ile en sık k öğe.
+
+    En fazla k sayaç tutulur; yeni bir öğe gelip sayaçlar doluysa en
+    küçük sayaç bu öğeye devredilir ve eski değeri öğenin hata payı olur.
+    Gerçek sayı count - error ile count arasındadır.
+    """
+
+    def __init__(self, k: int = 50):
+        self.k = k
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+        self.total = 0
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def add(self, item: Hashable, count: int = 1):
+        self.total += count
+        counts = self.counts
+        if item in counts:
+            counts[item] += count
+        elif len(counts) < self.k:
+            counts[item] = count
+            self.errors[item] = 0
+        else:
+            victim = min(counts, key=counts.__getitem__)
+            floor = counts.pop(victim)
+            del self.errors[victim]
+            counts[item] = floor + count
+            self.errors[item] = floor
+
+    def min_count(self) -> int:
+        """Dolu sketch'te listede olmayan bir öğenin en fazla sayısı"""
+        return min(self.counts.values()) if len(self.counts) >= self.k else 0
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """
+        İki sketch'in birleşimi (yeni nesne).
+
+        Bir tarafta olmayan öğe için o tarafın en küçük sayacı hem sayıya
+        hem hata payına eklenir; sonuç yine en büyük k sayaçtır.
+        """
+        result = SpaceSaving(max(self.k, other.k))
+        result.total = self.total + other.total
+        floor_a, floor_b = self.min_count(), other.min_count()
+        for item in self.counts.keys() | other.counts.keys():
+            a, b = self.counts.get(item), other.counts.get(item)
+            result.counts[item] = (floor_a if a is None else a) + (floor_b if b is None else b)
+            result.errors[item] = ((floor_a if a is None else self.errors[item]) +
+                                   (floor_b if b is None else other.errors[item]))
+        if len(result.counts) > result.k:
+            keep = sorted(result.counts, key=result.counts.__getitem__, reverse=True)[:result.k]
+            result.counts = {item: result.counts[item] for item in keep}
+            result.errors = {item: result.errors[item] for item in keep}
+        return result
+
+    def top(self, limit: int = 10) -> List[Tuple[Hashable, int, int]]:
+        """(öğe, sayı, hata payı) listesi, en sık önce"""
+        items = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(item, count, self.errors[item]) for item, count in items]
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch ile sıklık tahmini.
+
+    depth satır x width sütun sayaç; her öğe satır başına bir sütunu
+    artırır. Tahmin satırlardaki en küçük değerdir ve gerçek sayıdan
+    küçük olamaz; hata en fazla e/width * toplam (1 - e^-depth olasılıkla).
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.rows = [[0] * width for _ in range(depth)]
+        self.total = 0
+
+    def _indexes(self, item: Hashable):
+        # Çift özetleme: tek 64 bit özetten depth adet sütun
+        h = _hash64(item)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        width = self.width
+        return [(h1 + i * h2) % width for i in range(self.depth)]
+
+    def add(self, item: Hashable, count: int = 1):
+        self.total += count
+        for row, index in zip(self.rows, self._indexes(item)):
+            row[index] += count
+
+    def estimate(self, item: Hashable) -> int:
+        return min(row[index] for row, index in zip(self.rows, self._indexes(item)))
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Count-Min sketches must have the same dimensions")
+        result = CountMinSketch(self.width, self.depth)
+        result.rows = [list(map(operator.add, a, b)) for a, b in zip(self.rows, other.rows)]
+        result.total = self.total + other.total
+        return result
+
+
+class HyperLogLog:
+    """
+    HyperLogLog ile farklı öğe sayısı.
+
+    2^p adet bir baytlık yazmaç; standart hata yaklaşık 1.04 / sqrt(2^p)
+    (p=12 için %1.6). Küçük sayılarda doğrusal sayım düzeltmesi uygulanır.
+    """
+
+    def __init__(self, p: int = 12):
+        if not 4 <= p <= 16:
+            raise ValueError("HyperLogLog precision must be between 4 and 16")
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+
+    def add(self, item: Hashable):
+        h = _hash64(item)
+        index = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        m = self.m
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if self.p != other.p:
+            raise ValueError("HyperLogLog sketches must have the same precision")
+        result = HyperLogLog(self.p)
+        result.registers = bytearray(map(max, self.registers, other.registers))
+        return result
+
+
+class SketchWindow:
+    """Bir zaman penceresindeki servis/şablon/kaynak/host özetleri"""
+
+    def __init__(self, k: int = 50, cm_width: int = 2048, cm_depth: int = 4, hll_p: int = 12):
+        self.services = SpaceSaving(k)
+        self.templates = SpaceSaving(k)
+        self.frequency = CountMinSketch(cm_width, cm_depth)
+        self.sources = HyperLogLog(hll_p)
+        self.hosts = HyperLogLog(hll_p)
+
+    @property
+    def total(self) -> int:
+        return self.services.total
+
+    def add(self, entry: LogEntry):
+        service = entry.service or "unknown"
+        template = entry.template_id if entry.template_id is not None else entry.message
+        # Örneklenen kayıt temsil ettiği kayıt sayısıyla eklenir (toplam dahil)
+        weight = entry.sample_weight
+        self.services.add(service, weight)
+        self.templates.add(template, weight)
+        self.frequency.add(("service", service), weight)
+        self.frequency.add(("template", template), weight)
+        if entry.source:
+            self.sources.add(entry.source)
+        host = service.split(HOST_SEPARATOR, 1)[0] if HOST_SEPARATOR in service else entry.source
+        if host:
+            self.hosts.add(host)
+
+    def merge(self, other: "SketchWindow") -> "SketchWindow":
+        result = SketchWindow.__new__(SketchWindow)
+        result.services = self.services.merge(other.services)
+        result.templates = self.templates.merge(other.templates)
+        result.frequency = self.frequency.merge(other.frequency)
+        result.sources = self.sources.merge(other.sources)
+        result.hosts = self.hosts.merge(other.hosts)
+        return result
+
+
+class WindowedSketches:
+    """
+    Zaman pencereli, sabit bellekli log özetleri.
+
+    Kayıtlar zaman damgalarına göre window saniyelik pencerelere eklenir;
+    en fazla windows pencere tutulur. Sorgu istenen aralıktaki pencereleri
+    birleştirir; maliyet log hacminden bağımsız O(pencere x k).
+    """
+
+    def __init__(self,
+                 window: float = 60.0,
+                 windows: int = 60,
+                 k: int = 50,
+                 cm_width: int = 2048,
+                 cm_depth: int = 4,
+                 hll_p: int = 12):
+        """
+        Args:
+            window: Pencere uzunluğu (saniye)
+            windows: Tutulacak pencere sayısı (varsayılan: 1 saat)
+            k: Space-Saving sayaç sayısı
+            cm_width: Count-Min sütun sayısı
+            cm_depth: Count-Min satır sayısı
+            hll_p: HyperLogLog hassasiyeti (2^p yazmaç)
+        """
+        self.window = window
+        self.windows = windows
+        self._params = (k, cm_width, cm_depth, hll_p)
+        self._windows: Dict[int, SketchWindow] = {}
+        self._newest: Optional[int] = None
+        self._lock = threading.Lock()
+        # Son sorgu: (sürüm, alt pencere) -> birleşim
+        self._cache: Tuple[Optional[Tuple], Optional[SketchWindow]] = (None, None)
+        # Tutulan aralıktan eski kayıtlar
+        self.late = 0
+        self.version = 0
+
+    def add_entries(self, entries: Iterable[LogEntry]):
+        """Log kayıtlarını pencerelere ekle (SnapshotManager log callback'i)"""
+        with self._lock:
+            self.version += 1
+            for entry in entries:
+                index = int(entry.timestamp.timestamp() // self.window)
+                if self._newest is None or index > self._newest:
+                    self._newest = index
+                    floor = index - self.windows
+                    for old in [i for i in self._windows if i <= floor]:
+                        del self._windows[old]
+                elif index <= self._newest - self.windows:
+                    self.late += 1
+                    continue
+                window = self._windows.get(index)
+                if window is None:
+                    window = self._windows[index] = SketchWindow(*self._params)
+                window.add(entry)
+
+    def query(self, seconds: float = None, now: float = None) -> SketchWindow:
+        """
+        Son seconds saniyeyi kapsayan pencerelerin birleşimi.
+
+        Args:
+            seconds: Aralık (None ise tutulan tüm pencereler)
+            now: Aralığın sonu (None ise şimdiki zaman)
+        """
+        now = time.time() if now is None else now
+        floor = int((now - seconds) // self.window) if seconds else None
+        with self._lock:
+            key = (self.version, floor)
+            hit = self._cache[0] == key
+            instruments.cache("sketches", hit)
+            if hit:
+                return self._cache[1]
+            selected = [w for i, w in sorted(self._windows.items()) if floor is None or i >= floor]
+            result = SketchWindow(*self._params)
+            for window in selected:
+                result = result.merge(window)
+            self._cache = (key, result)
+        return result
+
+    def estimate(self, kind: str, item: Hashable, seconds: float = None, now: float = None) -> int:
+        """
+        Bir servis veya şablonun aralıktaki sayı tahmini (Count-Min).
+
+        Args:
+            kind: 'service' veya 'template'
+            item: Servis adı veya şablon id'si
+        """
+        return self.query(seconds, now).frequency.estimate((kind, item))
+
+    def summary(self, seconds: float = None, limit: int = 10, now: float = None) -> Dict:
+        """Dashboard için en gürültülü servisler/şablonlar ve farklı kaynak sayıları"""
+        merged = self.query(seconds, now)
+        return {
+            "total": merged.total,
+            "services": [{"name": name, "count": count, "error": error}
+                         for name, count, error in merged.services.top(limit)],
+            "templates": [{"template": item, "count": count, "error": error}
+                          for item, count, error in merged.templates.top(limit)],
+            "distinct_sources": merged.sources.count(),
+            "distinct_hosts": merged.hosts.count()
+        }
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {"windows": len(self._windows), "late": self.late, "window": self.window}
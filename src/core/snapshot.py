@@ -0,0 +1,346 @@
+"""
+Snapshot Module
+Servis ve log durumunun sürümlü anlık görüntüleri.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .service_monitor import ServiceMonitor, ServiceInfo, ServiceStatus
+from .log_collector import LogCollector, LogEntry
+from .log_parser import LogParser
+from .alert_manager import AlertManager
+from .async_utils import run_sync
+from .instrumentation import instruments
+
+
+@dataclass
+class Snapshot:
+    """
+    Toplanmış durumun değişmez görüntüsü.
+
+    version yalnızca içerik değiştiğinde artar; böylece sürüm ETag
+    olarak kullanılabilir ve değişmeyen veri yeniden gönderilmez.
+    """
+    version: int
+    last_modified: datetime
+    collected_at: float
+    collect_duration: float
+    services: List[ServiceInfo]
+    service_summary: Dict
+    logs: List[LogEntry]
+    log_stats: Dict
+    # Servis adı -> son değiştiği sürüm
+    service_versions: Dict[str, int] = field(default_factory=dict)
+    # Kaldırılan servis adı -> kaldırıldığı sürüm
+    removed_services: Dict[str, int] = field(default_factory=dict)
+    # Seviye adı -> süreç başından beri görülen log sayısı (monoton)
+    log_totals: Dict[str, int] = field(default_factory=dict)
+    # Serileştirilmiş yanıt önbelleği (görüntü değişmez olduğu için güvenli)
+    cache: Dict = field(default_factory=dict, repr=False, compare=False)
+
+    def services_since(self, version: int) -> Tuple[List[ServiceInfo], List[str]]:
+        """
+        Verilen sürümden sonra değişen ve kaldırılan servisler.
+
+        Returns:
+            (değişen servisler, kaldırılan servis adları)
+        """
+        changed = [s for s in self.services if self.service_versions.get(s.name, 0) > version]
+        removed = [name for name, v in self.removed_services.items() if v > version]
+        return changed, removed
+
+    def cached(self, key, build: Callable):
+        """Bu görüntüye ait hesaplanmış değeri bir kez üret ve sakla"""
+        value = self.cache.get(key)
+        instruments.cache("snapshot", value is not None)
+        if value is None:
+            value = build()
+            self.cache[key] = value
+        return value
+
+
+def _service_key(service: ServiceInfo) -> Tuple:
+    """Değişiklik tespiti için karşılaştırılan alanlar"""
+    return (service.status, service.pid, service.sub_state, service.is_critical,
+            service.display_name, service.description)
+
+
+class SnapshotManager:
+    """
+    Servis ve log toplayıcılarını çalıştırıp sürümlü Snapshot üretir.
+
+    Arka plan thread'i çalışıyorsa istekler hiçbir zaman toplama
+    tetiklemez; çalışmıyorsa görüntü interval saniyeden eskiyse istek
+    sırasında (aynı anda tek bir toplama ile) yenilenir.
+
+    Loglar artımlı okunur: her turda yalnızca son turdan (veya kayıtlı
+    imleçten) bu yana gelen kayıtlar alınır ve son log_limit kayıtlık
+    pencereye eklenir. Sayaçlar ve hata oranı uyarısı yalnızca yeni
+    kayıtlarla güncellenir. governor verilirse yeni kayıtlar önce ondan
+    geçer; sayaçlar örneklenen kayıtların ağırlıklarıyla tutulur.
+    transitions verilirse servis uyarıları mutlak durumdan değil, yalnızca
+    değişen servislerden üretilen geçişlerden (TransitionTracker) gelir.
+    """
+
+    # Kaldırılan servis kayıtlarının tutulacağı sürüm aralığı
+    REMOVED_HISTORY = 1000
+
+    def __init__(self,
+                 service_monitor: ServiceMonitor,
+                 log_collector: LogCollector,
+                 log_parser: LogParser,
+                 alert_manager: AlertManager,
+                 interval: float = 5.0,
+                 log_limit: int = 100,
+                 log_batch: int = 1000,
+                 anomaly_detector=None,
+                 governor=None,
+                 transitions=None):
+        """
+        SnapshotManager başlatıcı.
+
+        Args:
+            interval: Arka plan yenileme aralığı / istek sırasında kabul edilen en eski yaş
+            log_limit: Görüntüye alınacak son log sayısı
+            log_batch: Tur başına okunacak en fazla yeni log
+            anomaly_detector: Yeni logları alan RateAnomalyDetector; verilirse
+                sabit error_threshold kontrolü yapılmaz
+            governor: Yeni logları callback'lerden önce sınırlayan IngestGovernor
+                (None ise tüm kayıtlar işlenir)
+            transitions: Değişen/kaldırılan servisleri alan TransitionTracker;
+                verilirse kritik servis uyarıları geçişlerden üretilir
+        """
+        self.service_monitor = service_monitor
+        self.log_collector = log_collector
+        self.log_parser = log_parser
+        self.alert_manager = alert_manager
+        self.interval = interval
+        self.log_limit = log_limit
+        self.log_batch = max(log_batch, log_limit)
+        self.anomaly_detector = anomaly_detector
+        self.governor = governor
+        self.transitions = transitions
+
+        self._snapshot: Optional[Snapshot] = None
+        self._version = 0
+        self._service_keys: Dict[str, Tuple] = {}
+        self._log_window = deque(maxlen=log_limit)
+        self._log_totals: Dict[str, int] = {}
+
+        # Toplama zamanlamaları (sürüm değişmese de her turda güncellenir)
+        self.collections = 0
+        self.collect_errors = 0
+        self.last_collect_duration = 0.0
+        self.last_collected_at = 0.0
+        self._refresh_lock = threading.Lock()
+        self._callbacks: List[Callable[[Snapshot], None]] = []
+        self._log_callbacks: List[Callable[[List[LogEntry]], None]] = []
+        if anomaly_detector is not None:
+            self._log_callbacks.append(anomaly_detector.add_entries)
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def current(self) -> Optional[Snapshot]:
+        """Son görüntü; hiçbir zaman toplama tetiklemez (henüz yoksa None)"""
+        return self._snapshot
+
+    def add_callback(self, callback: Callable[[Snapshot], None]):
+        """Yeni sürüm callback'i ekle"""
+        self._callbacks.append(callback)
+
+    def add_log_callback(self, callback: Callable[[List[LogEntry]], None]):
+        """Yeni log kayıtları callback'i ekle (görüntü kurulmadan önce çağrılır)"""
+        self._log_callbacks.append(callback)
+
+    def _notify_log_callbacks(self, new_logs: List[LogEntry]):
+        for callback in self._log_callbacks:
+            try:
+                instruments.call("callback.log", callback, new_logs)
+            except Exception as e:
+                print(f"Log callback error: {e}")
+
+    def _notify_callbacks(self, snapshot: Snapshot):
+        for callback in self._callbacks:
+            try:
+                instruments.call("callback.snapshot", callback, snapshot)
+            except Exception as e:
+                print(f"Snapshot callback error: {e}")
+
+    async def _collect(self):
+        """Toplayıcıları eşzamanlı çalıştır"""
+        return await asyncio.gather(
+            self.service_monitor.get_all_services_async(),
+            self.log_collector.collect_new_async(limit=self.log_batch)
+        )
+
+    def get(self) -> Snapshot:
+        """
+        Güncel görüntüyü döndür.
+
+        Arka plan yenileme yoksa ve görüntü interval'dan eskiyse yeniler.
+        """
+        snapshot = self._snapshot
+        background = self._thread is not None and self._thread.is_alive()
+        if snapshot is None or (not background and time.time() - snapshot.collected_at > self.interval):
+            return self.refresh(max_age=self.interval)
+        return snapshot
+
+    def refresh(self, max_age: float = 0) -> Snapshot:
+        """
+        Toplayıcıları çalıştırıp yeni görüntü üret.
+
+        Aynı anda gelen istekler tek bir toplamayı bekler; kilidi
+        aldığında görüntü max_age'den yeniyse yeniden toplamaz.
+        """
+        with self._refresh_lock:
+            current = self._snapshot
+            if current is not None and max_age and time.time() - current.collected_at <= max_age:
+                return current
+
+            start = time.perf_counter()
+            try:
+                services, new_logs = run_sync(self._collect())
+            except Exception:
+                self.collect_errors += 1
+                raise
+            duration = time.perf_counter() - start
+            instruments.record("snapshot.collect", duration)
+            self.collections += 1
+            self.last_collect_duration = duration
+            self.last_collected_at = time.time()
+            return self._apply(services, new_logs, duration)
+
+    def _apply(self, services: List[ServiceInfo], new_logs: List[LogEntry], duration: float) -> Snapshot:
+        """Toplanan veriyi önceki görüntüyle karşılaştırıp yeni görüntüyü kur"""
+        previous = self._snapshot
+        next_version = self._version + 1
+
+        service_versions = dict(previous.service_versions) if previous else {}
+        removed = dict(previous.removed_services) if previous else {}
+        changed: List[ServiceInfo] = []
+
+        keys = {}
+        for service in services:
+            key = _service_key(service)
+            keys[service.name] = key
+            if self._service_keys.get(service.name) != key:
+                changed.append(service)
+                service_versions[service.name] = next_version
+                removed.pop(service.name, None)
+
+        if self.governor is not None and new_logs:
+            new_logs = self.governor.admit(new_logs)
+
+        gone = [name for name in self._service_keys if name not in keys]
+        for name in gone:
+            service_versions.pop(name, None)
+            removed[name] = next_version
+
+        logs_changed = bool(new_logs)
+
+        if previous is not None and not changed and not gone and not logs_changed:
+            # İçerik aynı: sürüm ve önbellek korunur, yalnızca zaman güncellenir
+            previous.collected_at = time.time()
+            previous.collect_duration = duration
+            if self.transitions is not None:
+                # Geçiş yok; yalnızca dalgalanma pencereleri ilerler
+                self.transitions.observe([], now=previous.collected_at, version=previous.version)
+            return previous
+
+        # Eski kaldırma kayıtlarını buda
+        floor = next_version - self.REMOVED_HISTORY
+        removed = {name: v for name, v in removed.items() if v > floor}
+
+        if logs_changed or previous is None:
+            if new_logs:
+                self._notify_log_callbacks(new_logs)
+            self._log_window.extend(new_logs)
+            logs = list(self._log_window)
+            log_stats = self.log_parser.get_statistics(logs)
+            self._count_new_entries(new_logs)
+        else:
+            logs = previous.logs
+            log_stats = previous.log_stats
+
+        snapshot = Snapshot(
+            version=next_version,
+            last_modified=datetime.now(timezone.utc).replace(microsecond=0),
+            collected_at=time.time(),
+            collect_duration=duration,
+            services=services,
+            service_summary=self.service_monitor.summarize(services),
+            logs=logs,
+            log_stats=log_stats,
+            service_versions=service_versions,
+            removed_services=removed,
+            log_totals=dict(self._log_totals)
+        )
+
+        self._service_keys = keys
+        self._version = next_version
+        self._snapshot = snapshot
+
+        if self.transitions is not None:
+            self.transitions.observe(changed, gone, now=snapshot.collected_at, version=next_version)
+        self._check_alerts(changed, log_stats if logs_changed else None)
+        self._notify_callbacks(snapshot)
+        return snapshot
+
+    def _count_new_entries(self, new_logs: List[LogEntry]):
+        """Yeni kayıtları seviye sayaçlarına ekle (örneklenenler ağırlıklarıyla)"""
+        for entry in new_logs:
+            level = entry.level.name
+            self._log_totals[level] = self._log_totals.get(level, 0) + entry.sample_weight
+
+    def _check_alerts(self, changed: List[ServiceInfo], log_stats: Optional[Dict]):
+        """Yalnızca değişen servisler ve yeni log penceresi için uyarı kontrolü"""
+        # TransitionTracker varsa servis uyarıları yalnızca durma geçişlerinden gelir
+        changed = changed if self.transitions is None else []
+        for service in changed:
+            if service.is_critical and service.status in (ServiceStatus.STOPPED, ServiceStatus.FAILED):
+                self.alert_manager.check_service_status(
+                    service.name,
+                    is_running=False,
+                    is_critical=True
+                )
+
+        if log_stats is not None and self.anomaly_detector is None:
+            self.alert_manager.check_error_rate(
+                log_stats.get('error_count', 0),
+                log_stats.get('total', 1)
+            )
+
+    def start(self):
+        """Arka plan yenileme thread'ini başlat"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="snapshot-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arka plan yenilemeyi durdur"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 35)
+            self._thread = None
+        self.log_collector.save_cursor()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Snapshot refresh error: {e}")
+            self._stop_event.wait(self.interval)
@@ -0,0 +1,109 @@
+"""
+Startup Profile Module
+CLI açılış süresinin import bazında dökümü (--profile-startup).
+
+Komut `python -X importtime` ile alt süreçte yeniden çalıştırılır;
+stderr'deki "import time:" satırları ayrıştırılıp en pahalı modüller
+ve üst seviye paket toplamları raporlanır. Diğer stderr satırları
+olduğu gibi iletilir.
+"""
+
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+IMPORT_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+
+
+@dataclass
+class ImportRecord:
+    """Tek bir modülün import süresi (mikro saniye)"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(lines: Sequence[str]) -> Tuple[List[ImportRecord], List[str]]:
+    """
+    -X importtime çıktısını ayrıştır.
+
+    Returns:
+        (import kayıtları, import satırı olmayan stderr satırları)
+    """
+    records = []
+    other = []
+    for line in lines:
+        match = IMPORT_LINE_RE.match(line.rstrip("\n"))
+        if match is None:
+            if not line.startswith("import time:"):
+                other.append(line)
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        records.append(ImportRecord(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records, other
+
+
+def package_totals(records: Sequence[ImportRecord]) -> Dict[str, int]:
+    """Üst seviye paket başına toplam kendi süresi (mikro saniye)"""
+    totals: Dict[str, int] = {}
+    for record in records:
+        package = record.module.split(".", 1)[0]
+        totals[package] = totals.get(package, 0) + record.self_us
+    return totals
+
+
+def format_report(records: Sequence[ImportRecord], wall: float, limit: int = 15) -> str:
+    """Okunabilir açılış raporu"""
+    total_us = sum(r.self_us for r in records)
+    lines = [
+        "",
+        "=" * 60,
+        "Acilis Profili",
+        "=" * 60,
+        f"Toplam sure     : {wall * 1000:8.1f} ms",
+        f"Import suresi   : {total_us / 1000:8.1f} ms ({len(records)} modul)",
+        "",
+        f"{'Paket':<30} {'Kendi (ms)':>12}",
+        "-" * 60,
+    ]
+    totals = sorted(package_totals(records).items(), key=lambda item: -item[1])
+    for package, self_us in totals[:limit]:
+        lines.append(f"{package:<30} {self_us / 1000:12.1f}")
+    lines += [
+        "",
+        f"{'Modul (ust seviye import)':<40} {'Kumulatif (ms)':>16}",
+        "-" * 60,
+    ]
+    top_level = sorted((r for r in records if r.depth == 0), key=lambda r: -r.cumulative_us)
+    for record in top_level[:limit]:
+        lines.append(f"{record.module:<40} {record.cumulative_us / 1000:16.1f}")
+    return "\n".join(lines)
+
+
+def profile_command(script: str, argv: Sequence[str], limit: int = 15) -> int:
+    """
+    Betiği -X importtime ile alt süreçte çalıştırıp raporu yazdır.
+
+    Args:
+        script: Çalıştırılacak betik (main.py)
+        argv: Betiğe iletilecek argümanlar (--profile-startup hariç)
+        limit: Raporlanacak satır sayısı
+
+    Returns:
+        Alt sürecin çıkış kodu
+    """
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", script, *argv],
+        stderr=subprocess.PIPE
+    )
+    wall = time.perf_counter() - start
+    records, other = parse_importtime(process.stderr.decode("utf-8", errors="replace").splitlines())
+    for line in other:
+        print(line, file=sys.stderr)
+    print(format_report(records, wall, limit))
+    return process.returncode
@@ -0,0 +1,447 @@
+"""
+System Metrics Module
+Host seviyesi CPU, bellek, disk ve ağ metrikleri toplama modülü.
+"""
+
+import os
+import platform
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .instrumentation import instruments
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+# Sayaç vektörünün sabit sütun sırası (monoton artan değerler)
+COUNTERS = (
+    "cpu_user", "cpu_nice", "cpu_system", "cpu_idle",
+    "cpu_iowait", "cpu_irq", "cpu_softirq", "cpu_steal",
+    "disk_read_bytes", "disk_write_bytes", "disk_read_ops", "disk_write_ops",
+    "net_rx_bytes", "net_tx_bytes", "net_rx_packets", "net_tx_packets",
+)
+COUNTER_INDEX = {name: i for i, name in enumerate(COUNTERS)}
+CPU_SLICE = slice(0, 8)
+CPU_IDLE_INDEXES = (COUNTER_INDEX["cpu_idle"], COUNTER_INDEX["cpu_iowait"])
+
+# Disk istatistiklerinde sektör boyutu her zaman 512 bayttır
+SECTOR_SIZE = 512
+
+
+@dataclass
+class HostMetrics:
+    """Host metrikleri veri sınıfı"""
+    timestamp: float
+    cpu_percent: float = 0.0
+    cpu_count: int = 0
+    load_avg: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    memory_total: int = 0
+    memory_used: int = 0
+    memory_percent: float = 0.0
+    swap_percent: float = 0.0
+    disk_total: int = 0
+    disk_used: int = 0
+    disk_percent: float = 0.0
+    disk_read_bps: float = 0.0
+    disk_write_bps: float = 0.0
+    net_rx_bps: float = 0.0
+    net_tx_bps: float = 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "timestamp": self.timestamp,
+            "cpu_percent": self.cpu_percent,
+            "cpu_count": self.cpu_count,
+            "load_avg": list(self.load_avg),
+            "memory_total": self.memory_total,
+            "memory_used": self.memory_used,
+            "memory_percent": self.memory_percent,
+            "swap_percent": self.swap_percent,
+            "disk_total": self.disk_total,
+            "disk_used": self.disk_used,
+            "disk_percent": self.disk_percent,
+            "disk_read_bps": self.disk_read_bps,
+            "disk_write_bps": self.disk_write_bps,
+            "net_rx_bps": self.net_rx_bps,
+            "net_tx_bps": self.net_tx_bps
+        }
+
+
+class ProcStatSource:
+    """
+    /proc/stat, /proc/meminfo, /proc/diskstats ve /proc/net/dev okuyucu.
+
+    Dosyalar açık tutulur ve her örneklemede os.pread ile okunur.
+    """
+
+    READ_SIZE = 65536
+
+    def __init__(self, proc_root: str = "/proc"):
+        self.proc_root = proc_root
+        self._fds: Dict[str, int] = {}
+
+    def is_available(self) -> bool:
+        return os.path.isfile(os.path.join(self.proc_root, "stat"))
+
+    def _read(self, name: str) -> bytes:
+        fd = self._fds.get(name)
+        if fd is None:
+            fd = os.open(os.path.join(self.proc_root, name), os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+            self._fds[name] = fd
+        return os.pread(fd, self.READ_SIZE, 0)
+
+    def read_counters(self, out: List[float]):
+        """Sayaç değerlerini COUNTERS sırasıyla out içine yaz"""
+        # /proc/stat ilk satırı: cpu user nice system idle iowait irq softirq steal
+        line = self._read("stat").split(b"\n", 1)[0].split()
+        for i in range(8):
+            out[i] = float(line[i + 1]) if len(line) > i + 1 else 0.0
+
+        read_sectors = write_sectors = read_ops = write_ops = 0
+        for row in self._read("diskstats").split(b"\n"):
+            parts = row.split()
+            if len(parts) < 10 or not self._is_whole_disk(parts[2]):
+                continue
+            read_ops += int(parts[3])
+            read_sectors += int(parts[5])
+            write_ops += int(parts[7])
+            write_sectors += int(parts[9])
+        out[8] = float(read_sectors * SECTOR_SIZE)
+        out[9] = float(write_sectors * SECTOR_SIZE)
+        out[10] = float(read_ops)
+        out[11] = float(write_ops)
+
+        rx_bytes = tx_bytes = rx_packets = tx_packets = 0
+        for row in self._read("net/dev").split(b"\n")[2:]:
+            if b":" not in row:
+                continue
+            iface, data = row.split(b":", 1)
+            if iface.strip() == b"lo":
+                continue
+            parts = data.split()
+            rx_bytes += int(parts[0])
+            rx_packets += int(parts[1])
+            tx_bytes += int(parts[8])
+            tx_packets += int(parts[9])
+        out[12] = float(rx_bytes)
+        out[13] = float(tx_bytes)
+        out[14] = float(rx_packets)
+        out[15] = float(tx_packets)
+
+    @staticmethod
+    def _is_whole_disk(name: bytes) -> bool:
+        """Bölümleri ve sanal aygıtları (loop, ram, dm) çift saymamak için ele"""
+        if name.startswith((b"loop", b"ram", b"dm-", b"zram", b"sr", b"md")):
+            return False
+        # nvme0n1 / mmcblk0 tam disk, nvme0n1p1 / mmcblk0p1 bölüm
+        for prefix in (b"nvme", b"mmcblk"):
+            if name.startswith(prefix):
+                return b"p" not in name[len(prefix):]
+        return not name[-1:].isdigit()
+
+    def read_memory(self) -> Dict[str, int]:
+        """/proc/meminfo değerlerini bayt cinsinden döndür"""
+        wanted = {b"MemTotal:", b"MemAvailable:", b"SwapTotal:", b"SwapFree:"}
+        values = {}
+        for row in self._read("meminfo").split(b"\n"):
+            parts = row.split()
+            if parts and parts[0] in wanted:
+                values[parts[0][:-1].decode()] = int(parts[1]) * 1024
+        return values
+
+    def read_loadavg(self) -> Tuple[float, float, float]:
+        parts = self._read("loadavg").split()
+        return float(parts[0]), float(parts[1]), float(parts[2])
+
+    def close(self):
+        for fd in self._fds.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._fds.clear()
+
+
+class PsutilSource:
+    """psutil tabanlı kaynak (Windows ve /proc olmayan sistemler)"""
+
+    def is_available(self) -> bool:
+        return PSUTIL_AVAILABLE
+
+    def read_counters(self, out: List[float]):
+        cpu = psutil.cpu_times()
+        out[0] = cpu.user
+        out[1] = getattr(cpu, "nice", 0.0)
+        out[2] = cpu.system
+        out[3] = cpu.idle
+        out[4] = getattr(cpu, "iowait", 0.0)
+        out[5] = getattr(cpu, "irq", getattr(cpu, "interrupt", 0.0))
+        out[6] = getattr(cpu, "softirq", getattr(cpu, "dpc", 0.0))
+        out[7] = getattr(cpu, "steal", 0.0)
+
+        disk = psutil.disk_io_counters()
+        out[8] = float(disk.read_bytes) if disk else 0.0
+        out[9] = float(disk.write_bytes) if disk else 0.0
+        out[10] = float(disk.read_count) if disk else 0.0
+        out[11] = float(disk.write_count) if disk else 0.0
+
+        net = psutil.net_io_counters()
+        out[12] = float(net.bytes_recv)
+        out[13] = float(net.bytes_sent)
+        out[14] = float(net.packets_recv)
+        out[15] = float(net.packets_sent)
+
+    def read_memory(self) -> Dict[str, int]:
+        mem = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        return {
+            "MemTotal": mem.total,
+            "MemAvailable": mem.available,
+            "SwapTotal": swap.total,
+            "SwapFree": swap.free
+        }
+
+    def read_loadavg(self) -> Tuple[float, float, float]:
+        try:
+            return psutil.getloadavg()
+        except (AttributeError, OSError):
+            return (0.0, 0.0, 0.0)
+
+    def close(self):
+        pass
+
+
+class SystemMetricsCollector:
+    """
+    Host metrikleri toplayıcı.
+
+    Ham sayaçlar önceden ayrılmış halka tampona (satır = örnek,
+    sütun = COUNTERS) yazılır. Her turda fark ve oran vektörü tek
+    adımda hesaplanır; numpy varsa vektörel, yoksa tek bir
+    liste kavrayışı ile.
+    """
+
+    def __init__(self,
+                 interval: float = 1.0,
+                 history_size: int = 300,
+                 disk_path: str = None,
+                 source=None):
+        """
+        SystemMetricsCollector başlatıcı.
+
+        Args:
+            interval: Örnekleme aralığı (saniye)
+            history_size: Halka tampon kapasitesi (örnek sayısı)
+            disk_path: Doluluk oranı izlenecek bağlama noktası
+            source: Sayaç kaynağı (None ise platforma göre seçilir)
+        """
+        self.platform = platform.system().lower()
+        self.interval = interval
+        self.history_size = max(history_size, 2)
+        self.disk_path = disk_path or ("C:\\" if self.platform == "windows" else "/")
+        self.source = source or self._get_source()
+        self.cpu_count = os.cpu_count() or 1
+
+        width = len(COUNTERS)
+        if NUMPY_AVAILABLE:
+            self._counters = np.zeros((self.history_size, width), dtype=np.float64)
+            self._rates = np.zeros((self.history_size, width), dtype=np.float64)
+            self._times = np.zeros(self.history_size, dtype=np.float64)
+        else:
+            self._counters = [array("d", bytes(8 * width)) for _ in range(self.history_size)]
+            self._rates = [array("d", bytes(8 * width)) for _ in range(self.history_size)]
+            self._times = array("d", bytes(8 * self.history_size))
+
+        self._index = -1
+        self._samples = 0
+        self._latest: Optional[HostMetrics] = None
+        self.last_sample_duration = 0.0
+        self._history: List[Optional[HostMetrics]] = [None] * self.history_size
+        self._lock = threading.Lock()
+        # Arka plan thread'i ve istek yolu (/api/system) aynı halka satırına yazmasın
+        self._sample_lock = threading.Lock()
+        self._callbacks: List[Callable[[HostMetrics], None]] = []
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _get_source(self):
+        """Platform'a göre uygun sayaç kaynağını döndür"""
+        if self.platform == "linux":
+            source = ProcStatSource()
+            if source.is_available():
+                return source
+        return PsutilSource()
+
+    def add_callback(self, callback: Callable[[HostMetrics], None]):
+        """Yeni örnek callback'i ekle"""
+        self._callbacks.append(callback)
+
+    def _notify_callbacks(self, metrics: HostMetrics):
+        """Callback'leri bilgilendir"""
+        for callback in self._callbacks:
+            try:
+                instruments.call("callback.metrics", callback, metrics)
+            except Exception as e:
+                print(f"Metrics callback error: {e}")
+
+    def _compute_rates(self, current: int, previous: int, dt: float):
+        """Tüm sayaçların saniyelik oranını tek adımda hesapla"""
+        if NUMPY_AVAILABLE:
+            rates = self._rates[current]
+            np.subtract(self._counters[current], self._counters[previous], out=rates)
+            # Sayaç sıfırlanması (yeniden başlatma, taşma) negatif fark üretir
+            np.maximum(rates, 0.0, out=rates)
+            rates /= dt
+        else:
+            self._rates[current][:] = array("d", [
+                max(c - p, 0.0) / dt
+                for c, p in zip(self._counters[current], self._counters[previous])
+            ])
+
+    def sample(self) -> Optional[HostMetrics]:
+        """
+        Tek bir örnek al ve metrikleri hesapla.
+
+        Örneklemeler sıralanır: satır seçimi, sayaç okuma ve fark hesabı
+        tek kilit altında yapılır. Okuyucular (get_history) yalnızca
+        yayınlama anında kısa süre bekler.
+
+        Returns:
+            HostMetrics; kaynak okunamazsa None
+        """
+        with self._sample_lock:
+            metrics = self._sample()
+        if metrics is not None:
+            self._notify_callbacks(metrics)
+        return metrics
+
+    def _sample(self) -> Optional[HostMetrics]:
+        """Örneği al ve yayınla (_sample_lock tutulurken çağrılır)"""
+        now = time.time()
+        start = time.perf_counter()
+        current = (self._index + 1) % self.history_size
+        row = self._counters[current]
+
+        try:
+            self.source.read_counters(row)
+            memory = self.source.read_memory()
+            load_avg = self.source.read_loadavg()
+        except Exception as e:
+            print(f"Metrics sample error: {e}")
+            return None
+
+        self._times[current] = now
+        metrics = HostMetrics(timestamp=now, cpu_count=self.cpu_count, load_avg=load_avg)
+
+        if self._samples > 0:
+            previous = self._index
+            dt = max(now - self._times[previous], 1e-6)
+            self._compute_rates(current, previous, dt)
+            rates = self._rates[current]
+
+            cpu_total = sum(rates[CPU_SLICE])
+            if cpu_total > 0:
+                idle = sum(rates[i] for i in CPU_IDLE_INDEXES)
+                metrics.cpu_percent = round((cpu_total - idle) / cpu_total * 100, 2)
+            metrics.disk_read_bps = float(rates[COUNTER_INDEX["disk_read_bytes"]])
+            metrics.disk_write_bps = float(rates[COUNTER_INDEX["disk_write_bytes"]])
+            metrics.net_rx_bps = float(rates[COUNTER_INDEX["net_rx_bytes"]])
+            metrics.net_tx_bps = float(rates[COUNTER_INDEX["net_tx_bytes"]])
+
+        total = memory.get("MemTotal", 0)
+        if total:
+            metrics.memory_total = total
+            metrics.memory_used = total - memory.get("MemAvailable", 0)
+            metrics.memory_percent = round(metrics.memory_used / total * 100, 2)
+        swap_total = memory.get("SwapTotal", 0)
+        if swap_total:
+            metrics.swap_percent = round((swap_total - memory.get("SwapFree", 0)) / swap_total * 100, 2)
+
+        try:
+            usage = os.statvfs(self.disk_path)
+            metrics.disk_total = usage.f_blocks * usage.f_frsize
+            metrics.disk_used = (usage.f_blocks - usage.f_bfree) * usage.f_frsize
+        except (AttributeError, OSError):
+            if PSUTIL_AVAILABLE:
+                try:
+                    usage = psutil.disk_usage(self.disk_path)
+                    metrics.disk_total, metrics.disk_used = usage.total, usage.used
+                except OSError:
+                    pass
+        if metrics.disk_total:
+            metrics.disk_percent = round(metrics.disk_used / metrics.disk_total * 100, 2)
+
+        with self._lock:
+            self._index = current
+            self._samples += 1
+            self._history[current] = metrics
+            self._latest = metrics
+        self.last_sample_duration = time.perf_counter() - start
+        return metrics
+
+    def get_latest(self) -> Optional[HostMetrics]:
+        """Son örneği döndür"""
+        return self._latest
+
+    def get_history(self, limit: int = None) -> List[HostMetrics]:
+        """
+        Halka tampondaki örnekleri eskiden yeniye döndür.
+
+        Args:
+            limit: En fazla kaç örnek (None ise tümü)
+        """
+        with self._lock:
+            count = min(self._samples, self.history_size)
+            if limit is not None:
+                count = min(count, limit)
+            start = self._index - count + 1
+            return [self._history[i % self.history_size] for i in range(start, self._index + 1)]
+
+    def start(self):
+        """Arka plan örnekleme thread'ini başlat"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="system-metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arka plan örneklemeyi durdur"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval * 2)
+            self._thread = None
+
+    def _run(self):
+        """Örnekleme döngüsü; aralık örnek süresinden bağımsız sabit tutulur"""
+        next_tick = time.monotonic()
+        while not self._stop_event.is_set():
+            self.sample()
+            next_tick += self.interval
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                # Geride kaldıysak biriktirmeden yeniden hizala
+                next_tick = time.monotonic()
+                delay = 0
+            self._stop_event.wait(delay)
+
+
+# Test için
+if __name__ == "__main__":
+    collector = SystemMetricsCollector()
+    collector.sample()
+    time.sleep(1)
+    print(f"Host Metrics: {collector.sample().to_dict()}")
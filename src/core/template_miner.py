@@ -0,0 +1,295 @@
+"""
+Template Miner Module
+Drain benzeri çevrimiçi log şablonu çıkarımı.
+
+Mesajlar boşluklardan token'lara ayrılır ve sabit derinlikli bir ağaçta
+aranır: kök -> token sayısı -> ilk (depth - 2) token -> küme listesi.
+Rakam içeren token'lar ağaçta joker (<*>) dalına gider; böylece
+"Session 42 opened" ile "Session 57 opened" aynı yaprağa düşer. Yapraktaki
+en benzer kümenin benzerliği eşiği geçerse mesaj o kümeye eklenir ve
+farklı konumlar jokere çevrilir; geçmezse yeni küme açılır.
+
+Her satır için yalnızca şablon sürümü ve joker konumlarındaki parametreler
+saklanabilir (encode/decode); mesaj birebir geri kurulur.
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+from .log_collector import LogEntry
+
+WILDCARD = "<*>"
+
+# Saklanan mesaj: (şablon sürümü, parametreler) veya birebir kurulamıyorsa ham metin
+EncodedMessage = Union[Tuple[int, Tuple[str, ...]], str]
+
+
+def _has_digit(token: str) -> bool:
+    return any(c.isdigit() for c in token)
+
+
+@dataclass
+class LogTemplate:
+    """Bir mesaj kümesi ve istatistikleri"""
+    id: int
+    tokens: List[str]
+    count: int = 0
+    first_seen: float = 0.0
+    last_seen: float = 0.0
+    levels: Dict[str, int] = field(default_factory=dict)
+    services: Dict[str, int] = field(default_factory=dict)
+    # Şablonun encode'da kullanılan güncel sürüm numarası
+    version: int = 0
+    # (dakika, sayı) kovaları; hız hesabı için sabit boyutlu
+    buckets: Deque[List[int]] = field(default_factory=deque)
+
+    @property
+    def template(self) -> str:
+        return " ".join(self.tokens)
+
+    def rate(self, now: float, window_minutes: int) -> float:
+        """Son window_minutes dakikadaki dakika başına ortalama satır"""
+        floor = int(now // 60) - window_minutes
+        return sum(count for minute, count in self.buckets if minute > floor) / window_minutes
+
+    def to_dict(self, now: float, window_minutes: int) -> Dict:
+        return {
+            "id": self.id,
+            "template": self.template,
+            "count": self.count,
+            "rate_per_minute": round(self.rate(now, window_minutes), 3),
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "levels": dict(self.levels),
+            "services": dict(sorted(self.services.items(), key=lambda item: -item[1])[:5])
+        }
+
+
+class TemplateMiner:
+    """
+    Çevrimiçi log şablonu madencisi (Drain).
+
+    add / add_entries her satırı O(depth + yapraktaki küme sayısı)
+    adımda bir şablona atar. Küme sayısı max_clusters ile sınırlıdır;
+    sınır dolduktan sonra eşleşmeyen satırlar sayılır ama yeni küme açılmaz.
+    """
+
+    def __init__(self,
+                 depth: int = 4,
+                 similarity: float = 0.4,
+                 max_children: int = 100,
+                 max_clusters: int = 5000,
+                 rate_window: int = 15):
+        """
+        Args:
+            depth: Ağaç derinliği (>= 3; ilk depth-2 token dal olarak kullanılır)
+            similarity: Kümeye katılmak için en az benzerlik (0-1)
+            max_children: Düğüm başına en fazla dal; aşılırsa joker dalı kullanılır
+            max_clusters: En fazla küme
+            rate_window: Hız hesabındaki pencere (dakika)
+        """
+        self.depth = max(depth, 3)
+        self.similarity = similarity
+        self.max_children = max_children
+        self.max_clusters = max_clusters
+        self.rate_window = rate_window
+
+        self.templates: List[LogTemplate] = []
+        # Sürüm -> (şablon id, token'lar); decode eski sürümleri de çözebilsin diye tutulur
+        self._versions: List[Tuple[int, Tuple[str, ...]]] = []
+        self._root: Dict = {}
+        self._lock = threading.Lock()
+
+        self.lines = 0
+        self.unmatched = 0
+        # Her add çağrısında artar (koşullu GET için)
+        self.version = 0
+        self.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+
+    # ===== Eşleştirme =====
+
+    def _leaf(self, tokens: List[str]) -> List[LogTemplate]:
+        """Token'ların düştüğü yaprak küme listesi (yoksa oluşturulur)"""
+        node = self._root.setdefault(len(tokens), {})
+        for token in tokens[:self.depth - 2]:
+            key = WILDCARD if _has_digit(token) else token
+            child = node.get(key)
+            if child is None:
+                if len(node) >= self.max_children:
+                    key = WILDCARD
+                    child = node.get(key)
+                if child is None:
+                    child = node[key] = {}
+            node = child
+        return node.setdefault(None, [])
+
+    @staticmethod
+    def _similarity(template: List[str], tokens: List[str]) -> Tuple[float, int]:
+        same = 0
+        wildcards = 0
+        for a, b in zip(template, tokens):
+            if a == WILDCARD:
+                wildcards += 1
+            elif a == b:
+                same += 1
+        return same / len(tokens), wildcards
+
+    def _match(self, tokens: List[str]) -> Optional[LogTemplate]:
+        if not tokens:
+            tokens = [""]
+        clusters = self._leaf(tokens)
+        best = None
+        best_score = (-1.0, -1)
+        for cluster in clusters:
+            score = self._similarity(cluster.tokens, tokens)
+            if score > best_score:
+                best, best_score = cluster, score
+        if best is not None and best_score[0] >= self.similarity:
+            merged = [a if a == b else WILDCARD for a, b in zip(best.tokens, tokens)]
+            if merged != best.tokens:
+                best.tokens = merged
+                best.version = self._new_version(best)
+            return best
+        if len(self.templates) >= self.max_clusters:
+            return None
+        cluster = LogTemplate(id=len(self.templates), tokens=list(tokens))
+        cluster.version = self._new_version(cluster)
+        self.templates.append(cluster)
+        clusters.append(cluster)
+        return cluster
+
+    def _new_version(self, cluster: LogTemplate) -> int:
+        self._versions.append((cluster.id, tuple(cluster.tokens)))
+        return len(self._versions) - 1
+
+    def _record(self, cluster: LogTemplate, timestamp: float, level: str, service: str,
+                weight: int = 1):
+        cluster.count += weight
+        if not cluster.first_seen or timestamp < cluster.first_seen:
+            cluster.first_seen = timestamp
+        cluster.last_seen = max(cluster.last_seen, timestamp)
+        cluster.levels[level] = cluster.levels.get(level, 0) + weight
+        if service:
+            cluster.services[service] = cluster.services.get(service, 0) + weight
+        minute = int(timestamp // 60)
+        if cluster.buckets and cluster.buckets[-1][0] == minute:
+            cluster.buckets[-1][1] += weight
+        elif not cluster.buckets or minute > cluster.buckets[-1][0]:
+            cluster.buckets.append([minute, weight])
+            if len(cluster.buckets) > self.rate_window:
+                cluster.buckets.popleft()
+
+    # ===== Genel API =====
+
+    def add(self, message: str, timestamp: float = None, level: str = "INFO",
+            service: str = "") -> Optional[LogTemplate]:
+        """
+        Tek bir mesajı şablona ata.
+
+        Returns:
+            Atanan şablon (küme sınırı dolduysa None)
+        """
+        with self._lock:
+            self._touch()
+            return self._add(message, time.time() if timestamp is None else timestamp, level, service)
+
+    def _touch(self):
+        self.version += 1
+        self.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+
+    def _add(self, message: str, timestamp: float, level: str, service: str,
+             weight: int = 1) -> Optional[LogTemplate]:
+        self.lines += weight
+        cluster = self._match(message.split())
+        if cluster is None:
+            self.unmatched += weight
+            return None
+        self._record(cluster, timestamp, level, service, weight)
+        return cluster
+
+    def add_entries(self, entries: Iterable[LogEntry]):
+        """
+        Log kayıtlarını şablonlara ata (SnapshotManager log callback'i).
+
+        Her kaydın template_id alanı atanan şablonun id'si olur.
+        """
+        with self._lock:
+            self._touch()
+            for entry in entries:
+                cluster = self._add(entry.message, entry.timestamp.timestamp(), entry.level.name,
+                                    entry.service, entry.sample_weight)
+                entry.template_id = cluster.id if cluster is not None else None
+
+    def encode(self, message: str) -> EncodedMessage:
+        """
+        Mesajı (şablon sürümü, parametreler) olarak kodla.
+
+        İstatistiklere sayılmaz. Boşlukları tek boşluk olmayan veya
+        token'ı jokerle karışabilecek mesajlar birebir kurulamayacağı
+        için ham metin olarak döner.
+        """
+        tokens = message.split()
+        if " ".join(tokens) != message or WILDCARD in tokens:
+            return message
+        with self._lock:
+            cluster = self._match(tokens)
+            if cluster is None:
+                return message
+            params = tuple(token for token, slot in zip(tokens, cluster.tokens) if slot == WILDCARD)
+            return cluster.version, params
+
+    def decode(self, encoded: EncodedMessage) -> str:
+        """encode çıktısından mesajı geri kur"""
+        if isinstance(encoded, str):
+            return encoded
+        version, params = encoded
+        _, tokens = self._versions[version]
+        values = iter(params)
+        return " ".join(next(values) if token == WILDCARD else token for token in tokens)
+
+    def template_of(self, encoded: EncodedMessage) -> Optional[int]:
+        """Kodlanmış mesajın şablon id'si (ham metinse None)"""
+        if isinstance(encoded, str):
+            return None
+        return self._versions[encoded[0]][0]
+
+    def template_text(self, template_id: int) -> Optional[str]:
+        """Şablon id'sinin güncel metni"""
+        templates = self.templates
+        return templates[template_id].template if 0 <= template_id < len(templates) else None
+
+    def top(self, limit: int = 20, sort: str = "count", service: str = None,
+            level: str = None, now: float = None) -> List[Dict]:
+        """
+        En sık (veya en hızlı) şablonlar.
+
+        Args:
+            limit: En fazla şablon
+            sort: 'count' (toplam) veya 'rate' (son pencerede dakika başına)
+            service: Yalnızca bu serviste görülen şablonlar
+            level: Yalnızca bu seviyede görülen şablonlar (ör. 'ERROR')
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            templates = [t for t in self.templates
+                         if (not service or service in t.services)
+                         and (not level or level in t.levels)]
+            if sort == "rate":
+                key = lambda t: (t.rate(now, self.rate_window), t.count)
+            else:
+                key = lambda t: t.count
+            templates.sort(key=key, reverse=True)
+            return [t.to_dict(now, self.rate_window) for t in templates[:limit]]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "lines": self.lines,
+                "templates": len(self.templates),
+                "unmatched": self.unmatched,
+                "version": self.version
+            }
@@ -11,13 +11,15 @@ import os
 # Modül yolunu ekle
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from config import config
 
-
-def self_check():
+def self_check(full=False):
     """
     Self-check / Auto Test mekanizması.
     Tüm modüllerin doğru çalıştığını kontrol eder.
+    
+    Varsayılan kontrol hafiftir (health probe / cron için): tek bir
+    kritik servisin durumu ve tek log kaydı okunur. full=True ise tüm
+    servisler listelenir ve log istatistikleri çıkarılır.
     """
     print("=" * 50)
     print("[*] Self-Check / Auto Test")
@@ -27,18 +29,29 @@ def self_check():
     
     # Core modülleri kontrol et
     try:
-        from core.service_monitor import ServiceMonitor, ServiceStatus
-        monitor = ServiceMonitor()
-        summary = monitor.get_service_summary()
-        checks.append(("Service Monitor", True, f"{summary['total']} servis bulundu"))
+        from config import config
+        from core.service_monitor import ServiceMonitor
+        monitor = ServiceMonitor(custom_critical_services=config.critical_services)
+        if full:
+            summary = monitor.get_service_summary()
+            checks.append(("Service Monitor", True, f"{summary['total']} servis bulundu"))
+        else:
+            name = monitor.critical_services[0]
+            service = monitor.adapter.get_service_status(name)
+            status = service.status.value if service else "bulunamadi"
+            checks.append(("Service Monitor", True, f"{name}: {status}"))
     except Exception as e:
         checks.append(("Service Monitor", False, str(e)))
     
     try:
         from core.log_collector import LogCollector
         collector = LogCollector()
-        stats = collector.get_log_statistics()
-        checks.append(("Log Collector", True, f"{stats['total']} log okundu"))
+        if full:
+            stats = collector.get_log_statistics()
+            checks.append(("Log Collector", True, f"{stats['total']} log okundu"))
+        else:
+            logs = collector.get_logs(limit=1)
+            checks.append(("Log Collector", True, f"{len(logs)} log okundu"))
     except Exception as e:
         checks.append(("Log Collector", False, str(e)))
     
@@ -114,7 +127,7 @@ def list_services():
         print(f"\n... ve {len(services) - 30} servis daha")
 
 
-def show_logs(level=None, limit=20):
+def show_logs(level=None, limit=20, after_cursor=None):
     """Log göster"""
     from core.log_collector import LogCollector, LogLevel
     from core.log_parser import LogParser
@@ -131,7 +144,17 @@ def show_logs(level=None, limit=20):
         }
         log_level = level_map.get(level.lower())
     
-    logs = collector.get_logs(limit=limit, level=log_level)
+    cursor = None
+    if after_cursor is not None:
+        if not collector.supports_cursor:
+            print("[!] Bu platformda imlecle okuma desteklenmiyor")
+            return
+        # İmleçten sonraki loglar (eskiden yeniye); seviye filtresi sonradan uygulanır
+        logs, cursor = collector.read_new_logs(after_cursor=after_cursor or None, limit=limit)
+        if log_level is not None:
+            logs = [entry for entry in logs if entry.level.value <= log_level.value]
+    else:
+        logs = collector.get_logs(limit=limit, level=log_level)
     stats = parser.get_statistics(logs)
     
     print(f"\n{'='*70}")
@@ -151,48 +174,189 @@ def show_logs(level=None, limit=20):
         message = log.message[:35] + "..." if len(log.message) > 35 else log.message
         service = log.service[:12] if log.service else "-"
         print(f"{time_str:<20} {log.level.name:<10} {service:<15} {message}")
+    
+    if cursor:
+        print(f"\nImlec: {cursor}")
+
+
+def import_logs(paths, workers=None, fmt=None, level=None, limit=20, compress=False):
+    """Geçmiş log dosyalarını paralel ayrıştırıp özetle"""
+    from core.bulk_ingest import BulkIngestor
+    from core.log_collector import LogLevel
+    
+    store = None
+    if compress:
+        from core.log_blocks import BlockLogStore
+        store = BlockLogStore()
+    ingestor = BulkIngestor(store=store, workers=workers)
+    try:
+        result = ingestor.ingest(paths, fmt=fmt)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Ice aktarma basarisiz: {e}")
+        return False
+    
+    stats = ingestor.store.get_statistics()
+    time_range = ingestor.store.time_range()
+    
+    print(f"\n{'='*70}")
+    print("Toplu Log Ice Aktarma")
+    print(f"{'='*70}\n")
+    print(f"Dosya: {result.files}, yigin: {result.chunks}, worker: {result.workers}")
+    print(f"Kayit: {result.entries} ({result.skipped} satir atlandi), "
+          f"{result.bytes / 1024 / 1024:.1f} MiB")
+    print(f"Sure: {result.duration:.2f} sn ({result.entries_per_second:,.0f} kayit/sn)")
+    if time_range:
+        print(f"Aralik: {time_range[0]:%Y-%m-%d %H:%M:%S} - {time_range[1]:%Y-%m-%d %H:%M:%S}")
+    for level_name, count in sorted(stats['by_level'].items(), key=lambda item: LogLevel[item[0]].value):
+        print(f"  {level_name}: {count}")
+    if compress:
+        compression = stats['compression']
+        print(f"Sikistirma ({compression['codec']}): {compression['text_bytes'] / 1024 / 1024:.1f} MiB -> "
+              f"{compression['compressed_bytes'] / 1024 / 1024:.1f} MiB (x{compression['ratio']}, "
+              f"{compression['blocks']} blok)")
+    
+    log_level = LogLevel[level.upper()] if level else None
+    logs = ingestor.store.query(limit=limit, level=log_level)
+    if logs:
+        print(f"\n{'-'*70}")
+        for log in logs:
+            message = log.message[:35] + "..." if len(log.message) > 35 else log.message
+            service = log.service[:12] if log.service else "-"
+            print(f"{log.timestamp:%Y-%m-%d %H:%M}    {log.level.name:<10} {service:<15} {message}")
+    return True
 
 
 def watch_critical():
-    """Kritik servisleri izle"""
-    import time
+    """Kritik servisleri izle (journal olayları + uyarlanır aralıklı sorgu)"""
+    from config import config
     from core.service_monitor import ServiceMonitor
     from core.alert_manager import AlertManager
+    from core.critical_watcher import CriticalWatcher
+    
+    monitor = ServiceMonitor(custom_critical_services=config.critical_services)
+    watcher = CriticalWatcher(
+        monitor,
+        alert_manager=AlertManager(),
+        min_interval=config.watch_min_interval,
+        max_interval=config.watch_max_interval,
+        poll_max_interval=config.watch_poll_max_interval
+    )
     
-    monitor = ServiceMonitor()
-    alert_manager = AlertManager()
+    def on_transition(transition):
+        previous = transition.previous.value if transition.previous else "-"
+        mark = "[X]" if transition.is_down else "[OK]"
+        print(f"{mark} {transition.name}: {previous} -> {transition.current.value} "
+              f"({transition.source}, {transition.latency * 1000:.0f} ms)")
+    
+    watcher.add_callback(on_transition)
     
     print("\n[*] Kritik servis izleme baslatildi...")
     print("Cikmak icin Ctrl+C basin\n")
     
     try:
-        while True:
-            critical_down = monitor.get_critical_down_services()
-            
-            if critical_down:
-                print(f"\n[!] {len(critical_down)} kritik servis durmus!")
-                for service in critical_down:
-                    print(f"  [X] {service.name}")
-            else:
-                print("[OK] Tum kritik servisler calisiyor", end="\r")
-            
-            time.sleep(5)
+        watcher.run()
     except KeyboardInterrupt:
+        watcher.stop()
+        report = watcher.get_latency_report()
         print("\n\nIzleme durduruldu.")
+        print(f"Sorgu: {report['polls']}, journal olayi: {report['events']}")
+        for source in ("event", "poll"):
+            stats = report[source]
+            if stats["count"]:
+                print(f"  {source:<6} algilama gecikmesi: p50 {stats['p50_ms']} ms, "
+                      f"p90 {stats['p90_ms']} ms, p99 {stats['p99_ms']} ms, max {stats['max_ms']} ms "
+                      f"({stats['count']} degisiklik)")
+
+
+def run_agent(address, agent_id=None, spool_dir=None):
+    """Agent modu: servis ve log değişikliklerini aggregator'a gönder"""
+    import asyncio
+    from config import config
+    from agent.client import AgentClient
+    from agent.spool import Spool
+    from core.service_monitor import ServiceMonitor
+    from core.log_collector import LogCollector
+    from core.system_metrics import SystemMetricsCollector
+    
+    spool = None
+    if spool_dir:
+        spool = Spool(spool_dir, max_bytes=config.agent_spool_max_mb * 1024 * 1024)
+        print(f"[*] Log spool: {spool_dir} ({spool.pending_bytes} bayt onay bekliyor)")
+    
+    client = AgentClient(
+        address,
+        service_monitor=ServiceMonitor(custom_critical_services=config.critical_services),
+        log_collector=LogCollector(),
+        system_metrics=SystemMetricsCollector(),
+        agent_id=agent_id,
+        interval=config.agent_interval,
+        max_inflight=config.agent_max_inflight,
+        spool=spool
+    )
+    
+    print(f"\n[*] Agent baslatildi: {client.agent_id} -> {address}")
+    print("Durdurmak icin Ctrl+C basin\n")
+    
+    try:
+        asyncio.run(client.run())
+    except KeyboardInterrupt:
+        stats = client.get_stats()
+        print(f"\n\nAgent durduruldu. {stats['frames_acked']} cerceve onaylandi, "
+              f"{stats['bytes_sent']} bayt gonderildi.")
+    finally:
+        if spool is not None:
+            spool.close()
+
+
+def run_aggregator(listen):
+    """Aggregator modu: agent'ları dinle ve tüm host'lar için dashboard sun"""
+    from config import config
+    from agent.aggregator import AggregatorServer, HostRegistry
+    from adapters.aggregator_adapter import AggregatorAdapter
+    from core.service_monitor import ServiceMonitor
+    from core.log_collector import LogCollector
+    from web.state import PanelState
+    
+    def make_state():
+        registry = HostRegistry(max_logs_per_host=config.max_log_entries)
+        server = AggregatorServer(listen, registry)
+        server.start()
+        print(f"[*] Aggregator dinleniyor: {server.bound_address}")
+        adapter = AggregatorAdapter(registry)
+        return PanelState(
+            service_monitor=ServiceMonitor(adapter=adapter),
+            log_collector=LogCollector(adapter=adapter),
+            hosts=registry
+        )
+    
+    run_server(state_factory=make_state)
 
 
-def run_server():
+def run_server(state_factory=None):
     """Web sunucusunu başlat"""
+    from config import config
     from web.app import run_server as start_server
     
+    if config.server_mode == 'production':
+        from web.server import check_workers
+        try:
+            config.workers = check_workers(config.workers)
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            sys.exit(2)
+    
     print(f"\n{'='*50}")
     print("[*] Monitoring & Logging Panel")
     print(f"{'='*50}")
     print(f"Sunucu baslatiliyor: http://{config.host}:{config.port}")
+    if config.server_mode == 'production':
+        print(f"Mod: production ({config.workers} worker x {config.threads} thread)")
     print("Durdurmak icin Ctrl+C basin")
     print(f"{'='*50}\n")
     
-    start_server(host=config.host, port=config.port, debug=config.debug)
+    start_server(host=config.host, port=config.port, debug=config.debug,
+                 mode=config.server_mode, workers=config.workers, threads=config.threads,
+                 state_factory=state_factory)
 
 
 def main():
@@ -207,6 +371,18 @@ def main():
         help="Self-check / Auto Test çalıştır"
     )
     
+    parser.add_argument(
+        "--full-check",
+        action="store_true",
+        help="--self-check ile: tüm servisleri ve log istatistiklerini kontrol et"
+    )
+    
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Komutu -X importtime ile çalıştırıp açılış süresi dökümünü göster"
+    )
+    
     parser.add_argument(
         "--list-services",
         action="store_true",
@@ -232,6 +408,38 @@ def main():
         help="Gösterilecek maksimum log sayısı"
     )
     
+    parser.add_argument(
+        "--after-cursor",
+        metavar="CURSOR",
+        help="--logs ile: yalnızca bu imleçten sonraki logları göster (boş: son loglar + imleç)"
+    )
+    
+    parser.add_argument(
+        "--import",
+        dest="import_paths",
+        nargs="+",
+        metavar="PATH",
+        help="Geçmiş log dosyalarını (short-iso/json metin veya .journal) paralel içe aktar"
+    )
+    
+    parser.add_argument(
+        "--import-workers",
+        type=int,
+        help="İçe aktarmada süreç sayısı (varsayılan: CPU sayısı)"
+    )
+    
+    parser.add_argument(
+        "--import-format",
+        choices=["text", "json", "journal"],
+        help="İçe aktarılan dosya biçimi (varsayılan: otomatik)"
+    )
+    
+    parser.add_argument(
+        "--import-compress",
+        action="store_true",
+        help="İçe aktarılan logları servis bazında sıkıştırılmış bloklarda tut"
+    )
+    
     parser.add_argument(
         "--watch-critical",
         action="store_true",
@@ -240,17 +448,62 @@ def main():
     
     parser.add_argument(
         "--host",
-        default=config.host,
         help="Sunucu adresi"
     )
     
     parser.add_argument(
         "--port",
         type=int,
-        default=config.port,
         help="Sunucu portu"
     )
     
+    parser.add_argument(
+        "--server-mode",
+        choices=["dev", "production"],
+        help="Sunucu modu: dev (Werkzeug) veya production (gunicorn)"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Production modunda worker süreç sayısı (yalnızca 1; eşzamanlılık için --threads)"
+    )
+    
+    parser.add_argument(
+        "--threads",
+        type=int,
+        help="Production modunda worker başına thread sayısı"
+    )
+    
+    parser.add_argument(
+        "--agent",
+        metavar="ADDR",
+        help="Agent modu: aggregator adresine bağlan (host:port veya unix:/yol)"
+    )
+    
+    parser.add_argument(
+        "--agent-id",
+        help="Agent kimliği (varsayılan: hostname)"
+    )
+    
+    parser.add_argument(
+        "--spool-dir",
+        help="Agent modunda log yığınları için disk kuyruğu dizini"
+    )
+    
+    parser.add_argument(
+        "--aggregator",
+        metavar="ADDR",
+        help="Aggregator modu: agent'ları bu adreste dinle ve dashboard sun"
+    )
+    
+    parser.add_argument(
+        "--config",
+        dest="config_file",
+        metavar="FILE",
+        help="Yapılandırma dosyası (JSON/TOML); değişiklikler yeniden başlatmadan uygulanır"
+    )
+    
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -259,21 +512,41 @@ def main():
     
     args = parser.parse_args()
     
-    # Update config
-    config.host = args.host
-    config.port = args.port
+    if args.profile_startup:
+        from core.startup_profile import profile_command
+        argv = [arg for arg in sys.argv[1:] if arg != "--profile-startup"]
+        sys.exit(profile_command(os.path.abspath(__file__), argv))
+    
+    # Update config: yapılandırma yalnızca burada yüklenir (--help ve
+    # --profile-startup yüklemeden döner); verilmeyen seçenekler config'te kalır
+    from config import config
+    for name in ("host", "port", "server_mode", "workers", "threads", "config_file"):
+        value = getattr(args, name)
+        if value is not None:
+            setattr(config, name, value)
     config.debug = args.debug
+    if args.spool_dir is None:
+        args.spool_dir = config.agent_spool_dir
     
     # Execute command
     if args.self_check:
-        success = self_check()
+        success = self_check(full=args.full_check)
         sys.exit(0 if success else 1)
     elif args.list_services:
         list_services()
     elif args.logs:
-        show_logs(level=args.level, limit=args.limit)
+        show_logs(level=args.level, limit=args.limit, after_cursor=args.after_cursor)
+    elif args.import_paths:
+        success = import_logs(args.import_paths, workers=args.import_workers,
+                              fmt=args.import_format, level=args.level, limit=args.limit,
+                              compress=args.import_compress)
+        sys.exit(0 if success else 1)
     elif args.watch_critical:
         watch_critical()
+    elif args.agent:
+        run_agent(args.agent, agent_id=args.agent_id, spool_dir=args.spool_dir)
+    elif args.aggregator:
+        run_aggregator(args.aggregator)
     else:
         # Default: run web server
         run_server()
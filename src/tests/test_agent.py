@@ -0,0 +1,378 @@
+"""
+Agent / Aggregator Tests
+Kablo protokolü, agent gönderimi ve aggregator birleştirme testleri (localhost).
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+from datetime import datetime
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.service_monitor import ServiceMonitor, ServiceInfo, ServiceStatus
+from core.log_collector import LogCollector, LogEntry, LogLevel
+from agent.protocol import (
+    Frame, FrameType, ProtocolError, HEADER, FLAG_ZLIB, MAX_FRAME_SIZE,
+    encode_frame, read_frame, parse_address, pack_frame, logs_to_columns, columns_to_logs
+)
+from agent.client import AgentClient
+from agent.spool import Spool
+from agent.aggregator import AggregatorServer, HostRegistry
+from adapters.aggregator_adapter import AggregatorAdapter
+
+
+class FakeHostAdapter:
+    """Tek bir host'u taklit eden adaptör"""
+
+    def __init__(self, host):
+        self.services = [
+            ServiceInfo("nginx", "nginx", ServiceStatus.RUNNING),
+            ServiceInfo("sshd", "sshd", ServiceStatus.RUNNING),
+        ]
+        self.logs = [
+            LogEntry(datetime(2024, 1, 15, 10, 0), LogLevel.ERROR, f"{host} connection failed", service="nginx"),
+        ]
+
+    async def get_services_async(self):
+        return [ServiceInfo(s.name, s.display_name, s.status) for s in self.services]
+
+    async def get_logs_async(self, limit=100, **kwargs):
+        return self.logs[-limit:]
+
+
+class CursorHostAdapter(FakeHostAdapter):
+    """journalctl --after-cursor davranışını taklit eden adaptör"""
+
+    def __init__(self, host):
+        super().__init__(host)
+        self.cursor_calls = []
+
+    async def read_new_logs_async(self, after_cursor=None, limit=1000):
+        self.cursor_calls.append(after_cursor)
+        start = int(after_cursor) + 1 if after_cursor else max(len(self.logs) - limit, 0)
+        batch = self.logs[start:start + limit]
+        return batch, str(start + len(batch) - 1) if batch else after_cursor
+
+
+def make_agent(address, host, **kwargs):
+    adapter = FakeHostAdapter(host)
+    agent = AgentClient(
+        address,
+        service_monitor=ServiceMonitor(custom_critical_services=["sshd"], adapter=adapter),
+        log_collector=LogCollector(adapter=adapter),
+        agent_id=host,
+        **kwargs
+    )
+    return agent, adapter
+
+
+async def _read(data: bytes) -> Frame:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return await read_frame(reader)
+
+
+@pytest.fixture
+def server():
+    aggregator = AggregatorServer("127.0.0.1:0")
+    aggregator.start()
+    yield aggregator
+    aggregator.stop()
+
+
+async def _run_until(agents, condition, timeout=10.0):
+    """Agent'ları koşul sağlanana kadar çalıştır"""
+    stop = asyncio.Event()
+    tasks = [asyncio.ensure_future(agent.run(stop)) for agent in agents]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition() and loop.time() < deadline:
+        await asyncio.sleep(0.02)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return condition()
+
+
+class TestProtocol:
+    """Çerçeve kodlama testleri"""
+
+    def test_roundtrip(self):
+        frame = asyncio.run(_read(encode_frame(FrameType.LOGS, 42, {"a": [1, 2]})))
+
+        assert frame.type == FrameType.LOGS
+        assert frame.seq == 42
+        assert frame.payload == {"a": [1, 2]}
+
+    def test_large_body_is_compressed(self):
+        payload = {"message": ["timeout while connecting"] * 200}
+        data = encode_frame(FrameType.LOGS, 1, payload)
+        _, _, flags, _ = HEADER.unpack(data[:HEADER.size])
+
+        assert flags & FLAG_ZLIB
+        assert len(data) < 500
+        assert asyncio.run(_read(data)).payload == payload
+
+    def test_decompression_bomb_rejected(self):
+        """Küçük sıkıştırılmış çerçeve MAX_FRAME_SIZE ötesine açılamaz"""
+        import zlib
+        bomb = zlib.compress(b"[" + b" " * (MAX_FRAME_SIZE + 1) + b"]", 9)
+        assert len(bomb) < 64 * 1024
+
+        with pytest.raises(ProtocolError):
+            asyncio.run(_read(pack_frame(FrameType.LOGS, 1, FLAG_ZLIB, bomb)))
+
+    def test_log_timestamps_are_aware(self):
+        entry = LogEntry(datetime(2024, 1, 15, 10, 0).astimezone(), LogLevel.INFO, "m", service="a")
+        decoded = columns_to_logs(logs_to_columns([entry]))[0]
+
+        assert decoded.timestamp.tzinfo is not None
+        assert decoded.timestamp == entry.timestamp
+
+    def test_unknown_type_rejected(self):
+        data = HEADER.pack(0, 99, 0, 1)
+
+        with pytest.raises(ProtocolError):
+            asyncio.run(_read(data))
+
+    def test_parse_address(self):
+        assert parse_address("10.0.0.1:7000") == ("tcp", "10.0.0.1", 7000)
+        assert parse_address("unix:/run/panel.sock") == ("unix", "/run/panel.sock", None)
+        with pytest.raises(ValueError):
+            parse_address("nohost")
+
+
+class TestAgentAggregator:
+    """Agent'ların localhost aggregator'a bağlandığı uçtan uca testler"""
+
+    def test_multiple_agents(self, server):
+        agents = [make_agent(server.bound_address, f"host-{i}", interval=0.05)[0] for i in range(3)]
+        registry = server.registry
+
+        ok = asyncio.run(_run_until(agents, lambda: all(
+            agent.frames_acked >= 2 for agent in agents
+        )))
+
+        assert ok
+        names = sorted(s.name for s in registry.get_services())
+        assert names == sorted(f"host-{i}/{svc}" for i in range(3) for svc in ("nginx", "sshd"))
+        critical = [s.name for s in registry.get_services() if s.is_critical]
+        assert sorted(critical) == [f"host-{i}/sshd" for i in range(3)]
+        assert len(registry.get_logs()) == 3
+
+    def test_only_changes_are_sent(self, server):
+        agent, adapter = make_agent(server.bound_address, "web-1", interval=0.05)
+
+        async def scenario():
+            stop = asyncio.Event()
+            task = asyncio.ensure_future(agent.run(stop))
+            await asyncio.sleep(0.3)
+            sent = agent.frames_sent
+            adapter.services[0].status = ServiceStatus.FAILED
+            adapter.logs.append(LogEntry(datetime(2024, 1, 15, 10, 5), LogLevel.INFO, "reload", service="nginx"))
+            await asyncio.sleep(0.3)
+            await agent.flush()
+            stop.set()
+            await task
+            return sent
+
+        sent_before = asyncio.run(scenario())
+        host = server.registry.hosts["web-1"]
+
+        # Değişiklik yokken heartbeat dışında çerçeve gönderilmez
+        assert agent.frames_sent - sent_before == 2
+        assert host.services["nginx"].status == ServiceStatus.FAILED
+        assert len(host.logs) == 2
+
+    def test_unix_socket(self, tmp_path):
+        aggregator = AggregatorServer(f"unix:{tmp_path / 'agg.sock'}")
+        aggregator.start()
+        try:
+            agent, _ = make_agent(aggregator.bound_address, "db-1", interval=0.05)
+            assert asyncio.run(_run_until([agent], lambda: agent.frames_acked >= 2))
+            assert len(aggregator.registry.hosts["db-1"].services) == 2
+        finally:
+            aggregator.stop()
+
+    def test_resync_after_aggregator_restart(self, server):
+        address = server.bound_address
+        agent, adapter = make_agent(address, "app-1", interval=0.05)
+
+        async def scenario():
+            stop = asyncio.Event()
+            task = asyncio.ensure_future(agent.run(stop))
+            while agent.frames_acked < 2:
+                await asyncio.sleep(0.02)
+            # Aggregator aynı portta yeniden başlar ve tüm durumu kaybeder
+            server.address = parse_address(address)
+            await asyncio.to_thread(server.stop)
+            server.registry = HostRegistry()
+            await asyncio.to_thread(server.start)
+            for _ in range(300):
+                host = server.registry.hosts.get("app-1")
+                if host and len(host.services) == 2:
+                    break
+                await asyncio.sleep(0.02)
+            stop.set()
+            await task
+
+        asyncio.run(scenario())
+
+        assert len(server.registry.hosts["app-1"].services) == 2
+        assert agent.reconnects >= 1
+
+
+class TestBackpressure:
+    """Bekleyen kuyruk ve tekrar çerçeve testleri"""
+
+    def test_pending_cap_drops_oldest_logs(self):
+        agent, adapter = make_agent("127.0.0.1:1", "h", max_pending=3)
+
+        async def collect(times):
+            for i in range(times):
+                adapter.logs.append(LogEntry(datetime(2024, 1, 15, 11, i), LogLevel.INFO, f"m{i}"))
+                await agent.collect_once()
+
+        asyncio.run(collect(5))
+        types = [item[0] for item in agent._pending]
+
+        assert len(types) == 3
+        assert types[0] == FrameType.SERVICES
+        assert agent.dropped_frames == 3
+        assert agent.dropped_logs == 4
+
+    def test_duplicate_frames_are_skipped(self):
+        registry = HostRegistry()
+        registry.hello({"agent_id": "h", "session": "s"})
+        frame = Frame(FrameType.SERVICES, 1, {"full": True, "services": [
+            ["nginx", "nginx", "running", False, "", None]
+        ], "removed": []})
+
+        assert registry.apply("h", frame)
+        assert not registry.apply("h", frame)
+        assert registry.hosts["h"].duplicates == 1
+        assert registry.hello({"agent_id": "h", "session": "s"}) == {"last_seq": 1, "full": False, "spool_offset": -1}
+        assert registry.hello({"agent_id": "h", "session": "new"}) == {"last_seq": 0, "full": True, "spool_offset": -1}
+
+
+class TestSpool:
+    """Disk kuyruğu üzerinden log gönderimi"""
+
+    def test_restart_resumes_from_spool_and_cursor(self, server, tmp_path):
+        adapter = CursorHostAdapter("web-2")
+        adapter.logs = [LogEntry(datetime(2024, 1, 15, 12, i), LogLevel.INFO, f"m{i}") for i in range(2)]
+
+        def agent_for(address):
+            return AgentClient(
+                address,
+                service_monitor=ServiceMonitor(adapter=adapter),
+                log_collector=LogCollector(adapter=adapter),
+                agent_id="web-2",
+                interval=0.05,
+                log_limit=2,
+                spool=Spool(str(tmp_path))
+            )
+
+        # Aggregator'a ulaşılamıyor: loglar diske yazılır
+        offline = agent_for("127.0.0.1:1")
+        asyncio.run(offline.collect_once())
+        offline.spool.close()
+        assert offline.spool.pending_bytes > 0
+
+        # Yeniden başlatma: journal baştan okunmaz, spool'daki yığınlar gönderilir
+        adapter.logs.extend(LogEntry(datetime(2024, 1, 15, 12, i), LogLevel.INFO, f"m{i}") for i in range(2, 5))
+        adapter.logs.append(LogEntry(datetime(2024, 1, 15, 12, 30), LogLevel.ERROR, "new"))
+        agent = agent_for(server.bound_address)
+        host_logs = lambda: len(server.registry.hosts.get("web-2").logs) if "web-2" in server.registry.hosts else 0
+        assert asyncio.run(_run_until([agent], lambda: host_logs() == 6 and not agent.spool.pending_bytes))
+        agent.spool.close()
+
+        # İlk çalıştırmada imleç yok; yeniden başlatmada spool'daki imleçten devam edilir
+        assert adapter.cursor_calls[:3] == [None, "1", "1"]
+        assert adapter.cursor_calls[-1] == "5"
+        assert [e.message for e in server.registry.hosts["web-2"].logs] == [
+            "m0", "m1", "m2", "m3", "m4", "new"
+        ]
+        assert Spool(str(tmp_path)).cursor == "5"
+
+    def test_replayed_spool_batches_are_applied_once(self):
+        registry = HostRegistry()
+        registry.hello({"agent_id": "h", "session": "s1", "spool_id": "sp"})
+        batch = {"ts": [0.0], "level": [6], "service": ["a"], "source": [""], "message": ["x"], "offset": 0}
+        registry.apply("h", Frame(FrameType.LOGS, 1, batch))
+
+        # Agent yeniden başladı; checkpoint ACK'ten önce yazılmamıştı
+        welcome = registry.hello({"agent_id": "h", "session": "s2", "spool_id": "sp"})
+        applied = registry.apply("h", Frame(FrameType.LOGS, 1, batch))
+
+        assert welcome == {"last_seq": 0, "full": True, "spool_offset": 0}
+        assert not applied
+        assert len(registry.hosts["h"].logs) == 1
+        # Yeni spool (dizin silinmiş): ofsetler sıfırlanır
+        assert registry.hello({"agent_id": "h", "session": "s3", "spool_id": "other"})["spool_offset"] == -1
+
+
+class TestAggregatorAdapter:
+    """Aggregator verisi üzerinde dashboard testleri"""
+
+    def test_incremental_reads_do_not_lose_busy_hosts(self):
+        """limit ötesindeki kayıtlar host başına sıra imleciyle sonraki çağrıda okunur"""
+        registry = HostRegistry()
+        seqs = {}
+
+        def send(host, start, count):
+            registry.hello({"agent_id": host, "session": host})
+            seqs[host] = seqs.get(host, 0) + 1
+            registry.apply(host, Frame(FrameType.LOGS, seqs[host], {
+                "ts": [1705312800.0 + i for i in range(start, start + count)], "level": [6] * count,
+                "service": ["app"] * count, "source": [""] * count,
+                "message": [f"{host}-{i}" for i in range(start, start + count)]}))
+
+        collector = LogCollector(adapter=AggregatorAdapter(registry))
+        send("a", 0, 5)
+        send("b", 0, 5)
+        assert len(collector.collect_new(limit=3)) == 3
+
+        send("a", 5, 4)
+        send("b", 5, 4)
+        seen = []
+        for _ in range(4):
+            seen.extend(entry.message for entry in collector.collect_new(limit=3))
+
+        assert sorted(seen) == sorted(f"{host}-{i}" for host in "ab" for i in range(5, 9))
+        assert collector.collect_new(limit=3) == []
+        # Başka bir aggregator ömrüne ait imleç: son kayıtlardan başlanır
+        assert len(AggregatorAdapter(HostRegistry()).read_new_logs(collector.cursor)[0]) == 0
+
+    def test_dashboard_over_registry(self):
+        from web.app import create_app
+        from web.state import PanelState
+
+        registry = HostRegistry()
+        for host, status in (("a", "running"), ("b", "failed")):
+            registry.hello({"agent_id": host, "session": host})
+            registry.apply(host, Frame(FrameType.SERVICES, 1, {"full": True, "services": [
+                ["nginx", "nginx", status, True, "", None]
+            ], "removed": []}))
+        adapter = AggregatorAdapter(registry)
+        state = PanelState(
+            service_monitor=ServiceMonitor(adapter=adapter),
+            log_collector=LogCollector(adapter=adapter),
+            hosts=registry
+        )
+        client = create_app(state=state).test_client()
+
+        dashboard = client.get('/api/dashboard').get_json()
+        hosts = client.get('/api/hosts').get_json()
+
+        assert dashboard['services']['total'] == 2
+        assert dashboard['services']['critical_down'] == 1
+        assert hosts['count'] == 2
+
+
+# Test çalıştırma
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,121 @@
+"""
+Anomaly Detector Tests
+EWMA/varyans tabanlı log hızı anomali tespiti testleri.
+"""
+
+import pytest
+import sys
+import os
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.alert_manager import AlertManager, AlertType, AlertSeverity
+from core.anomaly_detector import RateAnomalyDetector
+from core.log_collector import LogLevel
+
+BASE = 1705312800.0
+
+
+def feed(detector, service, level, per_minute, minutes, start_minute=0):
+    """Her dakikaya per_minute kayıt ekle"""
+    for minute in range(start_minute, start_minute + minutes):
+        for i in range(per_minute):
+            detector.observe(service, level, BASE + minute * 60 + i * 0.1)
+
+
+class TestBaseline:
+    """Taban çizgisi testleri"""
+
+    def test_steady_noisy_service_does_not_alert(self):
+        manager = AlertManager()
+        detector = RateAnomalyDetector(manager)
+        feed(detector, "nginx", LogLevel.ERROR, 50, 60)
+
+        assert manager.alerts == []
+        series = detector.get_series()[0]
+        assert series["expected"] == pytest.approx(50, rel=0.05)
+
+    def test_spike_on_quiet_service_alerts_once(self):
+        manager = AlertManager()
+        detector = RateAnomalyDetector(manager, start=BASE)
+        feed(detector, "nginx", LogLevel.ERROR, 50, 30)
+        feed(detector, "cron", LogLevel.ERROR, 1, 30)
+        feed(detector, "cron", LogLevel.ERROR, 40, 1, start_minute=30)
+
+        alerts = manager.get_active_alerts()
+        assert len(alerts) == 1
+        assert alerts[0].type == AlertType.LOG_RATE_ANOMALY
+        assert alerts[0].severity == AlertSeverity.HIGH
+        assert alerts[0].source == "cron"
+        assert detector.get_series(limit=1)[0]["service"] == "cron"
+
+    def test_new_episode_after_recovery(self):
+        manager = AlertManager()
+        detector = RateAnomalyDetector(manager, alpha=0.05, start=BASE)
+        feed(detector, "db", LogLevel.WARNING, 2, 20)
+        feed(detector, "db", LogLevel.WARNING, 30, 1, start_minute=20)
+        feed(detector, "db", LogLevel.WARNING, 2, 5, start_minute=21)
+        feed(detector, "db", LogLevel.WARNING, 30, 1, start_minute=26)
+
+        assert len(manager.alerts) == 2
+        assert manager.alerts[0].severity == AlertSeverity.MEDIUM
+
+    def test_series_first_seen_after_warmup_uses_zero_baseline(self):
+        """Daha önce hiç hata üretmemiş servisteki ani artış yakalanır"""
+        detector = RateAnomalyDetector(start=BASE)
+        feed(detector, "web", LogLevel.ERROR, 3, 15)
+        feed(detector, "mail", LogLevel.ERROR, 20, 1, start_minute=15)
+
+        assert detector.anomalies == 1
+
+    def test_warmup_suppresses_alerts(self):
+        detector = RateAnomalyDetector(warmup=10, start=BASE)
+        feed(detector, "app", LogLevel.ERROR, 100, 1)
+
+        assert detector.anomalies == 0
+
+    def test_backlog_before_start_does_not_alert(self):
+        """Açılışta okunan geçmiş kayıtlardaki patlamalar uyarı üretmez ama öğrenilir"""
+        manager = AlertManager()
+        detector = RateAnomalyDetector(manager, start=BASE + 30 * 60)
+        feed(detector, "web", LogLevel.ERROR, 3, 15)
+        feed(detector, "mail", LogLevel.ERROR, 20, 1, start_minute=15)
+        feed(detector, "mail", LogLevel.ERROR, 1, 14, start_minute=16)
+
+        assert detector.anomalies == 0 and manager.alerts == []
+        feed(detector, "mail", LogLevel.ERROR, 40, 1, start_minute=30)
+        assert detector.anomalies == 1
+
+
+class TestBoundedState:
+    """Sınırlı bellek testleri"""
+
+    def test_levels_below_max_level_ignored(self):
+        detector = RateAnomalyDetector()
+        detector.observe("app", LogLevel.INFO, BASE)
+
+        assert detector.get_stats()["series"] == 0
+
+    def test_max_series_evicts_least_recent(self):
+        detector = RateAnomalyDetector(max_series=100)
+        for i in range(1000):
+            detector.observe(f"svc{i}", LogLevel.ERROR, BASE + i)
+
+        stats = detector.get_stats()
+        assert stats["series"] == 100
+        assert stats["evicted"] == 900
+
+    def test_long_gap_is_constant_time(self):
+        detector = RateAnomalyDetector()
+        detector.observe("app", LogLevel.ERROR, BASE)
+        detector.observe("app", LogLevel.ERROR, BASE + 60 * 1_000_000)
+
+        series = detector.get_series()[0]
+        assert series["samples"] == 1_000_000
+        assert series["expected"] == pytest.approx(0, abs=1e-3)
+
+
+# Test çalıştırma
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
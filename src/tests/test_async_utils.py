@@ -0,0 +1,247 @@
+"""
+Async Utilities Tests
+asyncio alt süreç yardımcıları ve async adaptör arayüzü testleri.
+"""
+
+import pytest
+import asyncio
+import sys
+import os
+import time
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.async_utils import run_sync, run_command, stream_command, run_command_sync, stream_command_sync
+from core.service_monitor import ServiceStatus
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="POSIX komutları gerektirir")
+
+PYTHON = sys.executable
+
+
+class TestRunCommand:
+    """run_command testleri"""
+
+    def test_output_and_code(self):
+        """stdout, stderr ve çıkış kodu döner"""
+        stdout, stderr, code = run_sync(run_command(
+            [PYTHON, "-c", "import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)"]
+        ))
+
+        assert stdout.strip() == "out"
+        assert stderr.strip() == "err"
+        assert code == 3
+
+    def test_missing_binary(self):
+        """Bulunamayan komut hata kodu döner"""
+        stdout, stderr, code = run_sync(run_command(["/nonexistent/binary"]))
+
+        assert code == 1
+        assert stderr
+
+    def test_timeout_kills_process(self):
+        """Zaman aşımında süreç öldürülür, çağıran beklemez"""
+        start = time.monotonic()
+        stdout, stderr, code = run_sync(run_command(["sleep", "5"], timeout=0.2))
+
+        assert code == 1
+        assert stderr == "Command timed out"
+        assert time.monotonic() - start < 2
+
+    def test_concurrent_latency_is_max(self):
+        """Eşzamanlı komutların süresi toplam değil en uzun olanıdır"""
+        async def fan_out():
+            return await asyncio.gather(*[run_command(["sleep", "0.3"]) for _ in range(4)])
+
+        start = time.monotonic()
+        results = run_sync(fan_out())
+
+        assert all(code == 0 for _, _, code in results)
+        assert time.monotonic() - start < 1.0
+
+    def test_cancellation_kills_process(self):
+        """İptal edilen görevin alt süreci öldürülür"""
+        async def cancel_midway():
+            task = asyncio.create_task(run_command(["sleep", "5"]))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        start = time.monotonic()
+        run_sync(cancel_midway())
+
+        assert time.monotonic() - start < 2
+
+
+class TestStreamCommand:
+    """stream_command testleri"""
+
+    def test_lines_streamed(self):
+        """Satırlar sırayla okunur"""
+        async def collect():
+            async with stream_command([PYTHON, "-c", "print('a'); print('b')"]) as lines:
+                return [line async for line in lines]
+
+        assert run_sync(collect()) == ["a", "b"]
+
+    def test_early_exit_terminates(self):
+        """Erken çıkışta sonsuz çıktı üreten süreç durdurulur"""
+        async def first_line():
+            async with stream_command(["yes"]) as lines:
+                async for line in lines:
+                    return line
+
+        assert run_sync(first_line()) == "y"
+
+    def test_timeout_raises(self):
+        """Zaman aşımında yarım çıktı başarı gibi dönmez, TimeoutError fırlatılır"""
+        async def drain():
+            async with stream_command(
+                    [PYTHON, "-c", "import time; print('partial', flush=True); time.sleep(5)"],
+                    timeout=0.5) as lines:
+                return [line async for line in lines]
+
+        start = time.monotonic()
+        with pytest.raises(TimeoutError):
+            run_sync(drain())
+        assert time.monotonic() - start < 2
+
+
+class TestSyncCommands:
+    """Event loop kurmayan senkron karşılıklar"""
+
+    def test_run_command_sync(self):
+        stdout, stderr, code = run_command_sync([PYTHON, "-c", "print('out'); raise SystemExit(2)"])
+
+        assert stdout.strip() == "out"
+        assert code == 2
+        assert run_command_sync(["/nonexistent/binary"])[2] == 1
+        assert run_command_sync(["sleep", "5"], timeout=0.2) == ("", "Command timed out", 1)
+
+    def test_stream_command_sync_early_exit(self):
+        start = time.monotonic()
+        with stream_command_sync(["yes"]) as lines:
+            first = next(lines)
+        with pytest.raises(TimeoutError):
+            with stream_command_sync(["sleep", "5"], timeout=0.2) as lines:
+                list(lines)
+
+        assert first == "y"
+        assert time.monotonic() - start < 2
+
+
+class TestRunSync:
+    """run_sync testleri"""
+
+    def test_inside_running_loop_raises(self):
+        """Çalışan loop içinden çağrı kilitlenmek yerine hata verir"""
+        async def nested():
+            with pytest.raises(RuntimeError):
+                run_sync(asyncio.sleep(0))
+
+        run_sync(nested())
+
+
+class TestLinuxServiceParsing:
+    """systemctl list-units ayrıştırma testleri"""
+
+    def test_failed_unit_marker(self):
+        """'●' ile başlayan hatalı birim satırı doğru ayrıştırılır"""
+        from adapters.linux_adapter import LinuxAdapter
+
+        output = (
+            "  nginx.service  loaded active running A high performance web server\n"
+            "● mysql.service  loaded failed failed  MySQL Server\n"
+        )
+        services = LinuxAdapter()._parse_services(output)
+
+        assert [s.name for s in services] == ["nginx", "mysql"]
+        assert services[1].status == ServiceStatus.FAILED
+
+
+class TestLinuxJournalJson:
+    """journalctl -o json (imleçli okuma) ayrıştırma testleri"""
+
+    def test_entry_with_cursor_and_priority(self):
+        from adapters.linux_adapter import LinuxAdapter
+        from core.log_collector import LogLevel
+
+        line = ('{"__CURSOR":"s=1;i=2a","__REALTIME_TIMESTAMP":"1705314645000000",'
+                '"PRIORITY":"3","SYSLOG_IDENTIFIER":"sshd","_HOSTNAME":"web",'
+                '"MESSAGE":[104,105]}')
+        entry, cursor = LinuxAdapter()._parse_json_entry(line)
+
+        assert cursor == "s=1;i=2a"
+        assert entry.level == LogLevel.ERROR
+        assert entry.service == "sshd"
+        assert entry.message == "hi"
+        assert entry.timestamp.timestamp() == 1705314645
+        assert LinuxAdapter()._parse_json_entry('{"MESSAGE":"no cursor"}') is None
+
+    def test_timeout_keeps_cursor(self, monkeypatch):
+        """Zaman aşımında yarım okunan kayıtlar dönmez, imleç ilerlemez"""
+        import contextlib
+        import adapters.linux_adapter as linux_adapter
+        from adapters.linux_adapter import LinuxAdapter
+
+        @contextlib.contextmanager
+        def fake_stream(cmd, timeout=None):
+            def produce():
+                yield '{"__CURSOR":"s=1;i=2b","__REALTIME_TIMESTAMP":"1705314645000000","MESSAGE":"x"}'
+                raise TimeoutError("Command timed out")
+            yield produce()
+
+        monkeypatch.setattr(linux_adapter, "stream_command_sync", fake_stream)
+
+        assert LinuxAdapter().read_new_logs("s=1;i=2a") == ([], "s=1;i=2a")
+
+
+class TestLinuxJournalFilters:
+    """journal alan eşleşmeleri ve filtreye kadar okuma testleri"""
+
+    def test_match_args(self):
+        from adapters.linux_adapter import journal_match_args
+
+        args = journal_match_args([{"SYSLOG_IDENTIFIER": ["nginx"], "_HOSTNAME": ["a", "b"]},
+                                   {"_PID": ["42"]}])
+
+        assert args == ["SYSLOG_IDENTIFIER=nginx", "_HOSTNAME=a", "_HOSTNAME=b", "+", "_PID=42"]
+
+    def test_reads_until_limit_matches(self, monkeypatch):
+        import contextlib
+        import adapters.linux_adapter as linux_adapter
+        from adapters.linux_adapter import LinuxAdapter
+
+        commands, read = [], []
+        # -r ile yeniden eskiye: her üç satırdan biri eşleşir
+        lines = [f"2024-01-15T10:{59 - i:02d}:00+0000 web app[1]: {'timeout' if i % 3 == 0 else 'ok'} {i}"
+                 for i in range(60)]
+
+        @contextlib.contextmanager
+        def fake_stream(cmd, timeout=None):
+            commands.append(cmd)
+
+            def produce():
+                for line in lines:
+                    read.append(line)
+                    yield line
+            yield produce()
+
+        monkeypatch.setattr(linux_adapter, "stream_command_sync", fake_stream)
+        monkeypatch.setattr(LinuxAdapter, "_grep_supported", False)
+        logs = list(LinuxAdapter().iter_logs(
+            limit=5, grep="timeout", matches=[{"_HOSTNAME": ["web"]}],
+            predicate=lambda log: "timeout" in log.message, max_scan=1000))
+
+        assert [log.message for log in logs] == [f"timeout {i}" for i in (12, 9, 6, 3, 0)]
+        assert len(read) == 13
+        assert "-r" in commands[0] and "--grep" not in commands[0]
+        assert commands[0][-1] == "_HOSTNAME=web"
+        assert commands[0][commands[0].index("-n") + 1] == "1000"
+
+
+# Test çalıştırma
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
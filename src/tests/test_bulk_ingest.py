@@ -0,0 +1,165 @@
+"""
+Bulk Ingest Tests
+Toplu ayrıştırma, satır hizalı bölme ve LogStore birleştirme testleri.
+"""
+
+import json
+import pytest
+import sys
+import os
+from datetime import datetime
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.bulk_ingest import BulkIngestor, chunk_ranges, detect_format, parse_lines
+from core.log_collector import LogLevel
+from core.log_store import LogBatch, LogStore
+
+
+def short_iso(second, service="sshd", message="Accepted publickey"):
+    return f"2024-01-15T10:{second // 60:02d}:{second % 60:02d}+0000 web {service}[42]: {message}\n"
+
+
+@pytest.fixture
+def text_file(tmp_path):
+    path = tmp_path / "journal.log"
+    with open(path, "w") as f:
+        for i in range(300):
+            f.write(short_iso(i, message=f"connection {i} failed" if i % 10 == 0 else f"request {i}"))
+    return str(path)
+
+
+class TestChunking:
+    """Satır hizalı bölme testleri"""
+
+    def test_chunks_cover_file_on_line_boundaries(self, text_file):
+        ranges = chunk_ranges(text_file, chunk_size=1000)
+        data = open(text_file, "rb").read()
+
+        assert len(ranges) > 5
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start
+            assert data[end - 1:end] == b"\n"
+
+    def test_detect_format(self, tmp_path, text_file):
+        json_path = tmp_path / "export.json"
+        json_path.write_text('\n{"MESSAGE": "x"}\n')
+
+        assert detect_format(text_file) == "text"
+        assert detect_format(str(json_path)) == "json"
+        assert detect_format("/var/log/journal/system.journal") == "journal"
+
+
+class TestParse:
+    """Worker ayrıştırma testleri"""
+
+    def test_text_lines(self):
+        batch = parse_lines([short_iso(5, "nginx", "upstream failed"), "garbage", "", short_iso(1)], "text")
+
+        assert len(batch) == 2
+        assert batch.skipped == 1
+        assert batch.service == ["sshd", "nginx"]
+        assert batch.level[1] == LogLevel.ERROR.value
+        assert batch.ts[0] == datetime.fromisoformat("2024-01-15T10:00:01+00:00").timestamp()
+
+    def test_json_lines(self):
+        lines = [json.dumps({"__REALTIME_TIMESTAMP": "1705312800000000", "PRIORITY": "2",
+                             "_SYSTEMD_UNIT": "db.service", "MESSAGE": "disk full"}), "{bad"]
+        batch = parse_lines(lines, "json")
+
+        assert batch.level == [LogLevel.CRITICAL.value]
+        assert batch.service == ["db.service"]
+        assert batch.skipped == 1
+
+
+class TestBulkIngestor:
+    """Uçtan uca içe aktarma testleri"""
+
+    def test_parallel_matches_sequential(self, text_file):
+        sequential = BulkIngestor(workers=1, chunk_size=1000)
+        parallel = BulkIngestor(workers=2, chunk_size=1000)
+
+        first = sequential.ingest([text_file])
+        second = parallel.ingest([text_file])
+
+        assert first.entries == second.entries == 300
+        assert first.chunks > 1
+        assert sequential.store.query(limit=0) == parallel.store.query(limit=0)
+
+    def test_files_merged_in_timestamp_order(self, tmp_path):
+        late = tmp_path / "late.log"
+        early = tmp_path / "early.log"
+        late.write_text("".join(short_iso(i) for i in range(100, 200, 2)))
+        early.write_text("".join(short_iso(i) for i in range(0, 150, 3)))
+
+        ingestor = BulkIngestor(workers=1, chunk_size=500)
+        ingestor.ingest([str(late), str(early)])
+        logs = ingestor.store.query(limit=0)
+
+        assert len(logs) == 100
+        assert [e.timestamp for e in logs] == sorted(e.timestamp for e in logs)
+
+    def test_batches_merged_while_submitting(self, text_file):
+        """Bekleyen görevler 2×worker ile sınırlı; yığınlar geldikçe birleştirilir"""
+        produced, in_flight = [], []
+
+        class RecordingStore(LogStore):
+            def merge(self, batches):
+                in_flight.append(len(produced) - len(in_flight))
+                return super().merge(batches)
+
+        ingestor = BulkIngestor(store=RecordingStore(), workers=2, chunk_size=300)
+        tasks = ingestor._tasks
+
+        def counting_tasks(*args):
+            for task in tasks(*args):
+                produced.append(task)
+                yield task
+
+        ingestor._tasks = counting_tasks
+        result = ingestor.ingest([text_file])
+
+        assert result.entries == 300
+        assert len(in_flight) == result.chunks > 8
+        assert max(in_flight) <= 2 * ingestor.workers + 1
+        sequential = BulkIngestor(workers=1, chunk_size=300)
+        sequential.ingest([text_file])
+        assert ingestor.store.query(limit=0) == sequential.store.query(limit=0)
+
+
+class TestLogStore:
+    """LogStore sorgu ve sınır testleri"""
+
+    def make_batch(self, seconds, level=LogLevel.INFO, service="app"):
+        batch = LogBatch()
+        for s in seconds:
+            batch.append(1705312800.0 + s, level.value, service, "web", f"m{s}")
+        return batch
+
+    def test_query_filters_and_limit(self):
+        store = LogStore()
+        store.merge([self.make_batch(range(0, 10)), self.make_batch([3, 7], LogLevel.ERROR, "db")])
+
+        errors = store.query(level=LogLevel.ERROR)
+        since = datetime.fromtimestamp(1705312800.0 + 8)
+        recent = store.query(limit=2, since=since)
+
+        assert [e.message for e in errors] == ["m3", "m7"]
+        assert [e.message for e in recent] == ["m8", "m9"]
+        assert store.query(limit=3, service="app")[-1].message == "m9"
+        assert store.get_statistics()["by_level"] == {"INFO": 10, "ERROR": 2}
+
+    def test_max_entries_drops_oldest(self):
+        store = LogStore(max_entries=5)
+        store.merge([self.make_batch(range(10))])
+
+        assert len(store) == 5
+        assert store.query(limit=1)[0].message == "m9"
+        assert store.query(limit=0)[0].message == "m5"
+
+
+# Test çalıştırma
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
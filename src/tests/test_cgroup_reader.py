@@ -0,0 +1,191 @@
+"""
+Cgroup Reader Tests
+cgroup/proc doğrudan okuyucu testleri (sahte cgroup ağacı ile).
+"""
+
+import pytest
+import sys
+import os
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adapters.cgroup_reader import CgroupReader
+from adapters.linux_adapter import LinuxAdapter
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def _make_unit(root, unit, usage=1000, memory=4096, pids=3, procs="42\n"):
+    base = os.path.join(root, "cgroup", "system.slice", unit)
+    _write(os.path.join(base, "cpu.stat"),
+           f"usage_usec {usage}\nuser_usec {usage // 2}\nsystem_usec {usage // 2}\n")
+    _write(os.path.join(base, "memory.current"), f"{memory}\n")
+    _write(os.path.join(base, "pids.current"), f"{pids}\n")
+    _write(os.path.join(base, "cgroup.procs"), procs)
+    return base
+
+
+def _make_proc(root, pid, comm="nginx"):
+    # 52 alanlı /proc/<pid>/stat satırı: utime=14, stime=15, threads=20
+    fields = ["0"] * 49
+    fields[0] = "S"
+    fields[11] = "150"
+    fields[12] = "50"
+    fields[17] = "4"
+    _write(os.path.join(root, "proc", str(pid), "stat"),
+           f"{pid} ({comm}) " + " ".join(fields) + "\n")
+
+
+class TestCgroupReader:
+    """CgroupReader sınıfı testleri"""
+
+    @pytest.fixture
+    def tree(self, tmp_path):
+        """Sahte cgroup ve proc ağacı"""
+        root = str(tmp_path)
+        _make_unit(root, "nginx.service", usage=2000, memory=8192, pids=5)
+        _make_unit(root, "system-getty.slice/getty@tty1.service", procs="")
+        _make_proc(root, 42, comm="nginx: master (x)")
+        return root
+
+    @pytest.fixture
+    def reader(self, tree):
+        reader = CgroupReader(cgroup_root=os.path.join(tree, "cgroup"),
+                              proc_root=os.path.join(tree, "proc"))
+        yield reader
+        reader.close()
+
+    def test_is_available(self, reader, tmp_path):
+        """system.slice varlık kontrolü"""
+        assert reader.is_available()
+        assert not CgroupReader(cgroup_root=str(tmp_path / "missing")).is_available()
+
+    def test_read_unit(self, reader):
+        """cgroup sayaçları ve /proc/<pid>/stat okuma"""
+        resources = reader.read_unit("nginx")
+
+        assert resources.cpu_usage_usec == 2000
+        assert resources.cpu_user_usec == 1000
+        assert resources.memory_bytes == 8192
+        assert resources.tasks == 5
+        assert resources.main_pid == 42
+        assert resources.process_state == "S"
+        assert resources.process_utime == 150
+        assert resources.process_stime == 50
+        assert resources.process_threads == 4
+
+    def test_template_instance_path(self, reader):
+        """Şablon örnekleri system-<şablon>.slice altında aranır"""
+        resources = reader.read_unit("getty@tty1")
+
+        assert resources is not None
+        assert resources.main_pid is None
+
+    def test_missing_unit(self, reader):
+        """cgroup'u olmayan birim None döner ve tanımlayıcı tutmaz"""
+        assert reader.read_unit("does-not-exist") is None
+        assert reader.open_descriptor_count() == 0
+
+    def test_descriptors_reused(self, reader, tree):
+        """Tanımlayıcılar yeniden kullanılır, değerler pread ile tazelenir"""
+        reader.read_unit("nginx")
+        count = reader.open_descriptor_count()
+
+        _write(os.path.join(tree, "cgroup", "system.slice", "nginx.service", "memory.current"),
+               "16384\n")
+        resources = reader.read_unit("nginx")
+
+        assert resources.memory_bytes == 16384
+        assert reader.open_descriptor_count() == count
+
+    def test_read_units_releases_stopped(self, reader, tree, monkeypatch):
+        """Duran birimin tanımlayıcıları bırakılır"""
+        import errno
+        import shutil
+
+        results = reader.read_units(["nginx", "getty@tty1"])
+        assert set(results) == {"nginx", "getty@tty1"}
+
+        # Silinen cgroup'un açık dosyaları kernfs'te ENODEV döner
+        stale = set(reader._unit_fds["getty@tty1"].values())
+        real_pread = os.pread
+
+        def fake_pread(fd, size, offset):
+            if fd in stale:
+                raise OSError(errno.ENODEV, "No such device")
+            return real_pread(fd, size, offset)
+
+        monkeypatch.setattr(os, "pread", fake_pread)
+        shutil.rmtree(os.path.join(tree, "cgroup", "system.slice", "system-getty.slice"))
+        results = reader.read_units(["nginx", "getty@tty1"])
+
+        assert set(results) == {"nginx"}
+        assert "getty@tty1" not in reader._unit_fds
+
+    def test_descriptor_budget(self, tree):
+        """Bütçe dolduğunda aç-oku-kapat yoluna düşülür"""
+        reader = CgroupReader(cgroup_root=os.path.join(tree, "cgroup"),
+                              proc_root=os.path.join(tree, "proc"),
+                              max_descriptors=2)
+
+        resources = reader.read_unit("nginx")
+
+        assert resources.tasks == 5
+        assert resources.process_threads == 4
+        assert reader.open_descriptor_count() == 2
+        reader.close()
+        assert reader.open_descriptor_count() == 0
+
+    def test_concurrent_readers_share_cache(self, reader):
+        """Anlık görüntü ve istek thread'leri aynı okuyucuyu kullanabilir"""
+        import threading
+
+        errors = []
+
+        def work():
+            for _ in range(200):
+                resources = reader.read_units(["nginx", "getty@tty1"]).get("nginx")
+                if resources is None or resources.memory_bytes != 8192:
+                    errors.append(resources)
+                reader.forget("getty@tty1")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        reader.close()
+        assert reader.open_descriptor_count() == 0
+
+    def test_parse_proc_stat_invalid(self):
+        """Bozuk stat satırı None döner"""
+        assert CgroupReader.parse_proc_stat(b"garbage") is None
+
+
+class TestLinuxAdapterResources:
+    """LinuxAdapter kaynak okuyucu entegrasyonu"""
+
+    def test_pluggable_reader(self, tmp_path):
+        """Okuyucu LinuxAdapter'a enjekte edilebilir"""
+        root = str(tmp_path)
+        _make_unit(root, "sshd.service", memory=1024)
+        reader = CgroupReader(cgroup_root=os.path.join(root, "cgroup"),
+                              proc_root=os.path.join(root, "proc"))
+        adapter = LinuxAdapter(resource_reader=reader)
+
+        resources = adapter.get_service_resources(["sshd"])
+
+        assert resources["sshd"].memory_bytes == 1024
+        reader.close()
+
+
+# Test çalıştırma
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
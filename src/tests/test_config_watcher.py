@@ -0,0 +1,151 @@
+"""
+Config Watcher Tests
+Yapılandırma dosyası doğrulama, izleme ve yeniden başlatmadan uygulama testleri.
+"""
+
+import pytest
+import sys
+import os
+import json
+import time
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config, load_config_file
+from core.config_watcher import ConfigWatcher
+from web.state import PanelState
+
+
+def write(path, values):
+    path.write_text(json.dumps(values))
+
+
+class TestLoadConfigFile:
+    """Dosya okuma ve doğrulama testleri"""
+
+    def test_overlay_on_base(self, tmp_path):
+        path = tmp_path / "monitor.json"
+        write(path, {"cpu_threshold": 75, "critical_services": ["postgresql"]})
+        base = Config(port=8080)
+        cfg = load_config_file(str(path), base)
+
+        assert cfg.cpu_threshold == 75.0 and isinstance(cfg.cpu_threshold, float)
+        assert cfg.critical_services == ["postgresql"]
+        assert cfg.port == 8080
+        assert base.cpu_threshold == 90.0
+
+    def test_toml(self, tmp_path):
+        pytest.importorskip("tomllib")
+        path = tmp_path / "monitor.toml"
+        path.write_text('error_threshold = 3\nsnapshot_interval = 2.5\n')
+
+        cfg = load_config_file(str(path))
+        assert (cfg.error_threshold, cfg.snapshot_interval) == (3, 2.5)
+
+    @pytest.mark.parametrize("values", [
+        {"colour": "red"}, {"port": "80"}, {"debug": 1}, {"critical_services": [1]},
+        {"cpu_threshold": 120}, {"snapshot_interval": 0}, {"server_mode": "fast"}, []
+    ])
+    def test_invalid(self, tmp_path, values):
+        path = tmp_path / "monitor.json"
+        write(path, values)
+
+        with pytest.raises(ValueError):
+            load_config_file(str(path))
+
+    def test_syntax_error(self, tmp_path):
+        path = tmp_path / "monitor.json"
+        path.write_text("{")
+
+        with pytest.raises(ValueError):
+            load_config_file(str(path))
+
+
+class TestConfigWatcher:
+    """İzleyici testleri"""
+
+    def make_watcher(self, path, applied, **kwargs):
+        def apply(cfg):
+            applied.append(cfg)
+            return ["error_threshold"]
+        return ConfigWatcher(str(path), load=load_config_file, apply=apply, **kwargs)
+
+    def test_check_detects_change(self, tmp_path):
+        path = tmp_path / "monitor.json"
+        write(path, {"error_threshold": 5})
+        applied = []
+        watcher = self.make_watcher(path, applied, use_inotify=False)
+
+        assert watcher.check() is None
+        write(path, {"error_threshold": 6, "warning_threshold": 7})
+        assert watcher.check() == ["error_threshold"]
+        assert applied[-1].error_threshold == 6
+
+    def test_invalid_file_keeps_config(self, tmp_path):
+        path = tmp_path / "monitor.json"
+        write(path, {"error_threshold": 5})
+        applied = []
+        watcher = self.make_watcher(path, applied, use_inotify=False)
+        write(path, {"error_threshold": -1, "x": 1})
+
+        assert watcher.check() is None
+        assert applied == []
+        assert watcher.get_stats()["errors"] == 1
+        os.remove(path)
+        assert watcher.check() is None
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify yalnızca Linux'ta")
+    def test_inotify_reload(self, tmp_path):
+        path = tmp_path / "monitor.json"
+        write(path, {"error_threshold": 5})
+        applied = []
+        watcher = self.make_watcher(path, applied, debounce=0.01)
+        watcher.start()
+        try:
+            assert watcher.backend == "inotify"
+            # Editörler gibi: geçici dosyaya yaz, rename ile değiştir
+            temp = tmp_path / "monitor.json.tmp"
+            write(temp, {"error_threshold": 9})
+            os.replace(temp, path)
+            deadline = time.time() + 5
+            while not applied and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            watcher.stop()
+
+        assert applied[-1].error_threshold == 9
+
+
+class TestPanelStateReload:
+    """Değişikliklerin bileşenlere aktarılması testleri"""
+
+    def test_propagates_without_rebuilding(self, tmp_path):
+        path = tmp_path / "monitor.json"
+        write(path, {"critical_services": ["sshd"], "cpu_threshold": 80})
+        state = PanelState(config=Config(config_file=str(path)))
+        monitor, snapshots = state.service_monitor, state.snapshots
+
+        assert state.service_monitor.critical_services == ["sshd"]
+        assert state.alert_manager.cpu_threshold == 80
+
+        write(path, {"critical_services": ["docker", "nginx"], "error_threshold": 2,
+                     "snapshot_interval": 1.5, "ingest_rate": 5, "port": 9000})
+        changed = state.config_watcher.reload()
+
+        assert set(changed) == {"critical_services", "cpu_threshold", "error_threshold",
+                                "snapshot_interval", "ingest_rate", "port"}
+        assert state.service_monitor is monitor and state.snapshots is snapshots
+        assert monitor.critical_services == ["docker", "nginx"]
+        # Dosyadan kaldırılan alan temel değere döner
+        assert state.alert_manager.cpu_threshold == 90.0
+        assert state.alert_manager.error_threshold == 2
+        assert snapshots.interval == 1.5
+        assert state.governor.rate == 5.0
+        assert state.config.port == 9000
+        assert state.config_watcher.reload() == []
+
+
+# Test çalıştırma
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,263 @@
+"""
+Critical Watcher Tests
+Olay tabanlı kritik servis izleme (--watch-critical) testleri.
+"""
+
+import pytest
+import queue
+import sys
+import os
+import threading
+import time
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adapters.linux_adapter import JournalUnitFollower, LinuxAdapter
+from core.alert_manager import AlertManager, AlertType
+from core.critical_watcher import CriticalWatcher
+from core.service_monitor import ServiceMonitor, ServiceStatus
+
+
+class FakeFollower:
+    """Kuyruktan beslenen journal olay kaynağı"""
+
+    def __init__(self):
+        self.items = queue.Queue()
+        self.closed = False
+
+    def __iter__(self):
+        while True:
+            item = self.items.get()
+            if item is None:
+                return
+            yield item
+
+    def close(self):
+        self.closed = True
+        self.items.put(None)
+
+
+class FakeAdapter:
+    """Toplu durum sorgusu ve olay kaynağı olan adaptör"""
+
+    def __init__(self, states, events=True):
+        self.states = dict(states)
+        self.queries = []
+        self.follower = FakeFollower()
+        if not events:
+            self.follow_unit_events = None
+
+    def get_units_state(self, names):
+        self.queries.append(list(names))
+        return {name: self.states[name] for name in names if name in self.states}
+
+    def follow_unit_events(self, names):
+        return self.follower
+
+
+def make_watcher(states, events=True, **kwargs):
+    adapter = FakeAdapter(states, events)
+    monitor = ServiceMonitor(custom_critical_services=["sshd", "nginx", "mysql"], adapter=adapter)
+    manager = AlertManager()
+    watcher = CriticalWatcher(monitor, alert_manager=manager, **kwargs)
+    return watcher, adapter, manager
+
+
+def run_in_thread(watcher):
+    thread = threading.Thread(target=watcher.run, daemon=True)
+    thread.start()
+    return thread
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class TestTransitions:
+    """Durum değişikliği testleri"""
+
+    def test_initial_poll_reports_only_down_services(self):
+        watcher, _, manager = make_watcher({"sshd": ServiceStatus.RUNNING, "nginx": ServiceStatus.FAILED})
+        transitions = watcher.poll()
+
+        assert [(t.name, t.previous, t.current) for t in transitions] == [
+            ("nginx", None, ServiceStatus.FAILED)
+        ]
+        assert manager.alerts[0].type == AlertType.CRITICAL_SERVICE_DOWN
+        # İlk durum bir değişiklik değildir; gecikme kaydedilmez
+        assert watcher.get_latency_report()["poll"]["count"] == 0
+
+    def test_missing_unit_is_not_down(self):
+        watcher, _, manager = make_watcher({"sshd": ServiceStatus.RUNNING})
+        watcher.poll()
+
+        assert "mysql" not in watcher.states
+        assert manager.alerts == []
+
+    def test_transitional_unknown_is_ignored(self):
+        watcher, adapter, _ = make_watcher({"sshd": ServiceStatus.RUNNING})
+        watcher.poll()
+        adapter.states["sshd"] = ServiceStatus.UNKNOWN
+
+        assert watcher.handle_event("sshd", time.time()) == []
+        assert watcher.states["sshd"] == ServiceStatus.RUNNING
+
+    def test_event_queries_only_that_unit(self):
+        watcher, adapter, manager = make_watcher({"sshd": ServiceStatus.RUNNING})
+        watcher.poll()
+        adapter.states["sshd"] = ServiceStatus.STOPPED
+        transitions = watcher.handle_event("sshd", time.time() - 0.05)
+
+        assert adapter.queries[-1] == ["sshd"]
+        assert transitions[0].source == "event"
+        assert 0.05 <= transitions[0].latency < 1.0
+        assert len(manager.get_active_alerts()) == 1
+
+    def test_event_burst_coalesced_per_unit(self):
+        watcher, adapter, _ = make_watcher({"sshd": ServiceStatus.RUNNING, "nginx": ServiceStatus.RUNNING})
+        watcher.poll()
+        adapter.states["sshd"] = ServiceStatus.STOPPED
+        now = time.time()
+        for i in range(100):
+            watcher._events.put(("sshd" if i % 2 else "nginx", now + i))
+        watcher._events.put(("cron", now))
+
+        batch = watcher._drain(("sshd", now - 1))
+        assert batch == {"sshd": now - 1, "nginx": now, "cron": now}
+        assert watcher._events.empty() and watcher.events == 102
+
+        transitions = watcher.handle_events(batch)
+        assert adapter.queries[-1] == ["sshd", "nginx"]
+        assert [(t.name, t.current) for t in transitions] == [("sshd", ServiceStatus.STOPPED)]
+
+    def test_event_for_other_unit_is_ignored(self):
+        watcher, adapter, _ = make_watcher({"sshd": ServiceStatus.RUNNING})
+        watcher.handle_event("cron", time.time())
+
+        assert adapter.queries == []
+
+
+class TestWatchLoop:
+    """Olay/sorgu döngüsü testleri"""
+
+    def test_event_detected_within_milliseconds(self):
+        watcher, adapter, _ = make_watcher({"sshd": ServiceStatus.RUNNING}, min_interval=30.0)
+        seen = []
+        watcher.add_callback(seen.append)
+        thread = run_in_thread(watcher)
+        try:
+            assert wait_for(lambda: watcher.polls == 1)
+            adapter.states["sshd"] = ServiceStatus.FAILED
+            adapter.follower.items.put(("sshd", time.time()))
+
+            # Sorgu aralığı 30 sn; değişikliği yalnızca olay yakalayabilir
+            assert wait_for(lambda: seen)
+            assert seen[0].source == "event"
+            assert seen[0].latency < 0.5
+        finally:
+            watcher.stop()
+            thread.join(timeout=2)
+
+        assert adapter.follower.closed
+        assert watcher.get_latency_report()["event"]["count"] == 1
+
+    def test_polling_fallback_without_events(self):
+        watcher, adapter, _ = make_watcher({"sshd": ServiceStatus.RUNNING}, events=False,
+                                           min_interval=0.01, poll_max_interval=0.02)
+        seen = []
+        watcher.add_callback(seen.append)
+        thread = run_in_thread(watcher)
+        try:
+            assert wait_for(lambda: watcher.polls >= 3)
+            adapter.states["sshd"] = ServiceStatus.STOPPED
+            assert wait_for(lambda: seen)
+        finally:
+            watcher.stop()
+            thread.join(timeout=2)
+
+        assert not watcher.events_active
+        assert seen[0].source == "poll"
+        assert watcher.interval <= 0.02
+
+    def test_follower_exit_falls_back_to_polling(self):
+        watcher, adapter, _ = make_watcher({"sshd": ServiceStatus.RUNNING}, min_interval=0.01)
+        thread = run_in_thread(watcher)
+        try:
+            assert wait_for(lambda: watcher.events_active)
+            adapter.follower.items.put(None)
+            assert wait_for(lambda: not watcher.events_active)
+        finally:
+            watcher.stop()
+            thread.join(timeout=2)
+
+
+class TestBackoff:
+    """Uyarlanır sorgu aralığı testleri"""
+
+    def test_idle_backoff_and_reset(self):
+        watcher, _, _ = make_watcher({}, min_interval=1.0, max_interval=8.0, poll_max_interval=4.0)
+        watcher.events_active = True
+        for _ in range(5):
+            watcher._adapt(False)
+        assert watcher.interval == 8.0
+
+        watcher._adapt(True)
+        assert watcher.interval == 1.0
+
+    def test_backoff_capped_without_events(self):
+        watcher, _, _ = make_watcher({}, min_interval=1.0, max_interval=60.0, poll_max_interval=4.0)
+        for _ in range(10):
+            watcher._adapt(False)
+
+        assert watcher.interval == 4.0
+
+
+class TestLatencyReport:
+    """Gecikme raporu testleri"""
+
+    def test_percentiles(self):
+        watcher, _, _ = make_watcher({})
+        watcher.latencies["event"].extend(i / 1000 for i in range(1, 101))
+        report = watcher.get_latency_report()
+
+        assert report["event"]["count"] == 100
+        assert report["event"]["p50_ms"] == 51.0
+        assert report["event"]["p99_ms"] == 100.0
+        assert report["event"]["max_ms"] == 100.0
+        assert report["poll"] == {"count": 0, "p50_ms": 0.0, "p90_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+
+
+class TestLinuxUnitEvents:
+    """systemd birim olayları için Linux adaptörü testleri"""
+
+    def test_follower_command(self):
+        command = JournalUnitFollower(["sshd", "docker.socket"]).command()
+
+        assert command[:3] == ["journalctl", "--no-pager", "-f"]
+        assert "UNIT=sshd.service" in command and "UNIT=docker.socket" in command
+        # Servislerin kendi log satırları değil, yalnızca systemd durum mesajları
+        assert "_PID=1" in command
+        assert not any(arg.startswith("_SYSTEMD_UNIT=") or arg == "+" for arg in command)
+
+    def test_units_state_parsing(self, monkeypatch):
+        adapter = LinuxAdapter()
+        stdout = ("Id=sshd.service\nLoadState=loaded\nActiveState=active\n\n"
+                  "Id=nginx.service\nLoadState=loaded\nActiveState=failed\n\n"
+                  "Id=mysql.service\nLoadState=not-found\nActiveState=inactive\n")
+        monkeypatch.setattr(adapter, "_run_command", lambda cmd, timeout=30: (stdout, "", 0))
+
+        assert adapter.get_units_state(["sshd", "nginx", "mysql"]) == {
+            "sshd": ServiceStatus.RUNNING,
+            "nginx": ServiceStatus.FAILED
+        }
+
+
+# Test çalıştırma
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,110 @@
+"""
+Encoding Tests
+Önbellekli parça kodlama ve JSON/MessagePack belge birleştirme testleri.
+"""
+
+import pytest
+import json
+import sys
+import os
+from datetime import datetime
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import encoding
+from core.alert_manager import AlertManager, AlertSeverity, AlertType
+from core.encoding import (
+    MSGPACK, MSGPACK_AVAILABLE, Fragments,
+    encode_document, encode_item, encode_items, iter_document, loads
+)
+from core.log_collector import LogEntry, LogLevel
+from core.log_parser import LogParser
+
+
+def make_logs(count):
+    return [LogEntry(datetime(2024, 1, 15, 10, 0, i % 60), LogLevel.ERROR, f"failed {i} ü",
+                     source="web-1", service="nginx") for i in range(count)]
+
+
+class TestItemCache:
+    """Nesne üzerindeki kodlama önbelleği testleri"""
+
+    def test_encoded_once(self):
+        log = make_logs(1)[0]
+        first = encode_item(log)
+
+        assert encode_item(log) is first
+        assert json.loads(first) == log.to_dict()
+
+    def test_template_assignment_reencodes(self):
+        parser = LogParser()
+        log = make_logs(1)[0]
+        parser.encode([log])
+        log.template_id = 7
+
+        assert json.loads(parser.encode([log]).items[0])["template_id"] == 7
+
+    def test_alert_version_invalidates(self):
+        manager = AlertManager()
+        alert = manager.create_alert(AlertType.CUSTOM, AlertSeverity.LOW, "t", "m")
+        before = encode_items([alert], version=lambda a: a.version).items[0]
+        manager.resolve_alert(alert.id)
+        after = encode_items([alert], version=lambda a: a.version).items[0]
+
+        assert json.loads(before)["resolved"] is False
+        assert json.loads(after)["resolved"] is True
+
+    def test_cache_not_part_of_equality(self):
+        a, b = make_logs(1)[0], make_logs(1)[0]
+        encode_item(a)
+
+        assert a == b
+        assert "_encoded" not in repr(a)
+
+
+class TestDocument:
+    """Belge birleştirme testleri"""
+
+    def test_matches_plain_json(self):
+        logs = make_logs(1300)
+        body = encode_document({
+            "logs": LogParser().encode(logs),
+            "count": len(logs),
+            "statistics": {"total": 1300}
+        })
+
+        assert json.loads(body) == {
+            "logs": [log.to_dict() for log in logs],
+            "count": 1300,
+            "statistics": {"total": 1300}
+        }
+
+    def test_streams_in_chunks(self):
+        chunks = list(iter_document({"logs": LogParser().encode(make_logs(1300))}))
+
+        assert len(chunks) > 3
+        assert max(len(c) for c in chunks) < len(b"".join(chunks))
+
+    def test_empty_values(self):
+        assert json.loads(encode_document({})) == {}
+        assert json.loads(encode_document({"logs": Fragments([]), "n": 0})) == {"logs": [], "n": 0}
+
+    def test_stdlib_fallback(self, monkeypatch):
+        monkeypatch.setattr(encoding, "ORJSON_AVAILABLE", False)
+        log = make_logs(1)[0]
+        body = encode_document({"logs": encode_items([log]), "ok": True})
+
+        assert json.loads(body) == {"logs": [log.to_dict()], "ok": True}
+
+    @pytest.mark.skipif(not MSGPACK_AVAILABLE, reason="msgpack kurulu değil")
+    def test_msgpack_document(self):
+        logs = make_logs(20)
+        body = encode_document({"logs": LogParser().encode(logs, MSGPACK), "count": len(logs)}, MSGPACK)
+
+        assert loads(body, MSGPACK) == {"logs": [log.to_dict() for log in logs], "count": len(logs)}
+
+
+# Test çalıştırma
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,105 @@
+"""
+Ingest Governor Tests
+Token kovası, rezervuar örnekleme ve ağırlıklı (sapmasız) sayım testleri.
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.anomaly_detector import RateAnomalyDetector
+from core.ingest_governor import IngestGovernor, TokenBucket
+from core.log_collector import LogEntry, LogLevel
+from core.log_parser import LogParser
+
+START = datetime(2024, 1, 15, 10, 0)
+
+
+def storm(count, service="noisy", per_second=10000, levels=(LogLevel.INFO,)):
+    """Saniyede per_second kayıt üreten servis"""
+    return [LogEntry(START + timedelta(seconds=i / per_second), levels[i % len(levels)],
+                     f"request {i}", service=service) for i in range(count)]
+
+
+class TestTokenBucket:
+    """Token kovası testleri"""
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=10, burst=5)
+
+        assert sum(bucket.take(0.0) for _ in range(10)) == 5
+        assert sum(bucket.take(1.0) for _ in range(20)) == 5
+        assert not bucket.take(0.5)
+
+
+class TestGovernor:
+    """Örnekleme ve sayım testleri"""
+
+    def test_quiet_services_untouched(self):
+        governor = IngestGovernor(rate=50, burst=100)
+        logs = storm(200, per_second=20)
+
+        assert governor.admit(logs) is logs
+        assert all(log.sample_weight == 1 for log in logs)
+
+    def test_errors_never_dropped(self):
+        governor = IngestGovernor(rate=1, burst=1, reservoir_size=10, seed=1)
+        logs = storm(20000, levels=(LogLevel.INFO, LogLevel.DEBUG, LogLevel.ERROR, LogLevel.CRITICAL))
+        kept = governor.admit(logs)
+
+        severe = [log for log in kept if log.level.value <= LogLevel.ERROR.value]
+        assert len(severe) == 10000
+        assert all(log.sample_weight == 1 for log in severe)
+        assert len(kept) < 10100
+
+    def test_only_info_and_debug_sampled(self):
+        governor = IngestGovernor(rate=1, burst=1, reservoir_size=10, seed=4)
+        logs = storm(8000, levels=(LogLevel.WARNING, LogLevel.NOTICE, LogLevel.INFO, LogLevel.DEBUG))
+        kept = governor.admit(logs)
+
+        assert sum(log.level in (LogLevel.WARNING, LogLevel.NOTICE) for log in kept) == 4000
+        assert {log.level for log in kept if log.sample_weight > 1} == {LogLevel.INFO, LogLevel.DEBUG}
+
+    def test_weights_preserve_counts(self):
+        governor = IngestGovernor(rate=10, burst=10, reservoir_size=25, seed=2)
+        logs = storm(12345, levels=(LogLevel.INFO, LogLevel.INFO, LogLevel.DEBUG)) + \
+            storm(300, service="quiet", per_second=5)
+        expected = LogParser().get_statistics(logs)
+        kept = governor.admit(logs)
+        stats = LogParser().get_statistics(kept)
+
+        assert stats["total"] == expected["total"]
+        assert stats["by_level"] == expected["by_level"]
+        assert stats["by_service"] == expected["by_service"]
+        positions = {id(log): index for index, log in enumerate(logs)}
+        order = [positions[id(log)] for log in kept]
+        assert order == sorted(order)
+        assert governor.get_stats()["top_sampled"][0]["service"] == "noisy"
+
+    def test_bounded_state(self):
+        governor = IngestGovernor(rate=1, burst=1, reservoir_size=5, max_services=3)
+        for index in range(10):
+            governor.admit(storm(100, service=f"s{index}"))
+
+        stats = governor.get_stats()
+        assert stats["services"] == 3
+        assert stats["kept"] == 10 * (1 + 5)
+        assert stats["seen"] == stats["kept"] + stats["dropped"]
+
+    def test_weighted_downstream_counts(self):
+        governor = IngestGovernor(rate=1, burst=1, reservoir_size=4,
+                                  protect_level=LogLevel.ERROR, seed=3)
+        detector = RateAnomalyDetector(interval=60)
+        detector.add_entries(governor.admit(storm(1000, levels=(LogLevel.WARNING,))))
+
+        assert detector.get_series()[0]["count"] == 1000
+        assert any(log.to_dict().get("sample_weight", 1) > 1 for log in governor.admit(storm(1000)))
+
+
+# Test çalıştırma
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
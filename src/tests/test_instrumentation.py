@@ -0,0 +1,169 @@
+"""
+Instrumentation Tests
+Sıcak yol histogramları, ölçülen kilitler ve örnekleyici profiler testleri.
+"""
+
+import pytest
+import random
+import sys
+import os
+import threading
+import time
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.instrumentation import Histogram, Instrumentation, InstrumentedLock, SamplingProfiler
+
+
+class TestHistogram:
+    """HDR tarzı histogram testleri"""
+
+    def test_small_values_exact(self):
+        histogram = Histogram()
+        for value in range(1, 101):
+            histogram.record(value)
+
+        assert histogram.percentile(50) == 50
+        assert histogram.percentile(100) == 100
+        assert histogram.to_dict()["count"] == 100
+
+    def test_relative_error_bounded(self):
+        rng = random.Random(7)
+        values = sorted(int(rng.lognormvariate(8, 2)) for _ in range(20000))
+        histogram = Histogram()
+        for value in values:
+            histogram.record(value)
+
+        for percent in (50, 90, 99, 99.9):
+            exact = values[int(percent / 100 * len(values) + 0.5) - 1]
+            assert histogram.percentile(percent) == pytest.approx(exact, rel=0.01, abs=1)
+        assert histogram.max == values[-1]
+
+    def test_merge(self):
+        a, b = Histogram(), Histogram()
+        a.record(10, count=3)
+        b.record(100_000)
+        a.merge(b)
+
+        assert a.count == 4
+        assert a.min == 10
+        assert a.percentile(100) == 100_000
+
+
+class TestDisabled:
+    """Ölçüm kapalıyken davranış testleri"""
+
+    def test_wrap_and_lock_are_passthrough(self):
+        registry = Instrumentation()
+
+        def parse(line):
+            return line
+
+        assert registry.wrap("parse.x", parse) is parse
+        assert not isinstance(registry.lock("x"), InstrumentedLock)
+
+    def test_nothing_recorded(self):
+        registry = Instrumentation()
+        with registry.timer("t"):
+            pass
+        registry.record("r", 1.0)
+        registry.cache("c", True)
+        registry.command(["journalctl"], 0.1, 0)
+
+        report = registry.get_report()
+        assert report["histograms"] == {} and report["counters"] == {} and report["caches"] == {}
+
+
+class TestEnabled:
+    """Ölçüm açıkken kayıt testleri"""
+
+    def test_timer_wrap_and_call(self):
+        registry = Instrumentation(enabled=True)
+        with registry.timer("block"):
+            time.sleep(0.002)
+        registry.wrap("parse.line", str.upper)("a")
+
+        def on_logs(entries):
+            return len(entries)
+
+        assert registry.call("callback.log", on_logs, [1, 2]) == 2
+
+        histograms = registry.get_report()["histograms"]
+        assert histograms["block"]["min_ms"] >= 2.0
+        assert histograms["parse.line"]["count"] == 1
+        assert "callback.log.TestEnabled.test_timer_wrap_and_call.on_logs" in histograms
+
+    def test_command_and_cache_counters(self):
+        registry = Instrumentation(enabled=True)
+        registry.command(["/usr/bin/systemctl", "show"], 0.01, 0)
+        registry.command(["systemctl", "show"], 0.02, 1)
+        for hit in (True, True, True, False):
+            registry.cache("snapshot", hit)
+
+        report = registry.get_report()
+        assert report["histograms"]["subprocess.systemctl"]["count"] == 2
+        assert report["counters"]["subprocess.systemctl.exit.1"] == 1
+        assert report["caches"]["snapshot"] == {"hits": 3, "misses": 1, "hit_rate": 0.75}
+
+    def test_instrumented_lock(self):
+        registry = Instrumentation(enabled=True)
+        lock = registry.lock("shared")
+        holding = threading.Event()
+
+        def hold():
+            with lock:
+                holding.set()
+                time.sleep(0.02)
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        holding.wait()
+        with lock:
+            pass
+        thread.join()
+
+        histograms = registry.get_report()["histograms"]
+        assert histograms["lock.shared.hold"]["count"] == 2
+        assert histograms["lock.shared.hold"]["max_ms"] >= 20.0
+        assert histograms["lock.shared.wait"]["max_ms"] > 5.0
+
+
+class TestSamplingProfiler:
+    """Örnekleyici profiler testleri"""
+
+    def test_collapsed_stacks(self):
+        stop = threading.Event()
+
+        def busy_worker():
+            while not stop.is_set():
+                sum(range(1000))
+
+        worker = threading.Thread(target=busy_worker, name="busy")
+        worker.start()
+        profiler = SamplingProfiler(interval=0.001)
+        try:
+            for _ in range(20):
+                profiler.sample()
+        finally:
+            stop.set()
+            worker.join()
+
+        lines = profiler.collapsed().splitlines()
+        assert profiler.samples == 20
+        assert any(line.startswith("busy;") and "busy_worker" in line for line in lines)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    def test_start_stop(self):
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+        time.sleep(0.05)
+        profiler.stop()
+
+        assert not profiler.running
+        assert profiler.samples > 0
+
+
+# Test çalıştırma
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
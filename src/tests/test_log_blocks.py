@@ -0,0 +1,174 @@
+"""
+Log Blocks Tests
+Sıkıştırılmış blok deposu: kayıpsız geri okuma, sözlükler ve saklama süresi testleri.
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.log_blocks import BlockLogStore, decode_columns, encode_columns, train_dictionary
+from core.log_collector import LogEntry, LogLevel
+from core.log_query import compile_query, execute
+from core.log_store import LogBatch, LogStore
+
+START = datetime(2024, 1, 15, 10, 0)
+MESSAGES = {
+    "sshd": "Failed password for invalid user admin from 192.168.1.{n} port {p} ssh2",
+    "nginx": "upstream timed out (110: Connection timed out) while reading upstream, client: 10.0.0.{n}",
+    "cron": "(root) CMD (run-parts /etc/cron.hourly)",
+}
+LEVELS = (LogLevel.INFO, LogLevel.INFO, LogLevel.WARNING, LogLevel.ERROR)
+
+
+def make_logs(count, step=1.0, start=START):
+    services = list(MESSAGES)
+    return [LogEntry(
+        timestamp=start + timedelta(seconds=i * step, microseconds=i % 7),
+        level=LEVELS[i % len(LEVELS)],
+        message=MESSAGES[services[i % 3]].format(n=i % 200, p=40000 + i),
+        source=f"web-{i % 2}",
+        service=services[i % 3]
+    ) for i in range(count)]
+
+
+def rows(entries):
+    return [(log.timestamp, log.level, log.service, log.source, log.message) for log in entries]
+
+
+class TestEncoding:
+    """Sütun kodlama ve sözlük testleri"""
+
+    def test_columns_round_trip(self):
+        batch = LogBatch.from_entries(make_logs(50))
+        batch.message[3] = "ünicode ✓ \n çok satırlı"
+        decoded = decode_columns(encode_columns(batch), "sshd")
+
+        assert decoded.ts == batch.ts
+        assert decoded.level == batch.level
+        assert decoded.source == batch.source
+        assert decoded.message == batch.message
+        assert decoded.weight == batch.weight
+
+    def test_dictionary_keeps_one_sample_per_shape(self):
+        messages = [f"session {i} opened" for i in range(100)] + ["disk full"]
+        dictionary = train_dictionary(messages, size=64)
+
+        assert dictionary.endswith(b"session 0 opened")
+        assert dictionary.count(b"session") == 1
+        assert len(train_dictionary(messages * 10, size=8)) <= 8
+
+
+class TestBlockLogStore:
+    """Blok deposu testleri"""
+
+    @pytest.fixture
+    def logs(self):
+        return make_logs(3000)
+
+    @pytest.fixture
+    def stores(self, logs):
+        blocks = BlockLogStore(block_size=256)
+        blocks.add_entries(logs[:1700])
+        blocks.add_entries(logs[1700:])
+        plain = LogStore()
+        plain.merge([LogBatch.from_entries(logs)])
+        return blocks, plain
+
+    def test_transparent_reads_match_log_store(self, stores):
+        blocks, plain = stores
+        window = {"since": START + timedelta(minutes=5), "until": START + timedelta(minutes=20)}
+
+        assert rows(blocks.iter_logs(limit=0)) == rows(plain.iter_logs(limit=0))
+        assert rows(blocks.query(limit=50)) == rows(plain.query(limit=50))
+        assert rows(blocks.query(limit=5, level=LogLevel.ERROR, service="nginx")) == \
+            rows(plain.query(limit=5, level=LogLevel.ERROR, service="nginx"))
+        assert rows(blocks.iter_logs(limit=0, **window)) == rows(plain.iter_logs(limit=0, **window))
+        assert blocks.time_range() == plain.time_range()
+        assert blocks.get_statistics()["by_level"] == plain.get_statistics()["by_level"]
+
+    def test_compresses_with_service_dictionaries(self, stores):
+        blocks, _ = stores
+        compression = blocks.get_statistics()["compression"]
+
+        assert compression["blocks"] == 3 * (1000 // 256)
+        assert compression["open_entries"] == 3000 - compression["compressed_entries"]
+        assert compression["dictionaries"] == 3
+        assert compression["ratio"] > 4
+
+    def test_query_decodes_only_newest_blocks(self, stores):
+        blocks, _ = stores
+        blocks.flush()
+        blocks.query(limit=10)
+
+        assert blocks.get_statistics()["compression"]["cache_misses"] == 3
+
+    def test_late_entries_keep_order(self):
+        store = BlockLogStore(block_size=10)
+        logs = make_logs(60)
+        store.add_entries(logs[30:])
+        store.add_entries(logs[:30])
+        store.flush()
+
+        assert rows(store.iter_logs(limit=0)) == rows(logs)
+
+    def test_idle_service_sealed_after_block_age(self):
+        store = BlockLogStore(block_size=1000, block_age=60)
+        store.add_entries(make_logs(3, step=10))
+        assert store.get_statistics()["compression"]["blocks"] == 0
+
+        # sshd tamponu yeni kayıtla birlikte, diğer iki servis tek başına kapanır
+        store.add_entries(make_logs(1, start=START + timedelta(minutes=5)))
+        assert store.get_statistics()["compression"]["blocks"] == 3
+        assert store.get_statistics()["compression"]["open_entries"] == 0
+
+    def test_sample_weights_kept(self):
+        """Ingest governor ağırlıkları bloklardan geri okunur"""
+        logs = make_logs(40)
+        for i, log in enumerate(logs):
+            log.sample_weight = 1 + i % 5
+        store = BlockLogStore(block_size=8)
+        store.add_entries(logs)
+
+        assert [log.sample_weight for log in store.iter_logs(limit=0)] == [log.sample_weight for log in logs]
+        assert [log.sample_weight for log in store.query(limit=3)] == [log.sample_weight for log in logs[-3:]]
+
+    def test_cache_keyed_by_block_sequence(self):
+        """Atılan bloğun önbellek kaydı yeni bir bloğa karışmaz"""
+        store = BlockLogStore(block_size=10, block_age=3600, retention_days=1, cache_blocks=100)
+        store.add_entries(make_logs(30, step=60))
+        store.flush()
+        list(store.iter_logs(limit=0))
+        expired = set(store._cache)
+        later = make_logs(30, step=60, start=START + timedelta(days=5))
+        store.add_entries(later)
+        store.flush()
+
+        assert not expired & set(store._cache)
+        assert rows(store.iter_logs(limit=0)) == rows(later)
+        assert len(set(store._cache)) == len(store._cache)
+
+    def test_retention_relative_to_newest_entry(self):
+        store = BlockLogStore(block_size=10, block_age=3600, retention_days=7)
+        store.add_entries(make_logs(30, step=3600))
+        store.add_entries(make_logs(30, step=3600, start=START + timedelta(days=10)))
+        statistics = store.get_statistics()
+
+        assert statistics["compression"]["expired"] == 30
+        assert statistics["total"] == 30
+        assert store.time_range()[0] >= START + timedelta(days=3)
+
+    def test_query_language_source(self, stores):
+        blocks, _ = stores
+        outcome = execute(compile_query("level>=error service:sshd | count"), blocks.iter_logs, scan_limit=0)
+
+        assert outcome["result"] == 250
+
+
+# Test çalıştırma
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,155 @@
+"""
+Log Cursor Tests
+İmleç checkpoint'i ve artımlı log toplama testleri.
+"""
+
+import json
+import pytest
+import sys
+import os
+from datetime import datetime
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.log_cursor import CursorCheckpoint
+from core.log_collector import LogCollector, LogEntry, LogLevel
+from core.log_parser import LogParser
+from core.alert_manager import AlertManager
+from core.service_monitor import ServiceMonitor
+from core.snapshot import SnapshotManager
+
+
+class JournalAdapter:
+    """--after-cursor davranışını taklit eden adaptör (imleç = kayıt indeksi)"""
+
+    def __init__(self, logs=None):
+        self.logs = logs or []
+        self.calls = []
+
+    def read_new_logs(self, after_cursor=None, limit=1000):
+        self.calls.append(after_cursor)
+        start = int(after_cursor) + 1 if after_cursor else max(len(self.logs) - limit, 0)
+        batch = self.logs[start:start + limit]
+        return batch, str(start + len(batch) - 1) if batch else after_cursor
+
+    async def read_new_logs_async(self, after_cursor=None, limit=1000):
+        return self.read_new_logs(after_cursor, limit)
+
+    async def get_services_async(self):
+        return []
+
+
+def error(i):
+    return LogEntry(datetime(2024, 1, 15, 10, 0, i), LogLevel.ERROR, f"failed {i}", service="app")
+
+
+class TestCursorCheckpoint:
+    """Checkpoint dosyası testleri"""
+
+    def test_interval_and_flush(self, tmp_path):
+        path = tmp_path / "state" / "cursor.json"
+        checkpoint = CursorCheckpoint(str(path), interval=60)
+
+        checkpoint.update("c1")
+        checkpoint.update("c2")
+
+        # İlk güncelleme hemen yazılır, sonrakiler aralık dolana kadar bekler
+        assert json.loads(path.read_text())["cursor"] == "c1"
+        checkpoint.flush()
+        assert json.loads(path.read_text())["cursor"] == "c2"
+        assert checkpoint.writes == 2
+        assert not (tmp_path / "state" / "cursor.json.tmp").exists()
+
+    def test_corrupt_file_is_ignored(self, tmp_path):
+        path = tmp_path / "cursor.json"
+        path.write_text("{not json")
+
+        assert CursorCheckpoint(str(path)).load() is None
+
+
+class TestIncrementalCollection:
+    """LogCollector.collect_new testleri"""
+
+    def test_reads_only_new_entries(self, tmp_path):
+        adapter = JournalAdapter([error(i) for i in range(3)])
+        collector = LogCollector(adapter=adapter, cursor_file=str(tmp_path / "c.json"))
+
+        first = collector.collect_new()
+        adapter.logs.append(error(3))
+        second = collector.collect_new()
+        third = collector.collect_new()
+
+        assert [e.message for e in first] == ["failed 0", "failed 1", "failed 2"]
+        assert [e.message for e in second] == ["failed 3"]
+        assert third == []
+        assert adapter.calls == [None, "2", "3"]
+
+    def test_restart_resumes_from_checkpoint(self, tmp_path):
+        path = str(tmp_path / "c.json")
+        adapter = JournalAdapter([error(i) for i in range(3)])
+        collector = LogCollector(adapter=adapter, cursor_file=path, cursor_interval=60)
+        collector.collect_new()
+        collector.save_cursor()
+
+        adapter.logs.extend([error(3), error(4)])
+        restarted = LogCollector(adapter=adapter, cursor_file=path)
+
+        assert [e.message for e in restarted.collect_new()] == ["failed 3", "failed 4"]
+
+    def test_fallback_without_cursor_support(self):
+        class WindowAdapter:
+            logs = [error(0), error(1)]
+
+            def get_logs(self, limit=100, **kwargs):
+                return self.logs[-limit:]
+
+        adapter = WindowAdapter()
+        collector = LogCollector(adapter=adapter)
+
+        assert len(collector.collect_new()) == 2
+        adapter.logs = adapter.logs + [error(2)]
+        assert [e.message for e in collector.collect_new()] == ["failed 2"]
+
+
+class TestSnapshotRestart:
+    """Yeniden başlatmada hata oranı sayaçları testleri"""
+
+    def make_manager(self, adapter, path):
+        return SnapshotManager(
+            ServiceMonitor(adapter=adapter),
+            LogCollector(adapter=adapter, cursor_file=path),
+            LogParser(),
+            AlertManager(error_threshold=5),
+            log_limit=10
+        )
+
+    def test_restart_does_not_double_count(self, tmp_path):
+        path = str(tmp_path / "c.json")
+        adapter = JournalAdapter([error(i) for i in range(4)])
+        manager = self.make_manager(adapter, path)
+        manager.refresh()
+        manager.stop()
+
+        adapter.logs.append(error(4))
+        restarted = self.make_manager(adapter, path)
+        snapshot = restarted.refresh()
+
+        # Yalnızca yeni kayıt sayılır; eşik (5) eski kayıtlarla tekrar aşılmaz
+        assert snapshot.log_totals == {"ERROR": 1}
+        assert restarted.alert_manager.get_active_alerts() == []
+
+    def test_window_keeps_last_entries(self):
+        adapter = JournalAdapter([error(i) for i in range(8)])
+        manager = self.make_manager(adapter, None)
+        manager.refresh()
+        adapter.logs.extend(error(i) for i in range(8, 14))
+        snapshot = manager.refresh()
+
+        assert [e.message for e in snapshot.logs] == [f"failed {i}" for i in range(4, 14)]
+        assert snapshot.log_totals == {"ERROR": 14}
+
+
+# Test çalıştırma
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
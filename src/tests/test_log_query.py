@@ -0,0 +1,177 @@
+"""
+Log Query Tests
+Sorgu dili ayrıştırma, filtre itme (pushdown) ve akış boru hattı testleri.
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.log_collector import LogEntry, LogLevel
+from core.log_query import QueryError, compile_query, execute, run_stages
+from core.log_store import LogBatch, LogStore
+
+NOW = datetime(2024, 1, 15, 12, 0)
+
+
+def make_logs():
+    return [
+        LogEntry(NOW - timedelta(hours=3), LogLevel.ERROR, "upstream timeout", service="nginx"),
+        LogEntry(NOW - timedelta(minutes=30), LogLevel.WARNING, "upstream Timeout", service="nginx"),
+        LogEntry(NOW - timedelta(minutes=20), LogLevel.INFO, "request timeout", service="nginx"),
+        LogEntry(NOW - timedelta(minutes=10), LogLevel.ERROR, "auth failed", service="sshd", source="web-2"),
+        LogEntry(NOW - timedelta(minutes=5), LogLevel.ERROR, "timeout reading", service="php-fpm"),
+    ]
+
+
+class FakeSource:
+    """Kaynağa itilen filtreleri kaydeden ve uygulayan sahte kaynak"""
+
+    def __init__(self, logs):
+        self.logs = logs
+        self.calls = []
+
+    def iter_logs(self, limit=100, level=None, service=None, since=None, until=None):
+        self.calls.append({"limit": limit, "level": level, "service": service, "since": since})
+        matching = [log for log in self.logs
+                    if (level is None or log.level.value <= level.value)
+                    and (service is None or log.service == service)
+                    and (since is None or log.timestamp >= since)]
+        return iter(matching[-limit:] if limit else matching)
+
+
+class TestParsing:
+    """Ayrıştırma ve plan testleri"""
+
+    def test_pushdown_and_residual(self):
+        plan = compile_query('level>=warning service:nginx AND msg~"timeout" since:-1h | count by service')
+        explain = plan.explain()
+
+        assert set(explain["pushdown"]) == {"level", "service", "since"}
+        assert explain["residual"] == 'message~"timeout"'
+        assert explain["stages"] == ["count by service"]
+        assert plan.aggregate and not plan.exact
+
+    def test_or_is_not_pushed(self):
+        plan = compile_query("service:nginx OR service:sshd")
+
+        assert plan.pushdown == {}
+        assert "OR" in plan.explain()["residual"]
+
+    def test_pure_pushdown_is_exact(self):
+        plan = compile_query("level>=error service:nginx")
+
+        assert plan.exact
+        assert plan.source_filters(NOW) == {"level": LogLevel.ERROR, "service": "nginx"}
+
+    def test_cached(self):
+        assert compile_query("level>=error") is compile_query("level>=error")
+
+    @pytest.mark.parametrize("text", [
+        "level>=loud", "colour:red", "msg~\"(\"", "since:yesterday",
+        "(service:a", "| count by colour", "| count | head 3", "template:abc"
+    ])
+    def test_invalid(self, text):
+        with pytest.raises(QueryError):
+            compile_query(text)
+
+
+class TestJournalPrefilter:
+    """Kalan koşulların journal alan eşleşmelerine çevrilmesi testleri"""
+
+    def test_or_and_product(self):
+        plan = compile_query('(service:nginx OR service:sshd) host:web-1 msg:"time out" level<=info')
+
+        assert plan.journal["grep"] == r"time\ out"
+        assert len(plan.journal["matches"]) == 4
+        assert {"SYSLOG_IDENTIFIER": ["sshd"], "_HOSTNAME": ["web-1"]} in plan.journal["matches"]
+        assert {"_SYSTEMD_UNIT": ["nginx.service"], "_HOSTNAME": ["web-1"]} in plan.journal["matches"]
+        assert "level" in plan.explain()["residual"]
+
+    def test_untranslatable_terms(self):
+        assert compile_query("NOT service:nginx").journal == {}
+        assert compile_query("service:ng* OR host:a").journal == {}
+        # Çelişen VE terimleri: ilk terim geçerli bir ön filtre olarak kalır
+        assert compile_query("host:a host:b").journal == {"matches": [{"_HOSTNAME": ["a"]}]}
+
+    def test_source_reads_until_limit(self):
+        calls = []
+
+        def fetch(limit=100, predicate=None, max_scan=0, **filters):
+            calls.append(dict(filters, limit=limit, max_scan=max_scan))
+            return iter([log for log in make_logs() if predicate(log)][-limit:])
+
+        outcome = execute(compile_query("timeout host:web-1 OR service:nginx"), fetch,
+                          limit=2, scan_limit=300, field_matches=True, now=NOW)
+
+        assert [log.message for log in outcome["logs"]] == ["upstream Timeout", "request timeout"]
+        assert calls[0]["limit"] == 2 and calls[0]["max_scan"] == 300
+        assert outcome["scanned"] == 5
+
+
+class TestExecution:
+    """Boru hattı yürütme testleri"""
+
+    def test_count_by_service(self):
+        source = FakeSource(make_logs())
+        plan = compile_query('level>=warning msg~"timeout" since:-1h | count by service')
+        outcome = execute(plan, source.iter_logs, now=NOW)
+
+        assert outcome["result"] == [{"service": "nginx", "count": 1}, {"service": "php-fpm", "count": 1}]
+        assert source.calls[0]["level"] == LogLevel.WARNING
+        assert source.calls[0]["since"] == NOW - timedelta(hours=1)
+
+    def test_residual_reads_scan_window(self):
+        source = FakeSource(make_logs())
+        outcome = execute(compile_query("timeout NOT service:nginx"), source.iter_logs,
+                          limit=10, scan_limit=500, now=NOW)
+
+        assert [log.message for log in outcome["logs"]] == ["timeout reading"]
+        assert source.calls[0]["limit"] == 500
+        assert outcome["scanned"] == 5
+
+    def test_residual_time_with_aware_timestamps(self):
+        """İtilemeyen since/until koşulu saat dilimli journal kayıtlarıyla karşılaştırılır"""
+        logs = [LogEntry(log.timestamp.astimezone(), log.level, log.message, service=log.service)
+                for log in make_logs()]
+        outcome = execute(compile_query("since:-1h OR level>=err"), FakeSource(logs).iter_logs,
+                          limit=10, now=NOW)
+
+        assert len(outcome["logs"]) == 5
+        outcome = execute(compile_query("until:-1h OR service:sshd"), FakeSource(logs).iter_logs,
+                          limit=10, now=NOW)
+        assert [log.message for log in outcome["logs"]] == ["upstream timeout", "auth failed"]
+
+    def test_limit_keeps_newest(self):
+        outcome = execute(compile_query("timeout"), FakeSource(make_logs()).iter_logs, limit=2, now=NOW)
+
+        assert [log.message for log in outcome["logs"]] == ["request timeout", "timeout reading"]
+
+    def test_head_stops_stream(self):
+        consumed = []
+
+        def stream():
+            for log in make_logs():
+                consumed.append(log)
+                yield log
+
+        head = list(run_stages(stream(), compile_query("| head 2").stages))
+
+        assert len(head) == 2 and len(consumed) == 2
+
+    def test_log_store_source(self):
+        store = LogStore()
+        store.merge([LogBatch.from_entries(make_logs())])
+        outcome = execute(compile_query("level>=error since:-2h | count by level"),
+                          store.iter_logs, scan_limit=0, now=NOW)
+
+        assert outcome["result"] == [{"level": "ERROR", "count": 2}]
+
+
+# Test çalıştırma
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
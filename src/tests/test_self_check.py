@@ -185,6 +185,50 @@ class TestSelfCheck:
             f"Self-check failed: {checks_passed}/{total_checks} passed"
 
 
+class TestFastStartup:
+    """Hızlı CLI açılışı testleri"""
+
+    def test_default_adapter_shared(self):
+        """Adaptör verilmediğinde monitor ve collector aynı örneği kullanır"""
+        from core.service_monitor import ServiceMonitor
+        from core.log_collector import LogCollector
+
+        assert ServiceMonitor().adapter is LogCollector().adapter
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Linux adaptörü")
+    def test_cli_path_skips_asyncio_and_flask(self):
+        """--logs yolu asyncio ve Flask import etmez"""
+        import subprocess
+        src = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = (
+            "import sys; sys.path.insert(0, %r); import main; "
+            "main.show_logs(limit=1); "
+            "print('asyncio' in sys.modules, 'flask' in sys.modules)"
+        ) % src
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+
+        assert result.stdout.strip().splitlines()[-1] == "False False"
+
+    def test_parse_importtime(self):
+        from core.startup_profile import parse_importtime, package_totals, format_report
+
+        lines = [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     _io",
+            "import time:      2000 |       2500 |   core.log_cursor",
+            "import time:      3000 |       5500 | core.log_collector",
+            "Traceback (most recent call last):",
+        ]
+        records, other = parse_importtime(lines)
+
+        assert [(r.module, r.depth) for r in records] == [
+            ("_io", 2), ("core.log_cursor", 1), ("core.log_collector", 0)
+        ]
+        assert other == ["Traceback (most recent call last):"]
+        assert package_totals(records) == {"_io": 120, "core": 5000}
+        assert "core.log_collector" in format_report(records, 0.01)
+
+
 # Test çalıştırma
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -11,7 +11,7 @@ import os
 # Modül yolunu ekle
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.service_monitor import ServiceMonitor, ServiceInfo, ServiceStatus
+from core.service_monitor import CriticalMatcher, ServiceMonitor, ServiceInfo, ServiceStatus
 
 
 class TestServiceStatus:
@@ -112,6 +112,70 @@ class TestServiceMonitor:
         assert test_service not in monitor.critical_services
 
 
+
+class PatternAdapter:
+    """Şablon örnekleri içeren sahte servis listesi (toplu durum sorgusu yok)"""
+
+    def __init__(self):
+        self.services = [
+            ServiceInfo(name, name, status) for name, status in [
+                ("sshd", ServiceStatus.RUNNING),
+                ("postgresql@14-main", ServiceStatus.FAILED),
+                ("postgresql@15-main", ServiceStatus.RUNNING),
+                ("docker-a1b2", ServiceStatus.RUNNING),
+                ("kube-proxy-7", ServiceStatus.STOPPED),
+                ("cron", ServiceStatus.STOPPED),
+            ]
+        ]
+
+    def get_services(self):
+        return [ServiceInfo(s.name, s.display_name, s.status) for s in self.services]
+
+
+class TestCriticalMatcher:
+    """Derlenmiş kritik servis eşleyicisi testleri"""
+
+    def test_exact_glob_and_regex(self):
+        matcher = CriticalMatcher(["sshd", "postgresql@*", "docker-*", "re:kube-.*-[0-9]+", "sshd"])
+
+        assert matcher.exact == frozenset({"sshd"})
+        assert len(matcher) == 4 and matcher.has_regex
+        assert "sshd" in matcher and "postgresql@14-main" in matcher
+        assert "docker-a1b2" in matcher and "kube-proxy-7" in matcher
+        assert "sshd-keygen" not in matcher and "kube-proxy" not in matcher
+        assert "mydocker-1" not in matcher
+
+    def test_memoized(self):
+        matcher = CriticalMatcher(["postgresql@*"])
+        for _ in range(3):
+            assert "postgresql@1" in matcher
+            assert "cron" not in matcher
+
+        assert matcher._memo == {"postgresql@1": True, "cron": False}
+
+    def test_monitor_patterns(self):
+        monitor = ServiceMonitor(custom_critical_services=["sshd", "postgresql@*"], adapter=PatternAdapter())
+        critical = [s.name for s in monitor.get_all_services() if s.is_critical]
+
+        assert critical == ["sshd", "postgresql@14-main", "postgresql@15-main"]
+        assert [s.name for s in monitor.get_critical_down_services()] == ["postgresql@14-main"]
+        assert monitor.get_critical_names() == ["sshd", "postgresql@14-main", "postgresql@15-main"]
+
+    def test_rebuilt_only_on_change(self):
+        monitor = ServiceMonitor(custom_critical_services=["sshd"], adapter=PatternAdapter())
+        matcher = monitor.critical_matcher
+        monitor.add_critical_service("sshd")
+        assert monitor.critical_matcher is matcher
+
+        monitor.add_critical_service("re:kube-.*")
+        assert monitor.critical_matcher is not matcher
+        assert monitor.get_critical_states() == {"sshd": ServiceStatus.RUNNING,
+                                                 "kube-proxy-7": ServiceStatus.STOPPED}
+        monitor.remove_critical_service("re:kube-.*")
+        assert not monitor.is_critical("kube-proxy-7")
+        assert monitor.critical_services == ["sshd"]
+
+
 # Test çalıştırma
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
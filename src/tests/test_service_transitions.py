@@ -0,0 +1,169 @@
+"""
+Service Transitions Tests
+Servis geçişleri: olay üretimi, uyarı/otomatik çözüm, çalışma oranı ve dalgalanma testleri.
+"""
+
+import pytest
+import sys
+import os
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.alert_manager import AlertManager, AlertType
+from core.log_collector import LogCollector
+from core.log_parser import LogParser
+from core.service_monitor import ServiceInfo, ServiceMonitor, ServiceStatus
+from core.service_transitions import TransitionTracker
+from core.snapshot import SnapshotManager
+
+RUNNING, STOPPED, FAILED = ServiceStatus.RUNNING, ServiceStatus.STOPPED, ServiceStatus.FAILED
+
+
+def svc(name, status, pid=None, sub_state="", critical=False):
+    return ServiceInfo(name, name, status, is_critical=critical, pid=pid, sub_state=sub_state)
+
+
+def active(manager, alert_type):
+    return [a for a in manager.get_active_alerts() if a.type == alert_type]
+
+
+class TestTransitionTracker:
+    """Geçiş motoru testleri"""
+
+    @pytest.fixture
+    def tracker(self):
+        tracker = TransitionTracker(AlertManager(), flap_window=100, flap_threshold=4)
+        tracker.observe([svc("nginx", RUNNING, pid=10), svc("sshd", STOPPED, critical=True),
+                         svc("cron", RUNNING)], now=0)
+        return tracker
+
+    def test_initial_snapshot_reports_only_down_units(self, tracker):
+        events = tracker.get_transitions()
+
+        assert [(e["name"], e["kind"], e["previous"]) for e in events] == [("sshd", "down", None)]
+        assert len(active(tracker.alert_manager, AlertType.CRITICAL_SERVICE_DOWN)) == 1
+
+    def test_kinds(self, tracker):
+        events = tracker.observe([
+            svc("nginx", RUNNING, pid=11),
+            svc("sshd", RUNNING, critical=True),
+            svc("cron", RUNNING, sub_state="exited"),
+            svc("docker", RUNNING),
+        ], gone=["missing"], now=5, version=2)
+
+        assert [(e.name, e.kind) for e in events] == [
+            ("nginx", "restart"), ("sshd", "up"), ("cron", "substate"), ("docker", "added")]
+        assert events[0].previous_pid == 10 and events[0].version == 2
+        # Yalnızca açıklama değişti: geçiş yok
+        assert tracker.observe([ServiceInfo("cron", "cron", RUNNING, description="x",
+                                            sub_state="exited")], now=6) == []
+
+    def test_alert_on_down_edge_resolved_on_recovery(self, tracker):
+        manager = tracker.alert_manager
+        tracker.observe([svc("sshd", FAILED, pid=3, critical=True)], now=1)
+        # Durmuş servisin durumu/PID'i değişse de yeni uyarı oluşmaz
+        assert len(active(manager, AlertType.CRITICAL_SERVICE_DOWN)) == 1
+
+        tracker.observe([svc("sshd", RUNNING, pid=4, critical=True)], now=2)
+        assert active(manager, AlertType.CRITICAL_SERVICE_DOWN) == []
+
+        tracker.observe([svc("sshd", STOPPED, critical=True)], now=3)
+        assert len(active(manager, AlertType.CRITICAL_SERVICE_DOWN)) == 1
+        tracker.observe([], gone=["sshd"], now=4)
+        assert active(manager, AlertType.CRITICAL_SERVICE_DOWN) == []
+
+    def test_uptime_accumulates_per_transition(self, tracker):
+        tracker.observe([svc("nginx", STOPPED)], now=30)
+        tracker.observe([svc("nginx", RUNNING, pid=12)], now=40)
+        record = tracker._units["nginx"]
+
+        assert (record.up_seconds, record.down_seconds, record.transitions) == (30, 10, 2)
+        stats = record.to_dict("nginx", now=100)
+        assert stats["uptime_ratio"] == pytest.approx(90 / 100)
+        assert stats["last_down"] == 30 and stats["last_up"] == 40
+
+    def test_flapping_alert_once_and_expires(self, tracker):
+        manager = tracker.alert_manager
+        now = 10
+        for status in (STOPPED, RUNNING) * 4:
+            tracker.observe([svc("sshd", status, critical=True)], now=now)
+            now += 1
+
+        assert tracker.get_stats()["flapping"] == ["sshd"]
+        assert len(active(manager, AlertType.SERVICE_FLAPPING)) == 1
+        # Dalgalanma sırasında durma uyarıları bastırılır, eskiler geri gelişte çözülür
+        assert active(manager, AlertType.CRITICAL_SERVICE_DOWN) == []
+
+        tracker.observe([], now=now + 200)
+        assert tracker.get_stats()["flapping"] == []
+        assert active(manager, AlertType.SERVICE_FLAPPING) == []
+
+    def test_flap_then_stay_down_raises_down_alert_on_expiry(self, tracker):
+        manager = tracker.alert_manager
+        now = 10
+        for status in (RUNNING, STOPPED) * 2 + (RUNNING, FAILED):
+            tracker.observe([svc("sshd", status, critical=True)], now=now)
+            now += 1
+        assert active(manager, AlertType.CRITICAL_SERVICE_DOWN) == []
+
+        tracker.observe([], now=now + 200)
+        assert active(manager, AlertType.SERVICE_FLAPPING) == []
+        assert len(active(manager, AlertType.CRITICAL_SERVICE_DOWN)) == 1
+
+    def test_transitions_since_and_callbacks(self, tracker):
+        received = []
+        tracker.add_callback(received.append)
+        last_id = tracker.last_id
+        tracker.observe([svc("cron", FAILED)], now=1)
+        tracker.observe([], now=2)
+
+        assert [e["kind"] for e in tracker.get_transitions(since=last_id)] == ["down"]
+        assert tracker.get_transitions(service="nginx") == []
+        assert len(received) == 1 and received[0][0].name == "cron"
+
+
+class TestSnapshotIntegration:
+    """SnapshotManager'ın geçişleri beslemesi"""
+
+    class Adapter:
+        def __init__(self):
+            self.services = [svc("sshd", STOPPED, pid=None), svc("nginx", RUNNING, pid=1)]
+
+        def get_services(self):
+            return [ServiceInfo(s.name, s.display_name, s.status, pid=s.pid, description=s.description)
+                    for s in self.services]
+
+        async def get_services_async(self):
+            return self.get_services()
+
+        def get_logs(self, **kwargs):
+            return []
+
+        async def get_logs_async(self, **kwargs):
+            return []
+
+    def test_only_changes_reach_tracker(self):
+        adapter = self.Adapter()
+        monitor = ServiceMonitor(custom_critical_services=["sshd"], adapter=adapter)
+        collector = LogCollector()
+        collector.adapter = adapter
+        manager = AlertManager()
+        tracker = TransitionTracker(manager)
+        snapshots = SnapshotManager(monitor, collector, LogParser(), manager, transitions=tracker)
+
+        snapshots.refresh()
+        adapter.services[0].description = "OpenSSH"
+        snapshots.refresh()
+        snapshots.refresh()
+        assert manager.created_count == 1
+
+        adapter.services[0].status = RUNNING
+        snapshots.refresh()
+        assert [e["kind"] for e in tracker.get_transitions()] == ["down", "up"]
+        assert manager.get_active_alerts() == []
+
+
+# Test çalıştırma
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
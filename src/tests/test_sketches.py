@@ -0,0 +1,162 @@
+"""
+Sketches Tests
+Space-Saving, Count-Min, HyperLogLog ve pencereli özet testleri.
+"""
+
+import random
+import pytest
+import sys
+import os
+from datetime import datetime
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.log_collector import LogEntry, LogLevel
+from core.sketches import CountMinSketch, HyperLogLog, SpaceSaving, WindowedSketches
+
+BASE = 1705312800.0
+
+
+def zipf_stream(n, items=500, seed=3):
+    rng = random.Random(seed)
+    weights = [1 / (i + 1) for i in range(items)]
+    return rng.choices([f"svc{i}" for i in range(items)], weights=weights, k=n)
+
+
+class TestSpaceSaving:
+    """En sık k öğe testleri"""
+
+    def test_heavy_hitters_found_with_bounded_error(self):
+        stream = zipf_stream(20000)
+        sketch = SpaceSaving(k=50)
+        for item in stream:
+            sketch.add(item)
+
+        top = sketch.top(5)
+        assert [item for item, _, _ in top] == ["svc0", "svc1", "svc2", "svc3", "svc4"]
+        for item, count, error in top:
+            assert count - error <= stream.count(item) <= count
+        assert len(sketch) == 50
+
+    def test_merge_matches_single_pass(self):
+        stream = zipf_stream(10000)
+        a, b, whole = SpaceSaving(30), SpaceSaving(30), SpaceSaving(30)
+        for i, item in enumerate(stream):
+            (a if i % 2 else b).add(item)
+            whole.add(item)
+
+        merged = a.merge(b)
+
+        assert merged.total == 10000
+        assert [i for i, _, _ in merged.top(3)] == [i for i, _, _ in whole.top(3)]
+        for item, count, error in merged.top(10):
+            assert count - error <= stream.count(item) <= count
+
+
+class TestCountMin:
+    """Sıklık tahmini testleri"""
+
+    def test_never_underestimates(self):
+        stream = zipf_stream(5000)
+        sketch = CountMinSketch(width=256, depth=4)
+        for item in stream:
+            sketch.add(item)
+
+        for item in ("svc0", "svc10", "svc400"):
+            assert sketch.estimate(item) >= stream.count(item)
+        assert sketch.estimate("svc0") <= stream.count("svc0") + 0.02 * 5000
+
+    def test_merge_adds_counters(self):
+        a, b = CountMinSketch(64, 3), CountMinSketch(64, 3)
+        a.add("x", 3)
+        b.add("x", 4)
+
+        assert a.merge(b).estimate("x") >= 7
+        with pytest.raises(ValueError):
+            a.merge(CountMinSketch(32, 3))
+
+
+class TestHyperLogLog:
+    """Farklı öğe sayısı testleri"""
+
+    @pytest.mark.parametrize("n", [10, 1000, 50000])
+    def test_estimate_within_error(self, n):
+        sketch = HyperLogLog(p=12)
+        for i in range(n):
+            sketch.add(f"host-{i}")
+            sketch.add(f"host-{i}")
+
+        assert sketch.count() == pytest.approx(n, rel=0.05)
+
+    def test_merge_is_union(self):
+        a, b = HyperLogLog(10), HyperLogLog(10)
+        for i in range(3000):
+            a.add(i)
+        for i in range(2000, 5000):
+            b.add(i)
+
+        assert a.merge(b).count() == pytest.approx(5000, rel=0.08)
+
+
+class TestWindowedSketches:
+    """Pencereli özet testleri"""
+
+    def entry(self, second, service, source="web-01", template_id=None):
+        return LogEntry(datetime.fromtimestamp(BASE + second), LogLevel.INFO, "m",
+                        source=source, service=service, template_id=template_id)
+
+    def test_summary_over_range(self):
+        sketches = WindowedSketches(window=60, windows=10)
+        entries = [self.entry(i, "nginx" if i % 3 else "db", source=f"h{i % 4}", template_id=i % 2)
+                   for i in range(600)]
+        sketches.add_entries(entries)
+
+        summary = sketches.summary(now=BASE + 600)
+        recent = sketches.summary(seconds=120, now=BASE + 600)
+
+        assert summary["total"] == 600
+        assert summary["services"][0] == {"name": "nginx", "count": 400, "error": 0}
+        assert summary["distinct_sources"] == 4
+        assert {t["template"] for t in summary["templates"]} == {0, 1}
+        assert recent["total"] == 120
+        assert sketches.estimate("service", "db", now=BASE + 600) >= 200
+
+    def test_old_windows_dropped(self):
+        sketches = WindowedSketches(window=60, windows=5)
+        sketches.add_entries([self.entry(i * 60, "app") for i in range(20)])
+        sketches.add_entries([self.entry(0, "late")])
+
+        assert sketches.get_stats()["windows"] == 5
+        assert sketches.get_stats()["late"] == 1
+        assert sketches.summary()["total"] == 5
+
+    def test_governor_weights_preserved(self):
+        """Örneklenmiş girdide top-K ve toplam görülen kayıt sayısına eşittir"""
+        from core.ingest_governor import IngestGovernor
+
+        governor = IngestGovernor(rate=10, burst=10, reservoir_size=50, seed=5)
+        entries = [self.entry(i / 1000, "noisy", template_id=1) for i in range(20000)] + \
+            [self.entry(30 + i / 10, "quiet", template_id=2) for i in range(400)]
+        kept = governor.admit(entries)
+        assert len(kept) < 1000
+        sketches = WindowedSketches()
+        sketches.add_entries(kept)
+        summary = sketches.summary(now=BASE + 60)
+
+        assert summary["total"] == 20400
+        assert [(s["name"], s["count"]) for s in summary["services"]] == [("noisy", 20000), ("quiet", 400)]
+        assert [(t["template"], t["count"]) for t in summary["templates"]] == [(1, 20000), (2, 400)]
+
+    def test_hosts_from_aggregated_service_names(self):
+        sketches = WindowedSketches()
+        sketches.add_entries([self.entry(0, "agent-a/nginx", source="agent-a"),
+                              self.entry(1, "agent-b/nginx", source="agent-b"),
+                              self.entry(2, "agent-b/sshd", source="agent-b")])
+
+        assert sketches.summary()["distinct_hosts"] == 2
+
+
+# Test çalıştırma
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,133 @@
+"""
+Spool Tests
+Agent log spool'u için segment, kurtarma, boyut sınırı ve checkpoint testleri.
+"""
+
+import os
+import pytest
+import sys
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.spool import Spool, SEGMENT_SUFFIX
+from agent.protocol import FrameType
+
+
+def segments(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(SEGMENT_SUFFIX))
+
+
+def read_all(spool):
+    records = []
+    while True:
+        record = spool.read_next()
+        if record is None:
+            return records
+        records.append(record)
+
+
+class TestSpool:
+    """Spool temel davranış testleri"""
+
+    def test_append_and_read_in_order(self, tmp_path):
+        spool = Spool(str(tmp_path))
+        offsets = [spool.append(FrameType.LOGS, 0, f"batch-{i}".encode(), items=2, cursor=f"c{i}")
+                   for i in range(3)]
+
+        records = read_all(spool)
+
+        assert [r.body for r in records] == [b"batch-0", b"batch-1", b"batch-2"]
+        assert [r.offset for r in records] == offsets
+        assert records[1].offset == records[0].next_offset
+        assert records[2].cursor == "c2"
+        assert spool.cursor == "c2"
+        assert spool.read_next() is None
+
+    def test_segments_roll_and_acked_segments_are_removed(self, tmp_path):
+        spool = Spool(str(tmp_path), segment_size=100)
+        for i in range(10):
+            spool.append(FrameType.LOGS, 0, b"x" * 30)
+
+        assert len(segments(tmp_path)) == 5
+
+        records = read_all(spool)
+        spool.ack(records[6].next_offset)
+        spool.commit()
+
+        # İlk üç segment tamamen onaylandı
+        assert len(segments(tmp_path)) == 2
+        assert spool.pending_bytes == records[-1].next_offset - records[6].next_offset
+
+    def test_restart_resumes_from_acked_offset_and_cursor(self, tmp_path):
+        spool = Spool(str(tmp_path), segment_size=100)
+        for i in range(4):
+            spool.append(FrameType.LOGS, 0, f"b{i}".encode(), cursor=f"s=abc;i={i}")
+        first, second = spool.read_next(), spool.read_next()
+        spool.ack(second.next_offset)
+        spool.close()
+
+        reopened = Spool(str(tmp_path), segment_size=100)
+
+        assert reopened.spool_id == spool.spool_id
+        assert reopened.cursor == "s=abc;i=3"
+        assert [r.body for r in read_all(reopened)] == [b"b2", b"b3"]
+
+    def test_torn_write_is_truncated(self, tmp_path):
+        spool = Spool(str(tmp_path))
+        spool.append(FrameType.LOGS, 0, b"complete", cursor="c1")
+        end = spool.end_offset
+        spool.close()
+        # Çökme: son kaydın yalnızca bir kısmı diske yazıldı
+        with open(tmp_path / segments(tmp_path)[-1], "ab") as f:
+            f.write(b"\x00\x00\x01\x00partial")
+
+        reopened = Spool(str(tmp_path))
+
+        assert reopened.end_offset == end
+        assert reopened.truncated_bytes == 11
+        assert [r.body for r in read_all(reopened)] == [b"complete"]
+        assert reopened.append(FrameType.LOGS, 0, b"next") == end
+
+    def test_size_cap_drops_oldest_unacked(self, tmp_path):
+        spool = Spool(str(tmp_path), segment_size=100, max_bytes=200)
+        for i in range(12):
+            spool.append(FrameType.LOGS, 0, b"%02d" % i + b"y" * 38, items=5)
+
+        bodies = [r.body[:2] for r in read_all(spool)]
+
+        assert spool.size_bytes <= 200
+        assert spool.dropped_segments > 0
+        assert spool.dropped_items == 5 * (12 - len(bodies))
+        # En yeni kayıtlar korunur
+        assert bodies[-1] == b"11"
+        assert bodies == sorted(bodies)
+
+    def test_offsets_continue_after_files_are_removed(self, tmp_path):
+        spool = Spool(str(tmp_path))
+        spool.append(FrameType.LOGS, 0, b"one")
+        spool.ack(spool.end_offset)
+        end = spool.end_offset
+        spool.close()
+        for name in segments(tmp_path):
+            os.unlink(tmp_path / name)
+
+        reopened = Spool(str(tmp_path))
+
+        # Ofsetler geri gitmez; aggregator eski ofsetleri tekrar saymaz
+        assert reopened.append(FrameType.LOGS, 0, b"two") == end
+
+    def test_fsync_is_batched(self, tmp_path):
+        spool = Spool(str(tmp_path), fsync_interval=60)
+        syncs = spool.syncs
+        for _ in range(50):
+            spool.append(FrameType.LOGS, 0, b"z")
+
+        assert spool.syncs == syncs
+        spool.commit()
+        assert spool.syncs == syncs + 1
+
+
+# Test çalıştırma
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
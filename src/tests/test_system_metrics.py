@@ -0,0 +1,162 @@
+"""
+System Metrics Tests
+Host metrikleri toplayıcı unit testleri (sahte /proc ağacı ile).
+"""
+
+import pytest
+import sys
+import os
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.system_metrics import SystemMetricsCollector, ProcStatSource
+from core.alert_manager import AlertManager, AlertType
+
+
+def _write_proc(root, cpu, disk_sectors, net_bytes):
+    """Sahte /proc dosyalarını yaz"""
+    files = {
+        "stat": "cpu  {} {} {} {} {} 0 0 0 0 0\ncpu0 1 1 1 1 1 0 0 0 0 0\n".format(*cpu),
+        "meminfo": ("MemTotal:       1000 kB\nMemFree:         100 kB\n"
+                    "MemAvailable:    250 kB\nSwapTotal:       200 kB\nSwapFree:        150 kB\n"),
+        "diskstats": (f"   8       0 sda 10 0 {disk_sectors} 0 20 0 {disk_sectors} 0 0 0 0\n"
+                      f"   8       1 sda1 10 0 {disk_sectors} 0 20 0 {disk_sectors} 0 0 0 0\n"
+                      f"   7       0 loop0 1 0 999 0 1 0 999 0 0 0 0\n"),
+        "net/dev": ("Inter-|   Receive                            |  Transmit\n"
+                    " face |bytes    packets errs drop fifo frame compressed multicast|bytes packets\n"
+                    f"    lo: 5000 10 0 0 0 0 0 0 5000 10 0 0 0 0 0 0\n"
+                    f"  eth0: {net_bytes} 10 0 0 0 0 0 0 {net_bytes // 2} 5 0 0 0 0 0 0\n"),
+        "loadavg": "0.50 0.25 0.10 1/100 1234\n",
+    }
+    os.makedirs(os.path.join(root, "net"), exist_ok=True)
+    for name, content in files.items():
+        with open(os.path.join(root, name), "w") as f:
+            f.write(content)
+
+
+class TestSystemMetricsCollector:
+    """SystemMetricsCollector sınıfı testleri"""
+
+    @pytest.fixture
+    def proc_root(self, tmp_path):
+        root = str(tmp_path)
+        _write_proc(root, cpu=(100, 0, 100, 800, 0), disk_sectors=0, net_bytes=0)
+        return root
+
+    @pytest.fixture
+    def collector(self, proc_root):
+        source = ProcStatSource(proc_root=proc_root)
+        collector = SystemMetricsCollector(interval=1.0, history_size=4, source=source)
+        yield collector
+        source.close()
+
+    def test_first_sample_gauges(self, collector):
+        """İlk örnekte oranlar sıfır, bellek değerleri dolu"""
+        metrics = collector.sample()
+
+        assert metrics.cpu_percent == 0.0
+        assert metrics.memory_total == 1000 * 1024
+        assert metrics.memory_used == 750 * 1024
+        assert metrics.memory_percent == 75.0
+        assert metrics.swap_percent == 25.0
+        assert metrics.load_avg == (0.5, 0.25, 0.1)
+
+    def test_rates_from_deltas(self, collector, proc_root, monkeypatch):
+        """İki örnek arasındaki farktan CPU yüzdesi ve oranlar hesaplanır"""
+        import core.system_metrics as module
+
+        clock = iter([1000.0, 1002.0])
+        monkeypatch.setattr(module.time, "time", lambda: next(clock))
+
+        collector.sample()
+        # 200 jiffy'nin 100'ü meşgul, 2 saniyede 1024 sektör ve 4000 bayt
+        _write_proc(proc_root, cpu=(150, 0, 150, 900, 0), disk_sectors=1024, net_bytes=4000)
+        metrics = collector.sample()
+
+        assert metrics.cpu_percent == 50.0
+        # Bölümler (sda1) ve loop aygıtları sayılmaz
+        assert metrics.disk_read_bps == 1024 * 512 / 2
+        assert metrics.disk_write_bps == 1024 * 512 / 2
+        # lo arayüzü sayılmaz
+        assert metrics.net_rx_bps == 2000.0
+        assert metrics.net_tx_bps == 1000.0
+
+    def test_counter_reset_not_negative(self, collector, proc_root):
+        """Sayaç sıfırlanması negatif oran üretmez"""
+        _write_proc(proc_root, cpu=(100, 0, 100, 800, 0), disk_sectors=0, net_bytes=9000)
+        collector.sample()
+        _write_proc(proc_root, cpu=(100, 0, 100, 800, 0), disk_sectors=0, net_bytes=10)
+        metrics = collector.sample()
+
+        assert metrics.net_rx_bps == 0.0
+
+    def test_history_ring_buffer(self, collector):
+        """Halka tampon kapasiteyi aşınca en eski örnekler düşer"""
+        samples = [collector.sample() for _ in range(6)]
+        history = collector.get_history()
+
+        assert len(history) == 4
+        assert history == samples[-4:]
+        assert collector.get_history(limit=2) == samples[-2:]
+        assert collector.get_latest() is samples[-1]
+
+    def test_concurrent_samples_use_distinct_slots(self, collector):
+        """Arka plan thread'i ve istek yolu aynı anda örneklese de satırlar karışmaz"""
+        import threading
+
+        threads = [threading.Thread(target=lambda: [collector.sample() for _ in range(25)])
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        history = collector.get_history()
+
+        assert collector._samples == 100
+        assert len({id(m) for m in history}) == 4
+        assert [m.timestamp for m in history] == sorted(m.timestamp for m in history)
+
+    def test_callbacks(self, collector):
+        """Her örnek callback'lere iletilir"""
+        received = []
+        collector.add_callback(received.append)
+
+        collector.sample()
+
+        assert len(received) == 1
+
+
+class TestSystemMetricAlerts:
+    """AlertManager host metrik eşikleri testleri"""
+
+    def test_alert_on_threshold_crossing(self):
+        """Eşik aşıldığında tek uyarı, düşüp tekrar aşınca yeni uyarı"""
+        manager = AlertManager(cpu_threshold=90.0)
+
+        manager.check_system_metrics({"cpu_percent": 95.0})
+        manager.check_system_metrics({"cpu_percent": 97.0})
+        assert len(manager.alerts) == 1
+        assert manager.alerts[0].type == AlertType.HIGH_CPU_USAGE
+
+        # Histerezis bandı içinde kalmak sıfırlamaz
+        manager.check_system_metrics({"cpu_percent": 88.0})
+        manager.check_system_metrics({"cpu_percent": 95.0})
+        assert len(manager.alerts) == 1
+
+        manager.check_system_metrics({"cpu_percent": 50.0})
+        manager.check_system_metrics({"cpu_percent": 95.0})
+        assert len(manager.alerts) == 2
+
+    def test_disk_alert_is_critical(self):
+        """Disk doluluğu kritik önemde uyarı üretir"""
+        manager = AlertManager(disk_threshold=80.0)
+
+        manager.check_system_metrics({"disk_percent": 85.0, "memory_percent": 10.0})
+
+        assert len(manager.get_critical_alerts()) == 1
+
+
+# Test çalıştırma
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
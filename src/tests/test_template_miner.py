@@ -0,0 +1,124 @@
+"""
+Template Miner Tests
+Drain ağacıyla şablon çıkarımı, kodlama ve hız istatistikleri testleri.
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.log_collector import LogEntry, LogLevel
+from core.log_store import LogBatch, LogStore
+from core.template_miner import TemplateMiner, WILDCARD
+
+BASE = 1705312800.0
+
+
+class TestClustering:
+    """Kümeleme testleri"""
+
+    def test_variable_tokens_become_wildcards(self):
+        miner = TemplateMiner()
+        first = miner.add("Accepted publickey for deploy from 10.0.0.4 port 5022", BASE)
+        second = miner.add("Accepted publickey for admin from 10.0.0.9 port 6100", BASE)
+
+        assert first is second
+        assert second.template == f"Accepted publickey for {WILDCARD} from {WILDCARD} port {WILDCARD}"
+        assert second.count == 2
+
+    def test_different_messages_get_different_templates(self):
+        miner = TemplateMiner()
+        miner.add("Started Session 4 of user root.", BASE)
+        miner.add("Started Session 5 of user root.", BASE)
+        miner.add("upstream timed out while reading response", BASE)
+        miner.add("disk full on /var", BASE)
+
+        assert len(miner.templates) == 3
+        assert miner.templates[0].template == f"Started Session {WILDCARD} of user root."
+
+    def test_max_clusters(self):
+        miner = TemplateMiner(max_clusters=2)
+        for message in ("alpha one", "beta two", "gamma three"):
+            miner.add(message, BASE)
+
+        assert len(miner.templates) == 2
+        assert miner.get_stats()["unmatched"] == 1
+
+    def test_add_entries_assigns_template_id(self):
+        miner = TemplateMiner()
+        entries = [LogEntry(datetime.fromtimestamp(BASE), LogLevel.ERROR, f"job {i} failed", service="cron")
+                   for i in range(3)]
+        miner.add_entries(entries)
+
+        assert {entry.template_id for entry in entries} == {0}
+        assert entries[0].to_dict()["template_id"] == 0
+        assert miner.templates[0].levels == {"ERROR": 3}
+
+
+class TestEncoding:
+    """Parametre kodlama testleri"""
+
+    @pytest.mark.parametrize("message", [
+        "Failed password for root from 192.168.1.7",
+        "Failed password for admin from 192.168.1.8",
+        "double  space kept",
+        "",
+        f"literal {WILDCARD} token",
+    ])
+    def test_roundtrip(self, message):
+        miner = TemplateMiner()
+        miner.add("Failed password for guest from 10.1.1.1", BASE)
+
+        assert miner.decode(miner.encode(message)) == message
+
+    def test_old_encodings_survive_generalization(self):
+        miner = TemplateMiner()
+        first = miner.encode("user alice logged in")
+        miner.encode("user bob logged in")
+
+        assert miner.decode(first) == "user alice logged in"
+        assert miner.template_of(first) == 0
+
+    def test_log_store_keeps_parameters_only(self):
+        miner = TemplateMiner()
+        store = LogStore(templates=miner)
+        batch = LogBatch()
+        for i in range(5):
+            batch.append(BASE + i, LogLevel.INFO.value, "app", "web", f"request {i} done")
+        store.merge([batch])
+
+        logs = store.query(limit=0)
+
+        assert [e.message for e in logs] == [f"request {i} done" for i in range(5)]
+        assert {e.template_id for e in logs} == {0}
+        assert store._data.message[-1][1] == ("4",)
+
+
+class TestTop:
+    """Sıralama ve hız testleri"""
+
+    def test_sort_by_count_and_rate(self):
+        miner = TemplateMiner(rate_window=5)
+        now = BASE + 3600
+        for i in range(10):
+            miner.add(f"old event {i}", BASE, service="a")
+        for i in range(3):
+            miner.add(f"new burst {i}", now - 30, level="ERROR", service="b")
+
+        by_count = miner.top(sort="count", now=now)
+        by_rate = miner.top(sort="rate", now=now)
+
+        assert by_count[0]["count"] == 10
+        assert by_rate[0]["template"] == f"new burst {WILDCARD}"
+        assert by_rate[0]["rate_per_minute"] == pytest.approx(3 / 5)
+        assert [t["count"] for t in miner.top(service="b", now=now)] == [3]
+        assert [t["count"] for t in miner.top(level="ERROR", now=now)] == [3]
+
+
+# Test çalıştırma
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
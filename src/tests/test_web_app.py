@@ -0,0 +1,448 @@
+"""
+Web App Tests
+Flask uygulama fabrikası ve API uçları testleri (sahte adaptörlerle).
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from core.instrumentation import instruments
+from core.service_monitor import ServiceMonitor, ServiceInfo, ServiceStatus
+from core.log_collector import LogCollector, LogEntry, LogLevel
+from web.app import create_app
+from web.state import PanelState
+
+
+class FakeAdapter:
+    """systemctl/journalctl çağırmayan test adaptörü"""
+
+    def __init__(self):
+        self.services = [
+            ServiceInfo("nginx", "nginx", ServiceStatus.RUNNING),
+            ServiceInfo("sshd", "sshd", ServiceStatus.STOPPED),
+            ServiceInfo("cron", "cron", ServiceStatus.FAILED),
+        ]
+        self.logs = [
+            LogEntry(datetime(2024, 1, 15, 10, 0), LogLevel.ERROR, "connection failed", service="nginx"),
+            LogEntry(datetime(2024, 1, 15, 10, 1), LogLevel.INFO, "started", service="sshd"),
+        ]
+
+    def get_services(self):
+        return [ServiceInfo(s.name, s.display_name, s.status) for s in self.services]
+
+    async def get_services_async(self):
+        return self.get_services()
+
+    def get_service_status(self, name):
+        return next((s for s in self.get_services() if s.name == name), None)
+
+    async def get_service_status_async(self, name):
+        return self.get_service_status(name)
+
+    def get_logs(self, limit=100, level=None, service=None, since=None, until=None):
+        return [log for log in self.logs if since is None or log.timestamp >= since][:limit]
+
+    async def get_logs_async(self, **kwargs):
+        return self.get_logs(**kwargs)
+
+
+@pytest.fixture
+def state():
+    """Sahte adaptörlerle PanelState"""
+    adapter = FakeAdapter()
+    monitor = ServiceMonitor(custom_critical_services=["sshd"])
+    monitor.adapter = adapter
+    collector = LogCollector()
+    collector.adapter = adapter
+    return PanelState(service_monitor=monitor, log_collector=collector)
+
+
+@pytest.fixture
+def client(state):
+    app = create_app(state=state)
+    return app.test_client()
+
+
+class TestAppFactory:
+    """create_app ve PanelState testleri"""
+
+    def test_state_is_per_app(self, state):
+        """Her uygulama kendi durumunu taşır"""
+        app_a = create_app(state=state)
+        app_b = create_app(state=PanelState(
+            service_monitor=state.service_monitor, log_collector=state.log_collector
+        ))
+
+        assert app_a.extensions['panel_state'] is state
+        assert app_b.extensions['panel_state'] is not state
+
+    def test_start_stop(self, state):
+        """Arka plan toplayıcıları başlatılıp durdurulabilir"""
+        state.start()
+        state.start()
+        state.stop()
+
+        assert not state._started
+
+    def test_single_worker_only(self):
+        """Durum süreçler arası paylaşılmadığından birden çok worker reddedilir"""
+        from web.server import check_workers
+
+        assert check_workers(1) == 1
+        with pytest.raises(ValueError):
+            check_workers(4)
+
+
+class TestApiRoutes:
+    """API uçları testleri"""
+
+    def test_status(self, client):
+        response = client.get('/api/status')
+
+        assert response.status_code == 200
+        assert response.get_json()['status'] == 'ok'
+
+    def test_services_filter(self, client):
+        data = client.get('/api/services?status=critical').get_json()
+
+        assert data['count'] == 1
+        assert data['services'][0]['name'] == 'sshd'
+
+    def test_unknown_status_filter_shares_cache(self, client, state):
+        for value in ('bogus', 'x' * 100, ''):
+            assert client.get(f'/api/services?status={value}').get_json()['count'] == 3
+
+        assert len(state.snapshots.current.cache) == 1
+
+    def test_aggregated_service_detail(self, client, state):
+        """Aggregator'ın 'host/servis' adları detay ucuyla eşleşir"""
+        state.service_monitor.adapter.services.append(
+            ServiceInfo("web-1/nginx", "nginx", ServiceStatus.RUNNING))
+
+        response = client.get('/api/services/web-1/nginx')
+        assert response.status_code == 200
+        assert response.get_json()['name'] == 'web-1/nginx'
+        # Sabit alt yollar path dönüştürücüsünden önce eşleşmeye devam eder
+        assert 'name' not in client.get('/api/services/summary').get_json()
+
+    def test_dashboard_raises_critical_alert(self, client, state):
+        data = client.get('/api/dashboard').get_json()
+
+        assert data['services']['total'] == 3
+        assert data['services']['critical_down'] == 1
+        assert data['logs']['error_count'] == 1
+        assert data['alerts']['critical'] == 1
+
+    def test_service_transitions(self, client, state):
+        client.get('/api/dashboard')
+        last_id = client.get('/api/services/transitions').get_json()['last_id']
+        state.service_monitor.adapter.services[1].status = ServiceStatus.RUNNING
+        state.snapshots.refresh()
+
+        data = client.get(f'/api/services/transitions?since={last_id}').get_json()
+        assert [(t['name'], t['kind']) for t in data['transitions']] == [('sshd', 'up')]
+        assert state.alert_manager.get_alert_summary()['critical'] == 0
+
+        uptime = client.get('/api/services/uptime?service=sshd').get_json()
+        assert uptime['services'][0]['transitions'] == 1
+        assert uptime['statistics']['units'] == 3
+
+    def test_logs_streamed_from_encoded_entries(self, client):
+        response = client.get('/api/logs')
+        data = response.get_json()
+
+        assert 'Accept' in response.headers['Vary']
+        assert data['count'] == 2
+        assert data['logs'][0]['message'] == 'connection failed'
+        assert data['statistics']['total'] == 2
+
+    def test_logs_since_returns_delta(self, client):
+        data = client.get('/api/logs?since=2024-01-15T10:00:30').get_json()
+
+        assert data['delta'] is True
+        assert [log['message'] for log in data['logs']] == ['started']
+        assert client.get('/api/logs?since=yesterday').get_json()['delta'] is False
+
+    def test_logs_query_language(self, client):
+        data = client.get('/api/logs', query_string={'q': 'failed OR level>=error | count by service'}).get_json()
+
+        assert data['result'] == [{'service': 'nginx', 'count': 1}]
+        assert data['plan']['stages'] == ['count by service']
+
+        listed = client.get('/api/logs', query_string={'q': 'service:ssh*'}).get_json()
+        assert [log['message'] for log in listed['logs']] == ['started']
+
+    def test_logs_query_error(self, client):
+        response = client.get('/api/logs?q=colour:red')
+
+        assert response.status_code == 400
+        assert 'Unknown field' in response.get_json()['error']
+
+    def test_ingest_governor_stats(self, client):
+        client.get('/api/dashboard')
+        data = client.get('/api/logs/ingest').get_json()
+
+        assert data['seen'] == 2
+        assert data['dropped'] == 0
+
+    def test_log_archive(self, client, state):
+        client.get('/api/dashboard')
+        state.log_archive.flush()
+        data = client.get('/api/logs/archive').get_json()
+
+        assert data['total'] == 2
+        assert data['compression']['blocks'] >= 1
+        logs = client.get('/api/logs?archive=true&level=error').get_json()['logs']
+        assert [log['message'] for log in logs] == ['connection failed']
+        result = client.get('/api/logs?archive=true&q=level>=error | count').get_json()['result']
+        assert result == 1
+
+    def test_msgpack_not_offered_without_backend(self, client, monkeypatch):
+        import web.app
+        monkeypatch.setattr(web.app, 'MSGPACK_AVAILABLE', False)
+        response = client.get('/api/services', headers={'Accept': 'application/msgpack'})
+
+        assert response.mimetype == 'application/json'
+        assert response.get_json()['count'] == 3
+
+    def test_log_templates(self, client, state):
+        data = client.get('/api/logs/templates?level=error').get_json()
+
+        assert data['count'] == 1
+        assert data['templates'][0]['template'] == 'connection failed'
+        assert data['templates'][0]['services'] == {'nginx': 1}
+        assert data['statistics']['lines'] == 2
+        assert state.snapshots.current.logs[0].template_id == data['templates'][0]['id']
+
+    def test_log_top(self, client):
+        data = client.get('/api/logs/top').get_json()
+
+        assert data['total'] == 2
+        assert {s['name'] for s in data['services']} == {'nginx', 'sshd'}
+        assert {t['template'] for t in data['templates']} == {'connection failed', 'started'}
+
+    def test_log_anomalies(self, client, state):
+        data = client.get('/api/logs/anomalies').get_json()
+
+        assert data['statistics']['series'] == 1
+        assert data['series'][0]['service'] == 'nginx'
+        assert state.snapshots.anomaly_detector is state.anomalies
+
+    def test_resolve_unknown_alert(self, client):
+        response = client.post('/api/alerts/ALT-999999/resolve')
+
+        assert response.status_code == 404
+
+
+class TestConditionalGet:
+    """ETag / 304 ve since_version delta testleri"""
+
+    @pytest.mark.parametrize("path", [
+        '/api/services', '/api/services/summary', '/api/alerts', '/api/dashboard?system=false',
+        '/api/logs/templates'
+    ])
+    def test_not_modified(self, client, path):
+        first = client.get(path)
+        etag = first.headers['ETag']
+
+        second = client.get(path, headers={'If-None-Match': etag})
+
+        assert first.status_code == 200
+        assert first.headers['Last-Modified']
+        assert second.status_code == 304
+        assert second.data == b''
+        assert second.headers['ETag'] == etag
+
+    def test_template_rates_expire_cached_copy(self, client, monkeypatch):
+        """Dakika kovası ilerleyince şablon hızları değişir; eski ETag 304 almaz"""
+        import web.app
+        now = 1705312800.0
+        monkeypatch.setattr(web.app.time, 'time', lambda: now)
+        first = client.get('/api/logs/templates')
+
+        assert client.get('/api/logs/templates',
+                          headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+        now += 60
+        second = client.get('/api/logs/templates',
+                            headers={'If-None-Match': first.headers['ETag'],
+                                     'If-Modified-Since': first.headers['Last-Modified']})
+
+        assert second.status_code == 200
+        assert second.headers['ETag'] != first.headers['ETag']
+
+    def test_snapshot_version_stable_without_changes(self, client, state):
+        version = client.get('/api/services').get_json()['version']
+        state.snapshots.refresh()
+
+        assert client.get('/api/services').get_json()['version'] == version
+
+    def test_services_delta(self, client, state):
+        first = client.get('/api/services').get_json()
+        state.service_monitor.adapter.services[0].status = ServiceStatus.STOPPED
+        state.snapshots.refresh()
+
+        response = client.get(f"/api/services?since_version={first['version']}",
+                              headers={'If-None-Match': f'"{state.epoch}-s{first["version"]}"'})
+        data = response.get_json()
+
+        assert response.status_code == 200
+        assert data['delta'] is True
+        assert data['version'] == first['version'] + 1
+        assert [s['name'] for s in data['services']] == ['nginx']
+        assert data['removed'] == []
+
+    def test_services_delta_filter_and_removal(self, client, state):
+        version = client.get('/api/services').get_json()['version']
+        adapter = state.service_monitor.adapter
+        adapter.services[0].status = ServiceStatus.STOPPED
+        del adapter.services[2]
+        state.snapshots.refresh()
+
+        data = client.get(f'/api/services?status=running&since_version={version}').get_json()
+
+        assert data['services'] == []
+        assert sorted(data['removed']) == ['cron', 'nginx']
+
+    def test_foreign_epoch_gets_full_response(self, client):
+        data = client.get('/api/services?since_version=1&epoch=deadbeef').get_json()
+
+        assert data['delta'] is False
+        assert data['count'] == 3
+
+    def test_alerts_delta(self, client, state):
+        client.get('/api/dashboard')
+        first = client.get('/api/alerts').get_json()
+        alert_id = first['alerts'][0]['id']
+
+        client.post(f'/api/alerts/{alert_id}/resolve')
+        data = client.get(f"/api/alerts?since_version={first['version']}").get_json()
+
+        assert data['delta'] is True
+        assert data['alerts'] == []
+        assert data['removed'] == [alert_id]
+
+    def test_dashboard_etag_changes_with_alerts(self, client, state):
+        etag = client.get('/api/dashboard?system=false').headers['ETag']
+        state.alert_manager.check_service_status('cron', is_running=False)
+
+        response = client.get('/api/dashboard?system=false', headers={'If-None-Match': etag})
+
+        assert response.status_code == 200
+        assert response.get_json()['alerts']['active'] == 2
+
+
+class TestMetricsEndpoint:
+    """Prometheus /metrics testleri"""
+
+    def test_never_collects(self, client, state):
+        response = client.get('/metrics')
+
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain; version=0.0.4')
+        assert state.snapshots.collections == 0
+        assert b'monitor_service_state' not in response.data
+
+    def test_renders_cached_snapshot(self, client, state):
+        state.snapshots.refresh()
+        body = client.get('/metrics').data.decode()
+
+        assert 'monitor_service_state{service="nginx",state="running"} 1' in body
+        assert 'monitor_service_state{service="sshd",state="stopped"} 1' in body
+        assert 'monitor_log_entries_total{level="error"} 1' in body
+        assert 'monitor_alerts_active{severity="critical"} 1' in body
+        assert 'monitor_snapshot_collections_total 1' in body
+
+    def test_regenerates_only_on_version_change(self, client, state):
+        state.snapshots.refresh()
+        client.get('/metrics')
+        renders = state.exporter.renders
+
+        state.snapshots.refresh()
+        client.get('/metrics')
+        assert state.exporter.renders == renders
+
+        state.service_monitor.adapter.services[0].status = ServiceStatus.FAILED
+        state.snapshots.refresh()
+        body = client.get('/metrics').data.decode()
+
+        assert state.exporter.renders > renders
+        assert 'monitor_service_state{service="nginx",state="failed"} 1' in body
+        assert 'monitor_snapshot_collections_total 3' in body
+
+    def test_log_counters_count_new_entries_once(self, client, state):
+        state.snapshots.refresh()
+        state.service_monitor.adapter.logs.append(
+            LogEntry(datetime(2024, 1, 15, 10, 2), LogLevel.ERROR, "timeout", service="nginx")
+        )
+        state.snapshots.refresh()
+        state.snapshots.refresh()
+
+        body = client.get('/metrics').data.decode()
+
+        assert 'monitor_log_entries_total{level="error"} 2' in body
+        assert 'monitor_log_entries_total{level="info"} 1' in body
+
+    def test_escapes_label_values(self):
+        from web.prometheus import escape_label
+
+        assert escape_label('a"b\\c\nd') == 'a\\"b\\\\c\\nd'
+
+
+
+class TestInternalProfile:
+    """/api/internal/profile testleri"""
+
+    @pytest.fixture
+    def instrumented(self):
+        adapter = FakeAdapter()
+        monitor = ServiceMonitor(custom_critical_services=["sshd"], adapter=adapter)
+        collector = LogCollector()
+        collector.adapter = adapter
+        state = PanelState(config=Config(instrumentation=True), service_monitor=monitor,
+                           log_collector=collector)
+        yield create_app(state=state).test_client()
+        instruments.enable(False)
+        instruments.reset()
+
+    def test_disabled_by_default(self, client):
+        assert client.get('/api/internal/profile').status_code == 404
+        assert client.get('/api/internal/profile/stacks').status_code == 404
+
+    def test_route_lock_and_cache_histograms(self, instrumented):
+        instrumented.get('/api/services')
+        etag = instrumented.get('/api/services').headers['ETag']
+        instrumented.get('/api/services', headers={'If-None-Match': etag})
+        data = instrumented.get('/api/internal/profile').get_json()
+
+        assert data['histograms']['route./api/services']['count'] == 3
+        assert data['counters']['route./api/services.status.304'] == 1
+        assert data['caches']['conditional_get']['hits'] == 1
+        assert data['caches']['snapshot']['hits'] == 1
+        assert 'lock.alert_manager.hold' in data['histograms']
+        assert 'snapshot.collect' in data['histograms']
+
+    def test_stacks(self, instrumented):
+        response = instrumented.get('/api/internal/profile/stacks?seconds=0.05')
+
+        assert response.mimetype == 'text/plain'
+        assert 'MainThread;' in response.get_data(as_text=True)
+
+    def test_concurrent_stacks_capture_rejected(self, instrumented):
+        state = instrumented.application.extensions['panel_state']
+        with state.profile_capture:
+            response = instrumented.get('/api/internal/profile/stacks?seconds=0.05')
+
+        assert response.status_code == 409
+        assert not state.profiler.running
+
+
+# Test çalıştırma
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -3,38 +3,217 @@ Flask Web Application
 Monitoring & Logging Dashboard web uygulaması.
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Blueprint, current_app, g, render_template, jsonify, request
 from flask_socketio import SocketIO, emit
+from datetime import datetime, timezone
 import os
+import re
 import sys
+import time
 
 # Modül yolunu ekle
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.service_monitor import ServiceMonitor
-from core.log_collector import LogCollector, LogLevel
-from core.log_parser import LogParser
-from core.alert_manager import AlertManager, AlertType, AlertSeverity
+from config import config
+from core.encoding import (
+    CONTENT_TYPES, JSON, MSGPACK, MSGPACK_AVAILABLE, MSGPACK_MEDIA_TYPES,
+    encode_document, encode_items, iter_document
+)
+from core.instrumentation import instruments
+from core.log_collector import LogLevel
+from core.log_query import QueryError, compile_query, execute as execute_query
+from web.state import PanelState
+from web.prometheus import CONTENT_TYPE as PROMETHEUS_CONTENT_TYPE
 
-# Flask uygulaması
-app = Flask(__name__, 
-            template_folder='templates',
-            static_folder='static')
-app.config['SECRET_KEY'] = 'monitoring-logging-secret-key'
+# Route'lar blueprint üzerinde tanımlanır, uygulama create_app ile kurulur
+bp = Blueprint('panel', __name__)
 
-# SocketIO
-socketio = SocketIO(app, cors_allowed_origins="*")
+# SocketIO (uygulamaya create_app içinde bağlanır)
+socketio = SocketIO()
 
-# Core modüller
-service_monitor = ServiceMonitor()
-log_collector = LogCollector()
-log_parser = LogParser()
-alert_manager = AlertManager()
+
+def get_state() -> PanelState:
+    """Aktif uygulamanın paylaşılan durumunu döndür"""
+    return current_app.extensions['panel_state']
+
+
+def create_app(state: PanelState = None, async_mode: str = None, start: bool = False) -> Flask:
+    """
+    Flask uygulamasını oluştur.
+    
+    Args:
+        state: Paylaşılan durum (None ise yapılandırmadan oluşturulur)
+        async_mode: SocketIO async modu (None ise otomatik)
+        start: Arka plan toplayıcılarını hemen başlat
+        
+    Returns:
+        Flask uygulaması
+    """
+    app = Flask(__name__, 
+                template_folder='templates',
+                static_folder='static')
+    app.config['SECRET_KEY'] = os.environ.get('MONITOR_SECRET_KEY', 'monitoring-logging-secret-key')
+    
+    state = state or PanelState()
+    app.extensions['panel_state'] = state
+    app.register_blueprint(bp)
+    
+    socketio.init_app(
+        app,
+        cors_allowed_origins="*",
+        async_mode=async_mode,
+        message_queue=config.message_queue or None
+    )
+    
+    # Yeni host örneklerini WebSocket istemcilerine ilet
+    state.system_metrics.add_callback(
+        lambda metrics: socketio.emit('system_update', metrics.to_dict())
+    )
+    # Servis geçişlerini (durdu/geri geldi/yeniden başladı) anında ilet
+    state.transitions.add_callback(
+        lambda events: socketio.emit('service_transitions', {
+            'transitions': [event.to_dict() for event in events],
+            'last_id': events[-1].id
+        })
+    )
+    
+    if start:
+        state.start()
+    
+    return app
+
+
+# ===== Conditional GET =====
+
+def _is_fresh(etag: str, last_modified: datetime) -> bool:
+    """İstemcinin önbellekteki kopyası güncel mi (If-None-Match / If-Modified-Since)"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def _conditional(etag: str, last_modified: datetime, build, fmt: str = None):
+    """
+    Koşullu GET yanıtı üret.
+    
+    İstemcinin kopyası güncelse gövde hiç oluşturulmadan 304 döner;
+    aksi halde build() çağrılır. Her iki durumda da ETag ve
+    Last-Modified başlıkları eklenir. fmt verilirse (Accept ile seçilen
+    kodlama) JSON dışındaki kodlamalar ayrı ETag alır.
+    """
+    if fmt is not None and fmt != JSON:
+        etag = f"{etag}-{fmt}"
+    fresh = _is_fresh(etag, last_modified)
+    instruments.cache("conditional_get", fresh)
+    if fresh:
+        response = current_app.response_class(status=304)
+    else:
+        response = build()
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    if fmt is not None:
+        response.vary.add('Accept')
+    return response
+
+
+def _response_format() -> str:
+    """
+    Accept başlığına göre yanıt kodlaması.
+    
+    MessagePack yalnızca açıkça istenirse ve msgpack kuruluysa seçilir.
+    """
+    if not MSGPACK_AVAILABLE:
+        return JSON
+    best = request.accept_mimetypes.best_match((CONTENT_TYPES[JSON],) + MSGPACK_MEDIA_TYPES)
+    return MSGPACK if best in MSGPACK_MEDIA_TYPES else JSON
+
+
+def _encoded_response(body, fmt: str = JSON):
+    """
+    Önceden kodlanmış gövdeden (bayt veya bayt parçaları üreteci) yanıt oluştur.
+    
+    Üreteç verilirse yanıt parça parça gönderilir.
+    """
+    response = current_app.response_class(body, mimetype=CONTENT_TYPES[fmt])
+    response.vary.add('Accept')
+    return response
+
+
+def _since_version(state: PanelState):
+    """
+    ?since_version= parametresi.
+    
+    Farklı bir süreçten (epoch) alınmış sürümler için None döner;
+    bu durumda tam yanıt gönderilir.
+    """
+    since = request.args.get('since_version', None, type=int)
+    epoch = request.args.get('epoch', None)
+    if since is None or (epoch and epoch != state.epoch):
+        return None
+    return since
+
+
+def _since_timestamp():
+    """
+    ?since= parametresi (ISO 8601 zaman damgası).
+    
+    Saat dilimi içeren değerler yerel saate çevrilir (journalctl
+    --since yerel saat bekler). Geçersiz değerler yok sayılır.
+    """
+    value = request.args.get('since', None)
+    if not value:
+        return None
+    try:
+        since = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if since.tzinfo is not None:
+        since = since.astimezone().replace(tzinfo=None)
+    return since
+
+
+# ?status= değerleri; bilinmeyenler filtresiz sayılır (görüntü önbelleği anahtarı sınırlı kalır)
+SERVICE_FILTERS = ('running', 'stopped', 'failed', 'critical')
+
+
+def _filter_services(services, filter_status):
+    """Servis listesini duruma göre filtrele"""
+    if filter_status == 'running':
+        return [s for s in services if s.status.value == 'running']
+    elif filter_status == 'stopped':
+        return [s for s in services if s.status.value == 'stopped']
+    elif filter_status == 'failed':
+        return [s for s in services if s.status.value == 'failed']
+    elif filter_status == 'critical':
+        return [s for s in services if s.is_critical]
+    return services
+
+
+# ===== Request timing =====
+
+@bp.before_app_request
+def _start_request_timer():
+    if instruments.enabled:
+        g.request_started = time.perf_counter()
+
+
+@bp.after_app_request
+def _record_request_time(response):
+    """Route başına gecikme histogramı ve durum kodu sayacı"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        rule = request.url_rule.rule if request.url_rule else 'unmatched'
+        instruments.record(f"route.{rule}", time.perf_counter() - started)
+        instruments.increment(f"route.{rule}.status.{response.status_code}")
+    return response
 
 
 # ===== HTML Routes =====
 
-@app.route('/')
+@bp.route('/')
 def index():
     """Ana sayfa"""
     return render_template('index.html')
@@ -42,61 +221,130 @@ def index():
 
 # ===== API Routes =====
 
-@app.route('/api/status')
+@bp.route('/api/status')
 def api_status():
     """Sistem durumu"""
+    state = get_state()
     return jsonify({
         'status': 'ok',
-        'platform': service_monitor.platform,
+        'platform': state.service_monitor.platform,
         'version': '1.0.0'
     })
 
 
-@app.route('/api/services')
+@bp.route('/api/services')
 def api_services():
     """Servis listesi"""
+    state = get_state()
     filter_status = request.args.get('status', None)
+    if filter_status not in SERVICE_FILTERS:
+        filter_status = None
+    snapshot = state.snapshots.get()
+    since = _since_version(state)
+    fmt = _response_format()
     
-    services = service_monitor.get_all_services()
+    def build():
+        if since is not None and since <= snapshot.version and \
+                since >= snapshot.version - state.snapshots.REMOVED_HISTORY:
+            # Delta: yalnızca değişen servisler; filtreden çıkanlar 'removed'a eklenir
+            changed, removed = snapshot.services_since(since)
+            matching = _filter_services(changed, filter_status)
+            matched_names = {s.name for s in matching}
+            removed += [s.name for s in changed if s.name not in matched_names]
+            return _encoded_response(encode_document({
+                'services': encode_items(matching, fmt),
+                'removed': removed,
+                'count': len(matching),
+                'delta': True,
+                'version': snapshot.version,
+                'epoch': state.epoch
+            }, fmt), fmt)
+        
+        def serialize():
+            # Servis parçaları görüntü başına bir kez kodlanır; filtreler aynı parçaları paylaşır
+            services = _filter_services(snapshot.services, filter_status)
+            return encode_document({
+                'services': encode_items(services, fmt),
+                'count': len(services),
+                'delta': False,
+                'version': snapshot.version,
+                'epoch': state.epoch
+            }, fmt)
+        
+        return _encoded_response(snapshot.cached(('services', filter_status, fmt), serialize), fmt)
     
-    # Duruma göre filtrele
-    if filter_status == 'running':
-        services = [s for s in services if s.status.value == 'running']
-    elif filter_status == 'stopped':
-        services = [s for s in services if s.status.value == 'stopped']
-    elif filter_status == 'failed':
-        services = [s for s in services if s.status.value == 'failed']
-    elif filter_status == 'critical':
-        services = [s for s in services if s.is_critical]
-    
-    return jsonify({
-        'services': [s.to_dict() for s in services],
-        'count': len(services)
-    })
+    return _conditional(f"{state.epoch}-s{snapshot.version}", snapshot.last_modified, build, fmt)
 
 
-@app.route('/api/services/summary')
+@bp.route('/api/services/summary')
 def api_services_summary():
     """Servis özeti"""
-    return jsonify(service_monitor.get_service_summary())
+    state = get_state()
+    snapshot = state.snapshots.get()
+    return _conditional(
+        f"{state.epoch}-s{snapshot.version}",
+        snapshot.last_modified,
+        lambda: jsonify(snapshot.service_summary)
+    )
+
+
+@bp.route('/api/services/transitions')
+def api_services_transitions():
+    """Son servis geçişleri (?since=<id> ile yalnızca yeniler)"""
+    state = get_state()
+    state.snapshots.get()
+    since = request.args.get('since', 0, type=int)
+    limit = request.args.get('limit', 100, type=int)
+    service = request.args.get('service') or None
+    transitions = state.transitions.get_transitions(since=since, service=service, limit=limit)
+    return jsonify({
+        'transitions': transitions,
+        'count': len(transitions),
+        'last_id': state.transitions.last_id
+    })
+
+
+@bp.route('/api/services/uptime')
+def api_services_uptime():
+    """Servis başına çalışma oranı, geçiş ve dalgalanma istatistiği"""
+    state = get_state()
+    state.snapshots.get()
+    limit = request.args.get('limit', 0, type=int)
+    sort = request.args.get('sort', 'transitions')
+    service = request.args.get('service') or None
+    return jsonify({
+        'services': state.transitions.get_uptime(service=service, limit=limit, sort=sort),
+        'statistics': state.transitions.get_stats()
+    })
 
 
-@app.route('/api/services/<service_name>')
+@bp.route('/api/services/<path:service_name>')
 def api_service_detail(service_name):
-    """Servis detayı"""
-    service = service_monitor.get_service_status(service_name)
+    """Servis detayı (aggregator modunda ad 'host/servis' biçimindedir)"""
+    state = get_state()
+    service = state.service_monitor.get_service_status(service_name)
     if service:
         return jsonify(service.to_dict())
     return jsonify({'error': 'Service not found'}), 404
 
 
-@app.route('/api/logs')
+@bp.route('/api/logs')
 def api_logs():
     """Log listesi"""
+    state = get_state()
     limit = request.args.get('limit', 100, type=int)
     level = request.args.get('level', None)
     service = request.args.get('service', None)
     search = request.args.get('search', None)
+    since = _since_timestamp()
+    query = request.args.get('q', None)
+    archive = request.args.get('archive', 'false').lower() == 'true'
+    
+    if archive and state.log_archive is None:
+        return jsonify({'error': 'Log archive disabled'}), 404
+    
+    if query:
+        return _query_logs(state, query, limit, archive=archive)
     
     # Seviye filtresi
     log_level = None
@@ -109,93 +357,354 @@ def api_logs():
         }
         log_level = level_map.get(level.lower())
     
-    logs = log_collector.get_logs(limit=limit, level=log_level, service=service)
+    collector = state.log_collector
+    if archive:
+        # Sıkıştırılmış arşiv: log_retention_days gün geriye gider
+        logs = state.log_archive.query(limit=limit, level=log_level, service=service, since=since)
+        if search:
+            logs = state.log_parser.filter_by_keyword(logs, search)
+    elif search and collector.supports_field_matches:
+        # Arama journal'a --grep olarak itilir; limit eşleşme bulunana kadar okunur
+        needle = search.lower()
+        logs = list(collector.iter_logs(
+            limit=limit, level=log_level, service=service, since=since,
+            grep=re.escape(search), predicate=lambda log: needle in log.message.lower(),
+            max_scan=state.config.log_query_scan_limit
+        ))
+    else:
+        logs = collector.get_logs(limit=limit, level=log_level, service=service, since=since)
+        
+        # Arama filtresi
+        if search:
+            logs = state.log_parser.filter_by_keyword(logs, search)
     
-    # Arama filtresi
-    if search:
-        logs = log_parser.filter_by_keyword(logs, search)
+    # Kayıtlar değişmez; parçalar kayıt üzerinde önbelleklenir ve yanıt akış halinde gönderilir
+    fmt = _response_format()
+    return _encoded_response(iter_document({
+        'logs': state.log_parser.encode(logs, fmt),
+        'count': len(logs),
+        'delta': since is not None,
+        'statistics': state.log_parser.get_statistics(logs)
+    }, fmt), fmt)
+
+
+def _query_logs(state: PanelState, text: str, limit: int, archive: bool = False):
+    """?q= sorgusu: plan bir kez derlenir, filtreler journalctl'e (veya arşive) itilir"""
+    try:
+        plan = compile_query(text)
+    except QueryError as e:
+        return jsonify({'error': f'Invalid query: {e}'}), 400
     
-    return jsonify({
-        'logs': log_parser.to_json(logs),
+    if archive:
+        outcome = execute_query(plan, state.log_archive.iter_logs, limit=limit,
+                                scan_limit=state.config.log_query_scan_limit)
+    else:
+        outcome = execute_query(plan, state.log_collector.iter_logs, limit=limit,
+                                scan_limit=state.config.log_query_scan_limit,
+                                field_matches=state.log_collector.supports_field_matches)
+    if plan.aggregate:
+        return jsonify({
+            'result': outcome['result'],
+            'scanned': outcome['scanned'],
+            'plan': plan.explain()
+        })
+    
+    logs = outcome['logs']
+    fmt = _response_format()
+    return _encoded_response(iter_document({
+        'logs': state.log_parser.encode(logs, fmt),
         'count': len(logs),
-        'statistics': log_parser.get_statistics(logs)
-    })
+        'scanned': outcome['scanned'],
+        'plan': plan.explain(),
+        'statistics': state.log_parser.get_statistics(logs)
+    }, fmt), fmt)
 
 
-@app.route('/api/logs/statistics')
+@bp.route('/api/logs/statistics')
 def api_logs_statistics():
     """Log istatistikleri"""
-    logs = log_collector.get_logs(limit=100)
-    return jsonify(log_parser.get_statistics(logs))
+    state = get_state()
+    return jsonify(state.snapshots.get().log_stats)
+
+
+@bp.route('/api/logs/templates')
+def api_logs_templates():
+    """En sık / en hızlı log şablonları"""
+    state = get_state()
+    # Şablonlar görüntü turlarında beslenir; gerekirse yeni tur tetiklenir
+    state.snapshots.get()
+    miner = state.templates
+    limit = request.args.get('limit', 20, type=int)
+    sort = request.args.get('sort', 'count')
+    service = request.args.get('service', None)
+    level = request.args.get('level', None)
+    version = miner.version
+    # Şablon hızları yeni kayıt gelmese de dakika kovası ilerledikçe değişir;
+    # kova ETag'e ve Last-Modified'a katılır, gövde aynı `now` ile üretilir
+    now = time.time()
+    minute = int(now // 60)
+    last_modified = max(miner.last_modified, datetime.fromtimestamp(minute * 60, timezone.utc))
+    
+    def build():
+        templates = miner.top(limit=limit, sort=sort, service=service,
+                              level=level.upper() if level else None, now=now)
+        return jsonify({
+            'templates': templates,
+            'count': len(templates),
+            'statistics': miner.get_stats(),
+            'rate_window_minutes': miner.rate_window
+        })
+    
+    return _conditional(f"{state.epoch}-t{version}-m{minute}", last_modified, build)
+
+
+@bp.route('/api/logs/top')
+def api_logs_top():
+    """En gürültülü servisler/şablonlar ve farklı kaynak/host sayıları (sketch'lerden)"""
+    state = get_state()
+    state.snapshots.get()
+    sketches = state.sketches
+    seconds = request.args.get('seconds', None, type=float)
+    limit = request.args.get('limit', 10, type=int)
+    summary = sketches.summary(seconds=seconds, limit=limit)
+    for item in summary['templates']:
+        if isinstance(item['template'], int):
+            item['id'] = item['template']
+            item['template'] = state.templates.template_text(item['id'])
+    summary['statistics'] = sketches.get_stats()
+    return jsonify(summary)
+
+
+@bp.route('/api/logs/anomalies')
+def api_logs_anomalies():
+    """Servis/seviye log hızı serileri (beklenenden en çok sapanlar önce)"""
+    state = get_state()
+    if state.anomalies is None:
+        return jsonify({'error': 'Anomaly detection disabled'}), 404
+    state.snapshots.get()
+    limit = request.args.get('limit', 20, type=int)
+    return jsonify({
+        'series': state.anomalies.get_series(limit=limit),
+        'statistics': state.anomalies.get_stats()
+    })
+
+
+@bp.route('/api/logs/ingest')
+def api_logs_ingest():
+    """Alım yöneticisi sayaçları (örneklenen/atılan kayıtlar)"""
+    state = get_state()
+    if state.governor is None:
+        return jsonify({'error': 'Ingest governor disabled'}), 404
+    limit = request.args.get('limit', 10, type=int)
+    return jsonify(state.governor.get_stats(limit=limit))
+
+
+@bp.route('/api/logs/archive')
+def api_logs_archive():
+    """Sıkıştırılmış log arşivi: kayıt sayıları ve sıkıştırma oranı"""
+    state = get_state()
+    if state.log_archive is None:
+        return jsonify({'error': 'Log archive disabled'}), 404
+    statistics = state.log_archive.get_statistics()
+    time_range = state.log_archive.time_range()
+    statistics['range'] = {
+        'start': time_range[0].isoformat(),
+        'end': time_range[1].isoformat()
+    } if time_range else None
+    return jsonify(statistics)
+
+
+@bp.route('/api/system')
+def api_system():
+    """Host metrikleri (son örnek)"""
+    state = get_state()
+    metrics = state.system_metrics.get_latest() or state.system_metrics.sample()
+    if metrics is None:
+        return jsonify({'error': 'Metrics unavailable'}), 503
+    return jsonify(metrics.to_dict())
+
+
+@bp.route('/api/system/history')
+def api_system_history():
+    """Host metrikleri geçmişi"""
+    state = get_state()
+    limit = request.args.get('limit', None, type=int)
+    history = state.system_metrics.get_history(limit=limit)
+    return jsonify({
+        'history': [m.to_dict() for m in history],
+        'count': len(history),
+        'interval': state.system_metrics.interval
+    })
+
+
+@bp.route('/api/hosts')
+def api_hosts():
+    """Aggregator modunda bağlı agent'lar"""
+    state = get_state()
+    if state.hosts is None:
+        return jsonify({'error': 'Not running in aggregator mode'}), 404
+    hosts = state.hosts.get_hosts()
+    return jsonify({
+        'hosts': [h.to_dict() for h in hosts],
+        'count': len(hosts),
+        'connected': len([h for h in hosts if h.connected])
+    })
 
 
-@app.route('/api/alerts')
+@bp.route('/api/alerts')
 def api_alerts():
     """Uyarı listesi"""
+    state = get_state()
+    manager = state.alert_manager
     active_only = request.args.get('active', 'true').lower() == 'true'
+    # Sürüm içerikten önce okunur; yanıt en az bu sürüm kadar günceldir
+    version = manager.version
+    last_modified = manager.last_modified
+    since = _since_version(state)
+    fmt = _response_format()
     
-    if active_only:
-        alerts = alert_manager.get_active_alerts()
-    else:
-        alerts = alert_manager.alerts
+    def encode_alerts(alerts):
+        return encode_items(alerts, fmt, version=lambda alert: alert.version)
     
-    return jsonify({
-        'alerts': [a.to_dict() for a in alerts],
-        'count': len(alerts),
-        'summary': alert_manager.get_alert_summary()
-    })
+    def build():
+        if since is not None and since <= version:
+            alerts, removed = manager.get_alerts_since(since, active_only=active_only)
+            if removed is not None:
+                return _encoded_response(encode_document({
+                    'alerts': encode_alerts(alerts),
+                    'removed': removed,
+                    'count': len(alerts),
+                    'summary': manager.get_alert_summary(),
+                    'delta': True,
+                    'version': version,
+                    'epoch': state.epoch
+                }, fmt), fmt)
+        
+        if active_only:
+            alerts = manager.get_active_alerts()
+        else:
+            alerts = manager.alerts
+        
+        return _encoded_response(encode_document({
+            'alerts': encode_alerts(alerts),
+            'count': len(alerts),
+            'summary': manager.get_alert_summary(),
+            'delta': False,
+            'version': version,
+            'epoch': state.epoch
+        }, fmt), fmt)
+    
+    return _conditional(f"{state.epoch}-a{version}", last_modified, build, fmt)
 
 
-@app.route('/api/alerts/<alert_id>/acknowledge', methods=['POST'])
+@bp.route('/api/alerts/<alert_id>/acknowledge', methods=['POST'])
 def api_acknowledge_alert(alert_id):
     """Uyarıyı onayla"""
-    if alert_manager.acknowledge_alert(alert_id):
+    state = get_state()
+    if state.alert_manager.acknowledge_alert(alert_id):
         return jsonify({'success': True})
     return jsonify({'error': 'Alert not found'}), 404
 
 
-@app.route('/api/alerts/<alert_id>/resolve', methods=['POST'])
+@bp.route('/api/alerts/<alert_id>/resolve', methods=['POST'])
 def api_resolve_alert(alert_id):
     """Uyarıyı çöz"""
-    if alert_manager.resolve_alert(alert_id):
+    state = get_state()
+    if state.alert_manager.resolve_alert(alert_id):
         return jsonify({'success': True})
     return jsonify({'error': 'Alert not found'}), 404
 
 
-@app.route('/api/dashboard')
+@bp.route('/api/dashboard')
 def api_dashboard():
     """Dashboard özeti"""
-    # Servis özeti
-    service_summary = service_monitor.get_service_summary()
-    
-    # Log istatistikleri
-    logs = log_collector.get_logs(limit=100)
-    log_stats = log_parser.get_statistics(logs)
-    
-    # Uyarı özeti
-    alert_summary = alert_manager.get_alert_summary()
-    
-    # Kritik servis kontrolü
-    critical_down = service_monitor.get_critical_down_services()
-    for service in critical_down:
-        alert_manager.check_service_status(
-            service.name, 
-            is_running=False, 
-            is_critical=True
-        )
+    state = get_state()
+    snapshot = state.snapshots.get()
+    alert_version = state.alert_manager.version
     
-    # Hata oranı kontrolü
-    alert_manager.check_error_rate(
-        log_stats.get('error_count', 0),
-        log_stats.get('total', 1)
-    )
+    # Host metrikleri her örnekte değişir; ?system=false ile dışarıda
+    # bırakıldığında ETag yalnızca servis/log/uyarı durumuna bağlıdır
+    include_system = request.args.get('system', 'true').lower() == 'true'
+    metrics = state.system_metrics.get_latest() if include_system else None
     
-    return jsonify({
-        'services': service_summary,
-        'logs': log_stats,
-        'alerts': alert_summary,
-        'platform': service_monitor.platform
-    })
+    etag = f"{state.epoch}-s{snapshot.version}-a{alert_version}"
+    last_modified = max(snapshot.last_modified, state.alert_manager.last_modified)
+    if metrics:
+        etag += f"-m{metrics.timestamp}"
+        last_modified = max(last_modified, datetime.fromtimestamp(int(metrics.timestamp), timezone.utc))
+    
+    def build():
+        data = {
+            'services': snapshot.service_summary,
+            'logs': snapshot.log_stats,
+            'alerts': state.alert_manager.get_alert_summary(),
+            'platform': state.service_monitor.platform,
+            'version': snapshot.version,
+            'alert_version': alert_version,
+            'epoch': state.epoch
+        }
+        if include_system:
+            data['system'] = metrics.to_dict() if metrics else None
+        return jsonify(data)
+    
+    return _conditional(etag, last_modified, build)
+
+
+@bp.route('/metrics')
+def metrics():
+    """Prometheus metrikleri (önbellekteki anlık görüntüden; toplama tetiklemez)"""
+    state = get_state()
+    return current_app.response_class(state.exporter.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+# ===== Internal =====
+
+@bp.route('/api/internal/profile')
+def api_internal_profile():
+    """Sıcak yol histogramları, sayaçlar ve önbellek isabet oranları"""
+    state = get_state()
+    if not state.config.instrumentation:
+        return jsonify({'error': 'Instrumentation disabled'}), 404
+    report = state.instruments.get_report()
+    report['profiler'] = {
+        'running': state.profiler.running,
+        'samples': state.profiler.samples,
+        'interval': state.profiler.interval
+    }
+    return jsonify(report)
+
+
+# İstek sırasında örnekleme süresi üst sınırı (worker thread'i bu kadar meşgul kalır)
+PROFILE_CAPTURE_MAX = 10.0
+
+
+@bp.route('/api/internal/profile/stacks')
+def api_internal_profile_stacks():
+    """
+    Örnekleyici profiler'ın katlanmış yığınları (flamegraph girdisi).
+    
+    Profiler sürekli çalışmıyorsa istek ?seconds= (en fazla
+    PROFILE_CAPTURE_MAX) boyunca örnekleyip o aralığın yığınlarını
+    döndürür. Aynı anda tek örnekleme yapılır; başka bir istek
+    örnekleme yaparken 409 döner (reset/stop birbirinin verisini silmez).
+    """
+    state = get_state()
+    if not state.config.instrumentation:
+        return jsonify({'error': 'Instrumentation disabled'}), 404
+    profiler = state.profiler
+    if not state.profile_capture.acquire(blocking=False):
+        return jsonify({'error': 'Profile capture already running'}), 409
+    try:
+        if not profiler.running:
+            seconds = min(max(request.args.get('seconds', 5.0, type=float), 0.0), PROFILE_CAPTURE_MAX)
+            profiler.reset()
+            profiler.start()
+            time.sleep(seconds)
+            profiler.stop()
+        stacks = profiler.collapsed()
+    finally:
+        state.profile_capture.release()
+    return current_app.response_class(stacks, mimetype='text/plain')
 
 
 # ===== WebSocket Events =====
@@ -209,14 +718,43 @@ def handle_connect():
 @socketio.on('request_update')
 def handle_request_update():
     """Güncel veri talebi"""
+    state = get_state()
+    metrics = state.system_metrics.get_latest()
     emit('dashboard_update', {
-        'services': service_monitor.get_service_summary(),
-        'alerts': alert_manager.get_alert_summary()
+        'services': state.snapshots.get().service_summary,
+        'alerts': state.alert_manager.get_alert_summary(),
+        'system': metrics.to_dict() if metrics else None
     })
 
 
-def run_server(host='0.0.0.0', port=5000, debug=False):
-    """Sunucuyu başlat"""
+def run_server(host='0.0.0.0', port=5000, debug=False, mode=None, workers=None, threads=None,
+               state_factory=None):
+    """
+    Sunucuyu başlat.
+    
+    Args:
+        mode: 'dev' (Werkzeug geliştirme sunucusu) veya 'production'
+            (gunicorn gthread worker'ları); None ise config.server_mode
+        workers: Worker süreç sayısı (production; yalnızca 1)
+        threads: Worker başına thread sayısı (production)
+        state_factory: PanelState üreten fonksiyon (None ise yapılandırmadan);
+            production modunda her worker içinde çağrılır
+    """
+    mode = mode or config.server_mode
+    make_state = state_factory or (lambda: None)
+    
+    if mode == 'production':
+        from web.server import run_production_server
+        run_production_server(
+            app_factory=lambda: create_app(state=make_state(), async_mode='threading', start=True),
+            host=host,
+            port=port,
+            workers=workers or config.workers,
+            threads=threads or config.threads
+        )
+        return
+    
+    app = create_app(state=make_state(), start=True)
     socketio.run(app, host=host, port=port, debug=debug, allow_unsafe_werkzeug=True)
 
 
@@ -0,0 +1,163 @@
+"""
+Prometheus Exporter Module
+/metrics için Prometheus metin formatı (0.0.4) üretimi.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from core.service_monitor import ServiceStatus
+from core.alert_manager import AlertSeverity
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Metrik adı öneki
+PREFIX = "monitor"
+
+
+def escape_label(value: str) -> str:
+    """Etiket değerini metin formatına göre kaçışla"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _header(lines: List[str], name: str, kind: str, help_text: str):
+    lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+    lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+
+
+class PrometheusExporter:
+    """
+    Paylaşılan durumdan Prometheus çıktısı üretir.
+
+    Çıktı üç parçadan oluşur: servis/log bölümü anlık görüntü sürümüne,
+    uyarı bölümü AlertManager sürümüne göre önbelleğe alınır ve yalnızca
+    sürüm değiştiğinde yeniden üretilir. Her istekte yalnızca birkaç
+    satırlık zamanlama ve geçiş sayacı bölümü biçimlendirilir. Hiçbir
+    zaman toplama (systemctl/journalctl) tetiklenmez.
+    """
+
+    def __init__(self, state):
+        """
+        Args:
+            state: PanelState
+        """
+        self.state = state
+        self._lock = threading.Lock()
+        self._snapshot_part: Tuple[Optional[int], bytes] = (None, b"")
+        self._alert_part: Tuple[Optional[int], bytes] = (None, b"")
+        self.renders = 0
+
+    def render(self) -> bytes:
+        """Güncel metrikleri metin formatında döndür"""
+        snapshot = self.state.snapshots.current
+        manager = self.state.alert_manager
+
+        with self._lock:
+            version = snapshot.version if snapshot else 0
+            if self._snapshot_part[0] != version:
+                self._snapshot_part = (version, self._render_snapshot(snapshot))
+                self.renders += 1
+            if self._alert_part[0] != manager.version:
+                # Sürüm içerikten önce okunur; araya giren değişiklik bir sonraki istekte yakalanır
+                alert_version = manager.version
+                self._alert_part = (alert_version, self._render_alerts())
+                self.renders += 1
+            snapshot_part = self._snapshot_part[1]
+            alert_part = self._alert_part[1]
+
+        return snapshot_part + alert_part + self._render_timings()
+
+    def _render_snapshot(self, snapshot) -> bytes:
+        """Servis durumları ve log sayaçları (sürüm başına bir kez)"""
+        lines: List[str] = []
+        if snapshot is None:
+            return b""
+
+        _header(lines, "service_state", "gauge",
+                "Service state (1 for the current state, 0 otherwise).")
+        states = [s.value for s in ServiceStatus]
+        for service in snapshot.services:
+            name = escape_label(service.name)
+            for value in states:
+                current = 1 if service.status.value == value else 0
+                lines.append(f'{PREFIX}_service_state{{service="{name}",state="{value}"}} {current}')
+
+        _header(lines, "service_critical", "gauge", "Whether the service is marked as critical.")
+        for service in snapshot.services:
+            if service.is_critical:
+                lines.append(f'{PREFIX}_service_critical{{service="{escape_label(service.name)}"}} 1')
+
+        _header(lines, "services", "gauge", "Number of services by state.")
+        summary = snapshot.service_summary
+        for value in ("running", "stopped", "failed"):
+            lines.append(f'{PREFIX}_services{{state="{value}"}} {summary.get(value, 0)}')
+        lines.append(f'{PREFIX}_services{{state="critical_down"}} {summary.get("critical_down", 0)}')
+
+        _header(lines, "log_entries_total", "counter", "Log entries seen since start, by level.")
+        for level, count in sorted(snapshot.log_totals.items()):
+            lines.append(f'{PREFIX}_log_entries_total{{level="{level.lower()}"}} {count}')
+
+        _header(lines, "log_window_entries", "gauge", "Log entries in the latest snapshot window, by level.")
+        for level, count in sorted(snapshot.log_stats.get("by_level", {}).items()):
+            lines.append(f'{PREFIX}_log_window_entries{{level="{level.lower()}"}} {count}')
+
+        _header(lines, "snapshot_version", "gauge", "Version of the current service/log snapshot.")
+        lines.append(f"{PREFIX}_snapshot_version {snapshot.version}")
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+    def _render_alerts(self) -> bytes:
+        """Önem derecesine göre uyarı sayıları (uyarı sürümü başına bir kez)"""
+        manager = self.state.alert_manager
+        active: Dict[str, int] = {s.value: 0 for s in AlertSeverity}
+        unacknowledged = 0
+        for alert in manager.get_active_alerts():
+            active[alert.severity.value] += 1
+            if not alert.acknowledged:
+                unacknowledged += 1
+
+        lines: List[str] = []
+        _header(lines, "alerts_active", "gauge", "Unresolved alerts by severity.")
+        for severity, count in active.items():
+            lines.append(f'{PREFIX}_alerts_active{{severity="{severity}"}} {count}')
+        _header(lines, "alerts_unacknowledged", "gauge", "Unresolved alerts not yet acknowledged.")
+        lines.append(f"{PREFIX}_alerts_unacknowledged {unacknowledged}")
+        _header(lines, "alerts_created_total", "counter", "Alerts created since start.")
+        lines.append(f"{PREFIX}_alerts_created_total {manager.created_count}")
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+    def _render_timings(self) -> bytes:
+        """Toplama zamanlamaları ve host metrikleri (her istekte, birkaç satır)"""
+        snapshots = self.state.snapshots
+        metrics = self.state.system_metrics
+        lines: List[str] = []
+
+        _header(lines, "snapshot_collections_total", "counter", "Service/log snapshot collections.")
+        lines.append(f"{PREFIX}_snapshot_collections_total {snapshots.collections}")
+        _header(lines, "snapshot_collect_errors_total", "counter", "Failed snapshot collections.")
+        lines.append(f"{PREFIX}_snapshot_collect_errors_total {snapshots.collect_errors}")
+        _header(lines, "snapshot_collect_duration_seconds", "gauge",
+                "Duration of the last service/log collection.")
+        lines.append(f"{PREFIX}_snapshot_collect_duration_seconds {snapshots.last_collect_duration:.6f}")
+        _header(lines, "snapshot_age_seconds", "gauge", "Seconds since the last service/log collection.")
+        age = time.time() - snapshots.last_collected_at if snapshots.last_collected_at else -1
+        lines.append(f"{PREFIX}_snapshot_age_seconds {age:.3f}")
+
+        transitions = self.state.transitions.get_stats()
+        _header(lines, "service_transitions_total", "counter", "Service state transitions since start, by kind.")
+        for kind, count in sorted(transitions["by_kind"].items()):
+            lines.append(f'{PREFIX}_service_transitions_total{{kind="{kind}"}} {count}')
+        _header(lines, "service_flapping", "gauge", "Services currently flapping between up and down.")
+        lines.append(f"{PREFIX}_service_flapping {len(transitions['flapping'])}")
+
+        latest = metrics.get_latest()
+        _header(lines, "host_sample_duration_seconds", "gauge", "Duration of the last host metrics sample.")
+        lines.append(f"{PREFIX}_host_sample_duration_seconds {metrics.last_sample_duration:.6f}")
+        if latest is not None:
+            _header(lines, "host_cpu_percent", "gauge", "Host CPU utilisation.")
+            lines.append(f"{PREFIX}_host_cpu_percent {latest.cpu_percent}")
+            _header(lines, "host_memory_percent", "gauge", "Host memory utilisation.")
+            lines.append(f"{PREFIX}_host_memory_percent {latest.memory_percent}")
+            _header(lines, "host_disk_percent", "gauge", "Host disk utilisation.")
+            lines.append(f"{PREFIX}_host_disk_percent {latest.disk_percent}")
+        return ("\n".join(lines) + "\n").encode("utf-8")
@@ -0,0 +1,82 @@
+"""
+Production Server Module
+gunicorn tabanlı çok worker'lı sunucu modu.
+"""
+
+from typing import Callable
+
+try:
+    from gunicorn.app.base import BaseApplication
+    GUNICORN_AVAILABLE = True
+except ImportError:
+    BaseApplication = object
+    GUNICORN_AVAILABLE = False
+
+
+class PanelApplication(BaseApplication):
+    """
+    Uygulamayı gunicorn içinden çalıştıran sarmalayıcı.
+
+    Uygulama worker'da fork sonrasında app_factory ile oluşturulur;
+    böylece PanelState ve arka plan thread'leri worker sürecine aittir.
+    """
+
+    def __init__(self, app_factory: Callable, options: dict = None):
+        self.app_factory = app_factory
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key.lower(), value)
+
+    def load(self):
+        return self.app_factory()
+
+
+def run_production_server(app_factory: Callable,
+                          host: str = "0.0.0.0",
+                          port: int = 5000,
+                          workers: int = 1,
+                          threads: int = 64):
+    """
+    gunicorn gthread worker'ları ile sunucuyu başlat.
+
+    Toplayıcılar asyncio alt süreçleri kullandığından eventlet/gevent
+    monkey patching yerine gerçek thread'li worker'lar tercih edilir.
+    WebSocket bağlantıları simple-websocket ile bir thread'e bağlanır.
+
+    Yalnızca tek worker desteklenir: toplayıcı çıktısı, uyarılar ve
+    onay/çözüm durumu süreç içi PanelState'te tutulur ve süreçler arasında
+    paylaşılmaz. Eşzamanlılık --threads ile sağlanır.
+
+    Args:
+        app_factory: Flask uygulaması döndüren fabrika
+        workers: Worker süreç sayısı (yalnızca 1)
+        threads: Worker başına thread sayısı (eşzamanlı istek/bağlantı)
+    """
+    if not GUNICORN_AVAILABLE:
+        raise RuntimeError("Production mode requires gunicorn: pip install gunicorn")
+
+    workers = check_workers(workers)
+
+    options = {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "threads": threads,
+        "worker_class": "gthread",
+        # Dashboard istekleri journalctl/systemctl bekleyebilir
+        "timeout": 60,
+        "keepalive": 5,
+        "accesslog": None,
+    }
+    PanelApplication(app_factory, options).run()
+
+
+def check_workers(workers: int) -> int:
+    """Worker sayısını doğrula (durum süreçler arası paylaşılmadığından en fazla 1)"""
+    if workers > 1:
+        raise ValueError(f"Production mode supports a single worker (got {workers}); "
+                         "use --threads for concurrency")
+    return 1
@@ -0,0 +1,225 @@
+"""
+Panel State Module
+Web uygulamasının paylaşılan durumu (toplayıcılar ve yöneticiler).
+"""
+
+import dataclasses
+import os
+import sys
+import threading
+import uuid
+from typing import List
+
+# Modül yolunu ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config, config as default_config, load_config_file
+from core.service_monitor import ServiceMonitor
+from core.log_collector import LogCollector
+from core.log_parser import LogParser
+from core.alert_manager import AlertManager
+from core.anomaly_detector import RateAnomalyDetector
+from core.config_watcher import ConfigWatcher
+from core.ingest_governor import IngestGovernor
+from core.log_blocks import BlockLogStore
+from core.instrumentation import SamplingProfiler, instruments
+from core.system_metrics import SystemMetricsCollector
+from core.sketches import WindowedSketches
+from core.service_transitions import TransitionTracker
+from core.snapshot import SnapshotManager
+from core.template_miner import TemplateMiner
+from web.prometheus import PrometheusExporter
+
+
+class PanelState:
+    """
+    Bir uygulama örneğine ait toplayıcı ve yöneticileri bir arada tutar.
+
+    Modül seviyesindeki global nesnelerin yerini alır; her Flask
+    uygulaması (ve her gunicorn worker'ı) kendi PanelState örneğine sahiptir.
+    """
+
+    def __init__(self,
+                 config: Config = None,
+                 service_monitor: ServiceMonitor = None,
+                 log_collector: LogCollector = None,
+                 log_parser: LogParser = None,
+                 alert_manager: AlertManager = None,
+                 system_metrics: SystemMetricsCollector = None,
+                 hosts=None):
+        """
+        PanelState başlatıcı. Verilmeyen bileşenler yapılandırmadan oluşturulur.
+
+        Args:
+            config: Uygulama yapılandırması (None ise global config)
+            hosts: Aggregator modunda agent kayıtları (HostRegistry)
+        """
+        self.config = config or default_config
+        # Ölçülen kilitler bileşenler kurulurken seçildiği için önce açılır
+        if self.config.instrumentation:
+            instruments.enable()
+        self.instruments = instruments
+        self.profiler = SamplingProfiler(interval=self.config.profiler_interval)
+        # İstek sırasında yapılan örneklemeler sıraya girmez, aynı anda tek örnekleme
+        self.profile_capture = threading.Lock()
+        self.service_monitor = service_monitor or ServiceMonitor(
+            custom_critical_services=self.config.critical_services
+        )
+        self.log_collector = log_collector or LogCollector(
+            cursor_file=self.config.log_cursor_file or None,
+            cursor_interval=self.config.log_cursor_interval
+        )
+        self.log_parser = log_parser or LogParser()
+        self.alert_manager = alert_manager or AlertManager(
+            error_threshold=self.config.error_threshold,
+            warning_threshold=self.config.warning_threshold,
+            cpu_threshold=self.config.cpu_threshold,
+            memory_threshold=self.config.memory_threshold,
+            disk_threshold=self.config.disk_threshold
+        )
+        self.system_metrics = system_metrics or SystemMetricsCollector(
+            interval=self.config.metrics_interval,
+            history_size=self.config.metrics_history_size
+        )
+        self.system_metrics.add_callback(
+            lambda metrics: self.alert_manager.check_system_metrics(metrics.to_dict())
+        )
+        self.anomalies = RateAnomalyDetector(
+            self.alert_manager,
+            interval=self.config.anomaly_interval,
+            alpha=self.config.anomaly_alpha,
+            threshold=self.config.anomaly_threshold,
+            max_series=self.config.anomaly_max_series
+        ) if self.config.anomaly_detection else None
+        self.governor = IngestGovernor(
+            rate=self.config.ingest_rate,
+            burst=self.config.ingest_burst,
+            reservoir_size=self.config.ingest_reservoir
+        ) if self.config.ingest_governor else None
+        self.transitions = TransitionTracker(
+            self.alert_manager,
+            flap_window=self.config.flap_window,
+            flap_threshold=self.config.flap_threshold,
+            history=self.config.transition_history
+        )
+        self.snapshots = SnapshotManager(
+            self.service_monitor,
+            self.log_collector,
+            self.log_parser,
+            self.alert_manager,
+            interval=self.config.snapshot_interval,
+            anomaly_detector=self.anomalies,
+            governor=self.governor,
+            transitions=self.transitions
+        )
+        self.templates = TemplateMiner(
+            depth=self.config.template_depth,
+            similarity=self.config.template_similarity,
+            max_clusters=self.config.template_max_clusters
+        )
+        self.snapshots.add_log_callback(self.templates.add_entries)
+        # Şablon id'leri atandıktan sonra çağrılmalı
+        self.sketches = WindowedSketches(
+            window=self.config.sketch_window,
+            windows=self.config.sketch_windows,
+            k=self.config.sketch_top_k
+        )
+        self.snapshots.add_log_callback(self.sketches.add_entries)
+        self.log_archive = BlockLogStore(
+            block_size=self.config.log_archive_block_size,
+            retention_days=self.config.log_retention_days
+        ) if self.config.log_archive else None
+        if self.log_archive is not None:
+            self.snapshots.add_log_callback(self.log_archive.add_entries)
+        self.hosts = hosts
+        self.exporter = PrometheusExporter(self)
+        # Sürüm numaraları süreç başına sıfırdan başlar; ETag'lere eklenen
+        # epoch farklı süreçlerin (yeniden başlatma, gunicorn worker'ları)
+        # aynı sürüm numaralarının karışmasını önler
+        self.epoch = uuid.uuid4().hex[:8]
+        # Dosya değerleri env/CLI ile kurulan temel yapılandırmanın üzerine uygulanır
+        self.base_config = dataclasses.replace(
+            self.config, critical_services=list(self.config.critical_services))
+        self.config_watcher = ConfigWatcher(
+            self.config.config_file,
+            load=lambda path: load_config_file(path, self.base_config),
+            apply=self.apply_config,
+            poll_interval=self.config.config_poll_interval
+        ) if self.config.config_file else None
+        if self.config_watcher is not None:
+            self.config_watcher.reload()
+        self._started = False
+
+    # Değişince bileşenlere aktarılan veya istek sırasında okunan alanlar;
+    # diğerleri (port, worker sayısı, geçmiş boyutları...) yeniden başlatma gerektirir
+    HOT_RELOAD_FIELDS = frozenset({
+        "critical_services", "error_threshold", "warning_threshold", "cpu_threshold",
+        "memory_threshold", "disk_threshold", "metrics_interval", "snapshot_interval",
+        "anomaly_threshold", "ingest_rate", "ingest_burst", "ingest_reservoir",
+        "log_query_scan_limit", "config_poll_interval", "flap_window", "flap_threshold"
+    })
+
+    def apply_config(self, new_config: Config) -> List[str]:
+        """
+        Yeni yapılandırmayı yerinde uygula ve bileşenlere aktar.
+
+        Config nesnesi değiştirilmez, alanları tek bir dict.update ile
+        yenilenir: nesneyi tutan her modül yeni değerleri görür, GIL
+        altında okuyucular yarım güncellenmiş bir nesne görmez.
+        Bileşenler (ve önbellekleri) yerinde kalır.
+
+        Returns:
+            Değişen alan adları
+        """
+        changed = [item.name for item in dataclasses.fields(Config)
+                   if getattr(self.config, item.name) != getattr(new_config, item.name)]
+        if not changed:
+            return changed
+        vars(self.config).update(vars(new_config))
+        cfg = self.config
+
+        if "critical_services" in changed:
+            self.service_monitor.set_critical_services(cfg.critical_services)
+        for name in ("error_threshold", "warning_threshold", "cpu_threshold",
+                     "memory_threshold", "disk_threshold"):
+            setattr(self.alert_manager, name, getattr(cfg, name))
+        self.system_metrics.interval = cfg.metrics_interval
+        self.snapshots.interval = cfg.snapshot_interval
+        self.transitions.flap_window = cfg.flap_window
+        self.transitions.flap_threshold = cfg.flap_threshold
+        if self.anomalies is not None:
+            self.anomalies.threshold = cfg.anomaly_threshold
+        if self.governor is not None:
+            self.governor.configure(rate=cfg.ingest_rate, burst=cfg.ingest_burst,
+                                    reservoir_size=cfg.ingest_reservoir)
+        if self.config_watcher is not None:
+            self.config_watcher.poll_interval = cfg.config_poll_interval
+
+        restart = [name for name in changed if name not in self.HOT_RELOAD_FIELDS]
+        print(f"Config reloaded: {', '.join(changed)}")
+        if restart:
+            print(f"Config fields applied on restart only: {', '.join(restart)}")
+        return changed
+
+    def start(self):
+        """Arka plan toplayıcılarını başlat (tekrar çağrılması güvenli)"""
+        if self._started:
+            return
+        self.system_metrics.start()
+        self.snapshots.start()
+        if self.config_watcher is not None:
+            self.config_watcher.start()
+        if self.config.profiler:
+            self.profiler.start()
+        self._started = True
+
+    def stop(self):
+        """Arka plan toplayıcılarını durdur"""
+        if not self._started:
+            return
+        self.system_metrics.stop()
+        self.snapshots.stop()
+        if self.config_watcher is not None:
+            self.config_watcher.stop()
+        self.profiler.stop()
+        self._started = False
@@ -92,6 +92,9 @@ async function refreshData() {
         alertBadge.textContent = data.alerts.active || 0;
         alertBadge.style.display = data.alerts.active > 0 ? 'flex' : 'none';
 
+        // Update host metrics
+        updateSystemMetrics(data.system);
+
         // Update charts
         updateServiceChart(data.services);
         updateLogChart(data.logs);
@@ -102,41 +105,230 @@ async function refreshData() {
         // Load alerts for recent section
         loadRecentAlerts();
 
+        // Pull only changes for the open table
+        if (currentTab === 'services') loadServices();
+        else if (currentTab === 'logs') loadLogs();
+
     } catch (error) {
         console.error('Error refreshing data:', error);
     }
 }
 
+function updateSystemMetrics(system) {
+    if (!system) return;
+
+    document.getElementById('stat-cpu').textContent = `%${system.cpu_percent.toFixed(1)}`;
+    document.getElementById('stat-memory').textContent = `%${system.memory_percent.toFixed(1)}`;
+    document.getElementById('stat-disk').textContent = `%${system.disk_percent.toFixed(1)}`;
+    document.getElementById('stat-network').textContent =
+        `${formatBytes(system.net_rx_bps)}/s / ${formatBytes(system.net_tx_bps)}/s`;
+}
+
+// ===== Virtual List =====
+/**
+ * Windowed, keyed row renderer.
+ * Only rows inside the scroll viewport (plus overscan) exist in the DOM;
+ * two spacer elements stand in for the rows above and below so the
+ * scrollbar still reflects the whole list. Row nodes are keyed and are
+ * rebuilt only when their signature changes.
+ */
+class VirtualList {
+    constructor(viewport, container, options) {
+        this.viewport = viewport;
+        this.container = container;
+        this.key = options.key;
+        this.signature = options.signature || (() => '');
+        this.renderRow = options.renderRow;
+        this.spacerTag = options.spacerTag || 'div';
+        this.overscan = options.overscan || 10;
+        this.rowHeight = options.rowHeight || 40;
+        this.items = [];
+        this.nodes = new Map();
+        this.frame = null;
+        this.top = this.createSpacer();
+        this.bottom = this.createSpacer();
+
+        viewport.addEventListener('scroll', () => this.schedule(), { passive: true });
+        window.addEventListener('resize', () => this.schedule());
+    }
+
+    createSpacer() {
+        const spacer = document.createElement(this.spacerTag);
+        spacer.className = 'virtual-spacer';
+        if (this.spacerTag === 'tr') spacer.appendChild(document.createElement('td')).colSpan = 100;
+        return spacer;
+    }
+
+    setItems(items) {
+        this.items = items;
+        this.schedule();
+    }
+
+    showMessage(html) {
+        this.items = [];
+        this.nodes.clear();
+        this.container.innerHTML = html;
+    }
+
+    schedule() {
+        if (this.frame === null) {
+            this.frame = requestAnimationFrame(() => this.render());
+        }
+    }
+
+    columns() {
+        const template = getComputedStyle(this.container).gridTemplateColumns;
+        if (!template || template === 'none') return 1;
+        return Math.max(1, template.split(' ').length);
+    }
+
+    render() {
+        this.frame = null;
+        if (this.top.parentNode !== this.container) {
+            this.container.innerHTML = '';
+            this.container.append(this.top, this.bottom);
+        }
+
+        const columns = this.columns();
+        const gap = parseFloat(getComputedStyle(this.container).rowGap) || 0;
+        const totalRows = Math.ceil(this.items.length / columns);
+
+        // Scroll position relative to the first row
+        const offset = this.container.getBoundingClientRect().top -
+            this.viewport.getBoundingClientRect().top + this.viewport.scrollTop;
+        const scrolled = Math.max(0, this.viewport.scrollTop - offset);
+        const firstRow = Math.max(0, Math.floor(scrolled / this.rowHeight) - this.overscan);
+        const lastRow = Math.min(totalRows,
+            Math.ceil((scrolled + this.viewport.clientHeight) / this.rowHeight) + this.overscan);
+
+        // Keyed diff: reuse unchanged nodes, rebuild changed ones
+        const visible = [];
+        const wanted = new Set();
+        for (let i = firstRow * columns; i < Math.min(this.items.length, lastRow * columns); i++) {
+            const item = this.items[i];
+            const key = this.key(item);
+            const signature = this.signature(item);
+            let entry = this.nodes.get(key);
+            if (!entry || entry.signature !== signature) {
+                if (entry) entry.node.remove();
+                entry = { node: this.renderRow(item), signature };
+                this.nodes.set(key, entry);
+            }
+            wanted.add(key);
+            visible.push(entry.node);
+        }
+        for (const [key, entry] of this.nodes) {
+            if (!wanted.has(key)) {
+                entry.node.remove();
+                this.nodes.delete(key);
+            }
+        }
+
+        let cursor = this.top.nextSibling;
+        for (const node of visible) {
+            if (node === cursor) cursor = cursor.nextSibling;
+            else this.container.insertBefore(node, cursor);
+        }
+
+        this.setSpacer(this.top, firstRow, gap);
+        this.setSpacer(this.bottom, totalRows - lastRow, gap);
+
+        // Row height is estimated until the first rows are measured
+        if (visible.length) {
+            const measured = visible.length > columns
+                ? visible[columns].offsetTop - visible[0].offsetTop
+                : visible[0].offsetHeight + gap;
+            if (measured > 0 && Math.abs(measured - this.rowHeight) > 1) {
+                this.rowHeight = measured;
+                this.schedule();
+            }
+        }
+    }
+
+    setSpacer(spacer, rows, gap) {
+        spacer.style.display = rows > 0 ? '' : 'none';
+        spacer.style.height = rows > 0 ? `${rows * this.rowHeight - gap}px` : '0';
+    }
+}
+
+function createElement(html) {
+    const template = document.createElement('template');
+    template.innerHTML = html.trim();
+    return template.content.firstElementChild;
+}
+
 // ===== Services =====
+// Client-side copy of /api/services; refreshed with since_version deltas
+const serviceCache = { filter: null, epoch: null, version: null, etag: null, items: new Map() };
+let serviceList = null;
+
+function getServiceList() {
+    if (!serviceList) {
+        const container = document.getElementById('services-list');
+        serviceList = new VirtualList(container.parentElement, container, {
+            key: service => service.name,
+            signature: service => `${service.status}|${service.is_critical}|${service.display_name}`,
+            renderRow: renderServiceCard,
+            rowHeight: 90,
+            overscan: 4
+        });
+    }
+    return serviceList;
+}
+
 async function loadServices() {
-    const container = document.getElementById('services-list');
-    container.innerHTML = '<div class="loading"><i class="fas fa-spinner fa-spin"></i><p>Yükleniyor...</p></div>';
+    const list = getServiceList();
+    const filter = document.getElementById('service-filter').value;
+
+    if (serviceCache.filter !== filter) {
+        Object.assign(serviceCache, { filter, epoch: null, version: null, etag: null, items: new Map() });
+        list.viewport.scrollTop = 0;
+        list.showMessage('<div class="loading"><i class="fas fa-spinner fa-spin"></i><p>Yükleniyor...</p></div>');
+    }
 
     try {
-        const filter = document.getElementById('service-filter').value;
-        const url = filter ? `/api/services?status=${filter}` : '/api/services';
+        let url = filter ? `/api/services?status=${filter}` : '/api/services';
+        const headers = {};
+        if (serviceCache.version !== null) {
+            url += `${filter ? '&' : '?'}since_version=${serviceCache.version}&epoch=${serviceCache.epoch}`;
+            if (serviceCache.etag) headers['If-None-Match'] = serviceCache.etag;
+        }
 
-        const response = await fetch(url);
+        const response = await fetch(url, { headers });
+        if (response.status === 304) return;
         const data = await response.json();
 
-        servicesData = data.services;
-        renderServices(servicesData);
+        if (!data.delta) serviceCache.items = new Map();
+        data.services.forEach(service => serviceCache.items.set(service.name, service));
+        (data.removed || []).forEach(name => serviceCache.items.delete(name));
+        serviceCache.version = data.version;
+        serviceCache.epoch = data.epoch;
+        serviceCache.etag = response.headers.get('ETag');
+
+        servicesData = Array.from(serviceCache.items.values())
+            .sort((a, b) => a.name.localeCompare(b.name));
+        searchServices();
 
     } catch (error) {
         console.error('Error loading services:', error);
-        container.innerHTML = '<div class="empty-state"><i class="fas fa-exclamation-circle"></i><p>Servisler yüklenemedi</p></div>';
+        serviceCache.filter = null;
+        list.showMessage('<div class="empty-state"><i class="fas fa-exclamation-circle"></i><p>Servisler yüklenemedi</p></div>');
     }
 }
 
 function renderServices(services) {
-    const container = document.getElementById('services-list');
+    const list = getServiceList();
 
     if (services.length === 0) {
-        container.innerHTML = '<div class="empty-state"><i class="fas fa-server"></i><p>Servis bulunamadı</p></div>';
+        list.showMessage('<div class="empty-state"><i class="fas fa-server"></i><p>Servis bulunamadı</p></div>');
         return;
     }
 
-    container.innerHTML = services.map(service => `
+    list.setItems(services);
+}
+
+function renderServiceCard(service) {
+    return createElement(`
         <div class="service-card">
             <div class="service-status ${service.status}"></div>
             <div class="service-info">
@@ -145,7 +337,7 @@ function renderServices(services) {
             </div>
             ${service.is_critical ? '<span class="service-badge critical">Kritik</span>' : ''}
         </div>
-    `).join('');
+    `);
 }
 
 function filterServices() {
@@ -162,45 +354,94 @@ function searchServices() {
 }
 
 // ===== Logs =====
+// Client-side copy of /api/logs; refreshed with ?since=<newest timestamp>
+const logCache = { query: null, keys: new Set() };
+let logList = null;
+
+function getLogList() {
+    if (!logList) {
+        const container = document.getElementById('logs-list');
+        logList = new VirtualList(container.closest('.logs-container'), container, {
+            key: log => log.key,
+            renderRow: renderLogRow,
+            spacerTag: 'tr',
+            rowHeight: 45
+        });
+    }
+    return logList;
+}
+
 async function loadLogs() {
-    const container = document.getElementById('logs-list');
-    container.innerHTML = '<tr><td colspan="4" class="loading"><i class="fas fa-spinner fa-spin"></i> Yükleniyor...</td></tr>';
+    const list = getLogList();
+    const level = document.getElementById('log-level-filter').value;
+    const limit = parseInt(document.getElementById('log-limit').value, 10);
+    const query = `${level}|${limit}`;
+
+    if (logCache.query !== query) {
+        logCache.query = query;
+        logCache.keys = new Set();
+        logsData = [];
+        list.viewport.scrollTop = 0;
+        list.showMessage('<tr><td colspan="4" class="loading"><i class="fas fa-spinner fa-spin"></i> Yükleniyor...</td></tr>');
+    }
 
     try {
-        const level = document.getElementById('log-level-filter').value;
-        const limit = document.getElementById('log-limit').value;
-
         let url = `/api/logs?limit=${limit}`;
         if (level) url += `&level=${level}`;
+        if (logsData.length) url += `&since=${encodeURIComponent(logsData[logsData.length - 1].timestamp)}`;
 
         const response = await fetch(url);
         const data = await response.json();
 
-        logsData = data.logs;
-        renderLogs(logsData);
+        mergeLogs(data.logs, limit);
+        searchLogs();
 
     } catch (error) {
         console.error('Error loading logs:', error);
-        container.innerHTML = '<tr><td colspan="4" class="loading">Loglar yüklenemedi</td></tr>';
+        logCache.query = null;
+        list.showMessage('<tr><td colspan="4" class="loading">Loglar yüklenemedi</td></tr>');
+    }
+}
+
+function mergeLogs(logs, limit) {
+    // Entries have no id; identical lines in the same second are told apart by occurrence
+    const occurrences = new Map();
+    logs.forEach(log => {
+        const base = `${log.timestamp}|${log.service}|${log.message}`;
+        const count = (occurrences.get(base) || 0) + 1;
+        occurrences.set(base, count);
+        log.key = `${base}#${count}`;
+        if (!logCache.keys.has(log.key)) {
+            logCache.keys.add(log.key);
+            logsData.push(log);
+        }
+    });
+
+    if (logsData.length > limit) {
+        logsData.splice(0, logsData.length - limit).forEach(log => logCache.keys.delete(log.key));
     }
 }
 
 function renderLogs(logs) {
-    const container = document.getElementById('logs-list');
+    const list = getLogList();
 
     if (logs.length === 0) {
-        container.innerHTML = '<tr><td colspan="4" class="loading">Log bulunamadı</td></tr>';
+        list.showMessage('<tr><td colspan="4" class="loading">Log bulunamadı</td></tr>');
         return;
     }
 
-    container.innerHTML = logs.map(log => `
+    list.setItems(logs);
+}
+
+function renderLogRow(log) {
+    return createElement(`
         <tr>
             <td class="log-timestamp">${formatTimestamp(log.timestamp)}</td>
             <td><span class="log-level ${log.level.toLowerCase()}">${log.level}</span></td>
             <td class="log-service">${escapeHtml(log.service || '-')}</td>
             <td class="log-message" title="${escapeHtml(log.message)}">${escapeHtml(log.message)}</td>
         </tr>
-    `).join('');
+    `);
 }
 
 function filterLogs() {
@@ -411,6 +652,17 @@ function escapeHtml(text) {
     return div.innerHTML;
 }
 
+function formatBytes(bytes) {
+    const units = ['B', 'KB', 'MB', 'GB', 'TB'];
+    let value = bytes || 0;
+    let unit = 0;
+    while (value >= 1024 && unit < units.length - 1) {
+        value /= 1024;
+        unit++;
+    }
+    return `${value.toFixed(unit === 0 ? 0 : 1)} ${units[unit]}`;
+}
+
 function formatTimestamp(isoString) {
     if (!isoString) return '-';
     try {